@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: belief ledger calibration reports as claims pile up
+Usage: python3 benchmarks/bench_belief_ledger.py [--claims 1k,10k,100k,1M] [--agents 3]
+Synthetic agents state confidences with different miscalibration; the report
+(Brier scores, calibration curves, tiers) is timed against a plain Python loop
+over the same rows. Requires numpy.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from belief_ledger import BeliefLedger, OUTCOME_DTYPE, TIERS, BAYESIAN_KINDS, PRIOR
+
+UNITS = {"K": 1000, "M": 1000000}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def populate(ledger: BeliefLedger, n: int, agents: int, rng: np.random.Generator):
+    """n prior statements over n claims, each resolved; agent i inflates confidence by i * 10%"""
+    for i in range(agents):
+        ledger.agents.code(f"agent-{i}")
+    for i in range(n):
+        ledger.claims.code(f"claim {i}")
+    agent = rng.integers(agents, size=n)
+    truth = rng.random(n)
+    confidence = np.clip(truth + 0.1 * agent, 0, 1)
+    outcomes = np.zeros(n, OUTCOME_DTYPE)
+    outcomes["claim"] = np.arange(n)
+    outcomes["outcome"] = rng.random(n) < truth
+    outcomes["timestamp"] = 1e9
+    shift = rng.normal(scale=0.3, size=n)
+    ledger.append_rows({
+        "message": rng.integers(1 << 62, size=n, dtype=np.uint64),
+        "timestamp": np.arange(n, dtype=np.float64),
+        "agent": agent,
+        "claim": np.arange(n),
+        "role": np.full(n, PRIOR),
+        "confidence": confidence,
+        "shift": shift,
+        "tier": np.where(np.abs(shift) < 0.2, 0, np.where(np.abs(shift) <= 0.5, 1, 2)),
+        "kind": np.full(n, BAYESIAN_KINDS.index("bayesian_update")),
+    })
+    with open(ledger.directory / "outcomes.bin", "ab") as f:
+        outcomes.tofile(f)
+
+
+def python_report(ledger: BeliefLedger, bins: int = 10) -> dict:
+    """The same numbers with one Python loop over rows, for comparison"""
+    columns = {name: values.tolist() for name, values in ledger.columns.items()}
+    outcome, resolved_at = ledger.resolutions()
+    outcome, resolved_at = outcome.tolist(), resolved_at.tolist()
+    squared = defaultdict(float)
+    counts = defaultdict(int)
+    cells = defaultdict(lambda: [0, 0.0, 0.0])
+    tiers = defaultdict(int)
+    for i in range(len(columns["message"])):
+        agent, claim, p = columns["agent"][i], columns["claim"][i], columns["confidence"][i]
+        tiers[agent, TIERS[columns["tier"][i]]] += 1
+        if outcome[claim] < 0 or not columns["timestamp"][i] <= resolved_at[claim]:
+            continue
+        o = outcome[claim]
+        squared[agent] += (p - o) ** 2
+        counts[agent] += 1
+        cell = cells[agent, min(int(p * bins), bins - 1)]
+        cell[0] += 1
+        cell[1] += p
+        cell[2] += o
+    return {agent: squared[agent] / counts[agent] for agent in counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Belief ledger benchmark")
+    parser.add_argument("--claims", default="1k,10k,100k,1M")
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'claims':>9} {'load':>9} {'report':>9} {'python':>9} {'speedup':>8}  Brier by agent")
+    for n in (parse_size(s) for s in args.claims.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            populate(BeliefLedger(tmp), n, args.agents, rng)
+
+            started = time.perf_counter()
+            ledger = BeliefLedger(tmp)
+            len(ledger)
+            loaded = time.perf_counter() - started
+
+            started = time.perf_counter()
+            report = ledger.report()
+            vectorized = time.perf_counter() - started
+
+            started = time.perf_counter()
+            baseline = python_report(ledger)
+            looped = time.perf_counter() - started
+
+            for i, name in enumerate(ledger.agents.values):
+                assert abs(report[name]["brier"] - baseline[i]) < 1e-6
+            briers = " ".join(f"{report[name]['brier']:.3f}" for name in ledger.agents.values)
+            print(f"{n:>9,} {1000 * loaded:>7.1f}ms {1000 * vectorized:>7.1f}ms {1000 * looped:>7.1f}ms "
+                  f"{looped / vectorized:>7.1f}x  {briers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooling open conflicts in one batch vs one at a time
+Usage: python3 benchmarks/bench_conflict_resolver.py [--conflicts 100,1k,10k] [--agents 3]
+Requires numpy.
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from conflict_resolver import Conflict, Position, pool
+
+UNITS = {"K": 1000, "M": 1000000}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def synthetic(n: int, agents: int, rng: random.Random):
+    names = [f"agent-{i}" for i in range(agents)]
+    conflicts = []
+    for i in range(n):
+        positions = [Position(name, f"option {rng.randrange(3)} of {i}", rng.uniform(0.3, 0.95))
+                     for name in rng.sample(names, rng.randint(2, agents))]
+        conflicts.append(Conflict(f"Task #{i}", positions))
+    return conflicts, {name: rng.uniform(0.1, 1.0) for name in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conflict pooling benchmark")
+    parser.add_argument("--conflicts", default="100,1k,10k")
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'conflicts':>9} {'method':>7} {'batched':>10} {'one by one':>11} {'speedup':>8}")
+    for n in (parse_size(s) for s in args.conflicts.split(",")):
+        conflicts, weights = synthetic(n, args.agents, rng)
+        for method in ("log", "linear"):
+            started = time.perf_counter()
+            pool(conflicts, method, weights)
+            batched = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for conflict in conflicts:
+                pool([conflict], method, weights)
+            single = time.perf_counter() - started
+            print(f"{n:>9,} {method:>7} {1000 * batched:>8.1f}ms {1000 * single:>9.1f}ms {single / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
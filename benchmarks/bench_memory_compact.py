@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory compaction over months of daily logs
+Usage: python3 benchmarks/bench_memory_compact.py [--days 180] [--entries 60]
+Times a first full pass, a heartbeat with nothing new, and a heartbeat after
+one new day, and reports how large MEMORY.md stays.
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from memory.compactor import Compactor
+
+TEMPLATES = [
+    "Status check: all agents online",
+    "No new messages in #agent-mesh",
+    "Checked the queue, nothing new",
+    "Mood: {word}",
+    "Merged PR #{n}",
+    "Decided to use {word} for the {topic}",
+    "{agent} prefers {word} summaries",
+    "Should the {topic} retry on {word} errors?",
+    "**{topic} timeout:** {n}s",
+    "Read through the {topic} logs for {word} issues",
+]
+WORDS = ["segmented", "batched", "short", "signed", "pooled", "cached", "quantized", "streamed"]
+TOPICS = ["queue", "bot", "index", "registry", "dispatcher", "signer"]
+AGENTS = ["Clawdy", "Neuromancer", "Wintermute"]
+
+
+def daily_log(day: date, entries: int, rng: random.Random) -> str:
+    lines = [f"# {day.isoformat()}", ""]
+    for hour in range(0, entries, 10):
+        lines.append(f"## {9 + hour // 10:02d}:00")
+        for _ in range(10):
+            lines.append("- " + rng.choice(TEMPLATES).format(
+                word=rng.choice(WORDS), topic=rng.choice(TOPICS), agent=rng.choice(AGENTS), n=rng.randint(1, 500)))
+        lines.append("")
+    lines.extend([f"### Error: {rng.choice(TOPICS)} stall",
+                  f"**Error:** {rng.choice(TOPICS)} blocked on {rng.choice(WORDS)} writes",
+                  f"**Fix:** switched to {rng.choice(WORDS)} commits",
+                  "**Lesson:** measure before tuning", ""])
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory compactor benchmark")
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--entries", type=int, default=60, help="Entries per daily log")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    first = date(2026, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "memory").mkdir()
+        for i in range(args.days):
+            day = first + timedelta(days=i)
+            (root / "memory" / f"{day.isoformat()}.md").write_text(daily_log(day, args.entries, rng))
+        log_bytes = sum(p.stat().st_size for p in (root / "memory").iterdir())
+
+        runs = []
+        started = time.perf_counter()
+        stats = Compactor(root).run()
+        runs.append(("full pass", time.perf_counter() - started, stats))
+
+        started = time.perf_counter()
+        stats = Compactor(root).run()
+        runs.append(("no new logs", time.perf_counter() - started, stats))
+
+        day = first + timedelta(days=args.days)
+        (root / "memory" / f"{day.isoformat()}.md").write_text(daily_log(day, args.entries, rng))
+        started = time.perf_counter()
+        stats = Compactor(root).run()
+        runs.append(("one new day", time.perf_counter() - started, stats))
+
+        print(f"{args.days} daily logs, {log_bytes / 1024:.0f} KiB")
+        print(f"{'run':>12} {'time':>10} {'read':>6} {'entries':>8} {'kept':>6} {'dups':>6}")
+        for name, elapsed, stats in runs:
+            print(f"{name:>12} {1000 * elapsed:>8.1f}ms {stats['processed']:>6} {stats['entries']:>8} "
+                  f"{sum(stats['kept'].values()):>6} {stats['duplicates']:>6}")
+        memory_bytes = (root / "MEMORY.md").stat().st_size
+        print(f"MEMORY.md: {memory_bytes / 1024:.1f} KiB ({100 * memory_bytes / log_bytes:.1f}% of the logs)")
+
+
+if __name__ == "__main__":
+    main()
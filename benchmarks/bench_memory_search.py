@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory_search index build, incremental update and query latency
+Usage: python3 benchmarks/bench_memory_search.py [--days 1095] [--sections 12] [--queries 200]
+Generates synthetic daily logs (memory/YYYY-MM-DD.md) in a temp workspace.
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from memory import MemoryIndex
+
+VOCABULARY = (
+    "agent mesh synthesis research matrix slack fallback signature ed25519 registry queue "
+    "latency cursor segment decision lesson error fix prevention heartbeat calibration "
+    "bayesian prior posterior conflict routing capability governance vision policy budget "
+    "iceberg catalog partition s3 tables lancedb ollama embedding vector chunk memory "
+    "neuromancer clawdy moltdude tatooine vps cron overnight monitoring cve advisory patch"
+).split()
+
+
+def write_workspace(root: Path, days: int, sections: int, rng: random.Random):
+    (root / "memory").mkdir()
+    start = date(2024, 1, 1)
+    for n in range(days):
+        day = start + timedelta(days=n)
+        lines = [f"# {day.isoformat()}\n"]
+        for s in range(sections):
+            lines.append(f"\n## {rng.choice(('Decision', 'Error', 'Status', 'Note'))}: "
+                         f"{' '.join(rng.choices(VOCABULARY, k=4))}\n")
+            for _ in range(rng.randint(2, 8)):
+                lines.append(" ".join(rng.choices(VOCABULARY, k=rng.randint(6, 18))) + f" ref{n}-{s}\n")
+        (root / "memory" / f"{day.isoformat()}.md").write_text("".join(lines))
+    (root / "MEMORY.md").write_text("# Memory\n\n" + " ".join(rng.choices(VOCABULARY, k=400)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="memory_search benchmark")
+    parser.add_argument("--days", type=int, default=1095, help="Daily logs to generate (default: 3 years)")
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_workspace(root, args.days, args.sections, rng)
+
+        index = MemoryIndex(root)
+        started = time.perf_counter()
+        index.update()
+        build = time.perf_counter() - started
+        stats = index.stats()
+        print(f"📦 {stats['files']} files, {stats['chunks']:,} chunks, "
+              f"{stats['index_bytes'] / 1e6:.1f} MB index — full build {build:.2f}s")
+
+        started = time.perf_counter()
+        index.update()
+        print(f"♻️  No-op update (stat only): {1000 * (time.perf_counter() - started):.1f} ms")
+
+        today = root / "memory" / "2030-01-01.md"
+        today.write_text("# 2030-01-01\n\n## Decision: new day\nappended heartbeat entry\n")
+        started = time.perf_counter()
+        index.update()
+        print(f"➕ Add one daily log: {1000 * (time.perf_counter() - started):.1f} ms")
+
+        latencies = []
+        for _ in range(args.queries):
+            query = " ".join(rng.choices(VOCABULARY, k=rng.randint(1, 4)))
+            started = time.perf_counter()
+            index.search(query, 10)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        print(f"🔍 {args.queries} queries: p50 {1000 * latencies[len(latencies) // 2]:.1f} ms, "
+              f"p99 {1000 * latencies[int(len(latencies) * 0.99)]:.1f} ms")
+
+        rare = [f"ref{rng.randrange(args.days)}-{rng.randrange(args.sections)}" for _ in range(args.queries)]
+        started = time.perf_counter()
+        for query in rare:
+            index.search(query, 10)
+        print(f"🎯 Rare-term query mean: {1000 * (time.perf_counter() - started) / len(rare):.2f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
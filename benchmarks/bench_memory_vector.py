@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vector search latency and recall as memory grows
+Usage: python3 benchmarks/bench_memory_vector.py [--sizes 10k,100k,1M] [--dim 256] [--queries 100]
+Vectors are synthetic and clustered (like topical memory chunks). Recall@k
+is measured against exact float32 search on the same store.
+Requires numpy.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from memory.vector import VectorStore, normalize
+
+UNITS = {"K": 1000, "M": 1000000}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def clustered(n: int, dim: int, rng: np.random.Generator, clusters: int = 1000, block: int = 100000):
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        noise = rng.normal(scale=0.5, size=(end - start, dim)).astype(np.float32)
+        out[start:end] = normalize(centers[rng.integers(clusters, size=end - start)] + noise)
+    return out
+
+
+def timed_search(store: VectorStore, queries, k: int, mode: str, nprobe: int = 8):
+    store.search(queries[:1], k, mode, nprobe)  # warm the page cache
+    started = time.perf_counter()
+    single = [store.search(q[None, :], k, mode, nprobe)[1][0] for q in queries]
+    per_query = (time.perf_counter() - started) / len(queries)
+    started = time.perf_counter()
+    store.search(queries, k, mode, nprobe)
+    batched = (time.perf_counter() - started) / len(queries)
+    return np.array(single), per_query, batched
+
+
+def recall(truth, found, k: int) -> float:
+    return float(np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector search benchmark")
+    parser.add_argument("--sizes", default="10k,100k,1M")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'chunks':>9} {'store':>8} {'mode':>6} {'1 query':>10} {'batched':>10} {'recall@' + str(args.k):>10}")
+
+    for size in (parse_size(s) for s in args.sizes.split(",")):
+        vectors = clustered(size, args.dim, rng)
+        picks = rng.choice(size, size=args.queries, replace=False)
+        queries = normalize(vectors[picks] + rng.normal(scale=0.05, size=(args.queries, args.dim)).astype(np.float32))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            truth = None
+            for quantize in ("float32", "int8"):
+                store = VectorStore.write(Path(tmp) / quantize, vectors, quantize)
+                ids, single, batched = timed_search(store, queries, args.k, "exact")
+                if truth is None:
+                    truth = ids
+                print(f"{size:>9,} {quantize:>8} {'exact':>6} {1000 * single:>8.2f}ms {1000 * batched:>8.2f}ms "
+                      f"{recall(truth, ids, args.k):>10.3f}")
+
+                started = time.perf_counter()
+                store.train_ivf()
+                trained = time.perf_counter() - started
+                ids, single, batched = timed_search(store, queries, args.k, "ivf", args.nprobe)
+                print(f"{size:>9,} {quantize:>8} {'ivf':>6} {1000 * single:>8.2f}ms {1000 * batched:>8.2f}ms "
+                      f"{recall(truth, ids, args.k):>10.3f}   (nlist {len(store.centroids)}, "
+                      f"nprobe {args.nprobe}, trained in {trained:.1f}s)")
+                del store
+        del vectors
+
+
+if __name__ == "__main__":
+    main()
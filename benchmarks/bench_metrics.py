@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call cost of mesh_metrics instrumentation, disabled and enabled
+Usage: python3 benchmarks/bench_metrics.py [--count 1000000]
+The disabled figures are what every instrumented hot path pays by default.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import mesh_metrics
+
+
+def per_call(fn, count: int) -> float:
+    started = time.perf_counter()
+    fn(count)
+    return (time.perf_counter() - started) / count
+
+
+def baseline(count):
+    for _ in range(count):
+        pass
+
+
+def spans(count):
+    span = mesh_metrics.span
+    for _ in range(count):
+        with span("bench", kind="ack"):
+            pass
+
+
+def traced_spans(count):
+    span = mesh_metrics.span
+    for i in range(count):
+        with span("bench", "f" * 64, kind="ack"):
+            pass
+
+
+def counters(count):
+    inc = mesh_metrics.inc
+    for _ in range(count):
+        inc("agent_mesh_bench_total", kind="ack")
+
+
+def observations(count):
+    observe = mesh_metrics.observe
+    for _ in range(count):
+        observe("agent_mesh_bench_seconds", 0.001)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    loop = per_call(baseline, args.count)
+    mesh_metrics.disable()
+    print("Disabled (net of an empty loop):")
+    for name, fn in (("span()", spans), ("inc()", counters), ("observe()", observations)):
+        print(f"  {name:<12} {(per_call(fn, args.count) - loop) * 1e9:8.0f} ns")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mesh_metrics.enable()
+        print("Enabled:")
+        for name, fn in (("span()", spans), ("inc()", counters), ("observe()", observations)):
+            print(f"  {name:<12} {(per_call(fn, args.count) - loop) * 1e9:8.0f} ns")
+        mesh_metrics.enable(trace_log=str(Path(tmpdir) / "trace.jsonl"))
+        traced = max(1, args.count // 10)
+        print(f"  {'traced span':<12} {(per_call(traced_spans, traced) - loop) * 1e9:8.0f} ns")
+        mesh_metrics.disable()
+
+
+if __name__ == "__main__":
+    main()
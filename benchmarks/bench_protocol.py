@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: protocol prefix parsing throughput on a synthetic corpus
+Usage: python3 benchmarks/bench_protocol.py [--count 1000000] [--seed 7]
+Compares the original split-twice parser with mesh_protocol's single-pass
+matcher, both producing the queue record.
+"""
+
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+
+def legacy_record(text: str) -> dict:
+    """The bot's original parse_protocol_message body"""
+    if "]" in text:
+        prefix = text.split("]")[0] + "]"
+        content = text.split("]", 1)[1].strip()
+    else:
+        prefix = "[MESSAGE]"
+        content = text
+    return {"prefix": prefix, "content": content, "raw": text}
+
+
+def corpus(count: int, seed: int) -> list:
+    """Mostly registered prefixes, some unknown brackets and plain chatter"""
+    rng = random.Random(seed)
+    tags = list(DEFAULT_PREFIXES.values())
+    words = ("model", "latency", "CVE", "synthesis", "agent", "cost", "[ref]", "benchmark", "memory")
+    messages = []
+    for _ in range(count):
+        body = " ".join(rng.choice(words) for _ in range(rng.randint(3, 60)))
+        roll = rng.random()
+        if roll < 0.85:
+            messages.append(f"{rng.choice(tags)} {body}")
+        elif roll < 0.95:
+            messages.append(f"[NOTE-{rng.randint(1, 9)}] {body}")
+        else:
+            messages.append(body)
+    return messages
+
+
+def run(name: str, fn, messages: list) -> dict:
+    started = time.perf_counter()
+    for text in messages:
+        fn(text)
+    elapsed = time.perf_counter() - started
+    return {"parser": name, "seconds": elapsed, "msgs_per_sec": len(messages) / elapsed}
+
+
+def retained_bytes(fn, messages: list) -> int:
+    """Memory held by the parsed results of the first 100k messages"""
+    sample = messages[:100000]
+    tracemalloc.start()
+    kept = [fn(text) for text in sample]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Protocol parser microbenchmark")
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    protocol = ProtocolParser(DEFAULT_PREFIXES)
+    messages = corpus(args.count, args.seed)
+    total_bytes = sum(len(m) for m in messages)
+    print(f"📦 {len(messages):,} messages, {total_bytes / 1e6:.1f} MB of text")
+
+    cases = [
+        ("legacy split + dict", legacy_record),
+        ("mesh_protocol parse", protocol.parse),
+        ("mesh_protocol parse + record", lambda text: protocol.parse(text).to_record()),
+    ]
+    for name, fn in cases:
+        result = run(name, fn, messages)
+        held = retained_bytes(fn, messages)
+        print(f"{name:<30} {result['msgs_per_sec']:>12,.0f} msg/s  "
+              f"{result['seconds']:6.2f}s  {held / 100000:6.0f} B/msg retained")
+
+
+if __name__ == "__main__":
+    main()
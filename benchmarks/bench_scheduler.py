@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: simulated day of the task scheduler with thousands of queued tasks
+Usage: python3 benchmarks/bench_scheduler.py [--tasks 1k,10k,50k] [--miss 0.1] [--limit 4]
+Tasks of random types arrive over a simulated day against the real
+agents.yaml routes. Agents ACK after a few seconds, or miss the deadline
+with probability --miss, and finish after a few minutes. Reports wall time
+per scheduler call and the cost of each failover tick.
+"""
+
+import sys
+import time
+import heapq
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from agent_registry import load_registry
+from mesh_metrics import Histogram
+from scheduler import Scheduler, ACK_TIMEOUT
+
+UNITS = {"K": 1000, "M": 1000000}
+MICROS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def simulate(scheduler: Scheduler, n: int, miss: float, rng: random.Random):
+    kinds = sorted(scheduler.routes)
+    events = []  # (sim time, seq, action, task, agent)
+    seq = 0
+    for i in range(n):
+        seq += 1
+        events.append((rng.uniform(0, 86400), seq, "submit", f"task-{i}", rng.choice(kinds)))
+    heapq.heapify(events)
+
+    calls, failovers = Histogram(MICROS), Histogram(MICROS)
+    peak_waiting = 0
+    next_tick = 0.0
+
+    def react(assignments, now):
+        nonlocal seq
+        for a in assignments:
+            if a.agent is None or rng.random() < miss:
+                continue
+            seq += 1
+            heapq.heappush(events, (now + rng.uniform(1, 20), seq, "ack", a.task, a.agent))
+            seq += 1
+            heapq.heappush(events, (now + rng.uniform(60, 900), seq, "complete", a.task, a.agent))
+
+    while events:
+        now, _, action, task, arg = heapq.heappop(events)
+        while next_tick <= now:
+            started = time.perf_counter()
+            assignments = scheduler.tick(next_tick)
+            elapsed = 1e6 * (time.perf_counter() - started)
+            if assignments:
+                failovers.observe(elapsed)
+            react(assignments, next_tick)
+            next_tick += 1.0
+        started = time.perf_counter()
+        if action == "submit":
+            assignments = scheduler.submit(task, arg, now)
+        elif action == "ack":
+            scheduler.ack(task, arg, now)
+            assignments = []
+        else:
+            # completions only count for the attempt that was ACKed
+            assignments = scheduler.complete(task, now) if scheduler.assignee(task) == arg else []
+        calls.observe(1e6 * (time.perf_counter() - started))
+        react(assignments, now)
+        peak_waiting = max(peak_waiting, scheduler.waiting())
+    return calls, failovers, peak_waiting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task scheduler simulation benchmark")
+    parser.add_argument("--tasks", default="1k,10k,50k")
+    parser.add_argument("--miss", type=float, default=0.1, help="Probability an agent misses its ACK")
+    parser.add_argument("--limit", type=int, default=4, help="Concurrent tasks per agent")
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+
+    registry = load_registry()
+    print(f"ACK deadline {ACK_TIMEOUT:.0f}s, {args.miss:.0%} missed, {args.limit} concurrent per agent")
+    print(f"{'tasks':>7} {'wall':>8} {'call p50':>9} {'call p99':>9} {'failover p99':>13} "
+          f"{'failovers':>10} {'escalated':>10} {'peak queue':>11}")
+    for n in (parse_size(s) for s in args.tasks.split(",")):
+        scheduler = Scheduler(registry, default_limit=args.limit, utc_offset=0)
+        started = time.perf_counter()
+        calls, failovers, peak = simulate(scheduler, n, args.miss, random.Random(args.seed))
+        wall = time.perf_counter() - started
+        print(f"{n:>7,} {wall:>7.2f}s {calls.quantile(0.5):>7.0f}µs {calls.quantile(0.99):>7.0f}µs "
+              f"{failovers.quantile(0.99):>11.0f}µs {scheduler.failovers:>10,} "
+              f"{scheduler.escalated:>10,} {peak:>11,}")
+
+
+if __name__ == "__main__":
+    main()
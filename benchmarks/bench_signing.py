@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: messages/sec for the native and ssh-keygen signing backends
+Usage: python3 benchmarks/bench_signing.py [--messages N]
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from sign_message import create_signature
+
+
+def bench_backend(backend: str, key_path: Path, message_files: list) -> float:
+    """Sign every message file once, returning messages/sec"""
+    start = time.perf_counter()
+    for message_file in message_files:
+        create_signature(str(message_file), key_path, backend)
+    elapsed = time.perf_counter() - start
+    return len(message_files) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200, help="Messages per backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        key_path = tmp / "bench_key"
+        subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(key_path), "-N", "", "-q"],
+                       check=True)
+
+        message_files = []
+        for i in range(args.messages):
+            path = tmp / f"msg-{i:05d}.md"
+            path.write_text(f"[ACK] bench-agent — message {i}\n\nAcknowledged task {i}.\n")
+            message_files.append(path)
+
+        # Warm the key cache and base-point table so we measure steady state
+        create_signature(str(message_files[0]), key_path, "native")
+
+        print(f"Signing {args.messages} messages per backend")
+        results = {}
+        for backend in ("native", "ssh-keygen"):
+            results[backend] = bench_backend(backend, key_path, message_files)
+            print(f"  {backend:<28} {results[backend]:>10.1f} msg/s")
+
+        print(f"  speedup: {results['native'] / results['ssh-keygen']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
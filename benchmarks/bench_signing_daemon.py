@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-signature latency through the signing daemon vs a CLI process per message
+Usage: python3 benchmarks/bench_signing_daemon.py [--messages N] [--cli-messages N]
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+import subprocess
+import tempfile
+import threading
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import signing_daemon
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+
+def start_daemon(socket_path: Path, key_dir: Path):
+    daemon = signing_daemon.SigningDaemon(socket_path, key_dir=key_dir)
+    daemon.preload(["bench"])
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    async def serve():
+        daemon.stop = asyncio.Event()
+        await daemon.start()
+        ready.set()
+        await daemon.stop.wait()
+        await daemon.close()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    ready.wait(5)
+    return daemon, loop, thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000, help="Signatures through the daemon")
+    parser.add_argument("--cli-messages", type=int, default=20, help="sign_message.py invocations")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        key_dir = tmp / ".agent-keys"
+        key_dir.mkdir()
+        subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(key_dir / "bench_key"), "-N", "", "-q"],
+                       check=True)
+        socket_path = tmp / "signer.sock"
+        daemon, loop, thread = start_daemon(socket_path, key_dir)
+
+        digests = [hashlib.sha512(f"[ACK] bench — message {i}\n".encode()).digest()
+                   for i in range(args.messages)]
+        print(f"Signing {args.messages} digests through the daemon")
+
+        with signing_daemon.connect("bench", socket_path) as client:
+            client.sign_digest("bench", digests[0])
+            start = time.perf_counter()
+            for digest in digests:
+                client.sign_digest("bench", digest)
+            sequential = (time.perf_counter() - start) / len(digests)
+
+            start = time.perf_counter()
+            client.sign_many("bench", digests)
+            pipelined = (time.perf_counter() - start) / len(digests)
+
+        env = dict(os.environ, HOME=str(tmp), AGENT_MESH_SIGNER_SOCKET=str(tmp / "absent.sock"))
+        start = time.perf_counter()
+        for i in range(args.cli_messages):
+            message = tmp / f"msg-{i:04d}.md"
+            message.write_text(f"[ACK] bench — message {i}\n")
+            subprocess.run([sys.executable, str(SCRIPTS / "sign_message.py"), str(message), "bench"],
+                           check=True, capture_output=True, env=env)
+        cli = (time.perf_counter() - start) / args.cli_messages
+
+        loop.call_soon_threadsafe(daemon.stop.set)
+        thread.join(5)
+
+        print(f"  {'CLI process per message':<28} {cli * 1000:>10.3f} ms/sig")
+        print(f"  {'daemon, one at a time':<28} {sequential * 1000:>10.3f} ms/sig")
+        print(f"  {'daemon, pipelined':<28} {pipelined * 1000:>10.3f} ms/sig")
+        print(f"  daemon p99 service time: {daemon.latency.quantile(0.99) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
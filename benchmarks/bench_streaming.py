@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming sign/verify time and peak memory across payload sizes
+Usage: python3 benchmarks/bench_streaming.py [--sizes 1M,100M,1G] [--legacy]
+Each measurement runs in a fresh process so peak RSS is per operation.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+LINE = b"- Finding: synthetic research payload line for streaming benchmarks.\n"
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def write_payload(path: Path, size: int):
+    block = LINE * ((1 << 20) // len(LINE))
+    with open(path, "wb") as f:
+        f.write(b"[RESEARCH] bench - streaming payload\n\n")
+        written = f.tell()
+        while written < size:
+            chunk = block[:size - written]
+            f.write(chunk)
+            written += len(chunk)
+
+
+def child(operation: str, message_file: str, key_dir: str):
+    """Run one operation and report seconds + peak RSS as JSON"""
+    os.environ["HOME"] = key_dir
+    import sshsig
+    import sign_message
+    import verify_message
+
+    start = time.perf_counter()
+    if operation == "sign":
+        sys.stdout = open(os.devnull, "w")
+        sign_message.sign_stream(message_file, "bench")
+    elif operation == "sign-legacy":
+        sys.stdout = open(os.devnull, "w")
+        sign_message.sign_message(message_file, "bench")
+    elif operation == "verify":
+        public_key = (Path(key_dir) / ".agent-keys" / "bench_key.pub").read_text()
+        verify_message._init_batch_worker({"bench": (sshsig.parse_public_key(public_key), None)})
+        result = verify_message.verify_file(message_file)
+        assert result["status"] == "valid", result
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sys.__stdout__.write(json.dumps({"seconds": elapsed, "peak_mb": peak_kb / 1024}) + "\n")
+
+
+def run_child(operation: str, message_file: Path, key_dir: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", operation, str(message_file), str(key_dir)],
+        check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1M,100M,1G", help="Comma-separated payload sizes")
+    parser.add_argument("--legacy", action="store_true",
+                        help="Also measure the in-memory sign_message() path")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        (tmp / ".agent-keys").mkdir()
+        subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(tmp / ".agent-keys" / "bench_key"),
+                        "-N", "", "-q"], check=True)
+
+        print(f"{'size':>8} {'operation':<12} {'seconds':>9} {'MB/s':>9} {'peak RSS MB':>12}")
+        for size_text in args.sizes.split(","):
+            size = parse_size(size_text)
+            message_file = tmp / "payload.md"
+            operations = ["sign", "verify"] + (["sign-legacy"] if args.legacy else [])
+            for operation in operations:
+                if operation.startswith("sign"):
+                    write_payload(message_file, size)
+                stats = run_child(operation, message_file, tmp)
+                rate = size / (1 << 20) / stats["seconds"]
+                print(f"{size_text:>8} {operation:<12} {stats['seconds']:>9.3f} {rate:>9.1f} "
+                      f"{stats['peak_mb']:>12.1f}")
+            message_file.unlink()
+
+
+if __name__ == "__main__":
+    main()
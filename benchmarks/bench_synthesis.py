@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: checkout-and-merge synthesis vs the in-memory synthesis builder
+Usage: python3 benchmarks/bench_synthesis.py [--agents N] [--lines N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from synthesis_builder import SynthesisBuilder
+
+TASK = "task-2026-02-13-bench"
+IDENTITY = {"GIT_AUTHOR_NAME": "Bench", "GIT_AUTHOR_EMAIL": "bench@agent-mesh",
+            "GIT_COMMITTER_NAME": "Bench", "GIT_COMMITTER_EMAIL": "bench@agent-mesh"}
+
+
+def git(repo: Path, *args: str):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def build_repo(repo: Path, agents: int, lines: int):
+    git(repo.parent, "init", "-q", "-b", "main", str(repo))
+    (repo / "README.md").write_text("# Mesh\n")
+    git(repo, "add", "README.md")
+    git(repo, "commit", "-qm", "base")
+    for i in range(agents):
+        agent = f"agent{i:03d}"
+        git(repo, "checkout", "-q", "-b", f"{TASK}/{agent}", "main")
+        path = repo / "research" / agent / "findings.md"
+        path.parent.mkdir(parents=True)
+        path.write_text("".join(f"{agent} finding {n}: {'x' * 60}\n" for n in range(lines)))
+        git(repo, "add", str(path))
+        git(repo, "commit", "-qm", f"{agent} research")
+    git(repo, "checkout", "-q", "main")
+
+
+def sequential_merge(repo: Path, agents: int):
+    """What docs/git-workflow-v1.1.md does by hand"""
+    git(repo, "checkout", "-q", "-b", f"{TASK}/synthesis", "main")
+    for i in range(agents):
+        git(repo, "merge", "-q", "--no-ff", "-m", f"merge agent{i:03d}", f"{TASK}/agent{i:03d}")
+    git(repo, "checkout", "-q", "main")
+    git(repo, "branch", "-q", "-D", f"{TASK}/synthesis")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=32, help="Agent branches")
+    parser.add_argument("--lines", type=int, default=10000, help="Lines per research file")
+    args = parser.parse_args()
+    os.environ.update(IDENTITY)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo = Path(tmpdir) / "mesh"
+        build_repo(repo, args.agents, args.lines)
+        print(f"Synthesizing {args.agents} agent branches ({args.lines} lines each)")
+
+        start = time.perf_counter()
+        sequential_merge(repo, args.agents)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        builder = SynthesisBuilder(str(repo), TASK)
+        plan = builder.plan()
+        builder.write(plan)
+        in_memory = time.perf_counter() - start
+
+        print(f"  {'checkout + merge per agent':<28} {sequential:>8.2f} s")
+        print(f"  {'synthesis_builder':<28} {in_memory:>8.2f} s  (clean={plan.clean})")
+        print(f"  speedup: {sequential / in_memory:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Load test: outbound Slack dispatcher against a local fake Slack Web API
+Usage: python3 benchmarks/load_slack_dispatcher.py [--agents 3] [--messages 100] [--ack-ratio 0.5]
+       [--server-rate 5] [--rate 4] [--burst 3] [--direct]
+The fake server enforces a per-channel rate limit and answers 429 + Retry-After
+when it is exceeded, like chat.postMessage. --direct posts straight through
+AsyncWebClient (the pre-dispatcher behaviour) for comparison.
+Requires: pip install slack-sdk aiohttp
+"""
+
+import sys
+import time
+import json
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import aiohttp
+from aiohttp import web
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slack_dispatcher import OutboundDispatcher, PRIORITY_SYNTHESIS, PRIORITY_RESEARCH
+
+CHANNEL = "agent-mesh-night-city"
+
+
+class FakeSlackAPI:
+    """chat.postMessage with a sliding one-second window per channel"""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.window = {}
+        self.accepted = 0
+        self.rejected = 0
+        self.connections = set()
+
+    async def post_message(self, request: web.Request) -> web.Response:
+        self.connections.add(request.transport.get_extra_info("peername"))
+        form = dict(await request.post()) if request.content_type != "application/json" else await request.json()
+        channel = form.get("channel", "")
+        now = time.monotonic()
+        recent = [t for t in self.window.get(channel, []) if now - t < 1.0]
+        if len(recent) >= self.rate:
+            self.window[channel] = recent
+            self.rejected += 1
+            retry = max(0.0, 1.0 - (now - recent[0]))
+            return web.json_response({"ok": False, "error": "ratelimited"}, status=429,
+                                     headers={"Retry-After": str(max(1, round(retry)))})
+        recent.append(now)
+        self.window[channel] = recent
+        self.accepted += 1
+        return web.json_response({"ok": True, "channel": channel, "ts": f"{now:.6f}"})
+
+    async def start(self) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_post("/api/chat.postMessage", self.post_message)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner
+
+
+async def agent(name: str, post, messages: int, ack_ratio: float, results: dict):
+    for i in range(messages):
+        started = time.perf_counter()
+        try:
+            if random.random() < ack_ratio:
+                await post("ack", f"[ACK] {name} #{i}")
+            else:
+                await post("research", f"[RESEARCH] {name} finding #{i}")
+            results["ok"] += 1
+            results["latency"].append(time.perf_counter() - started)
+        except Exception:
+            results["failed"] += 1
+        await asyncio.sleep(random.random() * 0.01)
+
+
+async def run(args) -> dict:
+    api = FakeSlackAPI(args.server_rate)
+    runner = await api.start()
+    port = runner.addresses[0][1]
+
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60))
+    client = AsyncWebClient(token="xoxb-load-test", base_url=f"http://127.0.0.1:{port}/api/",
+                            session=session)
+    dispatcher = OutboundDispatcher(client.chat_postMessage, rate=args.rate, burst=args.burst)
+
+    if args.direct:
+        async def post(kind, text):
+            return await client.chat_postMessage(channel=CHANNEL, text=text)
+    else:
+        await dispatcher.start()
+
+        async def post(kind, text):
+            if kind == "ack":
+                return await dispatcher.submit_ack(CHANNEL, text)
+            priority = PRIORITY_SYNTHESIS if "synthesis" in text else PRIORITY_RESEARCH
+            return await dispatcher.submit(priority, CHANNEL, text=text)
+
+    results = {"ok": 0, "failed": 0, "latency": []}
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        agent(f"agent-{n}", post, args.messages, args.ack_ratio, results)
+        for n in range(args.agents)
+    ])
+    if not args.direct:
+        await dispatcher.close()
+    elapsed = time.perf_counter() - started
+
+    await session.close()
+    await runner.cleanup()
+
+    latency = sorted(results["latency"]) or [0.0]
+    return {
+        "mode": "direct" if args.direct else "dispatcher",
+        "submitted": args.agents * args.messages,
+        "delivered": results["ok"],
+        "failed": results["failed"],
+        "slack_posts": api.accepted,
+        "slack_429s": api.rejected,
+        "coalesced_acks": 0 if args.direct else dispatcher.coalesced,
+        "tcp_connections": len(api.connections),
+        "seconds": round(elapsed, 2),
+        "p50_latency_s": round(latency[len(latency) // 2], 3),
+        "p99_latency_s": round(latency[int(len(latency) * 0.99)], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Slack outbound dispatcher")
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--messages", type=int, default=100, help="Messages per agent")
+    parser.add_argument("--ack-ratio", type=float, default=0.5)
+    parser.add_argument("--server-rate", type=int, default=5, help="Fake Slack posts/s per channel")
+    parser.add_argument("--rate", type=float, default=4.0, help="Dispatcher posts/s per channel")
+    parser.add_argument("--burst", type=int, default=3)
+    parser.add_argument("--direct", action="store_true", help="Bypass the dispatcher")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
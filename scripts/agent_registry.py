@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Compiled agent registry index for agents/agents.yaml
+Parses the YAML once into typed records with O(1) lookup by agent id or key
+fingerprint, and keeps a JSON snapshot so later processes skip YAML parsing.
+Usage: python3 scripts/agent_registry.py [agents.yaml]
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import yaml
+
+import sshsig
+
+SNAPSHOT_FORMAT = 3
+KEY_STATUSES = ("active", "retired", "revoked")
+
+
+class KeyEntry(NamedTuple):
+    """One signing key of an agent; dates are ISO strings or None"""
+    public_key: str
+    fingerprint: str
+    status: str
+    valid_from: Optional[str]
+
+
+class AgentRecord(NamedTuple):
+    """One agent from agents.yaml, reduced to what the tooling needs"""
+    id: str
+    name: str
+    emoji: str
+    status: str
+    availability: Optional[str]
+    public_key: Optional[str]
+    fingerprint: Optional[str]
+    key_status: Optional[str]
+    capabilities: Tuple[str, ...]
+    synthesizer_priority: Optional[int]
+    keys: Tuple[KeyEntry, ...] = ()  # every active, retired and revoked key
+
+
+class Registry:
+    """In-memory index over agents.yaml"""
+
+    def __init__(self, agents: Dict[str, AgentRecord], protocol: dict,
+                 synthesis_routing: dict, version: str):
+        self.agents = agents
+        self.protocol = protocol
+        self.synthesis_routing = synthesis_routing
+        self.version = version
+        self.by_fingerprint = {
+            record.fingerprint: record for record in agents.values() if record.fingerprint
+        }
+        for record in agents.values():
+            for key in record.keys:
+                self.by_fingerprint.setdefault(key.fingerprint, record)
+
+    def get(self, agent_id: str) -> Optional[AgentRecord]:
+        return self.agents.get(agent_id)
+
+    def by_key_fingerprint(self, fingerprint: str) -> Optional[AgentRecord]:
+        return self.by_fingerprint.get(fingerprint)
+
+    def public_key(self, agent_id: str) -> tuple:
+        """Return (public_key, error) with the same errors verify_message reports"""
+        record = self.agents.get(agent_id)
+        if record is None:
+            return None, f"Agent '{agent_id}' not found in registry"
+        if record.key_status is None:
+            return None, f"No authentication config for agent '{agent_id}'"
+        if record.key_status == 'pending_generation':
+            return None, f"Agent '{agent_id}' key pending generation"
+        if not record.public_key or record.public_key == 'PENDING_GENERATION':
+            return None, f"No public key for agent '{agent_id}'"
+        return record.public_key, None
+
+    @property
+    def prefixes(self) -> dict:
+        return self.protocol.get('communication', {}).get('prefixes', {})
+
+    @property
+    def fallback_chain(self) -> list:
+        return self.protocol.get('synthesizer_selection', {}).get('fallback_chain', [])
+
+    @property
+    def capability_routing(self) -> dict:
+        return self.protocol.get('synthesizer_selection', {}).get('capability_routing', {})
+
+    def to_snapshot(self) -> dict:
+        return {
+            "agents": {agent_id: record._asdict() for agent_id, record in self.agents.items()},
+            "protocol": self.protocol,
+            "synthesis_routing": self.synthesis_routing,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "Registry":
+        agents = {}
+        for agent_id, fields in data["agents"].items():
+            fields["capabilities"] = tuple(fields["capabilities"])
+            fields["keys"] = tuple(KeyEntry(*key) for key in fields["keys"])
+            agents[agent_id] = AgentRecord(**fields)
+        return cls(agents, data["protocol"], data["synthesis_routing"], data["version"])
+
+
+def _iso(value) -> Optional[str]:
+    """YAML dates/datetimes (or strings) as ISO text for the JSON snapshot"""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _key_entry(config: dict, default_status: str = 'active') -> Optional[KeyEntry]:
+    public_key = config.get('public_key')
+    if not public_key or public_key == 'PENDING_GENERATION':
+        return None
+    try:
+        fingerprint = sshsig.fingerprint(sshsig.parse_public_key(public_key))
+    except sshsig.SSHSigError:
+        return None
+    status = config.get('status', default_status)
+    if status not in KEY_STATUSES:
+        status = default_status
+    return KeyEntry(public_key, fingerprint, status, _iso(config.get('valid_from')))
+
+
+def _compile_keys(auth: dict) -> Tuple[KeyEntry, ...]:
+    """The top-level public_key (active) plus any authentication.keys history"""
+    primary = _key_entry({'public_key': auth.get('public_key'),
+                          'valid_from': auth.get('valid_from')})
+    entries = [primary] if primary else []
+    for config in auth.get('keys') or []:
+        entry = _key_entry(config or {})
+        if entry and all(entry.fingerprint != e.fingerprint for e in entries):
+            entries.append(entry)
+    return tuple(entries)
+
+
+def _compile_agent(agent_id: str, config: dict) -> AgentRecord:
+    auth = config.get('authentication')
+    keys = _compile_keys(auth) if auth else ()
+    public_key = auth.get('public_key') if auth else None
+    fingerprint = auth.get('key_fingerprint') if auth else None
+    if (not public_key or public_key == 'PENDING_GENERATION') and keys:
+        # Only a keys list: the first active key is the agent's current key
+        active = [key for key in keys if key.status == 'active']
+        public_key = active[0].public_key if active else public_key
+    if public_key and public_key != 'PENDING_GENERATION':
+        try:
+            fingerprint = sshsig.fingerprint(sshsig.parse_public_key(public_key))
+        except sshsig.SSHSigError:
+            pass
+    key_status = auth.get('status', 'configured') if auth is not None else None
+
+    return AgentRecord(
+        id=agent_id,
+        name=config.get('name', agent_id),
+        emoji=config.get('emoji', ''),
+        status=config.get('status', 'active'),
+        availability=(config.get('infrastructure') or {}).get('availability'),
+        public_key=public_key,
+        fingerprint=fingerprint,
+        key_status=key_status,
+        capabilities=tuple(c['id'] for c in config.get('capabilities') or [] if 'id' in c),
+        synthesizer_priority=config.get('synthesizer_priority'),
+        keys=keys,
+    )
+
+
+def compile_registry(config: dict, version: str) -> Registry:
+    """Build a Registry from parsed agents.yaml content"""
+    agents = {
+        agent_id: _compile_agent(agent_id, agent_config or {})
+        for agent_id, agent_config in (config.get('agents') or {}).items()
+    }
+    return Registry(agents, config.get('protocol') or {},
+                    config.get('synthesis_routing') or {}, version)
+
+
+def default_registry_path() -> Path:
+    """$AGENT_MESH_REGISTRY, else ./agents/agents.yaml, else the repo copy"""
+    if os.environ.get("AGENT_MESH_REGISTRY"):
+        return Path(os.environ["AGENT_MESH_REGISTRY"])
+    local = Path('agents/agents.yaml')
+    if local.exists():
+        return local
+    return Path(__file__).resolve().parent.parent / 'agents' / 'agents.yaml'
+
+
+def _snapshot_path(source: Path) -> Path:
+    cache_dir = Path(os.environ.get("AGENT_MESH_CACHE_DIR",
+                                    Path.home() / ".cache" / "agent-mesh"))
+    key = hashlib.sha256(str(source).encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"registry-{key}.json"
+
+
+def _read_snapshot(path: Path) -> Optional[dict]:
+    try:
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: dict):
+    """Atomically replace the snapshot; a read-only cache dir is not an error"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+# Registries already loaded in this process, keyed by resolved path
+_loaded: Dict[Path, Tuple[int, int, Registry]] = {}
+
+
+def load_registry(path=None, use_cache: bool = True) -> Registry:
+    """Load the registry, reusing the in-process copy or the on-disk snapshot
+
+    The snapshot is trusted while the file's mtime and size match; otherwise
+    the content hash decides whether the YAML actually needs re-parsing.
+    Raises FileNotFoundError if agents.yaml does not exist.
+    """
+    source = Path(path) if path else default_registry_path()
+    source = source.resolve()
+    stat = source.stat()
+
+    cached = _loaded.get(source)
+    if use_cache and cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    snapshot_path = _snapshot_path(source)
+    snapshot = _read_snapshot(snapshot_path) if use_cache else None
+
+    if snapshot and (snapshot["mtime_ns"], snapshot["size"]) == (stat.st_mtime_ns, stat.st_size):
+        registry = Registry.from_snapshot(snapshot["registry"])
+    else:
+        content = source.read_bytes()
+        content_hash = hashlib.sha256(content).hexdigest()
+        if snapshot and snapshot["sha256"] == content_hash:
+            registry = Registry.from_snapshot(snapshot["registry"])
+        else:
+            registry = compile_registry(yaml.safe_load(content) or {}, content_hash)
+        if use_cache:
+            _write_snapshot(snapshot_path, {
+                "format": SNAPSHOT_FORMAT,
+                "source": str(source),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": content_hash,
+                "registry": registry.to_snapshot(),
+            })
+
+    _loaded[source] = (stat.st_mtime_ns, stat.st_size, registry)
+    return registry
+
+
+if __name__ == "__main__":
+    registry = load_registry(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"📇 Registry {registry.version[:16]}... ({len(registry.agents)} agents)")
+    for record in sorted(registry.agents.values(), key=lambda r: r.synthesizer_priority or 99):
+        print(f"   {record.emoji} {record.id:<12} {record.status:<8} "
+              f"priority={record.synthesizer_priority} {record.fingerprint or 'no key'}")
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Append-only, hash-chained Merkle audit log of signed mesh messages
+Usage: python3 scripts/audit_log.py record <signed.md>... [--checkpoint-agent ID]
+       python3 scripts/audit_log.py checkpoint --agent ID
+       python3 scripts/audit_log.py audit
+       python3 scripts/audit_log.py prove <signed.md|payload-hash> [--output proof.json]
+       python3 scripts/audit_log.py verify-proof <proof.json>
+Environment: AGENT_MESH_AUDIT_DIR (default ./audit)
+
+Every signed message adds one entry (agent, Payload Hash (SHA256),
+signature) to entries.jsonl. Entries are linked twice:
+
+- a hash chain, chain[i] = SHA256(chain[i-1] || leaf[i]), and
+- an RFC 6962 Merkle tree over the leaf hashes. Completed subtree hashes
+  are kept per level under tree/, so a root, or an inclusion proof for
+  any entry, takes O(log n) reads.
+
+Every CHECKPOINT_EVERY entries (or on demand) an agent signs a checkpoint
+statement (size, Merkle root, chain head) with its mesh key under the
+"agent-mesh-audit" namespace. An Auditor keeps the last checkpoint it
+verified together with the compact Merkle frontier (one hash per set bit
+of the size). The next audit reads only the entries after it, re-derives
+their leaves and chain links, extends the frontier and must arrive at the
+next signed root. The cost is linear in new entries, not in history.
+A single message is proven with its leaf plus O(log n) sibling hashes
+against a signed root.
+
+sign_message.py appends to the log when AGENT_MESH_AUDIT_DIR is set.
+Writers in any number of processes serialize on an flock()ed lock file in
+the audit directory and pick up each other's entries before appending.
+"""
+
+import os
+import sys
+import json
+import fcntl
+import base64
+import hashlib
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import sshsig
+
+AUDIT_NAMESPACE = "agent-mesh-audit"
+HASH_SIZE = 32
+GENESIS = bytes(HASH_SIZE)
+CHECKPOINT_EVERY = 256
+STATEMENT_HEADER = "agent-mesh audit checkpoint v1"
+
+# fn(statement bytes) -> (agent id, armored SSHSIG) under AUDIT_NAMESPACE
+Signer = Callable[[bytes], Tuple[str, str]]
+
+
+class AuditError(Exception):
+    """The log on disk is inconsistent or a proof/checkpoint does not verify"""
+
+
+def default_audit_dir() -> Path:
+    return Path(os.environ.get("AGENT_MESH_AUDIT_DIR", "audit"))
+
+
+# =============================================================================
+# Merkle tree (RFC 6962 / RFC 9162 hashing)
+# =============================================================================
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def chain_hash(previous: bytes, leaf: bytes) -> bytes:
+    return hashlib.sha256(previous + leaf).digest()
+
+
+def _split(size: int) -> int:
+    """Largest power of two strictly below size"""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def frontier_append(frontier: List[bytes], size: int, leaf: bytes):
+    """Extend the frontier of a size-leaf tree by one leaf (binary carry)"""
+    node = leaf
+    while size & 1:
+        node = node_hash(frontier.pop(), node)
+        size >>= 1
+    frontier.append(node)
+
+
+def frontier_root(frontier: List[bytes]) -> bytes:
+    if not frontier:
+        return hashlib.sha256(b"").digest()
+    root = frontier[-1]
+    for node in reversed(frontier[:-1]):
+        root = node_hash(node, root)
+    return root
+
+
+def verify_inclusion(leaf: bytes, index: int, size: int, path: List[bytes], root: bytes) -> bool:
+    """RFC 9162 section 2.1.3.2"""
+    if index >= size:
+        return False
+    fn, sn = index, size - 1
+    result = leaf
+    for sibling in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            result = node_hash(sibling, result)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            result = node_hash(result, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and result == root
+
+
+# =============================================================================
+# Entries and checkpoints
+# =============================================================================
+
+def entry_leaf(entry: dict) -> bytes:
+    """Leaf hash over the recorded fields (everything but leaf/chain)"""
+    core = {key: value for key, value in entry.items() if key not in ("leaf", "chain")}
+    return leaf_hash(json.dumps(core, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+
+def checkpoint_statement(size: int, root: bytes, chain: bytes, when: str) -> bytes:
+    return (f"{STATEMENT_HEADER}\nsize {size}\nroot {root.hex()}\n"
+            f"chain {chain.hex()}\ntime {when}\n").encode("utf-8")
+
+
+def verify_checkpoint(checkpoint: dict, keyring=None) -> Optional[str]:
+    """None if the checkpoint is signed by a registered, unrevoked key of its agent"""
+    if keyring is None:
+        from mesh_keyring import load_keyring
+        keyring = load_keyring()
+    statement = checkpoint_statement(checkpoint["size"], bytes.fromhex(checkpoint["root"]),
+                                     bytes.fromhex(checkpoint["chain"]), checkpoint["time"])
+    signer, error = keyring.attribute(checkpoint["signature"], checkpoint["agent"])
+    if error:
+        return error
+    valid, error = sshsig.verify(signer.key, statement, checkpoint["signature"], AUDIT_NAMESPACE)
+    return None if valid else f"Checkpoint {checkpoint['size']}: {error}"
+
+
+def key_signer(agent: str) -> Signer:
+    """Sign checkpoints through the signing daemon if it holds the key, else in-process
+
+    Nothing is loaded or connected until a checkpoint is actually signed.
+    """
+    def sign(statement: bytes) -> Tuple[str, str]:
+        import signing_daemon
+
+        try:
+            client = signing_daemon.connect(agent)
+            if client is not None:
+                try:
+                    digest = hashlib.new(sshsig.HASH_ALG, statement).digest()
+                    return agent, client.sign_digest(agent, digest, AUDIT_NAMESPACE)
+                finally:
+                    client.close()
+            key = sshsig.load_private_key(Path.home() / ".agent-keys" / f"{agent}_key")
+            return agent, key.sign(statement, AUDIT_NAMESPACE)
+        except (OSError, sshsig.SSHSigError, signing_daemon.SignerError) as e:
+            raise AuditError(f"Cannot sign checkpoint as {agent}: {e}")
+    return sign
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class AuditLog:
+    """Writer and proof server for one audit directory"""
+
+    def __init__(self, directory=None, checkpoint_every: Optional[int] = None,
+                 signer: Optional[Signer] = None):
+        self.directory = Path(directory) if directory else default_audit_dir()
+        self.checkpoint_every = checkpoint_every or CHECKPOINT_EVERY
+        self.signer = signer
+        self.entries_path = self.directory / "entries.jsonl"
+        self.checkpoints_path = self.directory / "checkpoints.jsonl"
+        self.head_path = self.directory / "head.json"
+        self.lock_path = self.directory / "lock"
+        self.tree_dir = self.directory / "tree"
+        self._lock = threading.Lock()
+        self.size = 0
+        self.chain = GENESIS
+        self.offset = 0
+        self.frontier: List[bytes] = []
+        if self.directory.is_dir():  # a missing log reads as empty until the first write
+            with self._locked():
+                pass
+
+    # -- storage ---------------------------------------------------------------
+
+    def _level_path(self, level: int) -> Path:
+        return self.tree_dir / f"level-{level}.bin"
+
+    def _read_node(self, level: int, index: int) -> bytes:
+        with open(self._level_path(level), "rb") as f:
+            f.seek(index * HASH_SIZE)
+            node = f.read(HASH_SIZE)
+        if len(node) != HASH_SIZE:
+            raise AuditError(f"Missing tree node {level}/{index}")
+        return node
+
+    def _store_leaf(self, leaf: bytes):
+        """Append a leaf and every subtree it completes (amortized O(1))"""
+        size, level, node = self.size, 0, leaf
+        while True:
+            with open(self._level_path(level), "ab") as f:
+                f.write(node)
+            if not size & 1:
+                break
+            node = node_hash(self._read_node(level, size - 1), node)
+            size >>= 1
+            level += 1
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and processes; the state is re-read from disk"""
+        self.tree_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._recover()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _recover(self):
+        """Load the head, trim torn tree writes and replay entries written after it"""
+        try:
+            head = json.loads(self.head_path.read_text())
+            self.size, self.offset = head["size"], head["offset"]
+            self.chain = bytes.fromhex(head["chain"])
+        except FileNotFoundError:
+            self.size, self.offset, self.chain = 0, 0, GENESIS
+        except (OSError, ValueError, KeyError) as e:
+            raise AuditError(f"Unreadable {self.head_path}: {e}")
+
+        level = 0
+        while self._level_path(level).exists():
+            expected = (self.size >> level) * HASH_SIZE
+            if self._level_path(level).stat().st_size > expected:
+                os.truncate(self._level_path(level), expected)
+            level += 1
+        self.frontier = self._frontier(self.size)
+
+        replayed = False
+        for offset, end, entry in self._scan(self.offset):
+            if entry is None:  # torn final line of a crashed writer
+                os.truncate(self.entries_path, offset)
+                break
+            self._apply(entry)
+            self.offset = end
+            replayed = True
+        if replayed:
+            self._save_head()
+
+    def _apply(self, entry: dict):
+        if entry["seq"] != self.size:
+            raise AuditError(f"Entry {entry['seq']} found where {self.size} was expected")
+        leaf = entry_leaf(entry)
+        chain = chain_hash(self.chain, leaf)
+        if entry.get("leaf") != leaf.hex() or entry.get("chain") != chain.hex():
+            raise AuditError(f"Entry {entry['seq']} does not match its leaf/chain hashes")
+        self._store_leaf(leaf)
+        frontier_append(self.frontier, self.size, leaf)
+        self.size += 1
+        self.chain = chain
+
+    def _scan(self, offset: int) -> Iterator[Tuple[int, int, Optional[dict]]]:
+        """(start offset, end offset, entry) from offset to EOF
+
+        An unterminated final line (a torn or in-progress write) is yielded
+        as None; a complete line that does not parse raises AuditError.
+        """
+        try:
+            f = open(self.entries_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if not line.endswith(b"\n"):
+                    yield start, offset, None
+                    return
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if not isinstance(entry, dict):
+                    raise AuditError(f"Garbled entry at byte {start} of {self.entries_path}")
+                yield start, offset, entry
+
+    def _save_head(self):
+        tmp = self.head_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"size": self.size, "offset": self.offset,
+                                   "chain": self.chain.hex()}))
+        os.replace(tmp, self.head_path)
+
+    # -- writing ---------------------------------------------------------------
+
+    def append(self, agent: str, payload_hash: str, signature: str,
+               source: Optional[str] = None, when: Optional[str] = None) -> dict:
+        """Record one signed message; signature is the base64 block from the message"""
+        with self._locked():
+            entry = {"seq": self.size, "time": when or _now(), "agent": agent,
+                     "payload_hash": payload_hash, "signature": signature}
+            if source:
+                entry["source"] = source
+            leaf = entry_leaf(entry)
+            entry["leaf"] = leaf.hex()
+            entry["chain"] = chain_hash(self.chain, leaf).hex()
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            with open(self.entries_path, "ab") as f:
+                f.write(line)
+            self._apply(entry)
+            self.offset += len(line)
+            self._save_head()
+            due = self.signer is not None and self.size % self.checkpoint_every == 0
+        if due:
+            try:
+                self.checkpoint()
+            except AuditError as e:
+                print(f"⚠️  Audit checkpoint skipped ({e}); run audit_log.py checkpoint", file=sys.stderr)
+        return entry
+
+    def record_message(self, path: str) -> dict:
+        """Append the authentication block of a signed message file"""
+        from verify_message import read_signed_message
+
+        with open(path, "rb") as f:
+            _, _, signature_b64, claimed_hash, agent, error = read_signed_message(f)
+        if error:
+            raise AuditError(f"{path}: {error}")
+        if not agent:
+            raise AuditError(f"{path}: no agent in authentication block")
+        return self.append(agent, claimed_hash, signature_b64, source=str(path))
+
+    def checkpoint(self, signer: Optional[Signer] = None) -> dict:
+        """Sign (size, root, chain head) and append it to checkpoints.jsonl"""
+        signer = signer or self.signer
+        if signer is None:
+            raise AuditError("No signer configured for checkpoints")
+        with self._locked():
+            when = _now()
+            size, root, chain = self.size, frontier_root(self.frontier), self.chain
+            agent, armored = signer(checkpoint_statement(size, root, chain, when))
+            checkpoint = {"size": size, "root": root.hex(), "chain": chain.hex(), "time": when,
+                          "agent": agent, "signature": armored}
+            with open(self.checkpoints_path, "a") as f:
+                f.write(json.dumps(checkpoint) + "\n")
+        return checkpoint
+
+    # -- reading ---------------------------------------------------------------
+
+    def checkpoints(self) -> List[dict]:
+        try:
+            with open(self.checkpoints_path, "r") as f:
+                return [json.loads(line) for line in f if line.endswith("\n")]
+        except FileNotFoundError:
+            return []
+
+    def _frontier(self, size: int) -> List[bytes]:
+        frontier, start = [], 0
+        for level in range(size.bit_length() - 1, -1, -1):
+            if size >> level & 1:
+                frontier.append(self._read_node(level, start >> level))
+                start += 1 << level
+        return frontier
+
+    def subtree(self, start: int, end: int) -> bytes:
+        """Merkle hash of leaves [start, end) from stored complete subtrees"""
+        size = end - start
+        if size & (size - 1) == 0 and start % size == 0:
+            level = size.bit_length() - 1
+            return self._read_node(level, start >> level)
+        k = _split(size)
+        return node_hash(self.subtree(start, start + k), self.subtree(start + k, end))
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        size = self.size if size is None else size
+        if size == self.size:
+            return frontier_root(self.frontier)
+        return frontier_root(self._frontier(size)) if size else frontier_root([])
+
+    def inclusion_path(self, index: int, size: int) -> List[bytes]:
+        """RFC 6962 audit path for leaf index in the first size leaves"""
+        path, start, end = [], 0, size
+        while end - start > 1:
+            k = _split(end - start)
+            if index < start + k:
+                path.append(self.subtree(start + k, end))
+                end = start + k
+            else:
+                path.append(self.subtree(start, start + k))
+                start += k
+        return list(reversed(path))
+
+    def find(self, payload_hash: str) -> List[dict]:
+        return [entry for _, _, entry in self._scan(0)
+                if entry and entry["payload_hash"] == payload_hash]
+
+    def prove(self, payload_hash: str, checkpoint: Optional[dict] = None) -> dict:
+        """Inclusion proof for a message against a (default: the latest) checkpoint"""
+        checkpoint = checkpoint or (self.checkpoints() or [None])[-1]
+        if checkpoint is None:
+            raise AuditError("No checkpoint yet")
+        entries = [e for e in self.find(payload_hash) if e["seq"] < checkpoint["size"]]
+        if not entries:
+            raise AuditError(f"{payload_hash[:16]}... is not covered by checkpoint {checkpoint['size']}")
+        entry = entries[0]
+        return {
+            "entry": entry,
+            "size": checkpoint["size"],
+            "path": [node.hex() for node in self.inclusion_path(entry["seq"], checkpoint["size"])],
+            "checkpoint": checkpoint,
+        }
+
+
+def verify_proof(proof: dict, keyring=None) -> Optional[str]:
+    """None if the proof's entry is in the tree its signed checkpoint commits to"""
+    checkpoint, entry = proof["checkpoint"], proof["entry"]
+    if proof["size"] != checkpoint["size"]:
+        return "Proof and checkpoint sizes differ"
+    leaf = entry_leaf(entry)
+    if entry.get("leaf") not in (None, leaf.hex()):
+        return "Entry does not match its leaf hash"
+    if not verify_inclusion(leaf, entry["seq"], checkpoint["size"],
+                            [bytes.fromhex(node) for node in proof["path"]],
+                            bytes.fromhex(checkpoint["root"])):
+        return "Inclusion proof does not reach the checkpoint root"
+    return verify_checkpoint(checkpoint, keyring)
+
+
+# =============================================================================
+# Incremental auditor
+# =============================================================================
+
+def default_auditor_state(directory: Path) -> Path:
+    cache_dir = Path(os.environ.get("AGENT_MESH_CACHE_DIR",
+                                    Path.home() / ".cache" / "agent-mesh"))
+    key = hashlib.sha256(str(directory.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"audit-{key}.json"
+
+
+class Auditor:
+    """Verifies a log incrementally from the last checkpoint it trusted"""
+
+    def __init__(self, log: AuditLog, state_path=None, keyring=None):
+        self.log = log
+        self.state_path = Path(state_path) if state_path else default_auditor_state(log.directory)
+        self.keyring = keyring
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text())
+            state["frontier"] = [bytes.fromhex(node) for node in state["frontier"]]
+            state["chain"] = bytes.fromhex(state["chain"])
+            return state
+        except (OSError, ValueError, KeyError):
+            return {"size": 0, "offset": 0, "chain": GENESIS, "frontier": [], "checkpoints": 0}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = dict(self.state, chain=self.state["chain"].hex(),
+                     frontier=[node.hex() for node in self.state["frontier"]])
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_path)
+
+    def reset(self):
+        self.state = {"size": 0, "offset": 0, "chain": GENESIS, "frontier": [], "checkpoints": 0}
+
+    def audit(self) -> dict:
+        """Check new entries against new signed checkpoints; raises AuditError on tampering"""
+        state = self.state
+        size, chain, offset = state["size"], state["chain"], state["offset"]
+        frontier = list(state["frontier"])
+        checkpoints = self.log.checkpoints()[state["checkpoints"]:]
+        report = {"checkpoints": 0, "entries": 0, "pending": 0, "size": size}
+
+        entries = self.log._scan(offset)
+        for index, checkpoint in enumerate(checkpoints):
+            if checkpoint["size"] < size:
+                raise AuditError(f"Checkpoint {checkpoint['size']} goes back before {size}")
+            while size < checkpoint["size"]:
+                _, offset, entry = next(entries, (None, None, None))
+                if entry is None:
+                    raise AuditError(f"Checkpoint {checkpoint['size']} covers missing entries")
+                chain = self._check_entry(entry, size, chain, frontier)
+                size += 1
+                report["entries"] += 1
+            if frontier_root(frontier).hex() != checkpoint["root"] or chain.hex() != checkpoint["chain"]:
+                raise AuditError(f"Checkpoint {checkpoint['size']} does not match the log")
+            error = verify_checkpoint(checkpoint, self.keyring)
+            if error:
+                raise AuditError(error)
+            state.update(size=size, offset=offset, chain=chain, frontier=list(frontier),
+                         checkpoints=state["checkpoints"] + 1)
+            report["checkpoints"] += 1
+            self._save_state()
+
+        # Entries after the last checkpoint: chain-checked, not yet trusted
+        for _, _, entry in entries:
+            if entry is None:
+                break
+            chain = self._check_entry(entry, size, chain, frontier)
+            size += 1
+            report["pending"] += 1
+        report["size"] = state["size"]
+        return report
+
+    @staticmethod
+    def _check_entry(entry: dict, seq: int, chain: bytes, frontier: List[bytes]) -> bytes:
+        if entry["seq"] != seq:
+            raise AuditError(f"Entry {entry['seq']} found where {seq} was expected")
+        leaf = entry_leaf(entry)
+        chain = chain_hash(chain, leaf)
+        if entry.get("chain") != chain.hex():
+            raise AuditError(f"Hash chain broken at entry {seq}")
+        frontier_append(frontier, seq, leaf)
+        return chain
+
+
+def record_signed(agent: str, content_hash: str, armored: str, source: Optional[str] = None):
+    """sign_message.py hook: log the new signature if AGENT_MESH_AUDIT_DIR is set"""
+    if not os.environ.get("AGENT_MESH_AUDIT_DIR"):
+        return None
+    log = AuditLog(signer=key_signer(agent))
+    return log.append(agent, content_hash,
+                      base64.b64encode(armored.encode("ascii")).decode("ascii"), source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent-mesh audit log")
+    parser.add_argument("command", choices=["record", "checkpoint", "audit", "prove", "verify-proof"])
+    parser.add_argument("targets", nargs="*", help="Signed messages, a payload hash or a proof file")
+    parser.add_argument("--dir", type=Path, default=None, help="Audit directory ($AGENT_MESH_AUDIT_DIR)")
+    parser.add_argument("--agent", help="Agent whose key signs the checkpoint")
+    parser.add_argument("--checkpoint-agent", help="Sign periodic checkpoints while recording")
+    parser.add_argument("--every", type=int, default=CHECKPOINT_EVERY, help="Entries per checkpoint")
+    parser.add_argument("--output", type=Path, default=None, help="Write the proof here")
+    parser.add_argument("--full", action="store_true", help="Re-audit from the first entry")
+    args = parser.parse_args()
+
+    signer_agent = args.checkpoint_agent if args.command == "record" else args.agent
+    log = AuditLog(args.dir, args.every, key_signer(signer_agent) if signer_agent else None)
+
+    try:
+        if args.command == "record":
+            for target in args.targets:
+                entry = log.record_message(target)
+                print(f"📝 #{entry['seq']} {entry['agent']} {entry['payload_hash'][:16]}... {target}")
+        elif args.command == "checkpoint":
+            if not args.agent:
+                parser.error("checkpoint needs --agent")
+            checkpoint = log.checkpoint()
+            print(f"✅ Checkpoint {checkpoint['size']} root {checkpoint['root'][:16]}... "
+                  f"signed by {checkpoint['agent']}")
+        elif args.command == "audit":
+            auditor = Auditor(log)
+            if args.full:
+                auditor.reset()
+            report = auditor.audit()
+            print(f"🛡️  Audited {report['entries']} new entries across {report['checkpoints']} "
+                  f"checkpoints; trusted size {report['size']}, {report['pending']} pending")
+        elif args.command == "prove":
+            if len(args.targets) != 1:
+                parser.error("prove takes one signed message or payload hash")
+            target = args.targets[0]
+            if os.path.isfile(target):
+                from verify_message import read_signed_message
+                with open(target, "rb") as f:
+                    target = read_signed_message(f)[3] or target
+            proof = log.prove(target)
+            text = json.dumps(proof, indent=2)
+            if args.output:
+                args.output.write_text(text)
+                print(f"✅ Proof for #{proof['entry']['seq']} ({len(proof['path'])} hashes) → {args.output}")
+            else:
+                print(text)
+        else:
+            for target in args.targets:
+                error = verify_proof(json.loads(Path(target).read_text()))
+                print(f"❌ {target}: {error}" if error else f"✅ {target}: included and signed")
+                if error:
+                    sys.exit(1)
+    except AuditError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+"""
+Belief ledger for the Bayesian Update Protocol (docs/bayesian-update-protocol-v1.3.md)
+Usage: python3 scripts/belief_ledger.py ingest-queue [--queue-dir DIR] [--consumer belief-ledger]
+       python3 scripts/belief_ledger.py ingest <dir|glob> [--verify]
+       python3 scripts/belief_ledger.py resolve "<claim>" true|false
+       python3 scripts/belief_ledger.py report [--agent ID] [--bins 10] [--json]
+       python3 scripts/belief_ledger.py parse <message.md>
+The ledger lives in --dir (default: $BELIEF_LEDGER_DIR or .belief-ledger).
+
+[BAYESIAN-UPDATE], [BAYESIAN-CORRECTION], [BAYESIAN-CONFLICT] and [CONFLICT]
+messages are parsed into prior and posterior claims with their confidences.
+Every stated confidence becomes one ledger row. Rows are stored column by
+column, one fixed-width binary file per column, so reports over thousands of
+claims are a handful of NumPy reductions.
+
+Layout of the ledger directory:
+  <column>.bin   one value per row (see COLUMNS)
+  agents.txt     agent ids; row "agent" is a line number
+  claims.txt     normalized claim text; row "claim" is a line number
+  outcomes.bin   (claim, outcome, timestamp) resolutions; the latest wins
+
+A claim is resolved by an "Outcome:" line in a message or by `resolve`.
+A statement is scored only if it was made before the resolution: a prior
+in the resolving message counts, a posterior in it does not.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import mesh_protocol
+from health_monitor import agent_from_text
+
+BAYESIAN_KINDS = ("bayesian_update", "bayesian_correction", "bayesian_conflict", "conflict")
+CONFLICT_KINDS = ("bayesian_conflict", "conflict")
+DEFAULT_CONSUMER = "belief-ledger"
+
+PRIOR = 0
+POSTERIOR = 1
+
+# Protocol thresholds on |confidence shift|
+TIERS = ("trivial", "substantive", "major", "conflict", "unstated")
+TRIVIAL_BELOW = 0.20
+MAJOR_ABOVE = 0.50
+
+COLUMNS = OrderedDict([
+    ("message", np.dtype("<u8")),     # first 8 bytes of sha256(message text)
+    ("timestamp", np.dtype("<f8")),
+    ("agent", np.dtype("<u4")),
+    ("claim", np.dtype("<u4")),
+    ("role", np.dtype("u1")),         # PRIOR or POSTERIOR
+    ("confidence", np.dtype("<f4")),  # 0..1
+    ("shift", np.dtype("<f4")),       # message-level confidence shift; NaN if unstated
+    ("tier", np.dtype("u1")),         # index into TIERS
+    ("kind", np.dtype("u1")),         # index into BAYESIAN_KINDS
+])
+OUTCOME_DTYPE = np.dtype([("claim", "<u4"), ("outcome", "u1"), ("timestamp", "<f8")])
+
+PERCENT = re.compile(r"~?\s*(\d{1,3}(?:\.\d+)?)\s*%")
+SIGNED_PERCENT = re.compile(r"([+\-−–]\s*\d{1,3}(?:\.\d+)?)\s*%")
+ARROW_PERCENT = re.compile(r"(?:→|->)\s*~?\s*(\d{1,3}(?:\.\d+)?)\s*%")
+QUOTED = re.compile(r'"([^"]+)"|“([^”]+)”')
+THAT_CLAUSE = re.compile(r"%\s*(?:confidence\s+)?(?:that\s+)?(.+)$", re.IGNORECASE)
+ARROW_ITEM = re.compile(r"^(?P<claim>.+?)\s*(?:→|->)\s*~?\s*(?P<pct>\d{1,3}(?:\.\d+)?)\s*%")
+FIELD = re.compile(r"^(?P<head>[^:\"“]{1,60}):\s*(?P<rest>.*)$")
+SPEAKER = re.compile(r"^([A-Za-z][\w-]*?)(?:'s)?\s+(?:prior|posterior|position)\b", re.IGNORECASE)
+AUTHOR_LINE = re.compile(r"^\*\*Agent:\*\*\s*(\S+)", re.MULTILINE)
+TIMESTAMP_LINE = re.compile(r"^\*\*Timestamp:\*\*\s*(\S+)", re.MULTILINE)
+BULLET = re.compile(r"^(?:[-*•—–]\s+)+")
+TRUE_WORDS = {"true", "yes", "correct", "confirmed", "right", "held", "1"}
+FALSE_WORDS = {"false", "no", "incorrect", "refuted", "wrong", "failed", "0"}
+NOT_SPEAKERS = {"prior", "posterior", "confidence", "update"}
+
+
+class Claim(NamedTuple):
+    agent: Optional[str]  # None: the message's author
+    text: str
+    confidence: float     # 0..1
+
+
+class BayesianUpdate(NamedTuple):
+    kind: str
+    title: str
+    agent: Optional[str]
+    priors: List[Claim]
+    posteriors: List[Claim]
+    update: Optional[float]    # stated shift, -1..1
+    residual: Optional[float]
+    strength: Optional[str]
+    outcomes: List[Tuple[Optional[str], bool]]  # (claim or None for the priors, outcome)
+
+    @property
+    def shift(self) -> Optional[float]:
+        """Stated update, else the largest change between a prior and posterior of one claim"""
+        if self.update is not None:
+            return self.update
+        priors = {claim_key(c.text): c.confidence for c in self.priors}
+        changes = [p.confidence - priors[claim_key(p.text)] for p in self.posteriors
+                   if claim_key(p.text) in priors]
+        return max(changes, key=abs) if changes else None
+
+    @property
+    def tier(self) -> str:
+        return protocol_tier(self.shift, self.kind in CONFLICT_KINDS)
+
+
+def protocol_tier(shift: Optional[float], conflict: bool = False) -> str:
+    """Which protocol depth a shift calls for (thresholds table of the v1.3 doc)"""
+    if conflict:
+        return "conflict"
+    if shift is None:
+        return "unstated"
+    size = abs(shift)
+    return "trivial" if size < TRIVIAL_BELOW else "substantive" if size <= MAJOR_ABOVE else "major"
+
+
+def claim_key(text: str) -> str:
+    """Normalized claim text used to match a claim across messages"""
+    return " ".join(text.lower().split()).strip(" \"'“”.,;:")
+
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+def _clean(line: str) -> str:
+    line = line.strip().lstrip(">").strip()
+    return BULLET.sub("", line).replace("**", "").strip()
+
+
+def _pct(match) -> float:
+    return float(match.group(1).replace("−", "-").replace("–", "-").replace(" ", "")) / 100
+
+
+def _claim(text: str, fallback: str) -> Optional[Tuple[str, float]]:
+    """(claim, confidence) from 'X% that claim', '"claim" (confidence: X%)' and similar"""
+    pct = PERCENT.search(text)
+    if not pct or float(pct.group(1)) > 100:
+        return None
+    quoted = QUOTED.search(text)
+    if quoted:
+        claim = quoted.group(1) or quoted.group(2)
+    else:
+        that = THAT_CLAUSE.search(text)
+        claim = re.sub(r"\s*\([^)]*\)\s*$", "", that.group(1)) if that else PERCENT.sub("", text)
+    return claim.strip(" \"“”.") or fallback, _pct(pct)
+
+
+def _outcome(text: str) -> Optional[Tuple[Optional[str], bool]]:
+    quoted = QUOTED.search(text)
+    words = set(re.findall(r"[a-z0-9]+", QUOTED.sub("", text).lower()))
+    if words & TRUE_WORDS and not words & FALSE_WORDS:
+        value = True
+    elif words & FALSE_WORDS and not words & TRUE_WORDS:
+        value = False
+    else:
+        return None
+    return (quoted.group(1) or quoted.group(2)) if quoted else None, value
+
+
+def parse_update(text: str, agent: Optional[str] = None,
+                 parser: Optional[mesh_protocol.ProtocolParser] = None) -> Optional[BayesianUpdate]:
+    """BayesianUpdate from a protocol message, or None if it is not a Bayesian/conflict message"""
+    message = (parser or mesh_protocol.get_parser()).parse(text.lstrip())
+    if message.kind not in BAYESIAN_KINDS:
+        return None
+
+    lines = message.content.splitlines()
+    title = _clean(lines[0]) if lines else ""
+    if agent is None:
+        author = AUTHOR_LINE.search(text)
+        if author:
+            agent = author.group(1)
+        elif message.kind == "bayesian_correction":
+            # "[BAYESIAN-CORRECTION] Neuromancer → Clawdy": the first name corrects itself
+            named = re.match(r"([A-Za-z][\w-]*)\s*(?:→|->)", title)
+            agent = named.group(1) if named else None
+
+    priors: List[Claim] = []
+    posteriors: List[Claim] = []
+    outcomes: List[Tuple[Optional[str], bool]] = []
+    update = residual = strength = update_to = None
+    section = speaker = None
+
+    for raw in lines[1:]:
+        line = _clean(raw)
+        if not line:
+            continue
+        if section == "posterior":
+            item = ARROW_ITEM.match(line)
+            if item:
+                posteriors.append(Claim(speaker, item.group("claim").strip(" \"“”"),
+                                        float(item.group("pct")) / 100))
+                continue
+        if section == "prior" and not FIELD.match(line):
+            parsed = _claim(line, title)
+            if parsed:
+                priors.append(Claim(speaker, *parsed))
+            section = None
+            continue
+
+        field = FIELD.match(line)
+        if not field:
+            continue
+        head, rest = field.group("head").strip(), field.group("rest").strip()
+        lowered = head.lower()
+        named = SPEAKER.match(head)
+        who = named.group(1) if named and named.group(1).lower() not in NOT_SPEAKERS else None
+        section = None
+
+        if "position" in lowered:
+            speaker = who
+        elif re.search(r"\bprior\b", lowered):
+            parsed = _claim(rest, title)
+            if parsed:
+                priors.append(Claim(who or speaker, *parsed))
+            else:
+                section = "prior"  # value on the next line
+        elif re.search(r"\bposterior\b", lowered):
+            parsed = _claim(rest, title) if rest else None
+            if parsed:
+                posteriors.append(Claim(who or speaker, *parsed))
+            section = "posterior"  # a list of '"claim" → X%' may follow
+        elif re.search(r"\bupdate\b", lowered):
+            signed = SIGNED_PERCENT.search(rest)
+            if signed:
+                update = _pct(signed)
+            arrow = ARROW_PERCENT.search(rest)
+            if arrow:
+                update_to = _pct(arrow)
+        elif "residual" in lowered:
+            pct = PERCENT.search(head) or PERCENT.search(rest)
+            residual = _pct(pct) if pct else None
+        elif lowered == "strength":
+            strength = (rest.split() or [None])[0]
+            strength = strength.lower() if strength else None
+        elif lowered == "outcome":
+            outcome = _outcome(rest)
+            if outcome:
+                outcomes.append(outcome)
+
+    if update_to is not None and priors:
+        # "Confidence Update: -70% → ~15%" revises the (first) prior claim itself
+        prior = priors[0]
+        if all(claim_key(p.text) != claim_key(prior.text) for p in posteriors):
+            posteriors.insert(0, Claim(prior.agent, prior.text, update_to))
+
+    return BayesianUpdate(message.kind, title, agent, priors, posteriors, update,
+                          residual, strength, outcomes)
+
+
+def message_hash(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Epoch seconds from a Slack ts, an epoch number or an ISO 8601 string"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def agent_ids(registry=None) -> Dict[str, str]:
+    """Lower-cased agent id and display name -> agents.yaml id"""
+    if registry is None:
+        try:
+            from agent_registry import load_registry
+            registry = load_registry()
+        except FileNotFoundError:
+            return {}
+    ids = {}
+    for agent_id, record in registry.agents.items():
+        ids[agent_id.lower()] = agent_id
+        ids[record.name.lower()] = agent_id
+    return ids
+
+
+# =============================================================================
+# LEDGER
+# =============================================================================
+
+def default_ledger_dir() -> Path:
+    return Path(os.environ.get("BELIEF_LEDGER_DIR", ".belief-ledger"))
+
+
+class _Dictionary:
+    """Append-only string table: one entry per line, code = line number"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self._new: List[str] = []
+        if path.exists():
+            data = path.read_bytes()
+            if data and not data.endswith(b"\n"):  # torn append
+                data = data[:data.rfind(b"\n") + 1]
+                with open(path, "r+b") as f:
+                    f.truncate(len(data))
+            for line in data.decode("utf-8").splitlines():
+                self.codes.setdefault(line, len(self.values))
+                self.values.append(line)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self._new.append(value)
+        return code
+
+    def flush(self):
+        if self._new:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{value}\n" for value in self._new))
+                f.flush()
+                os.fsync(f.fileno())
+            self._new = []
+
+
+class BeliefLedger:
+    """Columnar store of stated confidences with calibration reports"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory) if directory is not None else default_ledger_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.agents = _Dictionary(self.directory / "agents.txt")
+        self.claims = _Dictionary(self.directory / "claims.txt")
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._outcomes: Optional[np.ndarray] = None
+        self._messages: Optional[set] = None
+        self._scored: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._recover()
+
+    def _column_path(self, name: str) -> Path:
+        return self.directory / f"{name}.bin"
+
+    def _recover(self):
+        """Cut every column back to the row count they all share (a torn append)"""
+        sizes = {name: self._column_path(name).stat().st_size if self._column_path(name).exists() else 0
+                 for name in COLUMNS}
+        rows = min(size // COLUMNS[name].itemsize for name, size in sizes.items())
+        for name, dtype in COLUMNS.items():
+            if sizes[name] != rows * dtype.itemsize:
+                with open(self._column_path(name), "r+b") as f:
+                    f.truncate(rows * dtype.itemsize)
+        path = self.directory / "outcomes.bin"
+        if path.exists() and path.stat().st_size % OUTCOME_DTYPE.itemsize:
+            with open(path, "r+b") as f:
+                f.truncate(path.stat().st_size - path.stat().st_size % OUTCOME_DTYPE.itemsize)
+
+    # -------------------------------------------------------------------------
+    # Columns
+    # -------------------------------------------------------------------------
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        if self._columns is None:
+            self._columns = {name: np.fromfile(self._column_path(name), dtype=dtype)
+                             if self._column_path(name).exists() else np.empty(0, dtype)
+                             for name, dtype in COLUMNS.items()}
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self.columns["message"])
+
+    def append_rows(self, rows: Dict[str, Iterable]):
+        """Append equal-length column values; dictionaries are written first"""
+        arrays = {name: np.asarray(list(rows[name]), dtype=dtype) for name, dtype in COLUMNS.items()}
+        if not len(arrays["message"]):
+            return
+        self.agents.flush()
+        self.claims.flush()
+        for name, values in arrays.items():
+            with open(self._column_path(name), "ab") as f:
+                values.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+        if self._messages is not None:
+            self._messages.update(int(m) for m in arrays["message"])
+        self._columns = self._scored = None
+
+    # -------------------------------------------------------------------------
+    # Ingesting
+    # -------------------------------------------------------------------------
+
+    def has_message(self, digest: int) -> bool:
+        if self._messages is None:
+            self._messages = set(self.columns["message"].tolist())
+        return digest in self._messages
+
+    def add(self, update: BayesianUpdate, text: str, timestamp: Optional[float] = None,
+            agent: Optional[str] = None) -> int:
+        """Record one parsed message; returns rows added (0 if already recorded)"""
+        digest = message_hash(text)
+        if self.has_message(digest):
+            return 0
+        timestamp = time.time() if timestamp is None else timestamp
+        author = update.agent or agent or "unknown"
+        shift = update.shift
+        tier = TIERS.index(update.tier)
+        kind = BAYESIAN_KINDS.index(update.kind)
+
+        rows = {name: [] for name in COLUMNS}
+        for role, claims in ((PRIOR, update.priors), (POSTERIOR, update.posteriors)):
+            for claim in claims:
+                rows["message"].append(digest)
+                rows["timestamp"].append(timestamp)
+                rows["agent"].append(self.agents.code((claim.agent or author).lower()))
+                rows["claim"].append(self.claims.code(claim_key(claim.text)))
+                rows["role"].append(role)
+                rows["confidence"].append(claim.confidence)
+                rows["shift"].append(np.nan if shift is None else shift)
+                rows["tier"].append(tier)
+                rows["kind"].append(kind)
+        self.append_rows(rows)
+        if not rows["message"]:
+            self._messages.add(digest)  # nothing to record, but don't parse it again
+
+        for claim, outcome in update.outcomes:
+            targets = [claim] if claim is not None else [c.text for c in update.priors]
+            for target in targets:
+                self.resolve(target, outcome, timestamp)
+        return len(rows["message"])
+
+    def ingest_text(self, text: str, agent: Optional[str] = None, timestamp: Optional[float] = None) -> int:
+        update = parse_update(text)
+        if update is None:
+            return 0
+        return self.add(update, text, timestamp, agent)
+
+    def ingest_records(self, records: Iterable[dict], ids: Optional[Dict[str, str]] = None) -> dict:
+        """Queue records (mesh_protocol.Message.to_record); non-Bayesian ones are skipped
+
+        A record without an agent is attributed to the registry agent its
+        first line names (ids: agent_ids()). If neither the record nor its
+        claims name an agent it is counted as unattributed, not filed under
+        the Slack user id.
+        """
+        ids = agent_ids() if ids is None else ids
+        stats = {"records": 0, "messages": 0, "rows": 0, "unattributed": 0}
+        for record in records:
+            stats["records"] += 1
+            if record.get("kind") not in BAYESIAN_KINDS:
+                continue
+            text = record.get("raw") or ""
+            update = parse_update(text)
+            if update is None:
+                continue
+            agent = record.get("agent") or agent_from_text(text, ids)
+            if not (agent or update.agent or all(c.agent for c in update.priors + update.posteriors)):
+                stats["unattributed"] += 1
+                continue
+            rows = self.add(update, text, parse_timestamp(record.get("timestamp")), agent)
+            stats["messages"] += bool(rows)
+            stats["rows"] += rows
+        return stats
+
+    def ingest_queue(self, queue_dir: Optional[str] = None, consumer: str = DEFAULT_CONSUMER) -> dict:
+        """Read the Slack file queue from this ledger's cursor onwards"""
+        from file_queue import FileQueue, DEFAULT_QUEUE_DIR
+
+        queue = FileQueue(queue_dir or os.environ.get("SLACK_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+        queue.register(consumer)
+        records, cursor = queue.read_since(queue.cursor(consumer))
+        stats = self.ingest_records(records)
+        if records:
+            queue.ack(consumer, cursor)  # only after the rows are on disk
+        return stats
+
+    def ingest_signed(self, target: str, verify: bool = False) -> dict:
+        """Signed markdown messages under a directory or glob; with verify, only valid ones"""
+        import verify_message
+
+        stats = {"files": 0, "invalid": 0, "messages": 0, "rows": 0}
+        cache = verify_message.init_verifier() if verify else None
+        try:
+            for path in verify_message.find_messages(target):
+                stats["files"] += 1
+                verified = None
+                if verify:
+                    result = verify_message.record_result(verify_message.verify_file(path), cache)
+                    if result["status"] != "valid":
+                        stats["invalid"] += 1
+                        continue
+                    verified = result["agent"]  # attributed by key when there is no **Agent:** line
+                with open(path, "rb") as f:
+                    source, length, _, _, agent, error = verify_message.read_signed_message(f)
+                    if error:
+                        source, length, agent = f, f.seek(0, os.SEEK_END), None
+                    source.seek(0)
+                    text = source.read(length).decode("utf-8", "replace")
+                stamp = TIMESTAMP_LINE.search(text)
+                timestamp = parse_timestamp(stamp.group(1)) if stamp else os.stat(path).st_mtime
+                rows = self.ingest_text(text, agent=verified or agent, timestamp=timestamp)
+                stats["messages"] += bool(rows)
+                stats["rows"] += rows
+        finally:
+            if cache is not None:
+                cache.save()
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Outcomes
+    # -------------------------------------------------------------------------
+
+    def resolve(self, claim: str, outcome: bool, timestamp: Optional[float] = None):
+        """Record whether a claim turned out true; later resolutions override earlier ones"""
+        record = np.zeros(1, OUTCOME_DTYPE)
+        record["claim"] = self.claims.code(claim_key(claim))
+        record["outcome"] = int(bool(outcome))
+        record["timestamp"] = time.time() if timestamp is None else timestamp
+        self.claims.flush()
+        with open(self.directory / "outcomes.bin", "ab") as f:
+            record.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._outcomes = self._scored = None
+
+    def resolutions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(outcome, resolved_at) per claim code; outcome -1 and resolved_at NaN if unresolved"""
+        if self._outcomes is None:
+            path = self.directory / "outcomes.bin"
+            self._outcomes = np.fromfile(path, dtype=OUTCOME_DTYPE) if path.exists() else np.empty(0, OUTCOME_DTYPE)
+        n = len(self.claims.values)
+        outcome = np.full(n, -1, dtype=np.int8)
+        resolved_at = np.full(n, np.nan)
+        if len(self._outcomes):
+            # Last resolution per claim: unique() on the reversed records keeps the latest
+            reversed_claims = self._outcomes["claim"][::-1]
+            claims, first = np.unique(reversed_claims, return_index=True)
+            latest = self._outcomes[::-1][first]
+            outcome[claims] = latest["outcome"]
+            resolved_at[claims] = latest["timestamp"]
+        return outcome, resolved_at
+
+    def scored(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row mask of statements that are scoreable, outcome per row)"""
+        if self._scored is not None:
+            return self._scored
+        columns = self.columns
+        outcome, resolved_at = self.resolutions()
+        row_outcome = outcome[columns["claim"]] if len(outcome) else np.empty(0, np.int8)
+        row_resolved_at = resolved_at[columns["claim"]] if len(outcome) else np.empty(0)
+        before = np.where(columns["role"] == PRIOR, columns["timestamp"] <= row_resolved_at,
+                          columns["timestamp"] < row_resolved_at)
+        self._scored = (row_outcome >= 0) & before, row_outcome
+        return self._scored
+
+    # -------------------------------------------------------------------------
+    # Reports
+    # -------------------------------------------------------------------------
+
+    def brier_scores(self) -> Dict[str, dict]:
+        """Per agent: mean squared error of stated confidence against outcome"""
+        mask, outcome = self.scored()
+        agent = self.columns["agent"][mask]
+        p = self.columns["confidence"][mask].astype(np.float64)
+        o = outcome[mask].astype(np.float64)
+        n_agents = len(self.agents.values)
+        counts = np.bincount(agent, minlength=n_agents)
+        squared = np.bincount(agent, weights=(p - o) ** 2, minlength=n_agents)
+        return {name: {"n": int(counts[i]), "brier": float(squared[i] / counts[i])}
+                for i, name in enumerate(self.agents.values) if counts[i]}
+
+    def calibration(self, bins: int = 10) -> Dict[str, List[dict]]:
+        """Per agent calibration curve: stated vs observed frequency per confidence bin"""
+        mask, outcome = self.scored()
+        agent = self.columns["agent"][mask].astype(np.int64)
+        p = self.columns["confidence"][mask].astype(np.float64)
+        o = outcome[mask].astype(np.float64)
+        which = np.minimum((p * bins).astype(np.int64), bins - 1)  # 100% falls in the top bin
+        cell = agent * bins + which
+        size = len(self.agents.values) * bins
+        counts = np.bincount(cell, minlength=size).reshape(-1, bins)
+        stated = np.bincount(cell, weights=p, minlength=size).reshape(-1, bins)
+        held = np.bincount(cell, weights=o, minlength=size).reshape(-1, bins)
+
+        curves = {}
+        for i, name in enumerate(self.agents.values):
+            filled = np.nonzero(counts[i])[0]
+            if not len(filled):
+                continue
+            curves[name] = [{"bin": f"{100 * b // bins}-{100 * (b + 1) // bins}%",
+                             "n": int(counts[i, b]),
+                             "confidence": float(stated[i, b] / counts[i, b]),
+                             "observed": float(held[i, b] / counts[i, b])} for b in filled]
+        return curves
+
+    def tiers(self) -> Dict[str, Dict[str, int]]:
+        """Per agent: messages by protocol tier (first row of each message counts)"""
+        columns = self.columns
+        _, first = np.unique(columns["message"], return_index=True)
+        agent = columns["agent"][first].astype(np.int64)
+        cell = agent * len(TIERS) + columns["tier"][first]
+        counts = np.bincount(cell, minlength=len(self.agents.values) * len(TIERS)).reshape(-1, len(TIERS))
+        return {name: {tier: int(n) for tier, n in zip(TIERS, counts[i]) if n}
+                for i, name in enumerate(self.agents.values) if counts[i].any()}
+
+    def report(self, bins: int = 10, min_count: int = 5, tolerance: float = 0.15) -> Dict[str, dict]:
+        """Brier score, calibration curve and plain-language feedback per agent"""
+        briers = self.brier_scores()
+        curves = self.calibration(bins)
+        tiers = self.tiers()
+        statements = np.bincount(self.columns["agent"], minlength=len(self.agents.values))
+
+        report = {}
+        for i, name in enumerate(self.agents.values):
+            if not statements[i]:
+                continue
+            curve = curves.get(name, [])
+            feedback = []
+            for cell in curve:
+                gap = cell["observed"] - cell["confidence"]
+                if cell["n"] >= min_count and abs(gap) >= tolerance:
+                    feedback.append(
+                        f"Your {100 * cell['confidence']:.0f}% should have been {100 * cell['observed']:.0f}% "
+                        f"({'over' if gap < 0 else 'under'}confident, n={cell['n']})")
+            n = sum(cell["n"] for cell in curve)
+            report[name] = {
+                "statements": int(statements[i]),
+                "resolved": briers.get(name, {}).get("n", 0),
+                "brier": briers.get(name, {}).get("brier"),
+                "calibration_error": (sum(cell["n"] * abs(cell["observed"] - cell["confidence"]) for cell in curve) / n
+                                      if n else None),
+                "curve": curve,
+                "tiers": tiers.get(name, {}),
+                "feedback": feedback,
+            }
+        return report
+
+
+def print_report(report: Dict[str, dict]):
+    for name, entry in report.items():
+        brier = f"{entry['brier']:.3f}" if entry["brier"] is not None else "n/a"
+        print(f"🧠 {name}: {entry['statements']} statements, {entry['resolved']} resolved, Brier {brier}")
+        if entry["tiers"]:
+            print("   Tiers: " + ", ".join(f"{tier} {n}" for tier, n in entry["tiers"].items()))
+        for cell in entry["curve"]:
+            bar = "█" * round(10 * cell["observed"])
+            print(f"   {cell['bin']:>8}  stated {100 * cell['confidence']:5.1f}%  "
+                  f"observed {100 * cell['observed']:5.1f}%  n={cell['n']:<5} {bar}")
+        for line in entry["feedback"]:
+            print(f"   ⚠️  {line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bayesian belief ledger")
+    parser.add_argument("command", choices=("ingest-queue", "ingest", "resolve", "report", "parse"))
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--dir", default=None, help="Ledger directory (default: $BELIEF_LEDGER_DIR or .belief-ledger)")
+    parser.add_argument("--queue-dir", default=None, help="File queue directory (default: $SLACK_QUEUE_DIR)")
+    parser.add_argument("--consumer", default=DEFAULT_CONSUMER, help="Queue cursor name")
+    parser.add_argument("--verify", action="store_true", help="Only ingest messages whose signature verifies")
+    parser.add_argument("--agent", default=None, help="Report on one agent")
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--min-count", type=int, default=5, help="Smallest bin that gets feedback")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "parse":
+        if len(args.args) != 1:
+            parser.error("parse takes <message.md>")
+        update = parse_update(Path(args.args[0]).read_text(encoding="utf-8"))
+        if update is None:
+            print("❌ Not a Bayesian update or conflict message")
+            sys.exit(1)
+        print(json.dumps({**update._asdict(), "shift": update.shift, "tier": update.tier},
+                         indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    ledger = BeliefLedger(args.dir)
+    if args.command == "ingest-queue":
+        stats = ledger.ingest_queue(args.queue_dir, args.consumer)
+        print(f"✅ Read {stats['records']} queue records: {stats['messages']} updates, {stats['rows']} claims"
+              + (f", {stats['unattributed']} without a known agent" if stats["unattributed"] else ""))
+    elif args.command == "ingest":
+        if len(args.args) != 1:
+            parser.error("ingest takes <dir|glob>")
+        stats = ledger.ingest_signed(args.args[0], verify=args.verify)
+        print(f"✅ Read {stats['files']} files: {stats['messages']} updates, {stats['rows']} claims"
+              + (f", {stats['invalid']} failed verification" if args.verify else ""))
+    elif args.command == "resolve":
+        if len(args.args) != 2:
+            parser.error('resolve takes "<claim>" true|false')
+        outcome = _outcome(args.args[1])
+        if outcome is None:
+            parser.error("outcome must be true or false")
+        ledger.resolve(args.args[0], outcome[1])
+        print(f"✅ Resolved \"{claim_key(args.args[0])}\" as {outcome[1]}")
+    else:
+        report = ledger.report(args.bins, args.min_count)
+        if args.agent:
+            report = {k: v for k, v in report.items() if k == args.agent.lower()}
+        if args.json:
+            print(json.dumps(report, indent=2))
+        elif report:
+            print_report(report)
+        else:
+            print("ℹ️  No statements recorded")
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Resolve multi-agent [CONFLICT]s by pooling beliefs weighted by calibration
+Usage: python3 scripts/conflict_resolver.py <conflict.md|dir|glob>... [--method log|linear]
+                                            [--ledger DIR] [--synthesizer AGENT] [--out synthesis.md]
+       python3 scripts/conflict_resolver.py --queue [--queue-dir DIR] [--consumer conflict-resolver] ...
+The output is a [SYNTHESIS] message ready for scripts/sign_message.py.
+
+Each agent's position becomes a distribution over the conflict's options:
+its stated confidence on the options it named, the remainder spread evenly
+over the others. A lone claim gets a "Not: <claim>" complement. Pooling:
+
+  linear   sum_a w_a * p_a(option)
+  log      softmax(sum_a w_a * log p_a(option)); for two options this is
+           log-odds pooling
+
+Weights come from the agent's Brier score in the belief ledger, shrunk
+towards an uninformed default while it has few resolved claims. All open
+conflicts are padded into one (conflict, agent, option) array and pooled in
+a single pass.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from belief_ledger import (BeliefLedger, BayesianUpdate, CONFLICT_KINDS, parse_update,
+                           claim_key, protocol_tier, default_ledger_dir, agent_ids)
+
+METHODS = ("log", "linear")
+DEFAULT_CONSUMER = "conflict-resolver"
+
+UNINFORMATIVE_BRIER = 0.25  # always answering 50%
+PRIOR_CLAIMS = 10           # pseudo-claims shrinking skill towards DEFAULT_SKILL
+DEFAULT_SKILL = 0.5
+MIN_WEIGHT = 0.05
+EPSILON = 1e-6
+
+DECIDED = 0.8      # pooled top option at or above: High confidence
+LEANING = 0.6      # at or above: Medium; below: needs a human decision
+
+
+class Position(NamedTuple):
+    agent: str
+    claim: str
+    confidence: float
+
+
+class Conflict(NamedTuple):
+    title: str
+    positions: List[Position]
+
+    @property
+    def agents(self) -> List[str]:
+        return list(dict.fromkeys(p.agent for p in self.positions))
+
+    @property
+    def options(self) -> List[str]:
+        first = {}
+        for p in self.positions:
+            first.setdefault(claim_key(p.claim), p.claim)
+        options = list(first.values())
+        if len(options) == 1:
+            options.append(f"Not: {options[0]}")
+        return options
+
+
+class Resolution(NamedTuple):
+    conflict: Conflict
+    options: List[str]
+    agents: List[str]
+    weights: np.ndarray        # (agents,), sums to 1
+    distributions: np.ndarray  # (agents, options)
+    pooled: np.ndarray         # (options,)
+
+    @property
+    def best(self) -> int:
+        return int(np.argmax(self.pooled))
+
+    @property
+    def confidence(self) -> str:
+        top = self.pooled[self.best]
+        return "High" if top >= DECIDED else "Medium" if top >= LEANING else "Low"
+
+
+# =============================================================================
+# INPUT
+# =============================================================================
+
+def conflict_from_update(update: BayesianUpdate, ids: Optional[Dict[str, str]] = None) -> Optional[Conflict]:
+    """Positions of a [CONFLICT]/[BAYESIAN-CONFLICT] message; None if fewer than two agents"""
+    ids = ids or {}
+    positions = []
+    for claim in update.priors + update.posteriors:
+        name = (claim.agent or update.agent or "unknown").lower()
+        positions.append(Position(ids.get(name, name), claim.text, claim.confidence))
+    # One position per (agent, claim): a later statement replaces an earlier one
+    latest = {(p.agent, claim_key(p.claim)): p for p in positions}
+    conflict = Conflict(update.title, list(latest.values()))
+    return conflict if len(conflict.agents) >= 2 else None
+
+
+def load_conflicts(texts: Iterable[str], ids: Optional[Dict[str, str]] = None) -> List[Conflict]:
+    conflicts = []
+    for text in texts:
+        update = parse_update(text)
+        if update is None or update.kind not in CONFLICT_KINDS:
+            continue
+        conflict = conflict_from_update(update, ids)
+        if conflict is not None:
+            conflicts.append(conflict)
+    return conflicts
+
+
+def read_queue(queue, consumer: str = DEFAULT_CONSUMER):
+    """Conflict texts after the consumer's cursor, plus the cursor to ack once handled"""
+    queue.register(consumer)
+    records, cursor = queue.read_since(queue.cursor(consumer))
+    return [r.get("raw") or "" for r in records if r.get("kind") in CONFLICT_KINDS], cursor
+
+
+# =============================================================================
+# POOLING
+# =============================================================================
+
+def calibration_weights(agents: List[str], ledger: Optional[BeliefLedger] = None) -> np.ndarray:
+    """Unnormalized weight per agent from Brier skill, shrunk by how much history backs it"""
+    scores = ledger.brier_scores() if ledger is not None else {}
+    n = np.array([scores.get(a, {}).get("n", 0) for a in agents], dtype=np.float64)
+    brier = np.array([scores.get(a, {}).get("brier", UNINFORMATIVE_BRIER) for a in agents], dtype=np.float64)
+    skill = np.clip(1 - brier / UNINFORMATIVE_BRIER, 0, 1)
+    shrunk = (n * skill + PRIOR_CLAIMS * DEFAULT_SKILL) / (n + PRIOR_CLAIMS)
+    return np.maximum(shrunk, MIN_WEIGHT)
+
+
+def pool(conflicts: List[Conflict], method: str = "log",
+         weights: Optional[Dict[str, float]] = None) -> List[Resolution]:
+    """Pool every conflict in one vectorized pass"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown pooling method: {method}")
+    if not conflicts:
+        return []
+    weights = weights or {}
+    option_lists = [c.options for c in conflicts]
+    agent_lists = [c.agents for c in conflicts]
+    n_conflicts = len(conflicts)
+    n_agents = max(len(a) for a in agent_lists)
+    n_options = max(len(o) for o in option_lists)
+
+    # Flatten every position to (conflict, agent slot, option slot, confidence)
+    cs, as_, os_, stated_p = [], [], [], []
+    W = np.zeros((n_conflicts, n_agents))
+    options_mask = np.zeros((n_conflicts, n_options), dtype=bool)
+    agents_mask = np.zeros((n_conflicts, n_agents), dtype=bool)
+    for c, conflict in enumerate(conflicts):
+        option_index = {claim_key(o): i for i, o in enumerate(option_lists[c])}
+        agent_index = {a: i for i, a in enumerate(agent_lists[c])}
+        options_mask[c, :len(option_index)] = True
+        agents_mask[c, :len(agent_index)] = True
+        W[c, :len(agent_index)] = [weights.get(a, 1.0) for a in agent_lists[c]]
+        for position in conflict.positions:
+            cs.append(c)
+            as_.append(agent_index[position.agent])
+            os_.append(option_index[claim_key(position.claim)])
+            stated_p.append(position.confidence)
+    W /= W.sum(axis=1, keepdims=True)
+
+    # Each agent: stated confidences, the remainder spread over the options it did not
+    # name, renormalized when it stated more than 100% in total
+    S = np.full((n_conflicts, n_agents, n_options), np.nan)
+    S[cs, as_, os_] = stated_p
+    stated = ~np.isnan(S)
+    valid = agents_mask[:, :, None] & options_mask[:, None, :]
+    unstated = (valid & ~stated).sum(axis=2, keepdims=True)
+    remainder = np.clip(1 - np.nansum(S, axis=2, keepdims=True), 0, None) / np.maximum(unstated, 1)
+    P = np.where(stated, S, np.where(valid, remainder, 0.0))
+    totals = P.sum(axis=2, keepdims=True)
+    P = np.divide(P, totals, out=np.zeros_like(P), where=totals > 0)
+
+    if method == "linear":
+        pooled = np.einsum("ca,cao->co", W, P)
+        pooled[~options_mask] = 0
+    else:
+        log_p = np.log(np.clip(P, EPSILON, 1.0))
+        scores = np.einsum("ca,cao->co", W, log_p)
+        scores[~options_mask] = -np.inf
+        scores -= scores.max(axis=1, keepdims=True)
+        pooled = np.exp(scores)
+    pooled /= pooled.sum(axis=1, keepdims=True)
+
+    return [Resolution(conflict, option_lists[c], agent_lists[c],
+                       W[c, :len(agent_lists[c])], P[c, :len(agent_lists[c]), :len(option_lists[c])],
+                       pooled[c, :len(option_lists[c])])
+            for c, conflict in enumerate(conflicts)]
+
+
+def resolve(conflicts: List[Conflict], method: str = "log",
+            ledger: Optional[BeliefLedger] = None) -> List[Resolution]:
+    agents = sorted({a for c in conflicts for a in c.agents})
+    weights = dict(zip(agents, calibration_weights(agents, ledger).tolist()))
+    return pool(conflicts, method, weights)
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def _display(agent: str, registry_names: Dict[str, str]) -> str:
+    return registry_names.get(agent, agent.capitalize())
+
+
+def render_synthesis(resolutions: List[Resolution], method: str = "log",
+                     synthesizer: Optional[str] = None, names: Optional[Dict[str, str]] = None,
+                     now: Optional[datetime] = None) -> str:
+    """[SYNTHESIS] message in the Formal Protocol's output format"""
+    names = names or {}
+    now = now or datetime.now(timezone.utc)
+    contributors = list(dict.fromkeys(a for r in resolutions for a in r.agents))
+    levels = [r.confidence for r in resolutions]
+    overall = "Low" if "Low" in levels else "Medium" if "Medium" in levels else "High"
+    decided = [r for r in resolutions if r.confidence != "Low"]
+    method_name = "Log-odds" if method == "log" else "Linear opinion"
+
+    lines = [
+        f"[SYNTHESIS] Conflict Resolution — {len(resolutions)} open conflict{'s' if len(resolutions) != 1 else ''}",
+        f"**Contributors:** {', '.join(_display(a, names) for a in contributors)}",
+        f"**Synthesized by:** {_display(synthesizer, names) if synthesizer else 'conflict_resolver'}",
+        f"**Date:** {now.strftime('%Y-%m-%d %H:%M')} UTC",
+        f"**Confidence:** {overall}",
+        f"**Method:** {method_name} pooling weighted by calibration (Brier score history)",
+        "",
+        "## Executive Summary",
+        f"Pooled {len(resolutions)} conflict{'s' if len(resolutions) != 1 else ''} in one round: "
+        f"{len(decided)} resolved, {len(resolutions) - len(decided)} need a human decision.",
+        "",
+        "## Detailed Findings",
+        "",
+    ]
+    for r in resolutions:
+        best = r.best
+        lines.append(f"### {r.conflict.title}")
+        header = " | ".join(f"{_display(a, names)} (w {w:.2f})" for a, w in zip(r.agents, r.weights))
+        lines.append(f"| Option | {header} | Pooled |")
+        lines.append("|---" * (len(r.agents) + 2) + "|")
+        for o, option in enumerate(r.options):
+            cells = " | ".join(f"{100 * p:.0f}%" for p in r.distributions[:, o])
+            marker = "**" if o == best else ""
+            lines.append(f"| {marker}{option}{marker} | {cells} | {marker}{100 * r.pooled[o]:.0f}%{marker} |")
+        lines.append("")
+        lines.append(f"**Posterior:** \"{r.options[best]}\" (confidence: {100 * r.pooled[best]:.0f}%)")
+        for a, agent in enumerate(r.agents):
+            before = r.distributions[a, best]
+            shift = r.pooled[best] - before
+            lines.append(f"- {_display(agent, names)}: {100 * before:.0f}% → {100 * r.pooled[best]:.0f}% "
+                         f"({100 * shift:+.0f}%, {protocol_tier(shift)})")
+        lines.append(f"**Residual Uncertainty ({100 * (1 - r.pooled[best]):.0f}%)**")
+        lines.append("")
+
+    open_questions = [r for r in resolutions if r.confidence == "Low"]
+    lines.append("### Open Questions (Require Human Decision)")
+    if open_questions:
+        for r in open_questions:
+            ranked = np.argsort(r.pooled)[::-1][:2]
+            lines.append(f"- {r.conflict.title}: \"{r.options[ranked[0]]}\" {100 * r.pooled[ranked[0]]:.0f}% vs "
+                         f"\"{r.options[ranked[1]]}\" {100 * r.pooled[ranked[1]]:.0f}%")
+    else:
+        lines.append("- None")
+    lines.append("")
+    lines.append("## Recommendations")
+    for i, r in enumerate(decided, 1):
+        lines.append(f"{i}. {r.conflict.title}: adopt \"{r.options[r.best]}\" ({r.confidence.lower()} confidence)")
+    if not decided:
+        lines.append("1. Escalate every conflict above with [ACTION]")
+    lines.append("")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pool conflicting agent beliefs into a [SYNTHESIS]")
+    parser.add_argument("sources", nargs="*", help="Conflict messages: files, directories or globs")
+    parser.add_argument("--queue", action="store_true", help="Read [CONFLICT] messages from the file queue")
+    parser.add_argument("--queue-dir", default=None, help="File queue directory (default: $SLACK_QUEUE_DIR)")
+    parser.add_argument("--consumer", default=DEFAULT_CONSUMER, help="Queue cursor name")
+    parser.add_argument("--method", choices=METHODS, default="log")
+    parser.add_argument("--ledger", default=None, help="Belief ledger (default: $BELIEF_LEDGER_DIR or .belief-ledger)")
+    parser.add_argument("--synthesizer", default=None, help="Agent id that will sign the synthesis")
+    parser.add_argument("--out", default=None, help="Write the synthesis here instead of stdout")
+    args = parser.parse_args()
+
+    if not args.sources and not args.queue:
+        parser.error("give conflict messages or --queue")
+
+    try:
+        from agent_registry import load_registry
+        registry = load_registry()
+        names = {agent_id: record.name for agent_id, record in registry.agents.items()}
+        ids = agent_ids(registry)
+    except FileNotFoundError:
+        names, ids = {}, {}
+
+    texts = []
+    for source in args.sources:
+        from verify_message import find_messages
+        texts.extend(Path(p).read_text(encoding="utf-8") for p in find_messages(source))
+
+    queue = cursor = None
+    if args.queue:
+        from file_queue import FileQueue, DEFAULT_QUEUE_DIR
+        queue = FileQueue(args.queue_dir or os.environ.get("SLACK_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+        queue_texts, cursor = read_queue(queue, args.consumer)
+        texts.extend(queue_texts)
+
+    conflicts = load_conflicts(texts, ids)
+    if not conflicts:
+        if queue is not None:
+            queue.ack(args.consumer, cursor)
+        print("ℹ️  No open conflicts with two or more agents", file=sys.stderr)
+        sys.exit(0)
+
+    ledger_dir = Path(args.ledger) if args.ledger else default_ledger_dir()
+    ledger = BeliefLedger(ledger_dir) if ledger_dir.exists() else None
+    resolutions = resolve(conflicts, args.method, ledger)
+    synthesis = render_synthesis(resolutions, args.method, args.synthesizer and ids.get(
+        args.synthesizer.lower(), args.synthesizer), names)
+
+    if args.out:
+        Path(args.out).write_text(synthesis, encoding="utf-8")
+        print(f"✅ Wrote {args.out} ({len(resolutions)} conflicts)", file=sys.stderr)
+        if args.synthesizer:
+            print(f"   Sign with: python3 scripts/sign_message.py {args.out} {args.synthesizer}", file=sys.stderr)
+    else:
+        print(synthesis)
+    if queue is not None and cursor is not None:
+        queue.ack(args.consumer, cursor)
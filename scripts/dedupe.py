@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Duplicate / redelivery suppression for Slack events
+An in-memory LRU with TTL answers the common case in O(1); an optional
+on-disk two-generation bloom filter remembers events across bot restarts.
+"""
+
+import mmap
+import math
+import time
+import struct
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+BLOOM_MAGIC = b"AMBLOOM1"
+# magic, capacity, bit count, hash count, inserted
+BLOOM_HEADER = struct.Struct("<8sQQII")
+
+
+class BloomFilter:
+    """Fixed-size bloom filter backed by an mmap'd file"""
+
+    def __init__(self, path: Path, capacity: int, error_rate: float):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        size = BLOOM_HEADER.size + (self.bits + 7) // 8
+
+        existing = self.path.exists() and self.path.stat().st_size == size
+        with open(self.path, "r+b" if existing else "w+b") as f:
+            if not existing:
+                f.truncate(size)
+            self._map = mmap.mmap(f.fileno(), size)
+
+        magic, capacity, bits, hashes, inserted = BLOOM_HEADER.unpack_from(self._map, 0)
+        if magic != BLOOM_MAGIC or bits != self.bits or hashes != self.hashes:
+            # New file or different sizing: start empty
+            self._map[:] = bytes(size)
+            inserted = 0
+        self.inserted = inserted
+        self._write_header()
+
+    def _write_header(self):
+        BLOOM_HEADER.pack_into(self._map, 0, BLOOM_MAGIC, self.capacity, self.bits,
+                               self.hashes, self.inserted)
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, key: bytes) -> bool:
+        base = BLOOM_HEADER.size
+        return all(self._map[base + p // 8] & (1 << (p % 8)) for p in self._positions(key))
+
+    def add(self, key: bytes):
+        base = BLOOM_HEADER.size
+        for p in self._positions(key):
+            self._map[base + p // 8] |= 1 << (p % 8)
+        self.inserted += 1
+        self._write_header()
+
+    @property
+    def full(self) -> bool:
+        return self.inserted >= self.capacity
+
+    def clear(self):
+        self._map[BLOOM_HEADER.size:] = bytes(len(self._map) - BLOOM_HEADER.size)
+        self.inserted = 0
+        self._write_header()
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+
+
+class GenerationalBloom:
+    """Two bloom filters: inserts go to the current one; when it fills, the
+    older generation is cleared and becomes current, so memory stays fixed
+    and keys are remembered for between one and two generations"""
+
+    def __init__(self, directory: str, capacity: int = 100000, error_rate: float = 1e-6):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.generations = [
+            BloomFilter(self.directory / f"bloom-{i}.bin", capacity, error_rate) for i in (0, 1)
+        ]
+        # The generation with room left (or fewer inserts) is current
+        self.current = 0 if self.generations[0].inserted <= self.generations[1].inserted else 1
+        if self.generations[self.current].full:
+            self._rotate()
+
+    def _rotate(self):
+        self.current ^= 1
+        self.generations[self.current].clear()
+
+    def __contains__(self, key: bytes) -> bool:
+        return any(key in g for g in self.generations)
+
+    def add(self, key: bytes):
+        if self.generations[self.current].full:
+            self._rotate()
+        self.generations[self.current].add(key)
+
+    def flush(self):
+        for g in self.generations:
+            g.flush()
+
+    def close(self):
+        for g in self.generations:
+            g.close()
+
+
+class DedupeCache:
+    """Remembers recently seen Slack events so redeliveries can be dropped
+
+    An event is a duplicate if its envelope_id was seen (Socket Mode retry of
+    the same envelope) or its (channel, ts) was seen (the same message in a
+    new envelope after a reconnect).
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0,
+                 bloom_dir: Optional[str] = None, bloom_capacity: int = 100000,
+                 bloom_error_rate: float = 1e-6):
+        """
+        bloom_dir: directory for the persistent bloom filter (None = memory only)
+        bloom_error_rate: false positives drop real messages, so keep it tiny
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._seen: "OrderedDict[Tuple, float]" = OrderedDict()
+        self.bloom = GenerationalBloom(bloom_dir, bloom_capacity, bloom_error_rate) if bloom_dir else None
+
+        self.checked = 0
+        self.duplicates = 0
+        self.bloom_hits = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @staticmethod
+    def keys(channel: Optional[str], ts: Optional[str], envelope_id: Optional[str]) -> list:
+        keys = []
+        if envelope_id:
+            keys.append(("envelope", envelope_id))
+        if channel and ts:
+            keys.append(("message", channel, ts))
+        return keys
+
+    def _fresh(self, key: Tuple, now: float) -> bool:
+        seen_at = self._seen.get(key)
+        if seen_at is None:
+            return False
+        if now - seen_at > self.ttl:
+            del self._seen[key]
+            self.expired += 1
+            return False
+        self._seen.move_to_end(key)
+        return True
+
+    def is_duplicate(self, channel: Optional[str], ts: Optional[str],
+                     envelope_id: Optional[str]) -> bool:
+        """Check-and-record; returns True if the event was already seen"""
+        self.checked += 1
+        keys = self.keys(channel, ts, envelope_id)
+        if not keys:
+            return False
+        now = time.monotonic()
+
+        if any(self._fresh(key, now) for key in keys):
+            self.duplicates += 1
+            return True
+
+        encoded = ["\x1f".join(key).encode("utf-8") for key in keys]
+        if self.bloom is not None and any(k in self.bloom for k in encoded):
+            self.duplicates += 1
+            self.bloom_hits += 1
+            self._remember(keys, now)
+            return True
+
+        self._remember(keys, now)
+        if self.bloom is not None:
+            for k in encoded:
+                self.bloom.add(k)
+        return False
+
+    def _remember(self, keys: list, now: float):
+        for key in keys:
+            self._seen[key] = now
+            self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def metrics(self) -> dict:
+        return {
+            "checked": self.checked,
+            "duplicates_suppressed": self.duplicates,
+            "bloom_hits": self.bloom_hits,
+            "entries": len(self._seen),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        if self.bloom is not None:
+            self.bloom.close()
+            self.bloom = None
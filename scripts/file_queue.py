@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Segmented JSONL file queue with per-agent durable cursors
+Usage: python3 scripts/file_queue.py read <agent_id> [--dir DIR] [--limit N] [--no-ack]
+       python3 scripts/file_queue.py unregister <consumer> [--dir DIR]
+       python3 scripts/file_queue.py compact [--dir DIR]
+       python3 scripts/file_queue.py stats [--dir DIR]
+
+Layout of the queue directory:
+  segment-<base_seq>.jsonl   one JSON record per line; line i has seq base_seq + i
+  segment-<base_seq>.idx     sparse (seq, byte offset) pairs, one per index_interval records
+  cursors/<agent_id>.json    next seq the agent (or other consumer) has not yet acknowledged
+"""
+
+import os
+import json
+import time
+import bisect
+import argparse
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_QUEUE_DIR = "/tmp/agent-mesh-slack-queue"
+SEGMENT_PREFIX = "segment-"
+
+
+def _segment_name(base_seq: int, suffix: str) -> str:
+    return f"{SEGMENT_PREFIX}{base_seq:020d}{suffix}"
+
+
+class Segment:
+    """One immutable-once-rotated JSONL file plus its sparse offset index"""
+
+    def __init__(self, directory: Path, base_seq: int):
+        self.base_seq = base_seq
+        self.path = directory / _segment_name(base_seq, ".jsonl")
+        self.index_path = directory / _segment_name(base_seq, ".idx")
+        self._index: Optional[array] = None
+        self._seqs: Optional[array] = None
+        self._index_size = -1
+
+    def index(self) -> array:
+        """Flat array of seq0, off0, seq1, off1, ... (reloaded if it grew)"""
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size != self._index_size:
+            entries = array('Q')
+            if size:
+                with open(self.index_path, 'rb') as f:
+                    entries.frombytes(f.read(size - size % 16))
+            self._index, self._seqs, self._index_size = entries, entries[0::2], size
+        return self._index
+
+    def seek_position(self, seq: int) -> Tuple[int, int]:
+        """Return (seq, byte offset) of the closest indexed record at or before seq"""
+        entries = self.index()
+        i = bisect.bisect_right(self._seqs, seq) - 1
+        if i < 0:
+            return self.base_seq, 0
+        return entries[2 * i], entries[2 * i + 1]
+
+
+class FileQueue:
+    """Append-side and read-side API over a segmented queue directory"""
+
+    def __init__(self, directory: str = DEFAULT_QUEUE_DIR, segment_max_bytes: int = 64 << 20,
+                 segment_max_age: float = 3600.0, index_interval: int = 64,
+                 agents: Optional[Iterable[str]] = None):
+        """
+        agents: ids that must acknowledge a segment before compaction may
+                delete it (default: every agent in agents.yaml)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "cursors").mkdir(exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.index_interval = index_interval
+        self._agents = list(agents) if agents is not None else None
+
+        self._segments = {}
+        self._active: Optional[Segment] = None
+        self._active_file = None
+        self._active_index = None
+        self._active_opened = 0.0
+        self._next_seq = None
+
+    # -------------------------------------------------------------------------
+    # Segments
+    # -------------------------------------------------------------------------
+
+    def segments(self) -> List[Segment]:
+        """Segments on disk, oldest first"""
+        bases = sorted(
+            int(p.name[len(SEGMENT_PREFIX):-len(".jsonl")])
+            for p in self.directory.glob(f"{SEGMENT_PREFIX}*.jsonl")
+        )
+        segments = []
+        for base in bases:
+            if base not in self._segments:
+                self._segments[base] = Segment(self.directory, base)
+            segments.append(self._segments[base])
+        for base in set(self._segments) - set(bases):
+            del self._segments[base]
+        return segments
+
+    def _recover_active(self):
+        """Find the next seq from the newest segment, dropping any torn last line"""
+        segments = self.segments()
+        if not segments:
+            self._next_seq = 0
+            return
+        last = segments[-1]
+        seq, offset = last.seek_position(2 ** 63)
+        with open(last.path, 'rb+') as f:
+            f.seek(offset)
+            good_end = offset
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                good_end += len(line)
+                seq += 1
+            f.truncate(good_end)
+
+        # Drop torn or dangling index entries so appends stay 16-byte aligned
+        entries = last.index()
+        keep = len(entries)
+        while keep and entries[keep - 1] >= good_end:
+            keep -= 2
+        if keep * 8 != (last.index_path.stat().st_size if last.index_path.exists() else 0):
+            with open(last.index_path, 'wb') as f:
+                f.write(entries[:keep].tobytes())
+
+        self._next_seq = seq
+        self._open_active(last)
+
+    def _open_active(self, segment: Segment):
+        self._active = segment
+        self._active_file = open(segment.path, 'ab')
+        self._active_index = open(segment.index_path, 'ab')
+        self._active_opened = time.time()  # segment age counts from when we took it over
+
+    def _close_active(self):
+        if self._active_file:
+            self._active_file.close()
+            self._active_index.close()
+        self._active = self._active_file = self._active_index = None
+
+    def _should_rotate(self) -> bool:
+        if self._active_file.tell() >= self.segment_max_bytes:
+            return True
+        return self._active_file.tell() > 0 and time.time() - self._active_opened >= self.segment_max_age
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def append_batch(self, records: List[dict]) -> int:
+        """Append records as one write; returns the seq of the last record"""
+        if self._next_seq is None:
+            self._recover_active()
+        if self._active is None or self._should_rotate():
+            self._close_active()
+            segment = Segment(self.directory, self._next_seq)
+            self._segments[segment.base_seq] = segment
+            self._open_active(segment)
+
+        offset = self._active_file.tell()
+        lines = []
+        index_entries = array('Q')
+        for record in records:
+            line = (json.dumps(record) + '\n').encode('utf-8')
+            if (self._next_seq - self._active.base_seq) % self.index_interval == 0:
+                index_entries.extend((self._next_seq, offset))
+            lines.append(line)
+            offset += len(line)
+            self._next_seq += 1
+
+        self._active_file.write(b"".join(lines))
+        self._active_file.flush()
+        if index_entries:
+            self._active_index.write(index_entries.tobytes())
+            self._active_index.flush()
+        return self._next_seq - 1
+
+    def sync(self):
+        """fsync the active segment and its index"""
+        if self._active_file:
+            os.fsync(self._active_file.fileno())
+            os.fsync(self._active_index.fileno())
+
+    def close(self):
+        self._close_active()
+        self._next_seq = None
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def read_since(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[dict], int]:
+        """Return (records after cursor, new cursor); cost is O(new records)"""
+        segments = self.segments()
+        bases = [s.base_seq for s in segments]
+        i = max(0, bisect.bisect_right(bases, cursor) - 1)
+        records = []
+
+        for segment in segments[i:]:
+            if cursor < segment.base_seq:
+                cursor = segment.base_seq  # older records were compacted away
+            seq, offset = segment.seek_position(cursor)
+            try:
+                f = open(segment.path, 'rb')
+            except FileNotFoundError:
+                continue
+            with f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partially written by the appender
+                    if seq >= cursor:
+                        records.append(json.loads(line))
+                        cursor = seq + 1
+                        if limit is not None and len(records) >= limit:
+                            return records, cursor
+                    seq += 1
+        return records, cursor
+
+    def _cursor_path(self, agent_id: str) -> Path:
+        return self.directory / "cursors" / f"{agent_id}.json"
+
+    def cursor(self, agent_id: str) -> int:
+        """Next seq the agent has not acknowledged (0 if it never read)"""
+        try:
+            with open(self._cursor_path(agent_id), 'r') as f:
+                return json.load(f)["cursor"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return 0
+
+    def ack(self, agent_id: str, cursor: int):
+        """Durably record that agent_id has processed everything before cursor"""
+        path = self._cursor_path(agent_id)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({"cursor": cursor, "updated": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def register(self, consumer: str):
+        """Give a non-agent consumer a cursor so compaction waits for it too"""
+        if not self._cursor_path(consumer).exists():
+            segments = self.segments()
+            self.ack(consumer, segments[0].base_seq if segments else 0)
+
+    def unregister(self, consumer: str) -> bool:
+        """Drop a retired consumer's cursor so compaction stops waiting for it"""
+        if consumer in self.registered_agents():
+            raise ValueError(f"'{consumer}' is an agents.yaml agent; compaction always waits for it")
+        try:
+            self._cursor_path(consumer).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def consume(self, agent_id: str, limit: Optional[int] = None,
+                ack: bool = True) -> List[dict]:
+        """Read the agent's new records and (by default) advance its cursor"""
+        records, cursor = self.read_since(self.cursor(agent_id), limit)
+        if ack and records:
+            self.ack(agent_id, cursor)
+        return records
+
+    # -------------------------------------------------------------------------
+    # Compaction
+    # -------------------------------------------------------------------------
+
+    def registered_agents(self) -> List[str]:
+        if self._agents is not None:
+            return self._agents
+        from agent_registry import load_registry
+        return list(load_registry().agents)
+
+    def consumers(self) -> List[str]:
+        """Registered agents plus every other consumer with a cursor on disk"""
+        on_disk = sorted(p.stem for p in (self.directory / "cursors").glob("*.json"))
+        agents = self.registered_agents()
+        return list(agents) + [c for c in on_disk if c not in agents]
+
+    def compact(self) -> List[Path]:
+        """Delete rotated segments every agent and consumer has acknowledged"""
+        consumers = self.consumers()
+        if not consumers:
+            return []
+        low_water = min(self.cursor(consumer) for consumer in consumers)
+
+        segments = self.segments()
+        removed = []
+        for segment, following in zip(segments, segments[1:]):
+            if segment is self._active or following.base_seq > low_water:
+                break
+            segment.path.unlink()
+            if segment.index_path.exists():
+                segment.index_path.unlink()
+            removed.append(segment.path)
+        self.segments()
+        return removed
+
+    def stats(self) -> dict:
+        segments = self.segments()
+        return {
+            "segments": len(segments),
+            "bytes": sum(s.path.stat().st_size for s in segments),
+            "first_seq": segments[0].base_seq if segments else 0,
+            "cursors": {consumer: self.cursor(consumer) for consumer in self.consumers()},
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agent-mesh segmented file queue")
+    parser.add_argument("command", choices=("read", "unregister", "compact", "stats"))
+    parser.add_argument("agent_id", nargs="?", help="Agent or consumer whose cursor to read from or drop")
+    parser.add_argument("--dir", default=os.environ.get("SLACK_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--no-ack", action="store_true", help="Do not advance the cursor")
+    args = parser.parse_args()
+
+    queue = FileQueue(args.dir)
+
+    if args.command == "read":
+        if not args.agent_id:
+            parser.error("read needs an agent_id")
+        for record in queue.consume(args.agent_id, args.limit, ack=not args.no_ack):
+            print(json.dumps(record))
+    elif args.command == "unregister":
+        if not args.agent_id:
+            parser.error("unregister needs a consumer name")
+        try:
+            removed = queue.unregister(args.agent_id)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"✅ Unregistered {args.agent_id}" if removed else f"ℹ️  {args.agent_id} had no cursor")
+    elif args.command == "compact":
+        removed = queue.compact()
+        print(f"🧹 Removed {len(removed)} acknowledged segment(s)")
+    else:
+        print(json.dumps(queue.stats(), indent=2))
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Agent liveness and primary-channel health monitor with automatic fallback
+Usage: python3 scripts/health_monitor.py run [--url URL] [--interval 2]
+       python3 scripts/health_monitor.py status
+       python3 scripts/health_monitor.py force primary|fallback
+       python3 scripts/health_monitor.py clear
+Environment: MATRIX_HEALTH_URL, MESH_HEALTH_FILE (default /tmp/agent-mesh-health.json)
+
+The primary channel (Matrix) is probed every `interval` seconds through a
+pluggable transport: any object with `async probe() -> bool`. HttpProbe
+hits the Matrix client versions endpoint; StubProbe is a local stand-in
+for tests and drills.
+
+Hysteresis keeps the mesh from flapping: `fail_after` consecutive failed
+probes switch to fallback, and only `recover_after` consecutive good probes
+after at least `min_dwell` seconds in fallback switch back. With the
+defaults, a dead Matrix is detected and failed over in about 3 probe
+intervals. A manual `force` pins the mode, whatever the probes say, until
+`clear` hands it back to them.
+
+Per-agent heartbeats (any message seen from an agent) re-arm a timer in a
+hashed timing wheel, so tracking thousands of agents costs O(1) per
+heartbeat and per tick; an agent silent for `heartbeat_timeout` is
+reported down until it is heard from again.
+
+The current mode is written atomically to the health file so other
+processes (the Slack bot, agents' scripts) can read it without talking to
+the monitor.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import inspect
+import argparse
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from mesh_metrics import Histogram
+
+PRIMARY = "primary"
+FALLBACK = "fallback"
+MODES = (PRIMARY, FALLBACK)
+
+MATRIX_HEALTH_URL = "https://matrix.org/_matrix/client/versions"
+DEFAULT_HEALTH_FILE = "/tmp/agent-mesh-health.json"
+
+PROBE_INTERVAL = 2.0
+PROBE_TIMEOUT = 5.0
+FAIL_AFTER = 3
+RECOVER_AFTER = 5
+MIN_DWELL = 60.0
+HEARTBEAT_TIMEOUT = 300.0
+
+
+class TimingWheel:
+    """Hashed timing wheel: O(1) schedule/cancel, expiry scans only elapsed slots
+
+    Timers further out than one revolution stay in their slot and are
+    skipped until their deadline has actually passed.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, now: float = 0.0):
+        self.tick = tick
+        self.slots: List[Dict[str, float]] = [{} for _ in range(slots)]
+        self.where: Dict[str, int] = {}
+        self.current = int(now // tick)
+
+    def __len__(self) -> int:
+        return len(self.where)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.where
+
+    def schedule(self, key: str, deadline: float):
+        """Arm (or re-arm) the timer for `key`"""
+        self.cancel(key)
+        slot = int(deadline // self.tick) % len(self.slots)
+        self.slots[slot][key] = deadline
+        self.where[key] = slot
+
+    def cancel(self, key: str):
+        slot = self.where.pop(key, None)
+        if slot is not None:
+            del self.slots[slot][key]
+
+    def advance(self, now: float) -> List[str]:
+        """Pop every timer whose deadline is <= now"""
+        target = int(now // self.tick)
+        if target < self.current:
+            return []
+        expired = []
+        steps = min(target - self.current + 1, len(self.slots))
+        for step in range(steps):
+            bucket = self.slots[(self.current + step) % len(self.slots)]
+            if not bucket:
+                continue
+            due = [key for key, deadline in bucket.items() if deadline <= now]
+            for key in due:
+                del bucket[key]
+                del self.where[key]
+            expired.extend(due)
+        self.current = target
+        return expired
+
+
+class HttpProbe:
+    """Primary channel is up if GET url answers 200 within the timeout"""
+
+    def __init__(self, url: str = MATRIX_HEALTH_URL, timeout: float = PROBE_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def _get(self) -> bool:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            return response.status == 200
+
+    async def probe(self) -> bool:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, self._get)
+        except OSError:
+            return False
+
+
+class StubProbe:
+    """Local transport for tests: replays scripted results, then reports `up`"""
+
+    def __init__(self, results: Iterable[bool] = (), up: bool = True):
+        self.results = list(results)
+        self.up = up
+        self.calls = 0
+
+    async def probe(self) -> bool:
+        self.calls += 1
+        if self.results:
+            return self.results.pop(0)
+        return self.up
+
+
+def default_health_file() -> Path:
+    return Path(os.environ.get("MESH_HEALTH_FILE", DEFAULT_HEALTH_FILE))
+
+
+def read_state(path=None) -> dict:
+    """Last state the monitor wrote; primary if there is none"""
+    try:
+        with open(path or default_health_file(), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"mode": PRIMARY}
+
+
+def _write_state(path: Path, state: dict):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def agent_from_text(text: str, ids: Dict[str, str]) -> Optional[str]:
+    """First registry agent named on a message's first line, e.g. "[ACK] clawdy: ..." """
+    first_line = text.split("\n", 1)[0].lower()
+    for word in re.findall(r"[\w-]+", first_line):
+        if word in ids:
+            return ids[word]
+    return None
+
+
+class HealthMonitor:
+    """Probes the primary channel, tracks agent heartbeats, flips the mesh mode"""
+
+    def __init__(self, transport, interval: float = PROBE_INTERVAL,
+                 fail_after: int = FAIL_AFTER, recover_after: int = RECOVER_AFTER,
+                 min_dwell: float = MIN_DWELL, probe_timeout: float = PROBE_TIMEOUT,
+                 heartbeat_timeout: float = HEARTBEAT_TIMEOUT, state_path=None,
+                 on_change: Optional[Callable] = None, on_agent: Optional[Callable] = None,
+                 clock: Callable[[], float] = time.time):
+        self.transport = transport
+        self.interval = interval
+        self.fail_after = fail_after
+        self.recover_after = recover_after
+        self.min_dwell = min_dwell
+        self.probe_timeout = probe_timeout
+        self.heartbeat_timeout = heartbeat_timeout
+        self.state_path = Path(state_path) if state_path else None
+        self.on_change = on_change
+        self.on_agent = on_agent
+        self.clock = clock
+
+        now = clock()
+        self.mode = PRIMARY
+        self.since = now
+        self.reason = "startup"
+        self.override: Optional[str] = None
+        self.failures = 0
+        self.successes = 0
+        self.first_failure: Optional[float] = None
+        self.wheel = TimingWheel(tick=1.0, now=now)
+        self.last_seen: Dict[str, float] = {}
+        self.down: set = set()
+        self.probes = 0
+        self.switches = 0
+        self.failover_latency = Histogram((1, 2, 5, 10, 20, 30, 60, 120, 300))
+        self._saved_mtime: Optional[int] = None
+
+    # -- channel health --------------------------------------------------
+
+    def record_probe(self, ok: bool, now: Optional[float] = None) -> Optional[str]:
+        """Feed one probe result; returns the new mode if it changed"""
+        now = self.clock() if now is None else now
+        self.probes += 1
+        if ok:
+            self.failures = 0
+            self.first_failure = None
+            self.successes += 1
+            if (self.mode == FALLBACK and not self.override and self.successes >= self.recover_after
+                    and now - self.since >= self.min_dwell):
+                return self._switch(PRIMARY, now, f"{self.successes} good probes")
+            return None
+
+        self.successes = 0
+        self.failures += 1
+        if self.first_failure is None:
+            self.first_failure = now
+        if self.mode == PRIMARY and not self.override and self.failures >= self.fail_after:
+            self.failover_latency.observe(now - self.first_failure)
+            return self._switch(FALLBACK, now, f"{self.failures} failed probes")
+        return None
+
+    def force(self, mode: str, reason: str = "manual override", now: Optional[float] = None,
+              sticky: bool = True) -> Optional[str]:
+        """Human override ("[SYSTEM] Force Slack fallback"); probes cannot undo it until clear_override()
+
+        sticky=False only adopts the mode (e.g. one left by a previous run)
+        and lets the probes move it again.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}' (expected one of {', '.join(MODES)})")
+        now = self.clock() if now is None else now
+        self.failures = self.successes = 0
+        self.first_failure = None
+        pinned = mode if sticky else None
+        if mode == self.mode:
+            if pinned != self.override:
+                self.override = pinned
+                self.save()
+            return None
+        self.override = pinned
+        return self._switch(mode, now, reason)
+
+    def clear_override(self):
+        """Hand the mode back to the probes; the hysteresis counters start over"""
+        if self.override:
+            self.override = None
+            self.failures = self.successes = 0
+            self.first_failure = None
+            self.save()
+
+    def _switch(self, mode: str, now: float, reason: str) -> str:
+        self.mode = mode
+        self.since = now
+        self.successes = 0
+        self.switches += 1
+        self.reason = reason
+        self.save()
+        return mode
+
+    async def probe_once(self) -> Optional[str]:
+        """Probe the transport (a timeout or error counts as down) and notify on change"""
+        try:
+            ok = bool(await asyncio.wait_for(self.transport.probe(), self.probe_timeout))
+        except Exception:
+            ok = False
+        changed = self.record_probe(ok)
+        if changed and self.on_change:
+            await _maybe_await(self.on_change(changed, self.reason))
+        return changed
+
+    # -- agent liveness --------------------------------------------------
+
+    def heartbeat(self, agent: str, now: Optional[float] = None):
+        """Any sign of life from `agent` re-arms its timer"""
+        now = self.clock() if now is None else now
+        self.last_seen[agent] = now
+        self.wheel.schedule(agent, now + self.heartbeat_timeout)
+        if agent in self.down:
+            self.down.discard(agent)
+            self.save()
+            if self.on_agent:
+                self.on_agent(agent, True)
+
+    def check_agents(self, now: Optional[float] = None) -> List[str]:
+        """Agents whose heartbeat timer just expired"""
+        now = self.clock() if now is None else now
+        expired = self.wheel.advance(now)
+        for agent in expired:
+            self.down.add(agent)
+            if self.on_agent:
+                self.on_agent(agent, False)
+        if expired:
+            self.save()
+        return expired
+
+    # -- loop ------------------------------------------------------------
+
+    async def run(self, stop: asyncio.Event):
+        """Probe and check heartbeats every interval until `stop` is set"""
+        self._read_override()  # resume a mode left by a previous run or `force`
+        self.save()
+        while not stop.is_set():
+            changed = self._read_override()
+            if changed and self.on_change:
+                await _maybe_await(self.on_change(changed, self.reason))
+            await self.probe_once()
+            self.check_agents()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _read_override(self) -> Optional[str]:
+        """Adopt a `force` or `clear` written to the health file since our last save"""
+        if not self.state_path:
+            return None
+        try:
+            mtime = self.state_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if mtime == self._saved_mtime:
+            return None
+        self._saved_mtime = mtime
+        state = read_state(self.state_path)
+        if state.get("override") in MODES:
+            return self.force(state["override"], state.get("reason") or "manual override")
+        if self.override:
+            self.clear_override()
+            return None
+        mode = state.get("mode")
+        return self.force(mode, state.get("reason") or "resumed", sticky=False) if mode in MODES else None
+
+    def state(self) -> dict:
+        return {
+            "mode": self.mode,
+            "since": self.since,
+            "reason": self.reason,
+            "override": self.override,
+            "consecutive_failures": self.failures,
+            "agents_down": sorted(self.down),
+            "last_seen": self.last_seen,
+            "updated": self.clock(),
+        }
+
+    def save(self):
+        if self.state_path:
+            _write_state(self.state_path, self.state())
+            try:
+                self._saved_mtime = self.state_path.stat().st_mtime_ns
+            except OSError:
+                pass
+
+    def metrics(self) -> dict:
+        return {
+            "mode": self.mode,
+            "probes": self.probes,
+            "switches": self.switches,
+            "agents_tracked": len(self.last_seen),
+            "agents_down": len(self.down),
+            "failover_latency": self.failover_latency.snapshot(),
+        }
+
+
+async def _maybe_await(result):
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _run_cli(args):
+    def report(mode, reason):
+        icon = "🟢" if mode == PRIMARY else "🟡"
+        print(f"{icon} {time.strftime('%H:%M:%S')} switched to {mode} ({reason})", flush=True)
+
+    monitor = HealthMonitor(HttpProbe(args.url, args.timeout), interval=args.interval,
+                            probe_timeout=args.timeout, state_path=args.state, on_change=report)
+    stop = asyncio.Event()
+    print(f"🩺 Probing {args.url} every {args.interval:g}s → {args.state}")
+    try:
+        await monitor.run(stop)
+    finally:
+        print(f"📊 {json.dumps(monitor.metrics())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primary channel health monitor")
+    parser.add_argument("command", choices=["run", "status", "force", "clear"])
+    parser.add_argument("mode", nargs="?", choices=MODES, help="Mode for 'force'")
+    parser.add_argument("--state", type=Path, default=None, help="Health file (default: $MESH_HEALTH_FILE)")
+    parser.add_argument("--url", default=os.environ.get("MATRIX_HEALTH_URL", MATRIX_HEALTH_URL))
+    parser.add_argument("--interval", type=float, default=PROBE_INTERVAL)
+    parser.add_argument("--timeout", type=float, default=PROBE_TIMEOUT)
+    args = parser.parse_args()
+    args.state = args.state or default_health_file()
+
+    if args.command == "status":
+        state = read_state(args.state)
+        icon = "🟢" if state["mode"] == PRIMARY else "🟡"
+        print(f"{icon} Mesh channel: {state['mode']}" + (" (manual override)" if state.get("override") else ""))
+        if state.get("agents_down"):
+            print(f"⚠️  Agents silent: {', '.join(state['agents_down'])}")
+    elif args.command == "force":
+        if not args.mode:
+            parser.error("force needs a mode: primary or fallback")
+        state = read_state(args.state)
+        state.update(mode=args.mode, override=args.mode, since=time.time(), reason="manual override")
+        _write_state(args.state, state)
+        print(f"✅ Mesh channel forced to {args.mode} until `clear`")
+    elif args.command == "clear":
+        state = read_state(args.state)
+        state.update(override=None, reason="override cleared")
+        _write_state(args.state, state)
+        print("✅ Manual override cleared — probes decide the mesh channel again")
+    else:
+        try:
+            asyncio.run(_run_cli(args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
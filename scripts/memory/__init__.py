@@ -0,0 +1,39 @@
+"""
+Python memory engine for the 3-tier memory architecture
+(docs/memory-architecture-v1.0.md)
+
+  memory_search(query)            ranked (path, line range) hits from the BM25 index
+  memory_get(path, start, end)    one snippet by byte offset
+
+Semantic search lives in memory.vector (needs numpy) and is not imported here.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+from memory.chunks import Chunk, chunk_markdown, tokenize
+from memory.index import Hit, MemoryIndex, default_root, memory_files, read_snippet
+
+__all__ = [
+    "Chunk", "Hit", "MemoryIndex",
+    "chunk_markdown", "tokenize", "default_root", "memory_files", "read_snippet",
+    "memory_search", "memory_get",
+]
+
+
+def memory_search(query: str, root: Optional[str] = None, k: int = 10,
+                  update: bool = True) -> List[Hit]:
+    """Refresh the index (only changed files are read) and return the top-k hits"""
+    index = MemoryIndex(root)
+    try:
+        if update:
+            index.update()
+        return index.search(query, k)
+    finally:
+        index.close()
+
+
+def memory_get(path: str, byte_start: int, byte_end: Optional[int] = None,
+               root: Optional[str] = None) -> str:
+    """Read a snippet of a memory file by byte range"""
+    return read_snippet(Path(root) if root is not None else default_root(), path, byte_start, byte_end)
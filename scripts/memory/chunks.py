@@ -0,0 +1,56 @@
+"""
+Section chunking and tokenization for markdown memory files
+A chunk is a heading plus its body; oversized sections are split on line
+boundaries. Offsets are byte offsets into the UTF-8 file so snippets can
+be read back with a single seek.
+"""
+
+import re
+from typing import Iterator, List, NamedTuple
+
+MAX_CHUNK_BYTES = 4096
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:[-'][^\W_]+)*")
+
+
+class Chunk(NamedTuple):
+    byte_start: int
+    byte_end: int
+    line_start: int  # 1-based, inclusive
+    line_end: int    # 1-based, inclusive
+    text: str
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _is_heading(line: bytes) -> bool:
+    return line.startswith(b"#") and line.lstrip(b"#")[:1] in (b" ", b"\t", b"\n", b"\r", b"")
+
+
+def chunk_markdown(data: bytes, max_bytes: int = MAX_CHUNK_BYTES) -> Iterator[Chunk]:
+    """Yield section chunks of a markdown file"""
+    lines = data.splitlines(keepends=True)
+    start_byte = offset = 0
+    start_line = 1
+    size = 0
+    in_fence = False
+
+    for number, line in enumerate(lines, 1):
+        stripped = line.lstrip()
+        if stripped.startswith(b"```") or stripped.startswith(b"~~~"):
+            in_fence = not in_fence
+        boundary = (not in_fence and _is_heading(line)) or size + len(line) > max_bytes
+        if boundary and size:
+            yield _chunk(data, start_byte, offset, start_line, number - 1)
+            start_byte, start_line, size = offset, number, 0
+        offset += len(line)
+        size += len(line)
+
+    if size:
+        yield _chunk(data, start_byte, offset, start_line, len(lines))
+
+
+def _chunk(data: bytes, start: int, end: int, line_start: int, line_end: int) -> Chunk:
+    return Chunk(start, end, line_start, line_end, data[start:end].decode("utf-8", "replace"))
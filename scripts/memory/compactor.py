@@ -0,0 +1,434 @@
+"""
+Strategic-forgetting compactor: distills daily logs into MEMORY.md
+
+Applies the Tier 2 heuristics of docs/memory-architecture-v1.0.md during
+heartbeats. memory/YYYY-MM-DD.md files are streamed section by section and
+every entry (a bullet with its continuation lines, or a paragraph) is
+classified by ordered rules:
+
+  keep   decisions, Error -> Fix -> Lesson cycles, people, open questions,
+         configuration
+  drop   status checks, mood logs, completed tasks, superseded notes,
+         secrets, and anything else (transient)
+
+Kept entries are compared with everything already curated by 64-bit SimHash,
+so a decision noted on three days is written once; a configuration entry
+replaces the earlier one for the same key.
+
+Curated entries live in a managed block of MEMORY.md and text outside the
+block is never touched. <root>/.memory-index/compactor.json records how far
+each daily log has been read, so a heartbeat only reads new logs and the
+appended tail of today's.
+"""
+
+import os
+import re
+import json
+import hashlib
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from memory.chunks import chunk_markdown, tokenize
+from memory.index import default_root
+
+STATE_VERSION = 1
+DAY_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}\.md")
+BLOCK_START = "<!-- compactor:start -->"
+BLOCK_END = "<!-- compactor:end -->"
+BLOCK_NOTE = "<!-- Distilled from memory/*.md by scripts/memory_compact.py; edits inside this block are kept -->"
+
+SIMHASH_BITS = 64
+NEAR_DUPLICATE_DISTANCE = 3
+SIMHASH_BANDS = 4  # entries within distance 3 agree exactly on at least one of 4 bands
+
+DECISION = "decision"
+LESSON = "lesson"
+PEOPLE = "people"
+QUESTION = "question"
+CONFIG = "config"
+TRANSIENT = "transient"
+
+# Keep categories and their MEMORY.md section titles, in output order
+KEEP = OrderedDict([
+    (DECISION, "Decisions"),
+    (LESSON, "Lessons"),
+    (PEOPLE, "People"),
+    (QUESTION, "Open Questions"),
+    (CONFIG, "Configuration"),
+])
+
+
+def _rules(*patterns: str) -> "re.Pattern":
+    return re.compile("|".join(patterns), re.IGNORECASE | re.MULTILINE)
+
+
+# First match wins, so drop rules that must override keep rules come first
+ENTRY_RULES: List[Tuple[str, "re.Pattern"]] = [
+    ("secret", _rules(r"\bxox[abpr]-[\w-]+", r"\bgh[pousr]_\w{20,}", r"-----BEGIN [A-Z ]*PRIVATE KEY",
+                      r"\b(api[_-]?key|password|secret|token)\s*[:=]\s*\S{8,}")),
+    ("superseded", _rules(r"~~.+?~~", r"\b(superseded|obsolete|outdated|no longer (true|valid|applies|needed))\b")),
+    (LESSON, _rules(r"\*\*lesson:\*\*", r"^\s*lesson( learned)?:", r"\blesson learned\b")),
+    (DECISION, _rules(r"\*\*decision:\*\*", r"\b(decided|decision|chose|going with|agreed (to|on)|we will)\b",
+                      r"\bswitched (to|from)\b")),
+    ("status", _rules(r"\bheartbeat(_ok)?\b", r"\bstatus check", r"\ball (agents|systems|checks) (are )?(online|green|ok|healthy|passing)\b",
+                      r"\bno (new )?(messages|updates|mentions|changes)\b", r"\bnothing (new|to report)\b",
+                      r"\bchecked (the )?(inbox|email|slack|messages|queue)\b")),
+    ("mood", _rules(r"^\s*(mood|feeling|energy)\s*:", r"\bfeeling (good|great|tired|productive|stuck)\b")),
+    (PEOPLE, _rules(r"\bprefers?\b", r"\bpreference\b", r"\b(likes|dislikes)\b", r"\btime ?zone\b",
+                    r"\b(asked|told) (me|us) (to|not to)\b")),
+    (QUESTION, _rules(r"\?\s*$", r"\b(open question|unresolved|tbd|need to (figure out|decide|investigate))\b")),
+    (CONFIG, _rules(r"\bconfig(ured|uration)?\b", r"\b(default|timeout|port|path|endpoint|channel|model) (is|=|set to)\b",
+                    r"\b(enabled|disabled|installed)\b",
+                    r"^\*\*(?!(error|root cause|fix|prevention)\b)[^*\n]{1,40}:\*\*\s*\S")),
+    ("completed", _rules(r"\b(done|completed|finished|shipped|merged|deployed|closed)\b", r"^\s*\[x\]")),
+]
+
+# Applied to entries no entry rule matched, from the section heading
+HEADING_RULES: List[Tuple[str, "re.Pattern"]] = [
+    (DECISION, _rules(r"\bdecisions?\b")),
+    (LESSON, _rules(r"\b(lessons?|post-?mortem)\b")),
+    (PEOPLE, _rules(r"\b(people|relationships?|contacts?|interactions?)\b")),
+    (QUESTION, _rules(r"\b(questions?|open issues)\b")),
+    (CONFIG, _rules(r"\b(config(uration)?|settings|setup)\b")),
+    ("status", _rules(r"\b(status|heartbeat|check-?in)\b")),
+    ("mood", _rules(r"\bmood\b")),
+]
+
+LESSON_FIELD = re.compile(r"^\s*(?:[-*+]\s+)?\*\*(error|root cause|fix|lesson|prevention):\*\*", re.IGNORECASE | re.MULTILINE)
+BULLET = re.compile(r"^\s{0,3}(?:[-*+]|\d+[.)])\s+")
+FENCE = ("```", "~~~")
+CONFIG_KEY = re.compile(r"^(?:\*\*)?([A-Za-z][\w .\-/]{0,40}?)(?::\*\*|\*\*:|:|\s*=)\s+\S")
+CURATED_ENTRY = re.compile(r"^- \[(\d{4}-\d{2}-\d{2})\] (.*)$")
+
+
+class Entry(NamedTuple):
+    category: str
+    day: str   # YYYY-MM-DD of the log it came from ("" for hand-written entries)
+    text: str  # may span lines
+
+
+# =============================================================================
+# CLASSIFICATION
+# =============================================================================
+
+def classify(text: str, heading: str = "") -> str:
+    """Category of one entry: a KEEP key or the name of a drop rule"""
+    for category, pattern in ENTRY_RULES:
+        if pattern.search(text):
+            return category
+    for category, pattern in HEADING_RULES:
+        if pattern.search(heading):
+            return category
+    return TRANSIENT
+
+
+def _lesson_block(lines: List[str], heading: str) -> Optional[str]:
+    """A section with **Error:** plus **Fix:** or **Lesson:** is kept whole"""
+    body = "\n".join(lines)
+    fields = {m.group(1).lower() for m in LESSON_FIELD.finditer(body)}
+    if "error" not in fields or not fields & {"fix", "lesson"}:
+        return None
+    kept = [BULLET.sub("", line, count=1).strip() for line in lines if line.strip()]
+    return "\n".join(([heading] if heading else []) + kept)
+
+
+def split_entries(text: str) -> Tuple[str, List[str]]:
+    """(heading, entries) of one section chunk; fenced code stays with its entry"""
+    heading = ""
+    lines = text.splitlines()
+    if lines and lines[0].startswith("#"):
+        heading = lines.pop(0).lstrip("#").strip()
+
+    entries: List[List[str]] = []
+    current: Optional[List[str]] = None
+    in_fence = False
+    for line in lines:
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+        elif not in_fence:
+            if not line.strip():
+                current = None
+                continue
+            match = BULLET.match(line)
+            if match:
+                current = [line[match.end():].rstrip()]
+                entries.append(current)
+                continue
+        if current is None:
+            current = []
+            entries.append(current)
+        current.append(line.rstrip() if in_fence or line.lstrip().startswith(FENCE) else line.strip())
+    return heading, ["\n".join(e) for e in entries if any(s.strip() for s in e)]
+
+
+def extract_section(text: str, day: str, heading: str = "") -> Tuple[str, List[Entry]]:
+    """(heading now in effect, classified entries) of one section chunk"""
+    section_heading, texts = split_entries(text)
+    if section_heading:
+        heading = section_heading
+        lesson = _lesson_block(text.splitlines()[1:], heading)
+        if lesson is not None:
+            category = "secret" if ENTRY_RULES[0][1].search(lesson) else LESSON
+            return heading, [Entry(category, day, lesson)]
+    return heading, [Entry(classify(t, heading), day, t) for t in texts]
+
+
+# =============================================================================
+# NEAR-DUPLICATES
+# =============================================================================
+
+@lru_cache(maxsize=65536)
+def _feature_bits(feature: str) -> str:
+    """64-bit feature hash as a '0'/'1' string, most significant bit first"""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return format(int.from_bytes(digest, "little"), f"0{SIMHASH_BITS}b")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams"""
+    tokens = tokenize(text)
+    features = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+    rows = [_feature_bits(feature) for feature, count in features.items() for _ in range(count)]
+    # A bit is set when more than half of the (weighted) features set it
+    bits = "".join("1" if 2 * column.count("1") > len(rows) else "0" for column in zip(*rows))
+    return int(bits, 2) if bits else 0
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """Finds a stored fingerprint within max_distance bits without a full scan"""
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE, bands: int = SIMHASH_BANDS):
+        if max_distance >= bands:
+            raise ValueError("max_distance must be smaller than the number of bands")
+        self.max_distance = max_distance
+        self.width = SIMHASH_BITS // bands
+        self.tables: List[Dict[int, list]] = [{} for _ in range(bands)]
+
+    def _bands(self, h: int) -> Iterator[Tuple[Dict[int, list], int]]:
+        mask = (1 << self.width) - 1
+        for i, table in enumerate(self.tables):
+            yield table, h >> (i * self.width) & mask
+
+    def add(self, h: int, item):
+        for table, key in self._bands(h):
+            table.setdefault(key, []).append((h, item))
+
+    def find(self, h: int):
+        """An item within max_distance of h, or None"""
+        for table, key in self._bands(h):
+            for other, item in table.get(key, ()):
+                if hamming(h, other) <= self.max_distance:
+                    return item
+        return None
+
+
+# =============================================================================
+# MEMORY.md BLOCK
+# =============================================================================
+
+def parse_block(text: str) -> "OrderedDict[str, List[Entry]]":
+    """Curated entries by category from the managed block of MEMORY.md"""
+    titles = {title: category for category, title in KEEP.items()}
+    curated: "OrderedDict[str, List[Entry]]" = OrderedDict((category, []) for category in KEEP)
+    start, end = text.find(BLOCK_START), text.find(BLOCK_END)
+    if start < 0 or end < start:
+        return curated
+
+    category = None
+    lines: Optional[List[str]] = None
+    day = ""
+
+    def flush():
+        if category is not None and lines:
+            curated[category].append(Entry(category, day, "\n".join(lines)))
+
+    for line in text[start + len(BLOCK_START):end].splitlines():
+        if line.startswith("## "):
+            flush()
+            title = line[3:].strip()
+            category, lines = titles.get(title, title), None
+            curated.setdefault(category, [])
+        elif line.startswith("- ") and category is not None:
+            flush()
+            match = CURATED_ENTRY.match(line)
+            day, lines = (match.group(1), [match.group(2)]) if match else ("", [line[2:]])
+        elif line.startswith("  ") and lines is not None:
+            lines.append(line[2:])
+        elif line.strip() and not line.startswith("<!--") and category is not None:
+            flush()
+            day, lines = "", [line]
+    flush()
+    return curated
+
+
+def render_block(curated: "OrderedDict[str, List[Entry]]") -> str:
+    lines = [BLOCK_START, BLOCK_NOTE]
+    for category, entries in curated.items():
+        if not entries:
+            continue
+        lines.append(f"## {KEEP.get(category, category)}")
+        for entry in entries:
+            first, *rest = entry.text.split("\n")
+            lines.append(f"- [{entry.day}] {first}" if entry.day else f"- {first}")
+            lines.extend(f"  {line}" if line else "" for line in rest)
+        lines.append("")
+    lines.append(BLOCK_END)
+    return "\n".join(lines)
+
+
+def replace_block(text: str, block: str) -> str:
+    """MEMORY.md text with the managed block replaced (or appended)"""
+    start, end = text.find(BLOCK_START), text.find(BLOCK_END)
+    if start >= 0 and end > start:
+        return text[:start] + block + text[end + len(BLOCK_END):]
+    if not text.strip():
+        return f"# MEMORY\n\n{block}\n"
+    return text.rstrip("\n") + "\n\n" + block + "\n"
+
+
+def _atomic_write(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# COMPACTOR
+# =============================================================================
+
+class Compactor:
+    """Incrementally distills memory/YYYY-MM-DD.md into MEMORY.md"""
+
+    def __init__(self, root: Optional[str] = None, state_path: Optional[str] = None,
+                 max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.root = Path(root) if root is not None else default_root()
+        self.memory_path = self.root / "MEMORY.md"
+        self.state_path = Path(state_path) if state_path else self.root / ".memory-index" / "compactor.json"
+        self.max_distance = max_distance
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            if state.get("format") == STATE_VERSION:
+                return state
+        except (FileNotFoundError, ValueError):
+            pass
+        return {"format": STATE_VERSION, "days": {}}
+
+    def daily_logs(self) -> List[str]:
+        """memory/YYYY-MM-DD.md files relative to root, oldest first"""
+        memory_dir = self.root / "memory"
+        if not memory_dir.is_dir():
+            return []
+        return sorted(f"memory/{p.name}" for p in memory_dir.iterdir()
+                      if DAY_PATTERN.fullmatch(p.name) and p.is_file())
+
+    def run(self, dry_run: bool = False, reprocess: bool = False) -> dict:
+        """Process new and grown daily logs; returns counts and the entries added"""
+        state = {"format": STATE_VERSION, "days": {}} if reprocess else self._load_state()
+        days = state["days"]
+        stats = {"logs": 0, "processed": 0, "unchanged": 0, "entries": 0,
+                 "kept": Counter(), "dropped": Counter(), "duplicates": 0, "superseded": 0,
+                 "added": []}
+
+        pending = []
+        for rel in self.daily_logs():
+            stats["logs"] += 1
+            st = (self.root / rel).stat()
+            record = days.get(rel)
+            if record and record["mtime_ns"] == st.st_mtime_ns and record["size"] == st.st_size:
+                stats["unchanged"] += 1
+            else:
+                pending.append((rel, st, record))
+        if not pending:
+            return stats  # the usual heartbeat: MEMORY.md is not even read
+
+        memory_text = self.memory_path.read_text(encoding="utf-8") if self.memory_path.exists() else ""
+        curated = parse_block(memory_text)
+        fingerprints = SimHashIndex(self.max_distance)
+        keyed: Dict[str, Tuple[str, int]] = {}  # config key -> (category, position)
+        for category, entries in curated.items():
+            for position, entry in enumerate(entries):
+                fingerprints.add(simhash(entry.text), (category, position))
+                if category == CONFIG:
+                    key = CONFIG_KEY.match(entry.text)
+                    if key:
+                        keyed[key.group(1).strip().lower()] = (category, position)
+
+        for rel, st, record in pending:
+            path = self.root / rel
+            data = path.read_bytes()
+            start, heading = 0, ""
+            if record and len(data) >= record["offset"] and \
+                    hashlib.sha256(data[:record["offset"]]).hexdigest() == record["prefix_sha256"]:
+                # Appended to: resume at the last (possibly unfinished) section
+                start, heading = record["offset"], record.get("heading", "")
+            stats["processed"] += 1
+
+            day = Path(rel).stem
+            offset, resume_heading = start, heading
+            for chunk in chunk_markdown(data[start:]):
+                # Oversized sections are split; later pieces inherit the heading
+                offset, resume_heading = start + chunk.byte_start, heading
+                heading, entries = extract_section(chunk.text, day, heading)
+                for entry in entries:
+                    stats["entries"] += 1
+                    if entry.category in KEEP:
+                        self._keep(entry, curated, fingerprints, keyed, stats)
+                    else:
+                        stats["dropped"][entry.category] += 1
+
+            # Resume at the last section next time: it may still be growing
+            days[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "offset": offset,
+                         "heading": resume_heading,
+                         "prefix_sha256": hashlib.sha256(data[:offset]).hexdigest()}
+
+        if not dry_run:
+            # MEMORY.md before the checkpoint: a crash in between only means the
+            # logs are read again, and their entries are dropped as duplicates
+            if stats["added"] or stats["superseded"]:
+                self.memory_path.parent.mkdir(parents=True, exist_ok=True)
+                _atomic_write(self.memory_path, replace_block(memory_text, render_block(curated)))
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.state_path, json.dumps(state))
+        return stats
+
+    def _keep(self, entry: Entry, curated, fingerprints: SimHashIndex, keyed: dict, stats: dict):
+        h = simhash(entry.text)
+        key = CONFIG_KEY.match(entry.text) if entry.category == CONFIG else None
+        key = key.group(1).strip().lower() if key else None
+
+        if key is not None and key in keyed:
+            category, position = keyed[key]
+            previous = curated[category][position]
+            curated[category][position] = entry  # newer value, newer "last confirmed" date
+            fingerprints.add(h, (category, position))
+            if previous.text != entry.text:
+                stats["superseded"] += 1
+                stats["added"].append(entry)
+            else:
+                stats["duplicates"] += 1
+            return
+
+        if fingerprints.find(h) is not None:
+            stats["duplicates"] += 1
+            return
+
+        entries = curated.setdefault(entry.category, [])
+        entries.append(entry)
+        position = (entry.category, len(entries) - 1)
+        fingerprints.add(h, position)
+        if key is not None:
+            keyed[key] = position
+        stats["kept"][entry.category] += 1
+        stats["added"].append(entry)
@@ -0,0 +1,448 @@
+"""
+Incremental BM25 index over section-chunked markdown memory
+
+Layout of the index directory (default <root>/.memory-index):
+  manifest.json        indexed files (id, mtime, size, sha256, segment) and live segments
+  seg-<n>.docs         uint64 x 6 per chunk: file id, byte start/end, line start/end, tokens
+  seg-<n>.lex          sorted terms, concatenated UTF-8
+  seg-<n>.tidx         uint64 x 4 per term: lex offset, lex length, postings offset, df
+  seg-<n>.post         uint32 (chunk, term frequency) pairs
+
+Segments are immutable and memory-mapped. An update indexes only new or
+changed files into one new segment; a file's chunks in older segments are
+dead because the manifest points the file at its newest segment. Small
+segments are merged once there are more than max_segments of them.
+"""
+
+import os
+import json
+import math
+import mmap
+import heapq
+import hashlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from memory.chunks import MAX_CHUNK_BYTES, chunk_markdown, tokenize
+
+FORMAT_VERSION = 1
+DOC_FIELDS = 6
+TERM_FIELDS = 4
+
+
+class Hit(NamedTuple):
+    path: str
+    line_start: int
+    line_end: int
+    byte_start: int
+    byte_end: int
+    score: float
+
+
+def default_root() -> Path:
+    """Agent workspace: $AGENT_MEMORY_ROOT or the current directory"""
+    return Path(os.environ.get("AGENT_MEMORY_ROOT", "."))
+
+
+def memory_files(root: Path) -> Iterator[str]:
+    """MEMORY.md, SESSION-STATE.md and everything under memory/, relative to root"""
+    for name in ("MEMORY.md", "SESSION-STATE.md"):
+        if (root / name).is_file():
+            yield name
+    memory_dir = root / "memory"
+    if memory_dir.is_dir():
+        for path in sorted(memory_dir.rglob("*.md")):
+            yield path.relative_to(root).as_posix()
+
+
+# =============================================================================
+# SEGMENTS
+# =============================================================================
+
+def _map(path: Path, typecode: str):
+    """(mmap, memoryview cast to typecode); (None, empty view) for empty files"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None, memoryview(array(typecode))
+        mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+    return mm, memoryview(mm).cast(typecode) if typecode != "B" else memoryview(mm)
+
+
+def write_segment(directory: Path, name: str, docs: array, postings: Dict[str, list]):
+    """Write an immutable segment; docs is a flat DOC_FIELDS-wide uint64 array"""
+    lex = bytearray()
+    tidx = array("Q")
+    post = array("I")
+    for term in sorted(postings):
+        encoded = term.encode("utf-8")
+        pairs = postings[term]
+        tidx.extend((len(lex), len(encoded), len(post) // 2, len(pairs) // 2))
+        lex += encoded
+        post.extend(pairs)
+
+    for suffix, data in ((".docs", docs.tobytes()), (".lex", bytes(lex)),
+                         (".tidx", tidx.tobytes()), (".post", post.tobytes())):
+        with open(directory / f"{name}{suffix}", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def segment_paths(directory: Path, name: str) -> List[Path]:
+    return [directory / f"{name}{suffix}" for suffix in (".docs", ".lex", ".tidx", ".post")]
+
+
+class Segment:
+    """Read-only, memory-mapped view of one segment"""
+
+    def __init__(self, directory: Path, name: str):
+        self.name = name
+        docs, lex, tidx, post = segment_paths(directory, name)
+        self._maps = []
+        self.docs = self._open(docs, "Q")
+        self.lex = self._open(lex, "B")
+        self.tidx = self._open(tidx, "Q")
+        self.post = self._open(post, "I")
+        self.doc_count = len(self.docs) // DOC_FIELDS
+        self.term_count = len(self.tidx) // TERM_FIELDS
+
+    def _open(self, path: Path, typecode: str) -> memoryview:
+        mm, view = _map(path, typecode)
+        self._maps.append((mm, view))
+        return view
+
+    def _term(self, i: int) -> bytes:
+        base = i * TERM_FIELDS
+        offset = self.tidx[base]
+        return bytes(self.lex[offset:offset + self.tidx[base + 1]])
+
+    def lookup(self, term: str) -> Optional[Tuple[int, int]]:
+        """(postings offset, df) for term, by binary search over the mapped lexicon"""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.term_count and self._term(lo) == key:
+            base = lo * TERM_FIELDS
+            return self.tidx[base + 2], self.tidx[base + 3]
+        return None
+
+    def postings(self, offset: int, df: int) -> memoryview:
+        """Flat (chunk, tf) pairs"""
+        return self.post[2 * offset:2 * (offset + df)]
+
+    def terms(self) -> Iterator[Tuple[str, int, int]]:
+        for i in range(self.term_count):
+            base = i * TERM_FIELDS
+            yield self._term(i).decode("utf-8"), self.tidx[base + 2], self.tidx[base + 3]
+
+    def doc(self, i: int) -> tuple:
+        base = i * DOC_FIELDS
+        return tuple(self.docs[base:base + DOC_FIELDS])
+
+    def close(self):
+        for mm, view in self._maps:
+            view.release()
+            if mm is not None:
+                mm.close()
+        self._maps = []
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class MemoryIndex:
+    """BM25 search over a workspace's markdown memory, updated incrementally"""
+
+    def __init__(self, root: Optional[str] = None, index_dir: Optional[str] = None,
+                 max_segments: int = 8, k1: float = 1.2, b: float = 0.75):
+        self.root = Path(root) if root is not None else default_root()
+        self.index_dir = Path(index_dir) if index_dir else self.root / ".memory-index"
+        self.max_segments = max_segments
+        self.k1 = k1
+        self.b = b
+        self._segments: Dict[str, Segment] = {}
+        self._norm_cache: Dict[str, tuple] = {}
+        self.manifest = self._load_manifest()
+
+    # -------------------------------------------------------------------------
+    # Manifest
+    # -------------------------------------------------------------------------
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.index_dir / "manifest.json", "r") as f:
+                manifest = json.load(f)
+            if manifest.get("format") == FORMAT_VERSION:
+                return manifest
+        except (FileNotFoundError, ValueError):
+            pass
+        return {"format": FORMAT_VERSION, "next_file_id": 0, "next_segment": 0,
+                "files": {}, "segments": []}
+
+    def _save_manifest(self):
+        path = self.index_dir / "manifest.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _live(self) -> Dict[int, Tuple[str, Optional[str]]]:
+        """file id -> (path, segment holding its current chunks)"""
+        return {entry["id"]: (path, entry["segment"]) for path, entry in self.manifest["files"].items()}
+
+    def _segment(self, name: str) -> Segment:
+        if name not in self._segments:
+            self._segments[name] = Segment(self.index_dir, name)
+        return self._segments[name]
+
+    def _new_segment_name(self) -> str:
+        name = f"seg-{self.manifest['next_segment']:06d}"
+        self.manifest["next_segment"] += 1
+        return name
+
+    # -------------------------------------------------------------------------
+    # Updating
+    # -------------------------------------------------------------------------
+
+    def update(self) -> dict:
+        """Index new and changed files, forget deleted ones; returns counts"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        files = self.manifest["files"]
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+
+        docs = array("Q")
+        postings: Dict[str, list] = {}
+        segment_name = None
+        seen = set()
+        dirty = False
+
+        for rel in memory_files(self.root):
+            seen.add(rel)
+            path = self.root / rel
+            st = path.stat()
+            entry = files.get(rel)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                stats["unchanged"] += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry["sha256"] == digest:
+                entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)  # touched, not edited
+                dirty = True
+                stats["unchanged"] += 1
+                continue
+
+            if segment_name is None:
+                segment_name = self._new_segment_name()
+            if entry is None:
+                entry = files[rel] = {"id": self.manifest["next_file_id"]}
+                self.manifest["next_file_id"] += 1
+                stats["added"] += 1
+            else:
+                stats["changed"] += 1
+
+            chunk_count, token_count = self._add_file(entry["id"], data, docs, postings)
+            entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size, sha256=digest,
+                         segment=segment_name if chunk_count else None,
+                         chunks=chunk_count, tokens=token_count)
+
+        for rel in set(files) - seen:
+            del files[rel]
+            stats["removed"] += 1
+
+        if len(docs):
+            write_segment(self.index_dir, segment_name, docs, postings)
+            self.manifest["segments"].append(segment_name)
+
+        if any(stats[k] for k in ("added", "changed", "removed")):
+            self._drop_dead_segments()
+            if len(self.manifest["segments"]) > self.max_segments:
+                self.merge()
+            self._norm_cache = {}
+        if dirty or any(stats[k] for k in ("added", "changed", "removed")):
+            self._save_manifest()
+            self._remove_orphans()
+
+        stats["segments"] = len(self.manifest["segments"])
+        return stats
+
+    def _add_file(self, file_id: int, data: bytes, docs: array, postings: Dict[str, list]) -> Tuple[int, int]:
+        chunk_count = token_count = 0
+        for chunk in chunk_markdown(data):
+            tokens = tokenize(chunk.text)
+            if not tokens:
+                continue
+            doc_id = len(docs) // DOC_FIELDS
+            docs.extend((file_id, chunk.byte_start, chunk.byte_end,
+                         chunk.line_start, chunk.line_end, len(tokens)))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).extend((doc_id, tf))
+            chunk_count += 1
+            token_count += len(tokens)
+        return chunk_count, token_count
+
+    def _drop_dead_segments(self):
+        """Forget segments no live file points into"""
+        used = {entry["segment"] for entry in self.manifest["files"].values()}
+        self.manifest["segments"] = [s for s in self.manifest["segments"] if s in used]
+
+    def merge(self, names: Optional[List[str]] = None):
+        """Merge segments (default: the smaller half) into one, keeping only live chunks"""
+        if names is None:
+            by_size = sorted(self.manifest["segments"],
+                             key=lambda s: (self.index_dir / f"{s}.post").stat().st_size)
+            names = by_size[:max(2, len(by_size) // 2)]
+        if len(names) < 2:
+            return
+
+        live = self._live()
+        merged_name = self._new_segment_name()
+        docs = array("Q")
+        postings: Dict[str, list] = {}
+
+        for name in names:
+            segment = self._segment(name)
+            remap = {}
+            for i in range(segment.doc_count):
+                doc = segment.doc(i)
+                if live.get(doc[0], (None, None))[1] == name:
+                    remap[i] = len(docs) // DOC_FIELDS
+                    docs.extend(doc)
+            if not remap:
+                continue
+            for term, offset, df in segment.terms():
+                pairs = segment.postings(offset, df)
+                out = None
+                for j in range(0, len(pairs), 2):
+                    new_id = remap.get(pairs[j])
+                    if new_id is not None:
+                        if out is None:
+                            out = postings.setdefault(term, [])
+                        out.extend((new_id, pairs[j + 1]))
+
+        merged = set(names)
+        if len(docs):
+            write_segment(self.index_dir, merged_name, docs, postings)
+        for entry in self.manifest["files"].values():
+            if entry["segment"] in merged:
+                entry["segment"] = merged_name
+        segments = [s for s in self.manifest["segments"] if s not in merged]
+        self.manifest["segments"] = segments + ([merged_name] if len(docs) else [])
+
+    def _remove_orphans(self):
+        """Delete segment files the manifest no longer references"""
+        keep = set(self.manifest["segments"])
+        for name in list(self._segments):
+            if name not in keep:
+                self._segments.pop(name).close()
+        for path in self.index_dir.glob("seg-*.*"):
+            if path.stem not in keep:
+                path.unlink()
+
+    # -------------------------------------------------------------------------
+    # Searching
+    # -------------------------------------------------------------------------
+
+    def search(self, query: str, k: int = 10) -> List[Hit]:
+        """Top-k chunks by BM25"""
+        terms = set(tokenize(query))
+        files = self.manifest["files"]
+        total_docs = sum(entry["chunks"] for entry in files.values())
+        if not terms or not total_docs:
+            return []
+        avg_len = sum(entry["tokens"] for entry in files.values()) / total_docs
+        live = self._live()
+        k1, b = self.k1, self.b
+
+        lookups = {}
+        for name in self.manifest["segments"]:
+            segment = self._segment(name)
+            for term in terms:
+                found = segment.lookup(term)
+                if found:
+                    lookups.setdefault(term, []).append((segment, found))
+
+        # Scores are keyed by base + chunk id so each segment gets its own key range
+        bases = {}
+        scores: Dict[int, float] = {}
+        for term, entries in lookups.items():
+            df = sum(found[1] for _, found in entries)  # includes dead chunks until merged
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for segment, (offset, count) in entries:
+                if segment.name not in bases:
+                    bases[segment.name] = len(bases) << 32
+                base = bases[segment.name]
+                norms = self._norms(segment, live, avg_len)
+                pairs = segment.postings(offset, count)
+                for doc_id, tf in zip(pairs[0::2], pairs[1::2]):
+                    norm = norms[doc_id]
+                    if norm < 0:
+                        continue  # chunk of a file that was re-indexed or deleted
+                    key = base + doc_id
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        names = {base >> 32: name for name, base in bases.items()}
+        hits = []
+        for key, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]):
+            name, doc_id = names[key >> 32], key & 0xFFFFFFFF
+            file_id, byte_start, byte_end, line_start, line_end, _ = self._segment(name).doc(doc_id)
+            hits.append(Hit(live[file_id][0], line_start, line_end, byte_start, byte_end, round(score, 4)))
+        return hits
+
+    def _norms(self, segment: Segment, live: dict, avg_len: float) -> array:
+        """Per-chunk BM25 length normalisation, -1 for dead chunks (cached per state)"""
+        state = (self.manifest["next_file_id"], len(live), avg_len)
+        cached = self._norm_cache.get(segment.name)
+        if cached and cached[0] == state:
+            return cached[1]
+        k1, b = self.k1, self.b
+        docs = segment.docs
+        norms = array("d", [-1.0]) * segment.doc_count
+        for i in range(segment.doc_count):
+            base = i * DOC_FIELDS
+            if live.get(docs[base], (None, None))[1] == segment.name:
+                norms[i] = k1 * (1 - b + b * docs[base + 5] / avg_len)
+        self._norm_cache[segment.name] = (state, norms)
+        return norms
+
+    def get(self, path: str, byte_start: int, byte_end: Optional[int] = None) -> str:
+        return read_snippet(self.root, path, byte_start, byte_end)
+
+    def stats(self) -> dict:
+        files = self.manifest["files"]
+        return {
+            "files": len(files),
+            "chunks": sum(entry["chunks"] for entry in files.values()),
+            "segments": len(self.manifest["segments"]),
+            "index_bytes": sum(p.stat().st_size for p in self.index_dir.glob("seg-*.*"))
+                           if self.index_dir.exists() else 0,
+        }
+
+    def close(self):
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+
+
+def read_snippet(root: Path, path: str, byte_start: int, byte_end: Optional[int] = None) -> str:
+    """Read one byte range of a memory file without loading the rest of it"""
+    root = Path(root).resolve()
+    full = (root / path).resolve()
+    if root != full and root not in full.parents:
+        raise ValueError(f"Path escapes memory root: {path}")
+    length = (byte_end - byte_start) if byte_end is not None else MAX_CHUNK_BYTES
+    with open(full, "rb") as f:
+        f.seek(byte_start)
+        return f.read(max(0, length)).decode("utf-8", "replace")
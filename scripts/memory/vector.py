@@ -0,0 +1,403 @@
+"""
+Offline vector search tier for agent memory (needs numpy)
+
+Embedders are pluggable; HashingEmbedder is deterministic and needs no
+network or model download. Embeddings are cached by content hash so an
+unchanged chunk is never embedded twice. Vectors live in a float32 or
+int8-quantized memmap and are searched exactly (blocked matrix products)
+or through an IVF index (k-means lists, nprobe lists scanned per query).
+
+Layout under <root>/.memory-index/vectors:
+  cache/<embedder>.keys       sha256 of each embedded text, 32 bytes per row
+  cache/<embedder>.f32        float32 vectors, one row per key
+  store/meta.json             dtype, dimensions, chunk table, source file signature
+  store/vectors.f32|.i8       one row per chunk (.i8 rows scaled by store/scales.f32)
+  store/ivf_*.npy             centroids, row order grouped by list, list offsets
+"""
+
+import os
+import json
+import math
+import hashlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    raise ImportError("memory.vector needs numpy: pip install 'agent-mesh-knowledge[vector]'")
+
+from memory.chunks import chunk_markdown, tokenize
+from memory.index import Hit, default_root, memory_files
+
+QUANTIZATIONS = ("float32", "int8")
+SEARCH_MODES = ("exact", "ivf")
+BLOCK_ROWS = 65536
+
+
+# =============================================================================
+# EMBEDDERS
+# =============================================================================
+
+class Embedder(ABC):
+    """Maps texts to L2-normalised float32 vectors"""
+
+    dim: int
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifies model and settings; part of the embedding cache key"""
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """(len(texts), dim) float32 array of unit vectors"""
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing of unigrams and bigrams with sublinear tf"""
+
+    def __init__(self, dim: int = 256, bigrams: bool = True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    @property
+    def name(self) -> str:
+        return f"hashing-v1-d{self.dim}{'-bigram' if self.bigrams else ''}"
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = Counter(tokens)
+            if self.bigrams:
+                features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+            vector = out[row]
+            for feature, tf in features.items():
+                h = _feature_hash(feature)
+                vector[h % self.dim] += (1.0 if h >> 63 else -1.0) * (1.0 + math.log(tf))
+        return normalize(out)
+
+
+def normalize(vectors: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+# =============================================================================
+# EMBEDDING CACHE
+# =============================================================================
+
+class EmbeddingCache:
+    """Append-only content-hash -> vector cache for one embedder"""
+
+    def __init__(self, directory: Union[str, Path], embedder: Embedder):
+        self.embedder = embedder
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keys_path = self.directory / f"{embedder.name}.keys"
+        self.vectors_path = self.directory / f"{embedder.name}.f32"
+        self.row_bytes = embedder.dim * 4
+
+        keys = self.keys_path.read_bytes() if self.keys_path.exists() else b""
+        vector_bytes = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        rows = min(len(keys) // 32, vector_bytes // self.row_bytes)  # a crash mid-append leaves one side longer
+        self._rows = {keys[i * 32:(i + 1) * 32]: i for i in range(rows)}
+        if len(keys) != rows * 32 or vector_bytes != rows * self.row_bytes:
+            self._truncate(rows)
+
+    def _truncate(self, rows: int):
+        for path, size in ((self.keys_path, rows * 32), (self.vectors_path, rows * self.row_bytes)):
+            with open(path, "ab") as f:
+                f.truncate(size)
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Content hash; surrounding whitespace (e.g. a blank line gained when
+        the next section is appended) does not count as a change"""
+        return hashlib.sha256(text.strip().encode("utf-8")).digest()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def embed(self, texts: Sequence[str], batch_size: int = 256) -> Tuple["np.ndarray", int]:
+        """Vectors for texts, embedding only unseen content; returns (vectors, newly embedded)"""
+        keys = [self.key(text) for text in texts]
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        if missing:
+            items = list(missing.items())
+            with open(self.vectors_path, "ab") as vf, open(self.keys_path, "ab") as kf:
+                for start in range(0, len(items), batch_size):
+                    batch = items[start:start + batch_size]
+                    vectors = self.embedder.embed([text for _, text in batch]).astype(np.float32)
+                    vf.write(vectors.tobytes())
+                    vf.flush()
+                    kf.write(b"".join(key for key, _ in batch))
+                    kf.flush()
+                    for key, _ in batch:
+                        self._rows[key] = len(self._rows)
+
+        out = np.empty((len(texts), self.embedder.dim), dtype=np.float32)
+        if len(texts):
+            stored = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                               shape=(len(self._rows), self.embedder.dim))
+            out[:] = stored[[self._rows[key] for key in keys]]
+            del stored
+        return out, len(missing)
+
+
+# =============================================================================
+# VECTOR STORE
+# =============================================================================
+
+class VectorStore:
+    """Memory-mapped matrix of unit vectors with exact and IVF top-k search"""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json", "r") as f:
+            self.meta = json.load(f)
+        self.count = self.meta["count"]
+        self.dim = self.meta["dim"]
+        self.quantize = self.meta["quantize"]
+
+        if self.quantize == "int8":
+            self.vectors = self._memmap("vectors.i8", np.int8)
+            self.scales = np.fromfile(self.directory / "scales.f32", dtype=np.float32)
+        else:
+            self.vectors = self._memmap("vectors.f32", np.float32)
+            self.scales = None
+
+        self.centroids = self.order = self.offsets = None
+        if (self.directory / "ivf_centroids.npy").exists():
+            self.centroids = np.load(self.directory / "ivf_centroids.npy")
+            self.order = np.load(self.directory / "ivf_order.npy", mmap_mode="r")
+            self.offsets = np.load(self.directory / "ivf_offsets.npy")
+
+    def _memmap(self, name: str, dtype):
+        if not self.count:
+            return np.zeros((0, self.dim), dtype=dtype)
+        return np.memmap(self.directory / name, dtype=dtype, mode="r", shape=(self.count, self.dim))
+
+    @classmethod
+    def write(cls, directory: Union[str, Path], vectors: "np.ndarray", quantize: str = "float32",
+              meta: Optional[dict] = None) -> "VectorStore":
+        """Write vectors (unit rows) to temp files, then replace data files first, meta.json last
+
+        Replacing instead of truncating in place leaves open readers mapping
+        the old files, which still match the meta.json they loaded.
+        """
+        if quantize not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantize}")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob("ivf_*.npy"):
+            stale.unlink()
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if quantize == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            files = {"vectors.i8": np.rint(vectors / scales[:, None]).astype(np.int8),
+                     "scales.f32": scales.astype(np.float32)}
+        else:
+            files = {"vectors.f32": vectors}
+        for name, data in files.items():
+            data.tofile(directory / f"{name}.tmp")
+        for name in files:
+            os.replace(directory / f"{name}.tmp", directory / name)
+
+        info = dict(meta or {})
+        info.update(count=int(vectors.shape[0]), dim=int(vectors.shape[1]), quantize=quantize)
+        tmp = directory / "meta.tmp"
+        with open(tmp, "w") as f:
+            json.dump(info, f)
+        os.replace(tmp, directory / "meta.json")
+        return cls(directory)
+
+    def rows(self, ids) -> "np.ndarray":
+        """float32 vectors for row ids (dequantized for int8)"""
+        block = np.asarray(self.vectors[ids], dtype=np.float32)
+        if self.scales is not None:
+            block *= self.scales[ids][:, None]
+        return block
+
+    # -------------------------------------------------------------------------
+    # Exact search
+    # -------------------------------------------------------------------------
+
+    def search(self, queries: "np.ndarray", k: int = 10, mode: str = "exact",
+               nprobe: int = 8) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(scores, ids), each (len(queries), k); ids are -1 where fewer than k rows exist"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if mode == "ivf" and self.centroids is not None:
+            return self._search_ivf(queries, k, nprobe)
+        return self._search_exact(queries, k)
+
+    def _search_exact(self, queries: "np.ndarray", k: int):
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for start in range(0, self.count, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, self.count)
+            scores = queries @ np.asarray(self.vectors[start:end], dtype=np.float32).T
+            if self.scales is not None:
+                scores *= self.scales[start:end]
+            ids = np.broadcast_to(np.arange(start, end), scores.shape)
+            best_scores, best_ids = _merge_topk(best_scores, best_ids, scores, ids, k)
+        return best_scores, best_ids
+
+    # -------------------------------------------------------------------------
+    # IVF
+    # -------------------------------------------------------------------------
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 10,
+                  sample: int = 65536, seed: int = 0):
+        """Spherical k-means over a sample, then group every row by nearest centroid"""
+        if not self.count:
+            return
+        rng = np.random.default_rng(seed)
+        nlist = nlist or max(1, int(math.sqrt(self.count)))
+        nlist = min(nlist, self.count)
+        picks = np.sort(rng.choice(self.count, size=min(sample, self.count), replace=False))
+        data = self.rows(picks)
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            empty = ~sums.any(axis=1)
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]  # reseed empty lists
+            centroids = normalize(sums)
+
+        assign = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, self.count)
+            assign[start:end] = np.argmax(self.rows(np.arange(start, end)) @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.searchsorted(assign[order], np.arange(nlist + 1)).astype(np.int64)
+
+        np.save(self.directory / "ivf_centroids.npy", centroids)
+        np.save(self.directory / "ivf_order.npy", order)
+        np.save(self.directory / "ivf_offsets.npy", offsets)
+        self.centroids, self.offsets = centroids, offsets
+        self.order = np.load(self.directory / "ivf_order.npy", mmap_mode="r")
+
+    def _search_ivf(self, queries: "np.ndarray", k: int, nprobe: int):
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for q, lists in enumerate(probes):
+            ids = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+            if not len(ids):
+                continue
+            ids.sort()  # sequential reads from the memmap
+            scores = self.rows(ids) @ queries[q]
+            s, i = _merge_topk(best_scores[q:q + 1], best_ids[q:q + 1], scores[None, :], ids[None, :], k)
+            best_scores[q], best_ids[q] = s[0], i[0]
+        return best_scores, best_ids
+
+
+def _merge_topk(best_scores, best_ids, scores, ids, k: int):
+    """Combine running top-k with a new block, sorted by descending score"""
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    all_ids = np.concatenate([best_ids, ids], axis=1)
+    if all_scores.shape[1] > k:
+        part = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+        all_scores = np.take_along_axis(all_scores, part, axis=1)
+        all_ids = np.take_along_axis(all_ids, part, axis=1)
+    order = np.argsort(-all_scores, axis=1, kind="stable")
+    return np.take_along_axis(all_scores, order, axis=1), np.take_along_axis(all_ids, order, axis=1)
+
+
+# =============================================================================
+# MEMORY INTEGRATION
+# =============================================================================
+
+class VectorIndex:
+    """Semantic search over the same section chunks as the BM25 index"""
+
+    def __init__(self, root: Optional[str] = None, embedder: Optional[Embedder] = None,
+                 index_dir: Optional[str] = None, quantize: str = "float32",
+                 ivf_min_chunks: int = 20000):
+        """
+        ivf_min_chunks: train an IVF index once the store has this many chunks
+        """
+        self.root = Path(root) if root is not None else default_root()
+        self.directory = Path(index_dir) if index_dir else self.root / ".memory-index" / "vectors"
+        self.embedder = embedder or HashingEmbedder()
+        self.quantize = quantize
+        self.ivf_min_chunks = ivf_min_chunks
+        self.cache = EmbeddingCache(self.directory / "cache", self.embedder)
+        self.store: Optional[VectorStore] = None
+        if (self.directory / "store" / "meta.json").exists():
+            self.store = VectorStore(self.directory / "store")
+
+    def _signature(self) -> List[list]:
+        signature = []
+        for rel in memory_files(self.root):
+            st = (self.root / rel).stat()
+            signature.append([rel, st.st_mtime_ns, st.st_size])
+        return signature
+
+    def update(self) -> dict:
+        """Rebuild the store if any memory file changed; only new content is embedded"""
+        signature = self._signature()
+        if (self.store is not None and self.store.meta.get("files") == signature
+                and self.store.meta.get("embedder") == self.embedder.name
+                and self.store.quantize == self.quantize):
+            return {"chunks": self.store.count, "embedded": 0, "unchanged": True}
+
+        chunks, texts = [], []
+        for rel, _, _ in signature:
+            for chunk in chunk_markdown((self.root / rel).read_bytes()):
+                if tokenize(chunk.text):
+                    chunks.append([rel, chunk.line_start, chunk.line_end, chunk.byte_start, chunk.byte_end])
+                    texts.append(chunk.text)
+
+        vectors, embedded = self.cache.embed(texts)
+        if not len(texts):
+            vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self.store = VectorStore.write(self.directory / "store", vectors, self.quantize, meta={
+            "embedder": self.embedder.name, "files": signature, "chunks": chunks,
+        })
+        if self.store.count >= self.ivf_min_chunks:
+            self.store.train_ivf()
+        return {"chunks": len(chunks), "embedded": embedded, "unchanged": False}
+
+    def search(self, query: Union[str, Sequence[str]], k: int = 10, mode: str = "exact",
+               nprobe: int = 8) -> Union[List[Hit], List[List[Hit]]]:
+        """Top-k chunks by cosine similarity; a list of queries is searched as one batch"""
+        single = isinstance(query, str)
+        queries = [query] if single else list(query)
+        if self.store is None or not self.store.count:
+            return [] if single else [[] for _ in queries]
+
+        scores, ids = self.store.search(self.embedder.embed(queries), k, mode, nprobe)
+        chunks = self.store.meta["chunks"]
+        results = []
+        for row_scores, row_ids in zip(scores, ids):
+            hits = []
+            for score, i in zip(row_scores, row_ids):
+                if i < 0 or score <= 0:
+                    continue  # padding, or no features in common with the query
+                path, line_start, line_end, byte_start, byte_end = chunks[i]
+                hits.append(Hit(path, line_start, line_end, byte_start, byte_end, round(float(score), 4)))
+            results.append(hits)
+        return results[0] if single else results
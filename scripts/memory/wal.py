@@ -0,0 +1,401 @@
+"""
+Write-ahead log for SESSION-STATE.md and the working buffer
+
+SESSION-STATE.md is the snapshot: "## Section" headings with "- " entries
+and a <!-- wal-lsn: N --> marker naming the last log record it contains.
+Lines the WAL does not own (the title, prose, "###" headings, numbered
+lists, fenced code) are kept verbatim, so a checkpoint of a hand-written
+file only changes the entries that were logged.
+Every change is first appended to SESSION-STATE.wal as one CRC-checked
+record, so recording a correction costs one small append instead of a
+whole-file rewrite. A checkpoint renders the snapshot (atomic replace) and
+starts an empty log; recovery loads the snapshot and replays only the
+records after its LSN, stopping at the first torn or corrupt record.
+
+Appends and checkpoints hold an flock on SESSION-STATE.lock, so several
+processes (an agent and the session_state.py CLI) can share one log: each
+first replays the records the others appended, then numbers its own.
+Threads share one fsync for everything written so far (group commit).
+
+Record layout: crc32 (uint32) | payload length (uint32) | lsn (uint64) | JSON payload
+The CRC covers the lsn and payload.
+"""
+
+import os
+import re
+import json
+import time
+import struct
+import zlib
+import fcntl
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from memory.index import default_root
+
+RECORD_HEADER = struct.Struct("<IIQ")
+LSN_MARKER = re.compile(r"<!-- wal-lsn: (\d+) -->")
+SNAPSHOT_TITLE = "# SESSION-STATE"
+PREAMBLE = ""  # section key for text before the first heading
+
+TASK = "Active Task"
+CORRECTIONS = "Corrections"
+DECISIONS = "Decisions"
+VALUES = "Values"
+DRAFTS = "Drafts"
+DEFAULT_SECTIONS = (TASK, CORRECTIONS, DECISIONS, VALUES, DRAFTS)
+
+
+class Verbatim(str):
+    """A hand-written snapshot line that is not a "- " entry; rendered as-is"""
+
+
+def _value_entry(key: str, value: str) -> str:
+    return f"**{key}:** {value}"
+
+
+def apply_op(sections: "OrderedDict[str, List[str]]", op: dict):
+    """Apply one logged operation to the in-memory state"""
+    entries = sections.setdefault(op["section"], [])
+    kind = op["op"]
+    if kind == "append":
+        entries.append(op["text"])
+    elif kind == "replace":
+        entries[:] = op["entries"]
+    elif kind == "set":
+        prefix = f"**{op['key']}:**"
+        entry = _value_entry(op["key"], op["value"])
+        for i, existing in enumerate(entries):
+            if not isinstance(existing, Verbatim) and existing.startswith(prefix):
+                entries[i] = entry
+                break
+        else:
+            entries.append(entry)
+    elif kind == "clear":
+        entries.clear()
+    else:
+        raise ValueError(f"Unknown WAL operation: {kind}")
+
+
+def parse_snapshot(text: str):
+    """(lsn, sections) from a SESSION-STATE.md, hand-written or checkpointed
+
+    "- " entries (with "  " continuation lines) become plain strings; every
+    other line becomes a Verbatim. Blank lines at the end of a section are
+    dropped (render_snapshot puts one between sections).
+    """
+    lsn = 0
+    sections: "OrderedDict[str, List[str]]" = OrderedDict()
+    current = sections.setdefault(PREAMBLE, [])
+    entry: Optional[List[str]] = None
+    fence = None
+
+    for line in text.splitlines():
+        if fence is None:
+            marker = LSN_MARKER.fullmatch(line.strip())
+            if marker:
+                lsn = int(marker.group(1))
+                continue
+        if entry is not None and line.startswith("  "):
+            entry.append(line[2:])
+            continue
+        entry = None
+        stripped = line.lstrip()
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+            current.append(Verbatim(line))
+        elif stripped.startswith(("```", "~~~")):
+            fence = stripped[:3]
+            current.append(Verbatim(line))
+        elif line.startswith("## "):
+            current = sections.setdefault(line[3:].strip(), [])
+        elif line.startswith("- "):
+            entry = [line[2:]]
+            current.append(entry)
+        else:
+            current.append(Verbatim(line))
+
+    for name in list(sections):
+        entries = [e if isinstance(e, Verbatim) else "\n".join(e) for e in sections[name]]
+        while entries and isinstance(entries[-1], Verbatim) and not entries[-1].strip():
+            entries.pop()
+        sections[name] = entries
+    if not sections[PREAMBLE]:
+        del sections[PREAMBLE]
+    return lsn, sections
+
+
+def _entry_lines(entry: str) -> List[str]:
+    if isinstance(entry, Verbatim):
+        return [entry]
+    first, *rest = entry.split("\n")
+    return [f"- {first}"] + [f"  {line}" for line in rest]
+
+
+def render_snapshot(sections: "OrderedDict[str, List[str]]", lsn: int) -> str:
+    marker = f"<!-- wal-lsn: {lsn} -->"
+    preamble = sections.get(PREAMBLE, [])
+    if not preamble:
+        lines = [SNAPSHOT_TITLE, marker]
+    elif isinstance(preamble[0], Verbatim) and preamble[0].startswith("# "):
+        lines = [preamble[0], marker]  # keep the document's own title
+        preamble = preamble[1:]
+    else:
+        lines = [marker]
+    for entry in preamble:
+        lines.extend(_entry_lines(entry))
+    for name, entries in sections.items():
+        if name == PREAMBLE:
+            continue
+        lines.extend(["", f"## {name}"])
+        for entry in entries:
+            lines.extend(_entry_lines(entry))
+    return "\n".join(lines) + "\n"
+
+
+class SessionState:
+    """SESSION-STATE.md backed by a write-ahead log with group commit"""
+
+    def __init__(self, root: Optional[str] = None, fsync_interval: Optional[float] = 0.0,
+                 checkpoint_bytes: int = 256 * 1024):
+        """
+        fsync_interval: seconds between fsyncs; 0 = every commit is durable before
+                        it returns (write corrections BEFORE responding), None = never
+        checkpoint_bytes: checkpoint automatically once the log grows past this
+        """
+        self.root = Path(root) if root is not None else default_root()
+        self.snapshot_path = self.root / "SESSION-STATE.md"
+        self.log_path = self.root / "SESSION-STATE.wal"
+        self.lock_path = self.root / "SESSION-STATE.lock"
+        self.fsync_interval = fsync_interval
+        self.checkpoint_bytes = checkpoint_bytes
+
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._syncing = False
+        self._last_fsync = time.monotonic()
+
+        self.replayed = 0  # records read back from the log, ours from a crash or other processes'
+        self.sections: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.snapshot_lsn = self.lsn = 0
+        self._log = None
+        self._offset = 0  # bytes of the log already applied to sections
+        self._lock_file = open(self.lock_path, "a")
+        with self._locked():
+            pass
+        self.durable_lsn = self.lsn
+
+    # -------------------------------------------------------------------------
+    # Recovery
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and processes; records others wrote are replayed first"""
+        with self._lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                self._catch_up()
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        """Follow a checkpoint by another process, then apply records after our offset
+
+        Records are written whole under the lock, so a torn or corrupt record
+        is the tail of a crashed writer: it and everything after it are cut.
+        """
+        try:
+            inode = os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if self._log is None or inode != os.fstat(self._log.fileno()).st_ino:
+            self._reopen()
+
+        log = self._log
+        log.seek(self._offset)
+        while True:
+            header = log.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            crc, length, lsn = RECORD_HEADER.unpack(header)
+            payload = log.read(length)
+            if len(payload) < length or zlib.crc32(header[8:] + payload) != crc:
+                break
+            if lsn > self.lsn:  # older records are already in the snapshot
+                apply_op(self.sections, json.loads(payload))
+                self.lsn = lsn
+                self.replayed += 1
+            self._offset = log.tell()
+        if os.fstat(log.fileno()).st_size > self._offset:
+            log.truncate(self._offset)
+
+    def _reopen(self):
+        """Open the current log; reload the snapshot if it folded in records we never saw"""
+        if self.snapshot_path.exists():
+            snapshot_lsn, sections = parse_snapshot(self.snapshot_path.read_text(encoding="utf-8"))
+        else:
+            snapshot_lsn, sections = 0, OrderedDict()
+        if self._log is None or snapshot_lsn > self.lsn:
+            for name in DEFAULT_SECTIONS:
+                sections.setdefault(name, [])
+            self.sections, self.lsn = sections, snapshot_lsn
+        self.snapshot_lsn = snapshot_lsn
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, "a+b")
+        self._offset = 0
+
+    # -------------------------------------------------------------------------
+    # Logging
+    # -------------------------------------------------------------------------
+
+    def apply(self, op: dict, sync: bool = True) -> int:
+        """Log op, apply it in memory and (per fsync policy) make it durable; returns its LSN"""
+        payload = json.dumps(op, ensure_ascii=False).encode("utf-8")
+        with self._locked():
+            self.lsn += 1
+            lsn = self.lsn
+            body = struct.pack("<Q", lsn) + payload
+            self._log.write(struct.pack("<II", zlib.crc32(body), len(payload)) + body)
+            self._log.flush()
+            self._offset = self._log.tell()
+            apply_op(self.sections, op)
+        if sync:
+            self.commit(lsn)
+        return lsn
+
+    def commit(self, lsn: Optional[int] = None):
+        """Make everything up to lsn durable; concurrent callers share one fsync"""
+        self._sync(lsn)
+        if self._offset >= self.checkpoint_bytes:
+            self.checkpoint()
+
+    def _sync(self, lsn: Optional[int] = None):
+        with self._lock:
+            target = self.lsn if lsn is None else lsn
+            while self.durable_lsn < target:
+                if self._syncing:
+                    self._synced.wait()  # another thread's fsync may cover us
+                    continue
+                written = self.lsn
+                now = time.monotonic()
+                if self.fsync_interval is None or now - self._last_fsync < self.fsync_interval:
+                    self.durable_lsn = written
+                    break
+                self._syncing = True
+                fd = os.dup(self._log.fileno())  # a checkpoint may swap the log meanwhile
+                self._lock.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                    self._lock.acquire()
+                    self._syncing = False
+                    self._last_fsync = now
+                    self.durable_lsn = max(self.durable_lsn, written)
+                    self._synced.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Checkpointing
+    # -------------------------------------------------------------------------
+
+    def checkpoint(self):
+        """Fold the log into SESSION-STATE.md and start an empty log"""
+        with self._locked():
+            text = render_snapshot(self.sections, self.lsn)
+            tmp = self.snapshot_path.with_suffix(".md.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # The snapshot now holds every record; a crash before the log is
+            # replaced just replays nothing because all LSNs are <= the marker.
+            # Replacing (not truncating) it tells other processes to reopen.
+            fresh = self.log_path.with_suffix(".wal.tmp")
+            open(fresh, "wb").close()
+            os.replace(fresh, self.log_path)
+            self._log.close()
+            self._log = open(self.log_path, "a+b")
+            self._offset = 0
+            self.snapshot_lsn = self.lsn
+            self.durable_lsn = max(self.durable_lsn, self.lsn)
+
+    def close(self, checkpoint: bool = True):
+        """Checkpoint (or, if not, just make logged records durable) and close the log"""
+        if checkpoint:
+            self.checkpoint()
+        else:
+            self._sync()
+        self._log.close()
+        self._lock_file.close()
+
+    # -------------------------------------------------------------------------
+    # Convenience operations
+    # -------------------------------------------------------------------------
+
+    def set_task(self, text: str) -> int:
+        return self.apply({"op": "replace", "section": TASK, "entries": [text]})
+
+    def record_correction(self, text: str) -> int:
+        return self.apply({"op": "append", "section": CORRECTIONS, "text": text})
+
+    def record_decision(self, text: str) -> int:
+        return self.apply({"op": "append", "section": DECISIONS, "text": text})
+
+    def set_value(self, key: str, value: str) -> int:
+        return self.apply({"op": "set", "section": VALUES, "key": key, "value": str(value)})
+
+    def add_draft(self, text: str) -> int:
+        return self.apply({"op": "append", "section": DRAFTS, "text": text})
+
+    def clear(self, section: str) -> int:
+        return self.apply({"op": "clear", "section": section})
+
+    def render(self) -> str:
+        return render_snapshot(self.sections, self.lsn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WorkingBuffer:
+    """memory/working-buffer.md: cleared at 60% context, then one append per exchange"""
+
+    def __init__(self, root: Optional[str] = None, fsync: bool = True):
+        self.root = Path(root) if root is not None else default_root()
+        self.path = self.root / "memory" / "working-buffer.md"
+        self.fsync = fsync
+
+    def clear(self, context_percent: Optional[int] = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        note = f" at {context_percent}% context" if context_percent is not None else ""
+        self._write(f"# Working Buffer\n\n_Started {started}{note}_\n", "w")
+
+    def append(self, human: str, summary: str):
+        """One append per exchange; never rewrites earlier entries"""
+        if not self.path.exists():
+            self.clear()
+        stamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        self._write(f"\n## {stamp}\n**Human:** {human}\n**Response:** {summary}\n", "a")
+
+    def read(self) -> str:
+        return self.path.read_text(encoding="utf-8") if self.path.exists() else ""
+
+    def _write(self, text: str, mode: str):
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
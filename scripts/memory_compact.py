@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Distill daily logs (memory/YYYY-MM-DD.md) into MEMORY.md during a heartbeat
+Usage: python3 scripts/memory_compact.py [--root DIR] [--dry-run] [--reprocess] [--json]
+Only logs that are new or have grown since the last run are read. Kept
+entries go into a managed block of MEMORY.md; --dry-run prints them instead
+so they can be proposed for review first (docs/identity-governance.md).
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from memory.compactor import KEEP, Compactor
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strategic-forgetting memory compactor")
+    parser.add_argument("--root", default=None, help="Workspace root (default: $AGENT_MEMORY_ROOT or .)")
+    parser.add_argument("--dry-run", action="store_true", help="Print what would be added; write nothing")
+    parser.add_argument("--reprocess", action="store_true", help="Ignore the checkpoint and read every log")
+    parser.add_argument("--json", action="store_true", help="Print counts as JSON")
+    args = parser.parse_args()
+
+    compactor = Compactor(args.root)
+    started = time.perf_counter()
+    stats = compactor.run(dry_run=args.dry_run, reprocess=args.reprocess)
+    elapsed = time.perf_counter() - started
+    added = stats.pop("added")
+
+    if args.json:
+        print(json.dumps({**stats, "added": len(added), "seconds": round(elapsed, 4)}, indent=2))
+        sys.exit(0)
+
+    if args.dry_run:
+        for entry in added:
+            first, *rest = entry.text.split("\n")
+            print(f"➕ [{KEEP[entry.category]}] {entry.day}: {first}")
+            for line in rest:
+                print(f"      {line}")
+
+    kept = ", ".join(f"{k} {v}" for k, v in stats["kept"].most_common()) or "none"
+    dropped = ", ".join(f"{k} {v}" for k, v in stats["dropped"].most_common()) or "none"
+    print(f"🧹 Read {stats['processed']} of {stats['logs']} daily logs "
+          f"({stats['unchanged']} unchanged) in {1000 * elapsed:.1f}ms")
+    print(f"   Kept: {kept}")
+    print(f"   Dropped: {dropped}")
+    print(f"   Near-duplicates skipped: {stats['duplicates']}, superseded: {stats['superseded']}")
+    if args.dry_run:
+        print("ℹ️  Dry run: MEMORY.md and the checkpoint were not written")
+    elif added:
+        print(f"✅ Updated {compactor.memory_path}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Search agent memory (MEMORY.md, SESSION-STATE.md, memory/*.md) with BM25
+Usage: python3 scripts/memory_search.py "<query>" [--root DIR] [-k 10] [--json]
+       python3 scripts/memory_search.py --get <path> <byte_start> [<byte_end>] [--root DIR]
+       python3 scripts/memory_search.py --stats [--root DIR]
+       python3 scripts/memory_search.py "<query>" --semantic [--ivf] [--int8]   (needs numpy)
+The index lives in <root>/.memory-index and is refreshed incrementally on each search.
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from memory import MemoryIndex, memory_get
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search agent memory")
+    parser.add_argument("query", nargs="*", help="Search terms (or --get arguments)")
+    parser.add_argument("--root", default=None, help="Workspace root (default: $AGENT_MEMORY_ROOT or .)")
+    parser.add_argument("-k", type=int, default=10, help="Number of hits")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON lines")
+    parser.add_argument("--get", action="store_true", help="Print a snippet: <path> <byte_start> [<byte_end>]")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics")
+    parser.add_argument("--semantic", action="store_true", help="Vector search (offline hashing embedder)")
+    parser.add_argument("--ivf", action="store_true", help="With --semantic: approximate IVF search")
+    parser.add_argument("--int8", action="store_true", help="With --semantic: int8-quantized vector store")
+    args = parser.parse_args()
+
+    if args.get:
+        if len(args.query) not in (2, 3):
+            parser.error("--get needs <path> <byte_start> [<byte_end>]")
+        path, start, *end = args.query
+        print(memory_get(path, int(start), int(end[0]) if end else None, root=args.root))
+        sys.exit(0)
+
+    if args.semantic:
+        from memory.vector import VectorIndex
+        index = VectorIndex(args.root, quantize="int8" if args.int8 else "float32")
+    else:
+        index = MemoryIndex(args.root)
+    started = time.perf_counter()
+    update = index.update()
+    indexed = time.perf_counter()
+
+    if args.stats:
+        stats = {"chunks": index.store.count} if args.semantic else index.stats()
+        print(json.dumps({**stats, "last_update": update}, indent=2))
+        sys.exit(0)
+
+    if not args.query:
+        parser.error("query is required")
+
+    if args.semantic:
+        hits = index.search(" ".join(args.query), args.k, mode="ivf" if args.ivf else "exact")
+    else:
+        hits = index.search(" ".join(args.query), args.k)
+    searched = time.perf_counter()
+
+    if args.json:
+        for hit in hits:
+            print(json.dumps(hit._asdict()))
+    else:
+        for hit in hits:
+            print(f"{hit.score:8.3f}  {hit.path}:{hit.line_start}-{hit.line_end}  "
+                  f"(bytes {hit.byte_start}-{hit.byte_end})")
+        print(f"\n🔍 {len(hits)} hit(s) — update {1000 * (indexed - started):.1f} ms, "
+              f"search {1000 * (searched - indexed):.1f} ms", file=sys.stderr)
+    if not args.semantic:
+        index.close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Fingerprint-indexed keyring over every agent key in agents.yaml
+Usage: python3 scripts/mesh_keyring.py list
+       python3 scripts/mesh_keyring.py attribute <signed-message.md>
+       python3 scripts/mesh_keyring.py allowed-signers [--output PATH]
+
+An agent's authentication block may list earlier keys next to its current
+public_key:
+
+    authentication:
+      public_key: "ssh-ed25519 AAAA... clawdy@agent-mesh"   # current, active
+      keys:
+        - public_key: "ssh-ed25519 AAAA... clawdy-2025"
+          status: "retired"          # active | retired | revoked
+          valid_from: "2025-06-01"
+
+Every key is indexed by its SHA256 fingerprint, so the key embedded in an
+SSHSIG block names its signer with one dict lookup. Retired keys keep
+verifying the messages they signed, so rotating a key never forces
+re-signing history; revoked keys never verify. Messages carry no trusted
+signing time, so there is no end date to check a retired key against:
+revoke a key to stop it verifying. valid_from is rendered as ssh-keygen's
+valid-after.
+
+allowed_signers() renders the whole keyring in ssh-keygen's format
+(revoked keys left out) and allowed_signers_path() caches it per
+agents.yaml version for bulk `ssh-keygen -Y verify` runs.
+"""
+
+import os
+import sys
+import base64
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import sshsig
+from agent_registry import Registry, load_registry
+
+
+class KeyringEntry(NamedTuple):
+    agent: str
+    fingerprint: str
+    public_key: str       # OpenSSH public key line
+    key: bytes            # raw Ed25519 public key
+    status: str           # active | retired | revoked
+    valid_from: Optional[float]
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """ISO date or datetime (naive means UTC) as epoch seconds"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class Keyring:
+    """All agent keys, indexed by fingerprint and by agent"""
+
+    def __init__(self, entries: List[KeyringEntry], version: str = ""):
+        self.version = version
+        self.by_fingerprint: Dict[str, KeyringEntry] = {}
+        self.by_agent: Dict[str, List[KeyringEntry]] = {}
+        for entry in entries:
+            self.by_fingerprint.setdefault(entry.fingerprint, entry)
+            self.by_agent.setdefault(entry.agent, []).append(entry)
+        self._signers_text: Optional[str] = None
+
+    @classmethod
+    def from_registry(cls, registry: Registry) -> "Keyring":
+        entries = []
+        for record in registry.agents.values():
+            for key in record.keys:
+                try:
+                    entries.append(KeyringEntry(
+                        record.id, key.fingerprint, key.public_key,
+                        sshsig.parse_public_key(key.public_key), key.status,
+                        parse_time(key.valid_from)))
+                except (sshsig.SSHSigError, ValueError):
+                    continue
+        return cls(entries, registry.version)
+
+    def lookup(self, fingerprint: str) -> Optional[KeyringEntry]:
+        return self.by_fingerprint.get(fingerprint)
+
+    def keys_for(self, agent: str) -> List[KeyringEntry]:
+        return self.by_agent.get(agent, [])
+
+    def resolve(self, fingerprint: str,
+                agent: Optional[str] = None) -> Tuple[Optional[KeyringEntry], Optional[str]]:
+        """(entry, error) for a signing key, optionally checked against agent"""
+        entry = self.by_fingerprint.get(fingerprint)
+        if entry is None:
+            return None, f"Unknown signing key {fingerprint}"
+        if agent is not None and entry.agent != agent:
+            return None, f"Key {fingerprint} belongs to '{entry.agent}', not '{agent}'"
+        if entry.status == "revoked":
+            return None, f"Key {fingerprint} of agent '{entry.agent}' is revoked"
+        return entry, None
+
+    def attribute(self, armored: str,
+                  agent: Optional[str] = None) -> Tuple[Optional[KeyringEntry], Optional[str]]:
+        """Signer of an armored SSHSIG block, found from the key it embeds"""
+        try:
+            public_key = sshsig.parse_signature(armored)["public_key"]
+        except sshsig.SSHSigError as e:
+            return None, str(e)
+        return self.resolve(sshsig.fingerprint(public_key), agent)
+
+    def allowed_signers(self) -> str:
+        """ssh-keygen allowed_signers text for every non-revoked key"""
+        if self._signers_text is None:
+            lines = []
+            for agent in sorted(self.by_agent):
+                for entry in self.by_agent[agent]:
+                    if entry.status == "revoked":
+                        continue
+                    options = f'namespaces="{sshsig.NAMESPACE}"'
+                    if entry.valid_from is not None:
+                        stamp = datetime.fromtimestamp(entry.valid_from, timezone.utc)
+                        options += f',valid-after="{stamp:%Y%m%d%H%M%S}Z"'
+                    key_type, key_data = entry.public_key.split()[:2]
+                    lines.append(f"{agent} {options} {key_type} {key_data}")
+            self._signers_text = "\n".join(lines) + "\n" if lines else ""
+        return self._signers_text
+
+    def allowed_signers_path(self, cache_dir=None) -> Path:
+        """Write allowed_signers once per registry version and return its path"""
+        cache_dir = Path(cache_dir or os.environ.get("AGENT_MESH_CACHE_DIR",
+                                                     Path.home() / ".cache" / "agent-mesh"))
+        path = cache_dir / f"allowed_signers-{self.version[:16] or 'unversioned'}"
+        if not path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(self.allowed_signers())
+            os.replace(tmp, path)
+        return path
+
+
+# Keyrings already built in this process, keyed by registry version
+_keyrings: Dict[str, Keyring] = {}
+
+
+def load_keyring(path=None) -> Keyring:
+    """Keyring for agents.yaml, rebuilt only when its content changes"""
+    registry = load_registry(path)
+    keyring = _keyrings.get(registry.version)
+    if keyring is None:
+        keyring = _keyrings[registry.version] = Keyring.from_registry(registry)
+    return keyring
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent-mesh keyring")
+    parser.add_argument("command", choices=["list", "attribute", "allowed-signers"])
+    parser.add_argument("message", nargs="?", help="Signed message for 'attribute'")
+    parser.add_argument("--registry", default=None, help="agents.yaml (default: auto-detect)")
+    parser.add_argument("--output", type=Path, default=None, help="Write allowed_signers here")
+    args = parser.parse_args()
+
+    keyring = load_keyring(args.registry)
+
+    if args.command == "list":
+        icons = {"active": "🟢", "retired": "⚪", "revoked": "🔴"}
+        for agent in sorted(keyring.by_agent):
+            for entry in keyring.by_agent[agent]:
+                print(f"{icons.get(entry.status, '?')} {agent:<12} {entry.status:<8} {entry.fingerprint}")
+    elif args.command == "allowed-signers":
+        if args.output:
+            args.output.write_text(keyring.allowed_signers())
+            print(f"✅ Wrote {args.output}")
+        else:
+            print(keyring.allowed_signers(), end="")
+    else:
+        if not args.message:
+            parser.error("attribute needs a signed message")
+        from verify_message import read_signed_message
+
+        with open(args.message, "rb") as f:
+            _, _, signature_b64, _, claimed, error = read_signed_message(f)
+        if error:
+            print(f"❌ {error}")
+            sys.exit(1)
+        entry, error = keyring.attribute(base64.b64decode(signature_b64).decode("ascii", "replace"))
+        if error:
+            print(f"❌ {error}")
+            sys.exit(1)
+        print(f"✅ Signed by {entry.agent} ({entry.status} key {entry.fingerprint})")
+        if claimed and claimed != entry.agent:
+            print(f"⚠️  Message claims to be from {claimed}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
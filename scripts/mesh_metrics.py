@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Lightweight in-process metrics and tracing for agent-mesh tooling
+
+Histogram is used directly by components that keep their own metrics.
+The process-wide REGISTRY adds counters, gauges and span timers that the
+signing, verification, Slack bot and queue code report into through
+inc(), observe() and span().
+
+Reporting is off unless one of these is set (or enable() is called):
+  AGENT_MESH_METRICS=1           collect in memory (render with prometheus())
+  AGENT_MESH_METRICS_FILE=PATH   also write Prometheus text at exit; "{pid}"
+                                 in PATH is replaced by the process id
+  AGENT_MESH_TRACE_LOG=PATH      also append one JSON line per finished span
+                                 that carries a message hash
+When off, inc()/observe() return after one global check and span() hands
+back a shared no-op context manager, so the hot path pays well under a
+microsecond. serve() exposes /metrics over HTTP for long-running processes.
+"""
+
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Latency buckets in seconds (upper bounds); the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/max"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    """Monotonic count"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Point-in-time value, set directly or read from a callback at render time"""
+
+    __slots__ = ("value", "callback")
+
+    def __init__(self, callback: Optional[Callable[[], float]] = None):
+        self.value = 0.0
+        self.callback = callback
+
+    def set(self, value: float):
+        self.value = value
+
+    def get(self) -> float:
+        return self.callback() if self.callback else self.value
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Named metric families, each holding one metric per label set"""
+
+    TYPES = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}
+
+    def __init__(self):
+        self._families: Dict[str, Dict[LabelKey, object]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, kind, labels: dict, factory):
+        key = _label_key(labels)
+        family = self._families.get(name)
+        if family is not None:
+            metric = family.get(key)
+            if isinstance(metric, kind):
+                return metric
+        with self._lock:
+            family = self._families.setdefault(name, {})
+            if family and not isinstance(next(iter(family.values())), kind):
+                raise ValueError(f"Metric {name} is already registered with another type")
+            metric = family.get(key)
+            if metric is None:
+                metric = family[key] = factory()
+        return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(name, Counter, labels, Counter)
+
+    def gauge(self, name: str, callback: Optional[Callable[[], float]] = None, **labels) -> Gauge:
+        gauge = self._get(name, Gauge, labels, lambda: Gauge(callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get(name, Histogram, labels, lambda: Histogram(buckets))
+
+    def register(self, name: str, metric, **labels):
+        """Export a metric a component already owns (e.g. its Histogram) under name"""
+        with self._lock:
+            self._families.setdefault(name, {})[_label_key(labels)] = metric
+        return metric
+
+    def clear(self):
+        with self._lock:
+            self._families.clear()
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            families = [(name, list(family.items())) for name, family in sorted(self._families.items())]
+        for name, metrics in families:
+            if not metrics:
+                continue
+            lines.append(f"# TYPE {name} {self.TYPES[type(metrics[0][1])]}")
+            for key, metric in sorted(metrics, key=lambda item: item[0]):
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), metric.counts):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(metric.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {metric.count}")
+                else:
+                    value = metric.get() if isinstance(metric, Gauge) else metric.value
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> dict:
+        """{name: {label string: value or histogram snapshot}} for JSON logs"""
+        with self._lock:
+            families = [(name, list(family.items())) for name, family in self._families.items()]
+        result = {}
+        for name, metrics in families:
+            result[name] = {
+                _format_labels(key) or "": (metric.snapshot() if isinstance(metric, Histogram)
+                                            else metric.get() if isinstance(metric, Gauge)
+                                            else metric.value)
+                for key, metric in metrics
+            }
+        return result
+
+
+REGISTRY = MetricsRegistry()
+
+# Hot-path switches; read as module globals so the disabled check is one lookup
+_enabled = False
+_trace_file = None
+_trace_lock = threading.Lock()
+_dump_path: Optional[str] = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def tracing() -> bool:
+    """True when spans are written to a trace log (callers can skip hashing otherwise)"""
+    return _trace_file is not None
+
+
+def enable(metrics_file: Optional[str] = None, trace_log: Optional[str] = None):
+    """Start collecting; optionally dump Prometheus text at exit and log spans"""
+    global _enabled, _trace_file, _dump_path
+    _enabled = True
+    if metrics_file:
+        if _dump_path is None:
+            atexit.register(_dump_at_exit)
+        _dump_path = metrics_file
+    if trace_log and _trace_file is None:
+        os.makedirs(os.path.dirname(os.path.abspath(trace_log)), exist_ok=True)
+        _trace_file = open(trace_log, "a", buffering=1, encoding="utf-8")
+
+
+def disable():
+    global _enabled, _trace_file, _dump_path
+    _enabled = False
+    _dump_path = None
+    if _trace_file is not None:
+        _trace_file.close()
+        _trace_file = None
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if not _enabled:
+        return
+    REGISTRY.counter(name, **labels).inc(amount)
+
+
+def observe(name: str, value: float, **labels):
+    if not _enabled:
+        return
+    REGISTRY.histogram(name, **labels).observe(value)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def annotate(self, trace: Optional[str] = None, **fields):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Times a block into <name>_seconds, counts failures in <name>_errors_total
+    and, with a trace log open, records the span under its message hash"""
+
+    __slots__ = ("name", "trace", "labels", "fields", "started", "wall")
+
+    def __init__(self, name: str, trace: Optional[str], labels: dict):
+        self.name = name
+        self.trace = trace
+        self.labels = labels
+        self.fields = None
+
+    def __enter__(self):
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        REGISTRY.histogram(f"agent_mesh_{self.name}_seconds", **self.labels).observe(seconds)
+        if exc_type is not None:
+            REGISTRY.counter(f"agent_mesh_{self.name}_errors_total", **self.labels).inc()
+        if self.trace and _trace_file is not None:
+            record = {"trace": self.trace, "span": self.name, "start": self.wall,
+                      "seconds": seconds, **self.labels, **(self.fields or {})}
+            if exc_type is not None:
+                record["error"] = exc_type.__name__
+            line = json.dumps(record) + "\n"
+            with _trace_lock:
+                if _trace_file is not None:
+                    _trace_file.write(line)
+        return False
+
+    def annotate(self, trace: Optional[str] = None, **fields):
+        """Attach the message hash once it is known, plus trace-only fields"""
+        if trace:
+            self.trace = trace
+        if fields:
+            self.fields = dict(self.fields or {}, **fields)
+
+
+def span(name: str, trace: Optional[str] = None, **labels):
+    """with span("sign", trace=payload_hash, backend="native"): ..."""
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, trace, labels)
+
+
+def write_prometheus(path: str, registry: MetricsRegistry = REGISTRY):
+    """Atomic dump for node_exporter's textfile collector or a later scrape"""
+    path = path.replace("{pid}", str(os.getpid()))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.prometheus())
+    os.replace(tmp, path)
+
+
+def _dump_at_exit():
+    if _dump_path:
+        try:
+            write_prometheus(_dump_path)
+        except OSError:
+            pass
+
+
+def serve(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+    """Serve GET /metrics from a daemon thread; returns the server (call shutdown() to stop)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def configure_from_env():
+    """Apply AGENT_MESH_METRICS / _METRICS_FILE / _TRACE_LOG"""
+    metrics_file = os.environ.get("AGENT_MESH_METRICS_FILE")
+    trace_log = os.environ.get("AGENT_MESH_TRACE_LOG")
+    if os.environ.get("AGENT_MESH_METRICS", "").lower() in ("1", "true", "yes") or metrics_file or trace_log:
+        enable(metrics_file, trace_log)
+
+
+configure_from_env()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Agent-mesh protocol message parsing
+Prefixes come from protocol.communication.prefixes in agents.yaml and are
+compiled into one lookup table, so a message is classified with a single
+scan for the closing bracket and one dict lookup.
+Usage: python3 scripts/mesh_protocol.py "<message text>"
+"""
+
+import sys
+import json
+from typing import Dict, Optional
+
+# Mirrors agents.yaml; used only when no registry can be found
+DEFAULT_PREFIXES = {
+    "research": "[RESEARCH]",
+    "research_vps": "[RESEARCH-VPS]",
+    "research_tatooine": "[RESEARCH-TATOOINE]",
+    "synthesis": "[SYNTHESIS]",
+    "question": "[QUESTION]",
+    "conflict": "[CONFLICT]",
+    "action": "[ACTION]",
+    "ack": "[ACK]",
+    "rush": "[RUSH]",
+    "bayesian_update": "[BAYESIAN-UPDATE]",
+    "bayesian_correction": "[BAYESIAN-CORRECTION]",
+    "bayesian_conflict": "[BAYESIAN-CONFLICT]",
+}
+
+# Prefix reported for text without a bracketed prefix (queue record schema)
+NO_PREFIX = "[MESSAGE]"
+# Bracketed prefixes longer than this are treated as ordinary text
+MAX_PREFIX_LEN = 64
+
+
+class Message:
+    """A parsed message: the original text plus the offset where the prefix ends
+
+    kind is the registry name ("research", "ack", ...) for a known prefix and
+    None otherwise; unknown bracketed prefixes still report their prefix.
+    """
+
+    __slots__ = ("text", "kind", "prefix_end")
+
+    def __init__(self, text: str, kind: Optional[str], prefix_end: int):
+        self.text = text
+        self.kind = kind
+        self.prefix_end = prefix_end
+
+    @property
+    def prefix(self) -> str:
+        return self.text[:self.prefix_end] if self.prefix_end else NO_PREFIX
+
+    @property
+    def content(self) -> str:
+        return self.text[self.prefix_end:].strip()
+
+    @property
+    def is_protocol(self) -> bool:
+        """True if the prefix is one defined in agents.yaml"""
+        return self.kind is not None
+
+    def to_record(self, **fields) -> dict:
+        """Queue record: caller fields followed by prefix/kind/content/raw"""
+        fields.update(prefix=self.prefix, kind=self.kind, content=self.content, raw=self.text)
+        return fields
+
+    def __repr__(self) -> str:
+        return f"Message(kind={self.kind!r}, prefix={self.prefix!r}, content={self.content[:40]!r})"
+
+
+class ProtocolParser:
+    """Compiled prefix table for one registry version"""
+
+    def __init__(self, prefixes: Dict[str, str]):
+        self.prefixes = dict(prefixes)
+        self.kinds = {tag: kind for kind, tag in self.prefixes.items()}
+
+    def parse(self, text: str) -> Message:
+        if not text.startswith("["):
+            return Message(text, None, 0)
+        end = text.find("]", 1, MAX_PREFIX_LEN)
+        if end < 0:
+            return Message(text, None, 0)
+        end += 1
+        return Message(text, self.kinds.get(text[:end]), end)
+
+    def tag(self, kind: str) -> str:
+        """Prefix for a kind, e.g. tag("synthesis") -> "[SYNTHESIS]" """
+        return self.prefixes[kind]
+
+    def format(self, kind: str, content: str) -> str:
+        return f"{self.prefixes[kind]} {content}"
+
+
+_parsers: Dict[Optional[str], ProtocolParser] = {}
+
+
+def get_parser(registry=None) -> ProtocolParser:
+    """Parser for the given (default: loaded) registry, cached per registry version"""
+    if registry is None:
+        try:
+            from agent_registry import load_registry
+            registry = load_registry()
+        except FileNotFoundError:
+            registry = None
+
+    version = registry.version if registry is not None else None
+    if version not in _parsers:
+        prefixes = registry.prefixes if registry is not None and registry.prefixes else DEFAULT_PREFIXES
+        _parsers[version] = ProtocolParser(prefixes)
+    return _parsers[version]
+
+
+def parse(text: str) -> Message:
+    """Parse with the default registry's prefixes"""
+    return get_parser().parse(text)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    print(json.dumps(parse(sys.argv[1]).to_record(), indent=2, ensure_ascii=False))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Bounded write-behind writer for the agent-mesh JSONL file queue
+One long-lived task owns the sink, group-commits batches by size or time
+and fsyncs on a configurable cadence. Sinks are a single JSONL file or a
+segmented FileQueue (scripts/file_queue.py). Commits and drops are also
+reported to mesh_metrics.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import List, Optional, Union
+
+import mesh_metrics
+from mesh_metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+_STOP = object()
+
+
+class JsonlFileSink:
+    """Append-only single JSONL file (the original queue layout)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def append_batch(self, records: List[dict]):
+        self._file.write("".join(json.dumps(record) + '\n' for record in records))
+        self._file.flush()
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class QueueWriter:
+    """Persistent writer task fed by a bounded asyncio.Queue"""
+
+    def __init__(self, sink: Union[str, object], max_queue: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 0.05, fsync_interval: Optional[float] = 1.0,
+                 overflow: str = "block"):
+        """
+        sink: a JSONL file path, or an object with append_batch(records),
+              sync() and close() such as file_queue.FileQueue
+        flush_interval: longest a record waits for its batch to fill (seconds)
+        fsync_interval: seconds between fsyncs; 0 = every batch, None = never
+        overflow: what put() does when the queue is full (see OVERFLOW_POLICIES)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.overflow = overflow
+
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None  # created on the running loop
+        self._task: Optional[asyncio.Task] = None
+        self._sink = None
+        self._closing = False
+        self._last_fsync = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_sizes = Histogram(buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+        self.commit_latency = Histogram()
+
+    async def start(self):
+        """Open the sink and start the writer task"""
+        if self._task:
+            return
+        self._ensure_queue()
+        self._sink = JsonlFileSink(self.sink) if isinstance(self.sink, str) else self.sink
+        self._last_fsync = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, record: dict) -> bool:
+        """Enqueue a record; returns False if it was dropped"""
+        if self._closing:
+            raise RuntimeError("QueueWriter is closed")
+        self._check_running()
+        self._ensure_queue()
+
+        if self.overflow == "block":
+            await self._queue.put(record)
+            return True
+
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            mesh_metrics.inc("agent_mesh_queue_dropped_total", policy=self.overflow)
+            if self.overflow == "drop_newest":
+                return False
+            # drop_oldest: make room by discarding the head of the queue
+            self._queue.get_nowait()
+            self._queue.put_nowait(record)
+            return True
+
+    async def close(self):
+        """Drain everything queued so far, fsync and close the sink"""
+        if not self._task or self._closing:
+            return
+        self._closing = True
+        self._check_running()
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def _check_running(self):
+        """Fail fast instead of queueing into a writer task that is gone"""
+        if self._task and self._task.done():
+            error = None if self._task.cancelled() else self._task.exception()
+            raise RuntimeError(f"QueueWriter task has stopped ({error!r})") from error
+
+    def _ensure_queue(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "batches": self.batches,
+            "batch_size": self.batch_sizes.snapshot(),
+            "commit_latency": self.commit_latency.snapshot(),
+        }
+
+    async def _next_batch(self) -> tuple:
+        """Wait for one record, then gather more until full or flush_interval passes"""
+        first = await self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            try:
+                record = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if record is _STOP:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        try:
+            while not stopping:
+                batch, stopping = await self._next_batch()
+                if batch:
+                    started = time.perf_counter()
+                    try:
+                        await loop.run_in_executor(None, self._commit, batch)
+                    except Exception as e:  # one bad batch must not stop the writer
+                        self.errors += 1
+                        logger.error(f"❌ Failed to write {len(batch)} record(s) to queue: {e}")
+                        mesh_metrics.inc("agent_mesh_queue_commit_errors_total")
+                        continue
+                    elapsed = time.perf_counter() - started
+                    self.commit_latency.observe(elapsed)
+                    self.batch_sizes.observe(len(batch))
+                    self.batches += 1
+                    self.written += len(batch)
+                    mesh_metrics.observe("agent_mesh_queue_commit_seconds", elapsed)
+                    mesh_metrics.inc("agent_mesh_queue_records_written_total", len(batch))
+        finally:
+            await loop.run_in_executor(None, self._close_sink)
+
+    def _commit(self, batch: List[dict]):
+        """Runs in the default executor so disk I/O never blocks the event loop"""
+        self._sink.append_batch(batch)
+        if self.fsync_interval is None:
+            return
+        now = time.monotonic()
+        if now - self._last_fsync >= self.fsync_interval:
+            self._sink.sync()
+            self._last_fsync = now
+
+    def _close_sink(self):
+        if self._sink:
+            if self.fsync_interval is not None:
+                self._sink.sync()
+            self._sink.close()
+            self._sink = None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Capability-aware task scheduler over the agents.yaml routing tables
+Usage: python3 scripts/scheduler.py [--registry agents.yaml] [--kind TASK_TYPE]...
+
+synthesis_routing (primary, fallback), protocol.synthesizer_selection
+.capability_routing, each agent's capability ids and the fallback_chain are
+compiled once into a route per task type: an ordered tuple of agent slots,
+best first, ending with the fallback chain. Unknown task types take the
+fallback chain.
+
+A task goes to the first agent on its route that is active, inside its
+availability window and below its concurrency limit; otherwise it waits in
+a FIFO lane. An assignment must be [ACK]ed within ACK_TIMEOUT seconds. A
+missed deadline marks the agent unresponsive, so it gets no new work until
+it ACKs again or RETRY_AFTER has passed, and hands the task to the next
+agent on its route; a task whose route is exhausted is
+escalated (an Assignment with agent=None). Deadlines sit in a heap, so
+tick() only touches what actually expired.
+
+The scheduler keeps no clock of its own: every call takes `now` (epoch
+seconds), which makes it equally usable live and in simulation.
+"""
+
+import sys
+import time
+import heapq
+import argparse
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+ACK_TIMEOUT = 60.0
+RETRY_AFTER = 300.0  # how long an agent that missed an ACK is passed over
+DEFAULT_CONCURRENCY = 2
+DEFAULT_ROUTE = "*"
+
+ALWAYS_ON = "24/7"
+HUMAN_SCHEDULE = "follows_human_schedule"
+HUMAN_HOURS = (8.0, 23.0)  # local hours a human-paced agent is expected to answer
+
+
+class Window(NamedTuple):
+    """Daily availability window in local hours; start > end wraps midnight"""
+    start: float
+    end: float
+    utc_offset: float = 0.0  # seconds east of UTC
+
+    def contains(self, now: float) -> bool:
+        hour = ((now + self.utc_offset) % 86400.0) / 3600.0
+        if self.start <= self.end:
+            return self.start <= hour < self.end
+        return hour >= self.start or hour < self.end
+
+
+class Assignment(NamedTuple):
+    """A scheduling decision; agent None means the route is exhausted"""
+    task: str
+    kind: str
+    agent: Optional[str]
+    attempt: int
+    deadline: Optional[float]
+
+
+def local_utc_offset() -> float:
+    return float(time.localtime().tm_gmtoff)
+
+
+def availability_window(availability: Optional[str], utc_offset: Optional[float] = None) -> Optional[Window]:
+    """Window for an agents.yaml availability value; None means always available"""
+    if availability == HUMAN_SCHEDULE:
+        return Window(*HUMAN_HOURS, local_utc_offset() if utc_offset is None else utc_offset)
+    return None
+
+
+def _dedupe(agents: Iterable[Optional[str]]) -> Tuple[str, ...]:
+    seen = []
+    for agent in agents:
+        if agent and agent not in seen:
+            seen.append(agent)
+    return tuple(seen)
+
+
+def compile_routes(registry) -> Dict[str, Tuple[str, ...]]:
+    """Task type -> ordered agent ids, for active agents only"""
+    active = {agent_id for agent_id, record in registry.agents.items() if record.status == "active"}
+    by_priority = sorted(active, key=lambda a: (registry.agents[a].synthesizer_priority or 99, a))
+    chain = _dedupe(list(registry.fallback_chain) + by_priority)
+
+    routes = {}
+    for agent_id in by_priority:
+        for capability in registry.agents[agent_id].capabilities:
+            routes.setdefault(capability, []).append(agent_id)
+    for kind, agent_id in registry.capability_routing.items():
+        routes[kind] = [agent_id] + routes.get(kind, [])
+    for kind, rule in registry.synthesis_routing.items():
+        rule = rule or {}
+        routes[kind] = [rule.get("primary"), rule.get("fallback")] + routes.get(kind, [])
+    routes[DEFAULT_ROUTE] = []
+
+    return {kind: tuple(a for a in _dedupe(agents + list(chain)) if a in active)
+            for kind, agents in routes.items()}
+
+
+class _Task:
+    __slots__ = ("id", "kind", "route", "submitted", "tried", "slot", "attempt", "deadline", "acked")
+
+    def __init__(self, task_id: str, kind: str, route: Tuple[int, ...], submitted: float):
+        self.id = task_id
+        self.kind = kind
+        self.route = route
+        self.submitted = submitted
+        self.tried = 0        # bitmask of agent slots that missed their ACK
+        self.slot = -1
+        self.attempt = 0
+        self.deadline = None
+        self.acked = False
+
+
+class Scheduler:
+    """Assigns tasks along compiled routes with concurrency, windows and ACK failover"""
+
+    def __init__(self, registry, limits: Optional[Dict[str, int]] = None,
+                 windows: Optional[Dict[str, Optional[Window]]] = None,
+                 default_limit: int = DEFAULT_CONCURRENCY, ack_timeout: float = ACK_TIMEOUT,
+                 retry_after: float = RETRY_AFTER, utc_offset: Optional[float] = None):
+        self.routes = compile_routes(registry)
+        self.agents = sorted({a for route in self.routes.values() for a in route})
+        self.index = {agent: slot for slot, agent in enumerate(self.agents)}
+        self.ack_timeout = ack_timeout
+        self.retry_after = retry_after
+
+        limits = limits or {}
+        windows = windows or {}
+        self.limits = [limits.get(a, default_limit) for a in self.agents]
+        self.windows = [windows[a] if a in windows else
+                        availability_window(registry.agents[a].availability, utc_offset)
+                        for a in self.agents]
+        self.running = [0] * len(self.agents)
+        self.responsive = [True] * len(self.agents)
+        self.retry_at = [0.0] * len(self.agents)
+        self.available = [True] * len(self.agents)
+
+        self._routes = {kind: tuple(self.index[a] for a in route) for kind, route in self.routes.items()}
+        self._lanes: Dict[Tuple[int, ...], deque] = {}
+        self._lanes_by_slot: List[List[Tuple[int, ...]]] = [[] for _ in self.agents]
+        self._deadlines: list = []
+        self._seq = 0
+        self.tasks: Dict[str, _Task] = {}
+        self.escalated = 0
+        self.failovers = 0
+
+    # -- queries -------------------------------------------------------
+
+    def route(self, kind: str) -> Tuple[str, ...]:
+        return self.routes.get(kind, self.routes[DEFAULT_ROUTE])
+
+    def waiting(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def assignee(self, task_id: str) -> Optional[str]:
+        task = self.tasks.get(task_id)
+        return self.agents[task.slot] if task is not None and task.slot >= 0 else None
+
+    # -- events ----------------------------------------------------------
+
+    def submit(self, task_id: str, kind: str, now: float) -> List[Assignment]:
+        """Queue a task; returns the assignment if an agent was free"""
+        if task_id in self.tasks:
+            raise ValueError(f"Task '{task_id}' already scheduled")
+        route = self._routes.get(kind, self._routes[DEFAULT_ROUTE])
+        task = self.tasks[task_id] = _Task(task_id, kind, route, now)
+        out = []
+        self._refresh(now, out)
+        self._dispatch(task, now, out, front=False)
+        return out
+
+    def ack(self, task_id: str, agent: str, now: float) -> bool:
+        """Record an [ACK]; late ACKs still mark the agent responsive again"""
+        slot = self.index.get(agent)
+        if slot is None:
+            return False
+        self.responsive[slot] = True
+        task = self.tasks.get(task_id)
+        if task is None or task.slot != slot or task.acked:
+            return False
+        task.acked = True
+        return True
+
+    def complete(self, task_id: str, now: float) -> List[Assignment]:
+        """Free the task's slot and hand it to the oldest task waiting for that agent"""
+        task = self.tasks.pop(task_id, None)
+        out = []
+        if task is not None and task.slot >= 0:
+            self.running[task.slot] -= 1
+            self._refresh(now, out)
+        return out
+
+    def tick(self, now: float) -> List[Assignment]:
+        """Fail over expired ACK deadlines and place tasks whose agent came back"""
+        out = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, _, task_id, attempt = heapq.heappop(deadlines)
+            task = self.tasks.get(task_id)
+            if task is None or task.attempt != attempt or task.acked:
+                continue
+            slot = task.slot
+            self.running[slot] -= 1
+            self.responsive[slot] = False
+            self.retry_at[slot] = now + self.retry_after
+            task.tried |= 1 << slot
+            task.slot = -1
+            task.deadline = None
+            self.failovers += 1
+            self._dispatch(task, now, out, front=True)
+        self._refresh(now, out)
+        return out
+
+    # -- internals -------------------------------------------------------
+
+    def _ready(self, slot: int) -> bool:
+        return self.available[slot] and self.responsive[slot] and self.running[slot] < self.limits[slot]
+
+    def _refresh(self, now: float, out: list):
+        """Re-evaluate windows and retries, then let every free agent pull waiting work"""
+        for slot, window in enumerate(self.windows):
+            if window is not None:
+                self.available[slot] = window.contains(now)
+            if not self.responsive[slot] and now >= self.retry_at[slot]:
+                self.responsive[slot] = True
+        for slot, lanes in enumerate(self._lanes_by_slot):
+            if lanes and self._ready(slot):
+                self._fill(slot, now, out)
+
+    def _assign(self, task: _Task, slot: int, now: float, out: list):
+        self.running[slot] += 1
+        task.slot = slot
+        task.attempt += 1
+        task.acked = False
+        task.deadline = now + self.ack_timeout
+        self._seq += 1
+        heapq.heappush(self._deadlines, (task.deadline, self._seq, task.id, task.attempt))
+        out.append(Assignment(task.id, task.kind, self.agents[slot], task.attempt, task.deadline))
+
+    def _dispatch(self, task: _Task, now: float, out: list, front: bool):
+        lane = tuple(s for s in task.route if not task.tried >> s & 1)
+        if not lane:
+            del self.tasks[task.id]
+            self.escalated += 1
+            out.append(Assignment(task.id, task.kind, None, task.attempt, None))
+            return
+        for slot in lane:
+            if self._ready(slot):
+                self._assign(task, slot, now, out)
+                return
+        queue = self._lanes.get(lane)
+        if queue is None:
+            queue = self._lanes[lane] = deque()
+            for slot in lane:
+                self._lanes_by_slot[slot].append(lane)
+        if front:
+            queue.appendleft(task)
+        else:
+            queue.append(task)
+
+    def _fill(self, slot: int, now: float, out: list):
+        """Give free capacity on `slot` to the oldest waiting task that can use it"""
+        lanes = self._lanes_by_slot[slot]
+        while lanes and self._ready(slot):
+            best = None
+            for lane in lanes:
+                queue = self._lanes[lane]
+                while queue and self.tasks.get(queue[0].id) is not queue[0]:
+                    queue.popleft()
+                if queue and (best is None or queue[0].submitted < self._lanes[best][0].submitted):
+                    best = lane
+            if best is None:
+                return
+            task = self._lanes[best][0]
+            # an agent earlier on the route may have freed up too; respect route order
+            target = next(s for s in best if self._ready(s))
+            self._lanes[best].popleft()
+            self._assign(task, target, now, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show compiled task routes and who would take a task now")
+    parser.add_argument("--registry", default=None, help="Path to agents.yaml")
+    parser.add_argument("--kind", action="append", default=[], help="Task type to route (repeatable)")
+    args = parser.parse_args()
+
+    from agent_registry import load_registry
+    try:
+        registry = load_registry(args.registry)
+    except FileNotFoundError as e:
+        print(f"❌ Registry not found: {e.filename}", file=sys.stderr)
+        sys.exit(1)
+
+    scheduler = Scheduler(registry)
+    now = time.time()
+    scheduler.tick(now)
+    print(f"🗺️  {len(scheduler.routes)} routes over {len(scheduler.agents)} agents")
+    for kind in args.kind or sorted(scheduler.routes):
+        route = scheduler.route(kind)
+        chain = " → ".join(f"{a}{'' if scheduler.available[scheduler.index[a]] else ' (off shift)'}"
+                           for a in route)
+        print(f"   {kind:<28} {chain}")
+
+
+if __name__ == "__main__":
+    main()
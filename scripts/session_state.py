@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Record session state through the write-ahead log (write BEFORE responding)
+Usage: python3 scripts/session_state.py show
+       python3 scripts/session_state.py task "<description>"
+       python3 scripts/session_state.py correct "<correction>"
+       python3 scripts/session_state.py decide "<decision>"
+       python3 scripts/session_state.py set <key> <value>
+       python3 scripts/session_state.py draft "<text>"
+       python3 scripts/session_state.py checkpoint
+       python3 scripts/session_state.py buffer-clear [--percent 60]
+       python3 scripts/session_state.py buffer-append "<human message>" "<response summary>"
+       python3 scripts/session_state.py buffer-read
+Files are relative to --root (default: $AGENT_MEMORY_ROOT or .).
+"""
+
+import sys
+import argparse
+
+from memory.wal import SessionState, WorkingBuffer
+
+COMMANDS = ("show", "task", "correct", "decide", "set", "draft", "checkpoint",
+            "buffer-clear", "buffer-append", "buffer-read")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SESSION-STATE.md write-ahead log")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--root", default=None)
+    parser.add_argument("--percent", type=int, default=None, help="Context usage when clearing the buffer")
+    args = parser.parse_args()
+
+    expected = {"task": 1, "correct": 1, "decide": 1, "draft": 1, "set": 2, "buffer-append": 2}
+    if len(args.args) != expected.get(args.command, 0):
+        parser.error(f"{args.command} takes {expected.get(args.command, 0)} argument(s)")
+
+    if args.command.startswith("buffer-"):
+        buffer = WorkingBuffer(args.root)
+        if args.command == "buffer-clear":
+            buffer.clear(args.percent)
+            print(f"🧹 Working buffer cleared: {buffer.path}")
+        elif args.command == "buffer-append":
+            buffer.append(*args.args)
+            print(f"✅ Appended to {buffer.path}")
+        else:
+            print(buffer.read(), end="")
+        sys.exit(0)
+
+    state = SessionState(args.root)
+    if args.command == "show":
+        print(state.render(), end="")
+    elif args.command == "checkpoint":
+        state.checkpoint()
+        print(f"✅ Checkpointed at LSN {state.lsn}: {state.snapshot_path}")
+    else:
+        action = {"task": state.set_task, "correct": state.record_correction,
+                  "decide": state.record_decision, "set": state.set_value, "draft": state.add_draft}
+        lsn = action[args.command](*args.args)
+        print(f"✅ Logged (LSN {lsn})")
+    # One append per command; the log is folded in by checkpoint or once it grows large
+    state.close(checkpoint=False)
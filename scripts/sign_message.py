@@ -1,58 +1,113 @@
 #!/usr/bin/env python3
 """
 Sign agent message with Ed25519 SSH key
-Usage: python3 scripts/sign_message.py <message.md> <agent_name>
+Usage: python3 scripts/sign_message.py <message.md|-> <agent_name> [--backend auto|daemon|native|ssh-keygen]
+Messages are hashed and signed chunk by chunk; "-" signs stdin to stdout.
+"auto" hands the digest to signing_daemon.py when it is running.
+With AGENT_MESH_AUDIT_DIR set, every signature is appended to audit_log.py.
+Signing time and counts are reported to mesh_metrics (AGENT_MESH_METRICS*).
 """
 
+import os
 import sys
 import hashlib
 import base64
+import argparse
 import subprocess
 from pathlib import Path
 
-def sign_message(message_file: str, agent_name: str) -> str:
-    """Sign message and append signature block"""
-    
-    # Read message content
-    with open(message_file, 'r') as f:
-        content = f.read()
-    
-    # Calculate SHA256 hash of content
-    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-    
-    # Load private key
-    private_key_path = Path.home() / f'.agent-keys/{agent_name}_key'
-    
-    if not private_key_path.exists():
-        print(f"❌ Private key not found: {private_key_path}")
-        print(f"Generate with: ssh-keygen -t ed25519 -f ~/.agent-keys/{agent_name}_key")
-        sys.exit(1)
-    
-    # Create detached signature using ssh-keygen
+import sshsig
+import audit_log
+import mesh_metrics
+import mesh_protocol
+
+BACKENDS = ("auto", "daemon", "native", "ssh-keygen")
+CHUNK_SIZE = 1 << 20
+
+# Parsed private keys, keyed by path → (mtime_ns, SigningKey)
+_signing_keys = {}
+
+
+def load_signing_key(private_key_path: Path) -> sshsig.SigningKey:
+    """Parse an OpenSSH private key once and keep it in memory"""
+    mtime = private_key_path.stat().st_mtime_ns
+    cached = _signing_keys.get(private_key_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    key = sshsig.load_private_key(private_key_path)
+    _signing_keys[private_key_path] = (mtime, key)
+    return key
+
+
+def sign_native(message_bytes: bytes, private_key_path: Path) -> str:
+    """Create an armored SSHSIG in-process"""
+    return load_signing_key(private_key_path).sign(message_bytes, sshsig.NAMESPACE)
+
+
+def sign_ssh_keygen(message_file: str, private_key_path: Path) -> str:
+    """Create an armored SSHSIG by running `ssh-keygen -Y sign`"""
     sig_file = f"{message_file}.sig"
-    
+    subprocess.run([
+        'ssh-keygen', '-Y', 'sign',
+        '-f', str(private_key_path),
+        '-n', sshsig.NAMESPACE,
+        message_file
+    ], check=True, capture_output=True)
+
     try:
-        subprocess.run([
-            'ssh-keygen', '-Y', 'sign',
-            '-f', str(private_key_path),
-            '-n', 'agent-mesh',
-            message_file
-        ], check=True, capture_output=True)
-        
-        # Read signature
-        with open(sig_file, 'rb') as f:
-            signature_bytes = f.read()
-        signature_b64 = base64.b64encode(signature_bytes).decode('ascii')
-        
+        with open(sig_file, 'r') as f:
+            return f.read()
+    finally:
         # Clean up .sig file
         Path(sig_file).unlink()
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Signing failed: {e}")
+
+
+def create_signature(message_file: str, private_key_path: Path, backend: str = "auto") -> str:
+    """Sign the message file with the requested backend, returning the armored SSHSIG
+
+    "auto" uses the native backend and falls back to ssh-keygen for keys
+    it cannot parse (e.g. passphrase-protected keys). The daemon signs by
+    agent id, not key path, so it is only used by sign_stream().
+    """
+    if backend == "daemon":
+        raise ValueError("The daemon backend signs by agent id; use sign_stream()")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown signing backend: {backend}")
+
+    if backend != "ssh-keygen":
+        try:
+            return sign_native(Path(message_file).read_bytes(), private_key_path)
+        except sshsig.SSHSigError:
+            if backend == "native":
+                raise
+
+    return sign_ssh_keygen(message_file, private_key_path)
+
+
+def daemon_socket_path() -> Path:
+    """signing_daemon.default_socket_path(), without importing the daemon and asyncio"""
+    if os.environ.get("AGENT_MESH_SIGNER_SOCKET"):
+        return Path(os.environ["AGENT_MESH_SIGNER_SOCKET"])
+    return Path.home() / ".agent-keys" / "signer.sock"
+
+
+def private_key_path_for(agent_name: str) -> Path:
+    """Locate the agent's private key, exiting with setup help if missing"""
+    private_key_path = Path.home() / f'.agent-keys/{agent_name}_key'
+
+    if not private_key_path.exists():
+        print(f"❌ Private key not found: {private_key_path}", file=sys.stderr)
+        print(f"Generate with: ssh-keygen -t ed25519 -f ~/.agent-keys/{agent_name}_key",
+              file=sys.stderr)
         sys.exit(1)
-    
-    # Append signature block to message
-    signed_message = content + f"""
+
+    return private_key_path
+
+
+def signature_block(agent_name: str, content_hash: str, armored: str, message_file: str) -> str:
+    """Authentication block appended after the signed payload"""
+    signature_b64 = base64.b64encode(armored.encode('ascii')).decode('ascii')
+    return f"""
 
 ---
 
@@ -73,21 +128,193 @@ def sign_message(message_file: str, agent_name: str) -> str:
 python3 scripts/verify_message.py {message_file} {agent_name}
 ```
 """
-    
+
+
+def message_type(head: str) -> str:
+    """Protocol prefix of a message, for the signing summary"""
+    message = mesh_protocol.parse(head)
+    if message.is_protocol:
+        return message.prefix
+    return f"{message.prefix} (not a registered protocol prefix)"
+
+
+def hash_stream(source, sink=None, extra=None) -> tuple:
+    """Hash a binary stream chunk by chunk, optionally teeing it to sink/extra
+
+    Returns (sha256 hexdigest, sha512 digest); sha512 is what SSHSIG signs.
+    """
+    sha256 = hashlib.sha256()
+    sha512 = hashlib.new(sshsig.HASH_ALG)
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        sha256.update(chunk)
+        sha512.update(chunk)
+        if sink is not None:
+            sink.write(chunk)
+        if extra is not None:
+            extra.write(chunk)
+    return sha256.hexdigest(), sha512.digest()
+
+
+def _sign_stream_ssh_keygen(source, sink, private_key_path: Path) -> tuple:
+    """Pipe the stream through `ssh-keygen -Y sign` (signature on its stdout)"""
+    proc = subprocess.Popen([
+        'ssh-keygen', '-Y', 'sign',
+        '-f', str(private_key_path),
+        '-n', sshsig.NAMESPACE
+    ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        content_hash, _ = hash_stream(source, sink, proc.stdin)
+    except BrokenPipeError:
+        content_hash = None
+    armored, stderr = proc.communicate()
+    if proc.returncode != 0 or content_hash is None:
+        raise subprocess.CalledProcessError(proc.returncode or 1, proc.args, stderr=stderr)
+    return content_hash, armored.decode('ascii')
+
+
+def record_audit(agent_name: str, content_hash: str, armored: str, source) -> None:
+    """Append the signature to the audit log; the message is already signed, so only warn"""
+    try:
+        audit_log.record_signed(agent_name, content_hash, armored, source)
+    except (audit_log.AuditError, OSError) as e:
+        print(f"⚠️  Audit log not updated ({e}); run audit_log.py record", file=sys.stderr)
+
+
+def sign_stream(message_file: str, agent_name: str, backend: str = "auto") -> str:
+    """Sign without holding the message in memory, returning the appended block
+
+    Files are hashed in place and the block is appended to them; "-" streams
+    stdin to stdout followed by the block. "auto" signs through a running
+    signing daemon that holds the agent's key, else falls back to native.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown signing backend: {backend}")
+
+    from_stdin = message_file == '-'
+
+    failures = (subprocess.CalledProcessError,)
+    daemon = None
+    if backend in ("auto", "daemon") and daemon_socket_path().exists():
+        import signing_daemon  # pulls in asyncio and the registry; only worth it with a daemon up
+
+        daemon = signing_daemon.connect(agent_name)
+        failures += (signing_daemon.SignerError,)
+    if daemon is None and backend == "daemon":
+        print(f"❌ Signing daemon not running or has no key for {agent_name}", file=sys.stderr)
+        sys.exit(1)
+
+    private_key_path = private_key_path_for(agent_name) if daemon is None else None
+
+    key = None
+    if daemon is None and backend != "ssh-keygen":
+        try:
+            key = load_signing_key(private_key_path)
+        except sshsig.SSHSigError as e:
+            if backend == "native":
+                print(f"❌ Signing failed: {e}", file=sys.stderr)
+                sys.exit(1)
+
+    source = sys.stdin.buffer if from_stdin else open(message_file, 'rb')
+    sink = sys.stdout.buffer if from_stdin else None
+    head = source.peek(mesh_protocol.MAX_PREFIX_LEN)[:mesh_protocol.MAX_PREFIX_LEN]
+
+    used = "daemon" if daemon is not None else "native" if key is not None else "ssh-keygen"
+    try:
+        with mesh_metrics.span("sign", backend=used) as span:
+            if daemon is not None:
+                content_hash, digest = hash_stream(source, sink)
+                armored = daemon.sign_digest(agent_name, digest)
+            elif key is not None:
+                content_hash, digest = hash_stream(source, sink)
+                armored = key.sign_digest(digest, sshsig.NAMESPACE)
+            elif from_stdin:
+                content_hash, armored = _sign_stream_ssh_keygen(source, sink, private_key_path)
+            else:
+                content_hash, _ = hash_stream(source)
+                armored = sign_ssh_keygen(message_file, private_key_path)
+            span.annotate(content_hash, agent=agent_name)
+    except failures as e:
+        print(f"❌ Signing failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if not from_stdin:
+            source.close()
+        if daemon is not None:
+            daemon.close()
+    mesh_metrics.inc("agent_mesh_signatures_total", backend=used)
+
+    block = signature_block(agent_name, content_hash, armored,
+                            '<message.md>' if from_stdin else message_file)
+
+    if from_stdin:
+        sink.write(block.encode('utf-8'))
+        sink.flush()
+    else:
+        with open(message_file, 'a') as f:
+            f.write(block)
+    record_audit(agent_name, content_hash, armored, None if from_stdin else message_file)
+
+    log = sys.stderr if from_stdin else sys.stdout
+    print(f"✅ Message signed: {message_file}", file=log)
+    print(f"   Agent: {agent_name}", file=log)
+    print(f"   Type: {message_type(head.decode('utf-8', 'replace'))}", file=log)
+    print(f"   Hash: {content_hash[:16]}...", file=log)
+
+    return block
+
+
+def sign_message(message_file: str, agent_name: str, backend: str = "auto") -> str:
+    """Sign message and append signature block"""
+
+    # Read message content
+    with open(message_file, 'r') as f:
+        content = f.read()
+
+    # Calculate SHA256 hash of content
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    # Load private key
+    private_key_path = private_key_path_for(agent_name)
+
+    # Create detached signature
+    try:
+        with mesh_metrics.span("sign", content_hash, backend=backend) as span:
+            armored = create_signature(message_file, private_key_path, backend)
+            span.annotate(agent=agent_name)
+
+    except (subprocess.CalledProcessError, sshsig.SSHSigError) as e:
+        print(f"❌ Signing failed: {e}")
+        sys.exit(1)
+    mesh_metrics.inc("agent_mesh_signatures_total", backend=backend)
+
+    # Append signature block to message
+    signed_message = content + signature_block(agent_name, content_hash, armored, message_file)
+
     # Write signed message
     with open(message_file, 'w') as f:
         f.write(signed_message)
-    
+    record_audit(agent_name, content_hash, armored, message_file)
+
     print(f"✅ Message signed: {message_file}")
     print(f"   Agent: {agent_name}")
+    print(f"   Type: {message_type(content[:mesh_protocol.MAX_PREFIX_LEN])}")
     print(f"   Hash: {content_hash[:16]}...")
-    
+
     return signed_message
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python3 scripts/sign_message.py <message.md> <agent_name>")
-        print("Example: python3 scripts/sign_message.py research.md clawdy")
-        sys.exit(1)
-    
-    sign_message(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(
+        description="Sign agent message with Ed25519 SSH key",
+        epilog="Example: python3 scripts/sign_message.py research.md clawdy"
+    )
+    parser.add_argument("message_file", help="Markdown message to sign in place, or - for stdin")
+    parser.add_argument("agent_name", help="Agent id (key read from ~/.agent-keys/<agent>_key)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="Signing backend (default: daemon if running, else native, "
+                             "ssh-keygen fallback)")
+    args = parser.parse_args()
+
+    sign_stream(args.message_file, args.agent_name, args.backend)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Long-running signer that keeps agent keys in memory behind a Unix socket
+Usage: python3 scripts/signing_daemon.py serve [--socket PATH] [--agent ID ...]
+       python3 scripts/signing_daemon.py ping [--socket PATH]
+Environment: AGENT_MESH_SIGNER_SOCKET (default ~/.agent-keys/signer.sock)
+
+High-frequency signers (cron jobs, the Slack bot) pay interpreter startup,
+key parsing and, with ssh-keygen, a fork for every message. The daemon
+parses each ~/.agent-keys/<agent>_key once and signs SHA-512 digests sent
+over the socket, so the message itself never crosses it.
+
+The wire format is one JSON object per line in each direction. Requests
+carry an "id" that is echoed back; a connection may pipeline any number of
+requests and responses come back in order. Operations:
+
+    {"op": "ping"}
+    {"op": "has_key", "agent": ID}
+    {"op": "sign", "agent": ID, "digest": <sha512 hex>}
+    {"op": "verify", "agent": ID, "digests": {"sha512": hex}, "signature": <armored>}
+
+Responses are {"id": ..., "ok": true, ...} or {"id": ..., "ok": false,
+"error": "..."}. The socket is created mode 0600; anyone who can connect
+can sign as any agent whose key the daemon can read.
+
+sign_message.py uses the daemon automatically when it is running and holds
+the agent's key; SignerClient.sign_many() pipelines batches for in-process
+callers.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import socket
+import hashlib
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import sshsig
+from agent_registry import load_registry
+from mesh_metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Agent ids become key file names, so keep them to a safe character set
+AGENT_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+CONNECT_TIMEOUT = 0.5
+PIPELINE_WINDOW = 256  # requests in flight per sign_many() round trip
+MAX_LINE = 1 << 20
+
+
+class SignerError(Exception):
+    """Raised when the daemon rejects a request or the socket fails"""
+
+
+def default_socket_path() -> Path:
+    if os.environ.get("AGENT_MESH_SIGNER_SOCKET"):
+        return Path(os.environ["AGENT_MESH_SIGNER_SOCKET"])
+    return Path.home() / ".agent-keys" / "signer.sock"
+
+
+def default_key_dir() -> Path:
+    return Path.home() / ".agent-keys"
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class SigningDaemon:
+    """Serves sign/verify requests from keys parsed once per (path, mtime)"""
+
+    def __init__(self, socket_path=None, key_dir=None, registry_path=None):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.key_dir = Path(key_dir) if key_dir else default_key_dir()
+        self.registry_path = registry_path
+        self.keys: Dict[str, tuple] = {}         # agent → (mtime_ns, SigningKey)
+        self.public_keys: Dict[str, tuple] = {}  # agent → (registry version, key bytes, error)
+        self.requests = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = set()
+
+    def signing_key(self, agent: str) -> sshsig.SigningKey:
+        """Load (or reuse) the agent's private key; raises SignerError"""
+        if not isinstance(agent, str) or not AGENT_ID.match(agent):
+            raise SignerError(f"Invalid agent id: {agent!r}")
+        path = self.key_dir / f"{agent}_key"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            raise SignerError(f"No private key for agent '{agent}'")
+        cached = self.keys.get(agent)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            key = sshsig.load_private_key(path)
+        except (OSError, ValueError, sshsig.SSHSigError) as e:
+            raise SignerError(f"Cannot load key for agent '{agent}': {e}")
+        self.keys[agent] = (mtime, key)
+        return key
+
+    def preload(self, agents: Iterable[str]) -> List[str]:
+        """Parse keys up front; returns the agents that loaded"""
+        loaded = []
+        for agent in agents:
+            try:
+                self.signing_key(agent)
+                loaded.append(agent)
+            except SignerError as e:
+                logger.warning(str(e))
+        return loaded
+
+    def public_key(self, agent: str) -> bytes:
+        """Registry public key for agent, re-parsed only when agents.yaml changes"""
+        try:
+            registry = load_registry(self.registry_path)
+        except FileNotFoundError:
+            raise SignerError("agents.yaml not found")
+        cached = self.public_keys.get(agent)
+        if cached and cached[0] == registry.version:
+            if cached[2]:
+                raise SignerError(cached[2])
+            return cached[1]
+        public_key, error = registry.public_key(agent)
+        if not error:
+            try:
+                public_key = sshsig.parse_public_key(public_key)
+            except sshsig.SSHSigError as e:
+                public_key, error = None, f"Invalid public key for agent '{agent}': {e}"
+        self.public_keys[agent] = (registry.version, public_key, error)
+        if error:
+            raise SignerError(error)
+        return public_key
+
+    def handle(self, request: dict) -> dict:
+        """Answer one decoded request"""
+        op = request.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "keys": sorted(self.keys), "requests": self.requests}
+        if op == "has_key":
+            self.signing_key(request.get("agent"))
+            return {"agent": request["agent"]}
+        if op == "sign":
+            try:
+                digest = bytes.fromhex(request.get("digest") or "")
+            except (TypeError, ValueError):
+                raise SignerError("digest must be hex")
+            if len(digest) != 64:
+                raise SignerError(f"digest must be a {sshsig.HASH_ALG} digest")
+            key = self.signing_key(request.get("agent"))
+            return {"signature": key.sign_digest(digest, _namespace(request))}
+        if op == "verify":
+            public_key = self.public_key(request.get("agent"))
+            try:
+                digests = {alg: bytes.fromhex(value)
+                           for alg, value in (request.get("digests") or {}).items()}
+            except (AttributeError, TypeError, ValueError):
+                raise SignerError("digests must map algorithm to hex")
+            armored = request.get("signature")
+            if not isinstance(armored, str):
+                raise SignerError("signature must be an armored string")
+            valid, error = sshsig.verify_digest(public_key, digests, armored, _namespace(request))
+            return {"valid": valid, "reason": error}
+        raise SignerError(f"Unknown op: {op!r}")
+
+    def respond(self, line: bytes) -> bytes:
+        started = time.perf_counter()
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise SignerError("request must be a JSON object")
+            request_id = request.get("id")
+            response = {"id": request_id, "ok": True, **self.handle(request)}
+        except (ValueError, SignerError) as e:
+            self.errors += 1
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        self.latency.observe(time.perf_counter() - started)
+        return json.dumps(response).encode("utf-8") + b"\n"
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # line over MAX_LINE
+                    writer.write(b'{"id": null, "ok": false, "error": "request too large"}\n')
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(self.respond(line))
+                await writer.drain()  # returns at once unless the client stopped reading
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def start(self):
+        path = self.socket_path
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if path.exists():
+            if _socket_alive(path):
+                raise SignerError(f"A signer is already listening on {path}")
+            path.unlink()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._serve_connection, path=str(path),
+                                                           limit=MAX_LINE)
+        finally:
+            os.umask(old_umask)
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        await self.start()
+        try:
+            await (stop or asyncio.Event()).wait()
+        finally:
+            await self.close()
+
+    def metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "keys_loaded": len(self.keys),
+            "latency": self.latency.snapshot(),
+        }
+
+
+def _namespace(request: dict) -> str:
+    namespace = request.get("namespace", sshsig.NAMESPACE)
+    if not isinstance(namespace, str):
+        raise SignerError("namespace must be a string")
+    return namespace
+
+
+def _socket_alive(path: Path) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(CONNECT_TIMEOUT)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+class SignerClient:
+    """Blocking client for one daemon connection (not thread-safe)"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._reader = sock.makefile("rb")
+        self._next_id = 0
+
+    @classmethod
+    def open(cls, socket_path=None, timeout: float = CONNECT_TIMEOUT) -> "SignerClient":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(socket_path or default_socket_path()))
+        except OSError as e:
+            sock.close()
+            raise SignerError(f"Signer not reachable: {e}")
+        sock.settimeout(None)
+        return cls(sock)
+
+    def close(self):
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _encode(self, request: dict) -> bytes:
+        self._next_id += 1
+        request["id"] = self._next_id
+        return json.dumps(request).encode("utf-8") + b"\n"
+
+    def _read(self) -> dict:
+        line = self._reader.readline()
+        if not line:
+            raise SignerError("Signer closed the connection")
+        return json.loads(line)
+
+    def call_many(self, requests: List[dict]) -> List[dict]:
+        """Pipeline requests, PIPELINE_WINDOW at a time; responses in request order"""
+        responses = []
+        try:
+            for start in range(0, len(requests), PIPELINE_WINDOW):
+                window = requests[start:start + PIPELINE_WINDOW]
+                self.sock.sendall(b"".join(self._encode(dict(r)) for r in window))
+                responses.extend(self._read() for _ in window)
+        except OSError as e:
+            raise SignerError(f"Signer connection failed: {e}")
+        return responses
+
+    def call(self, request: dict) -> dict:
+        response = self.call_many([request])[0]
+        if not response.get("ok"):
+            raise SignerError(response.get("error", "request failed"))
+        return response
+
+    def ping(self) -> dict:
+        return self.call({"op": "ping"})
+
+    def has_key(self, agent: str) -> bool:
+        try:
+            self.call({"op": "has_key", "agent": agent})
+        except SignerError:
+            return False
+        return True
+
+    def sign_digest(self, agent: str, digest: bytes, namespace: str = sshsig.NAMESPACE) -> str:
+        """Armored SSHSIG over a precomputed sha512 digest"""
+        return self.call({"op": "sign", "agent": agent, "digest": digest.hex(),
+                          "namespace": namespace})["signature"]
+
+    def sign(self, agent: str, message: bytes, namespace: str = sshsig.NAMESPACE) -> str:
+        return self.sign_digest(agent, hashlib.new(sshsig.HASH_ALG, message).digest(), namespace)
+
+    def sign_many(self, agent: str, digests: List[bytes],
+                  namespace: str = sshsig.NAMESPACE) -> List[str]:
+        """Sign many digests in pipelined round trips"""
+        responses = self.call_many([
+            {"op": "sign", "agent": agent, "digest": digest.hex(), "namespace": namespace}
+            for digest in digests
+        ])
+        for response in responses:
+            if not response.get("ok"):
+                raise SignerError(response.get("error", "request failed"))
+        return [response["signature"] for response in responses]
+
+    def verify_digest(self, agent: str, digests: dict, armored: str) -> tuple:
+        """(is_valid, error) against the agent's registry key, like sshsig.verify_digest"""
+        response = self.call({"op": "verify", "agent": agent, "signature": armored,
+                              "digests": {alg: d.hex() for alg, d in digests.items()}})
+        return response["valid"], response["reason"]
+
+
+def connect(agent: Optional[str] = None, socket_path=None) -> Optional[SignerClient]:
+    """Client for a running daemon (that holds agent's key), or None"""
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return None
+    try:
+        client = SignerClient.open(path)
+    except SignerError:
+        return None
+    if agent is not None and not client.has_key(agent):
+        client.close()
+        return None
+    return client
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+async def _serve(args):
+    import signal
+
+    daemon = SigningDaemon(args.socket)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    agents = args.agent
+    if agents is None:
+        agents = sorted(p.name[:-len("_key")] for p in daemon.key_dir.glob("*_key"))
+    loaded = daemon.preload(agents)
+    print(f"🔐 Signer on {daemon.socket_path} ({len(loaded)} keys: {', '.join(loaded) or 'none'})",
+          flush=True)
+    try:
+        await daemon.run(stop)
+    finally:
+        print(f"📊 {json.dumps(daemon.metrics())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent-mesh signing daemon")
+    parser.add_argument("command", choices=["serve", "ping"])
+    parser.add_argument("--socket", type=Path, default=None,
+                        help="Unix socket path (default: $AGENT_MESH_SIGNER_SOCKET)")
+    parser.add_argument("--agent", action="append", default=None,
+                        help="Preload this agent's key (repeatable; default: every ~/.agent-keys/*_key)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "ping":
+        client = connect(socket_path=args.socket)
+        if client is None:
+            print("❌ Signer not running")
+            sys.exit(1)
+        with client:
+            status = client.ping()
+        print(f"✅ Signer pid {status['pid']}: {len(status['keys'])} keys, "
+              f"{status['requests']} requests served")
+        return
+
+    try:
+        asyncio.run(_serve(args))
+    except SignerError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware outbound dispatcher for Slack posts
+Priority queue (urgent system > synthesis > system > research > ack) and a
+token bucket per channel, each drained by its own sender so a paused channel
+never holds up the others; Retry-After handling for 429s and coalescing of
+small consecutive [ACK] posts into one message.
+"""
+
+import time
+import asyncio
+import logging
+import itertools
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_URGENT = 0
+PRIORITY_SYNTHESIS = 1
+PRIORITY_SYSTEM = 2
+PRIORITY_RESEARCH = 3
+PRIORITY_ACK = 4
+
+
+class TokenBucket:
+    """Classic token bucket; also honours a server-imposed pause (Retry-After)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one can be taken now)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def take(self) -> float:
+        """Take a token if one is available (returns 0), else seconds until one is"""
+        wait = self.delay()
+        if wait <= 0:
+            self.tokens -= 1
+        return wait
+
+    def pause(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class _Outbound:
+    """One queued post; ACKs keep collecting text until dispatched"""
+
+    __slots__ = ("priority", "seq", "channel", "kwargs", "future", "attempts", "ack_lines")
+
+    def __init__(self, priority: int, seq: int, channel: str, kwargs: dict,
+                 future: asyncio.Future, ack_lines: Optional[list] = None):
+        self.priority = priority
+        self.seq = seq
+        self.channel = channel
+        self.kwargs = kwargs
+        self.future = future
+        self.attempts = 0
+        self.ack_lines = ack_lines
+
+    def __lt__(self, other: "_Outbound") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """Retry-After seconds if exc is a Slack 429, else None"""
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after") or 1
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class OutboundDispatcher:
+    """One sender task and priority queue per channel, each under its own limits"""
+
+    def __init__(self, post: Callable[..., Awaitable], rate: float = 1.0, burst: int = 3,
+                 max_retries: int = 3, ack_max_chars: int = 200):
+        """
+        post: coroutine called as post(channel=..., **kwargs), e.g.
+              AsyncWebClient.chat_postMessage
+        rate/burst: sustained posts per second and burst size, per channel
+        ack_max_chars: [ACK]s up to this size may be merged while queued
+        """
+        self.post = post
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.ack_max_chars = ack_max_chars
+
+        self._started = False
+        self._queues: Dict[str, asyncio.PriorityQueue] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._pending_acks: Dict[str, _Outbound] = {}
+        self._seq = itertools.count()
+
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+
+    async def start(self):
+        """Accept posts; each channel's sender starts with its first post"""
+        self._started = True
+
+    async def close(self):
+        """Send everything already queued, then stop"""
+        if not self._started:
+            return
+        for queue in list(self._queues.values()):
+            await queue.join()
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._queues.clear()
+        self._tasks.clear()
+        self._started = False
+
+    def bucket(self, channel: str) -> TokenBucket:
+        if channel not in self._buckets:
+            self._buckets[channel] = TokenBucket(self.rate, self.burst)
+        return self._buckets[channel]
+
+    def submit(self, priority: int, channel: str, **kwargs) -> asyncio.Future:
+        """Queue a post; the returned future resolves to the Slack response"""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Outbound(priority, next(self._seq), channel, kwargs, future))
+        return future
+
+    def submit_ack(self, channel: str, text: str) -> asyncio.Future:
+        """Queue a small [ACK]; merged into a still-queued ACK for the channel if possible"""
+        self._check_started()
+        pending = self._pending_acks.get(channel)
+        if (pending and len(text) <= self.ack_max_chars
+                and sum(len(line) for line in pending.ack_lines) + len(text) <= 3000):
+            pending.ack_lines.append(text)
+            self.coalesced += 1
+            return pending.future
+
+        future = asyncio.get_running_loop().create_future()
+        item = _Outbound(PRIORITY_ACK, next(self._seq), channel, {}, future, ack_lines=[text])
+        self._enqueue(item)
+        if len(text) <= self.ack_max_chars:
+            self._pending_acks[channel] = item
+        return future
+
+    def _check_started(self):
+        if not self._started:
+            raise RuntimeError("OutboundDispatcher is not running; await start() first")
+
+    def _enqueue(self, item: _Outbound):
+        self._check_started()
+        queue = self._queues.get(item.channel)
+        if queue is None:
+            queue = self._queues[item.channel] = asyncio.PriorityQueue()
+            self._tasks[item.channel] = asyncio.create_task(self._run(item.channel, queue))
+        queue.put_nowait(item)
+
+    @property
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "coalesced_acks": self.coalesced,
+        }
+
+    async def _run(self, channel: str, queue: asyncio.PriorityQueue):
+        bucket = self.bucket(channel)
+        while True:
+            item = await queue.get()
+            try:
+                wait = bucket.take()
+                if wait > 0:
+                    # Put it back and wait: whatever is most urgent when a
+                    # token frees up goes first, including posts queued meanwhile
+                    queue.put_nowait(item)
+                    await asyncio.sleep(wait)
+                    continue
+                await self._send(item, queue, bucket)
+            finally:
+                queue.task_done()
+
+    async def _send(self, item: _Outbound, queue: asyncio.PriorityQueue, bucket: TokenBucket):
+        if item.ack_lines is not None:
+            if self._pending_acks.get(item.channel) is item:
+                del self._pending_acks[item.channel]
+            item.kwargs["text"] = "\n".join(item.ack_lines)
+        item.attempts += 1
+
+        try:
+            response = await self.post(channel=item.channel, **item.kwargs)
+        except Exception as e:
+            pause = retry_after(e)
+            if pause is not None and item.attempts <= self.max_retries:
+                self.rate_limited += 1
+                bucket.pause(pause)
+                logger.warning(f"⏳ Slack rate limited on {item.channel}; retrying in {pause:.1f}s")
+                queue.put_nowait(item)  # keeps its (priority, seq) slot; sent once the pause ends
+                return
+            self.failed += 1
+            if not item.future.done():
+                item.future.set_exception(e)
+            return
+
+        self.sent += 1
+        if not item.future.done():
+            item.future.set_result(response)
@@ -4,19 +4,33 @@ slack_fallback_bot.py — Slack coordination fallback for Multi-Agent Knowledge
 Version: 1.2
 Usage: python3 slack_fallback_bot.py
 Environment: SLACK_BOT_TOKEN, SLACK_APP_TOKEN, SLACK_FALLBACK_CHANNEL
+Activation: SLACK_ENABLED=true, or SLACK_ENABLED=auto to probe Matrix (MATRIX_HEALTH_URL,
+            MESH_HEALTH_INTERVAL) and bridge only while the mesh is in fallback (MESH_HEALTH_FILE)
+Queue: SLACK_QUEUE_DIR (segmented, default /tmp/agent-mesh-slack-queue) or SLACK_QUEUE_FILE (single JSONL)
+Queue tuning: SLACK_QUEUE_MAX, SLACK_QUEUE_OVERFLOW, SLACK_QUEUE_FSYNC_INTERVAL
+Outbound tuning: SLACK_POST_RATE (posts/s per channel), SLACK_POST_BURST
+Inbound tuning: SLACK_EVENT_WORKERS, SLACK_EVENT_QUEUE_MAX
+Redelivery suppression: SLACK_DEDUPE_MAX, SLACK_DEDUPE_TTL, SLACK_DEDUPE_DIR (persistent bloom filter)
+Message bus: a running bot registers itself as the "slack" transport (scripts/transports.py)
+Metrics: AGENT_MESH_METRICS_PORT serves Prometheus /metrics; see scripts/mesh_metrics.py for file dumps
+         and the AGENT_MESH_TRACE_LOG per-message trace
 """
 
 import os
 import sys
 import json
+import time
+import signal
 import asyncio
+import hashlib
 import logging
 from datetime import datetime
 from typing import Optional
 
 # Slack SDK
 try:
-    from slack_sdk.async_client import AsyncWebClient
+    import aiohttp
+    from slack_sdk.web.async_client import AsyncWebClient
     from slack_sdk.socket_mode.aiohttp import SocketModeClient
     from slack_sdk.socket_mode.response import SocketModeResponse
 except ImportError:
@@ -24,6 +38,23 @@ except ImportError:
     print("Install: pip install slack-sdk aiohttp")
     sys.exit(1)
 
+from agent_registry import load_registry
+from dedupe import DedupeCache
+from health_monitor import (
+    HealthMonitor, HttpProbe, agent_from_text, default_health_file,
+    FALLBACK, MATRIX_HEALTH_URL, PROBE_INTERVAL,
+)
+import mesh_metrics
+from mesh_metrics import Histogram
+from mesh_protocol import get_parser
+from file_queue import FileQueue, DEFAULT_QUEUE_DIR
+from queue_writer import QueueWriter
+from transports import Envelope, Transport, TRANSPORTS, register_transport
+from slack_dispatcher import (
+    OutboundDispatcher, PRIORITY_URGENT, PRIORITY_SYNTHESIS,
+    PRIORITY_SYSTEM, PRIORITY_RESEARCH,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +63,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class SlackConfigError(RuntimeError):
+    """Slack tokens are missing"""
+
+
+class SlackDisabled(SlackConfigError):
+    """SLACK_ENABLED is not true or auto"""
+
+
 class SlackFallbackBot:
     """Slack fallback coordination bot for agent-mesh"""
     
@@ -40,25 +79,86 @@ class SlackFallbackBot:
         self.bot_token = os.environ.get("SLACK_BOT_TOKEN")
         self.app_token = os.environ.get("SLACK_APP_TOKEN")
         self.channel = os.environ.get("SLACK_FALLBACK_CHANNEL", "agent-mesh-night-city")
-        self.enabled = os.environ.get("SLACK_ENABLED", "false").lower() == "true"
+        enabled = os.environ.get("SLACK_ENABLED", "false").lower()
+        self.auto_failover = enabled == "auto"
+        self.enabled = enabled == "true" or self.auto_failover
         
         if not self.bot_token or not self.app_token:
-            logger.error("❌ Missing Slack tokens. Set SLACK_BOT_TOKEN and SLACK_APP_TOKEN")
-            sys.exit(1)
+            raise SlackConfigError("Missing Slack tokens. Set SLACK_BOT_TOKEN and SLACK_APP_TOKEN")
         
         if not self.enabled:
-            logger.warning("⚠️  Slack fallback disabled. Set SLACK_ENABLED=true to enable")
-            sys.exit(0)
+            raise SlackDisabled("Slack fallback disabled. Set SLACK_ENABLED=true (or auto) to enable")
         
-        # Initialize clients
+        # Agent roster (emoji, keys) from the compiled agents.yaml index
+        try:
+            self.registry = load_registry()
+        except FileNotFoundError:
+            logger.warning("⚠️  agents.yaml not found — using default agent display")
+            self.registry = None
+        self.protocol = get_parser(self.registry)
+        self.agent_ids = {}
+        for agent_id, record in (self.registry.agents.items() if self.registry else ()):
+            self.agent_ids[agent_id] = agent_id
+            self.agent_ids[record.name.lower()] = agent_id
+        
+        # SLACK_ENABLED=auto: Matrix health probes decide when Slack takes over
+        self.health: Optional[HealthMonitor] = None
+        if self.auto_failover:
+            self.health = HealthMonitor(
+                HttpProbe(os.environ.get("MATRIX_HEALTH_URL", MATRIX_HEALTH_URL)),
+                interval=float(os.environ.get("MESH_HEALTH_INTERVAL", PROBE_INTERVAL)),
+                state_path=default_health_file(),
+                on_change=self.on_channel_change,
+            )
+        
+        # Write-behind queue for agent pickup (started in start()); agents read
+        # it with `python3 scripts/file_queue.py read <agent_id>`
+        fsync_interval = os.environ.get("SLACK_QUEUE_FSYNC_INTERVAL", "1.0")
+        queue_sink = os.environ.get("SLACK_QUEUE_FILE") or FileQueue(
+            os.environ.get("SLACK_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+        self.queue_writer = QueueWriter(
+            queue_sink,
+            max_queue=int(os.environ.get("SLACK_QUEUE_MAX", "10000")),
+            overflow=os.environ.get("SLACK_QUEUE_OVERFLOW", "block"),
+            fsync_interval=None if fsync_interval == "never" else float(fsync_interval),
+        )
+        
+        # Initialize clients; the pooled HTTP session is opened in open_outbound()
         self.web_client = AsyncWebClient(token=self.bot_token)
         self.socket_client: Optional[SocketModeClient] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.dispatcher: Optional[OutboundDispatcher] = None
+        self.post_rate = float(os.environ.get("SLACK_POST_RATE", "1.0"))
+        self.post_burst = int(os.environ.get("SLACK_POST_BURST", "3"))
+        
+        # Inbound events: acked on receipt, processed by a bounded worker pool
+        self.event_workers = int(os.environ.get("SLACK_EVENT_WORKERS", "4"))
+        self.event_queue_max = int(os.environ.get("SLACK_EVENT_QUEUE_MAX", "1000"))
+        self.events: Optional[asyncio.Queue] = None
+        self.workers = []
+        self.shutdown: Optional[asyncio.Event] = None
+        self.healthy: Optional[asyncio.Event] = None
+        
+        # Drops Socket Mode retries and reconnect redeliveries before any parsing
+        self.dedupe = DedupeCache(
+            max_entries=int(os.environ.get("SLACK_DEDUPE_MAX", "10000")),
+            ttl=float(os.environ.get("SLACK_DEDUPE_TTL", "3600")),
+            bloom_dir=os.environ.get("SLACK_DEDUPE_DIR") or None,
+        )
+        
+        # Per-stage latency: receive -> ack -> parsed -> queued
+        self.stage_latency = {stage: Histogram() for stage in ("ack", "parsed", "queued", "total")}
+        for stage, histogram in self.stage_latency.items():
+            mesh_metrics.REGISTRY.register("agent_mesh_slack_stage_seconds", histogram, stage=stage)
+        self.metrics_port = int(os.environ.get("AGENT_MESH_METRICS_PORT", "0"))
+        self.metrics_server = None
         
         logger.info(f"🔌 Slack fallback bot initialized for channel: {self.channel}")
     
-    async def post_research(self, agent: str, content: str, signed: bool = False):
-        """Post [RESEARCH] message to Slack"""
-        emoji = "🔮" if agent == "neuromancer" else "🤖" if agent == "clawdy" else "🦞"
+    def post_research(self, agent: str, content: str, signed: bool = False) -> asyncio.Future:
+        """Queue a [RESEARCH] post; returns the dispatcher future without waiting on Slack"""
+        record = self.registry.get(agent) if self.registry else None
+        emoji = record.emoji if record and record.emoji else "🦞"
         
         blocks = [
             {
@@ -86,20 +186,16 @@ class SlackFallbackBot:
                 ]
             })
         
-        try:
-            response = await self.web_client.chat_postMessage(
-                channel=self.channel,
+        with mesh_metrics.span("slack_post", kind="research"):
+            return self._track(self.dispatcher.submit(
+                PRIORITY_RESEARCH,
+                self.channel,
                 blocks=blocks,
                 text=f"[RESEARCH] {agent}: {content[:100]}..."
-            )
-            logger.info(f"✅ Posted research from {agent} to Slack")
-            return response
-        except Exception as e:
-            logger.error(f"❌ Failed to post research: {e}")
-            raise
+            ), f"research from {agent}")
     
-    async def post_synthesis(self, agent: str, content: str, contributors: list = None):
-        """Post [SYNTHESIS] message to Slack"""
+    def post_synthesis(self, agent: str, content: str, contributors: list = None) -> asyncio.Future:
+        """Queue a [SYNTHESIS] post; returns the dispatcher future"""
         contributor_text = ", ".join(contributors) if contributors else "Multi-agent"
         
         blocks = [
@@ -132,25 +228,22 @@ class SlackFallbackBot:
             }
         ]
         
-        try:
-            response = await self.web_client.chat_postMessage(
-                channel=self.channel,
+        with mesh_metrics.span("slack_post", kind="synthesis"):
+            return self._track(self.dispatcher.submit(
+                PRIORITY_SYNTHESIS,
+                self.channel,
                 blocks=blocks,
                 text=f"[SYNTHESIS] {agent}: {content[:100]}..."
-            )
-            logger.info(f"✅ Posted synthesis from {agent} to Slack")
-            return response
-        except Exception as e:
-            logger.error(f"❌ Failed to post synthesis: {e}")
-            raise
+            ), f"synthesis from {agent}")
     
-    async def post_system_message(self, message: str, priority: str = "normal"):
-        """Post system message (fallback activation, health alerts)"""
+    def post_system_message(self, message: str, priority: str = "normal") -> asyncio.Future:
+        """Queue a system message (fallback activation, health alerts); returns the dispatcher future"""
         emoji = "🚨" if priority == "urgent" else "⚠️" if priority == "warning" else "ℹ️"
         
-        try:
-            response = await self.web_client.chat_postMessage(
-                channel=self.channel,
+        with mesh_metrics.span("slack_post", kind="system"):
+            return self._track(self.dispatcher.submit(
+                PRIORITY_URGENT if priority == "urgent" else PRIORITY_SYSTEM,
+                self.channel,
                 blocks=[
                     {
                         "type": "section",
@@ -161,98 +254,233 @@ class SlackFallbackBot:
                     }
                 ],
                 text=f"[SYSTEM] {message}"
-            )
-            logger.info(f"✅ Posted system message: {message}")
-            return response
-        except Exception as e:
-            logger.error(f"❌ Failed to post system message: {e}")
-            raise
+            ), f"system message: {message}")
+    
+    def post_ack(self, agent: str, content: str) -> asyncio.Future:
+        """Post [ACK]; small ACKs still waiting for the rate limiter are merged into one post"""
+        with mesh_metrics.span("slack_post", kind="ack"):
+            return self._track(self.dispatcher.submit_ack(self.channel, f"[ACK] {agent}: {content}"),
+                               f"ack from {agent}")
+    
+    def _track(self, future: asyncio.Future, what: str) -> asyncio.Future:
+        """Log the outcome of a queued post when the dispatcher gets to it"""
+        def done(f: asyncio.Future):
+            if f.cancelled():
+                return
+            if f.exception():
+                mesh_metrics.inc("agent_mesh_slack_posts_total", result="error")
+                logger.error(f"❌ Failed to post {what}: {f.exception()}")
+            else:
+                mesh_metrics.inc("agent_mesh_slack_posts_total", result="ok")
+                logger.info(f"✅ Posted {what}")
+        future.add_done_callback(done)
+        return future
+    
+    async def open_outbound(self):
+        """Open one pooled HTTP session shared by all Slack calls and start the dispatcher"""
+        if self.dispatcher:
+            return
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60)
+        )
+        self.web_client = AsyncWebClient(token=self.bot_token, session=self.http_session)
+        self.dispatcher = OutboundDispatcher(
+            self.web_client.chat_postMessage,
+            rate=self.post_rate,
+            burst=self.post_burst,
+        )
+        await self.dispatcher.start()
+    
+    async def close_outbound(self):
+        """Flush queued posts and release the HTTP session"""
+        if self.dispatcher:
+            await self.dispatcher.close()
+            logger.info(f"📊 Outbound dispatcher: {json.dumps(self.dispatcher.metrics())}")
+            self.dispatcher = None
+        if self.http_session:
+            await self.http_session.close()
+            self.http_session = None
     
     async def handle_message(self, client, req):
-        """Handle incoming Slack messages"""
-        if req.type == "events_api":
+        """Ack the envelope immediately, then hand the event to the worker pool"""
+        with mesh_metrics.span("slack_handle_message"):
+            received = time.perf_counter()
+        
+            # Acknowledge receipt before any parsing or disk I/O so Slack never redelivers
+            response = SocketModeResponse(envelope_id=req.envelope_id)
+            await client.send_socket_mode_response(response)
+            acked = time.perf_counter()
+            self.stage_latency["ack"].observe(acked - received)
+        
+            mesh_metrics.inc("agent_mesh_slack_events_total", type=req.type)
+            if req.type != "events_api":
+                return
+        
             event = req.payload.get("event", {})
-            
+        
+            if self.dedupe.is_duplicate(event.get("channel"), event.get("ts"), req.envelope_id):
+                mesh_metrics.inc("agent_mesh_slack_duplicates_total")
+                logger.info(f"♻️  Dropped redelivered event {req.envelope_id}")
+                return
+        
             # Only process messages in our channel
             if event.get("channel") != self.channel:
                 return
-            
+        
             if event.get("type") != "message":
                 return
-            
+        
             # Skip bot messages
             if event.get("bot_id") or event.get("user") == "USLACKBOT":
                 return
+        
+            # Bounded: a full queue back-pressures this listener, not the ack
+            await self.events.put((event, received, acked))
+    
+    async def event_worker(self):
+        """Process queued Slack events until cancelled"""
+        while True:
+            event, received, acked = await self.events.get()
+            try:
+                await self.process_event(event, received, acked)
+            except Exception as e:
+                logger.error(f"❌ Failed to process Slack event: {e}")
+            finally:
+                self.events.task_done()
+    
+    async def process_event(self, event: dict, received: float, acked: float):
+        """Route one channel message: protocol messages to the queue, human commands to agents"""
+        user = event.get("user")
+        text = event.get("text", "")
+        ts = event.get("ts")
+        
+        logger.info(f"📨 Received message from {user}: {text[:50]}...")
+        
+        if self.health:
+            agent = agent_from_text(text, self.agent_ids)
+            if agent:
+                self.health.heartbeat(agent)
+        
+        if not self.bridging:
+            return  # auto mode with Matrix healthy: agents coordinate there
+        
+        # Parse protocol messages
+        if text.startswith("["):
+            message_data = self.build_queue_record(text, user, ts)
+            parsed = time.perf_counter()
+            self.stage_latency["parsed"].observe(parsed - acked)
             
-            user = event.get("user")
-            text = event.get("text", "")
-            ts = event.get("ts")
-            
-            logger.info(f"📨 Received message from {user}: {text[:50]}...")
-            
-            # Parse protocol messages
-            if text.startswith("["):
-                await self.parse_protocol_message(text, user, ts)
-            elif text.lower().startswith("mitko:") or text.lower().startswith("@mitko"):
-                # Human command — broadcast to other agents
-                await self.handle_human_command(text, user)
-        
-        # Acknowledge receipt
-        response = SocketModeResponse(envelope_id=req.envelope_id)
-        await client.send_socket_mode_response(response)
+            await self.write_to_queue(message_data)
+            queued = time.perf_counter()
+            self.stage_latency["queued"].observe(queued - parsed)
+            self.stage_latency["total"].observe(queued - received)
+        elif text.lower().startswith("mitko:") or text.lower().startswith("@mitko"):
+            # Human command — broadcast to other agents
+            await self.handle_human_command(text, user)
     
-    async def parse_protocol_message(self, text: str, user: str, timestamp: str):
-        """Parse [RESEARCH], [SYNTHESIS], etc. from Slack"""
-        # Extract prefix
-        if "]" in text:
-            prefix = text.split("]")[0] + "]"
-            content = text.split("]", 1)[1].strip()
+    def build_queue_record(self, text: str, user: str, timestamp: str) -> dict:
+        """Parse [RESEARCH], [SYNTHESIS], etc. into a queue record"""
+        message = self.protocol.parse(text)
+        
+        if message.is_protocol:
+            logger.info(f"📝 Parsed protocol message: {message.prefix}")
         else:
-            prefix = "[MESSAGE]"
-            content = text
-        
-        logger.info(f"📝 Parsed protocol message: {prefix}")
-        
-        # Store in local queue for agent pickup
-        message_data = {
-            "source": "slack",
-            "timestamp": timestamp,
-            "user": user,
-            "prefix": prefix,
-            "content": content,
-            "raw": text
-        }
+            logger.info(f"📝 Parsed message with unregistered prefix: {message.prefix}")
         
-        # Write to file queue for agent consumption
-        await self.write_to_queue(message_data)
+        return message.to_record(source="slack", timestamp=timestamp, user=user)
+    
+    async def parse_protocol_message(self, text: str, user: str, timestamp: str):
+        """Parse [RESEARCH], [SYNTHESIS], etc. from Slack and queue for agent pickup"""
+        await self.write_to_queue(self.build_queue_record(text, user, timestamp))
     
     async def handle_human_command(self, text: str, user: str):
         """Handle human commands from Slack"""
         logger.info(f"👤 Human command received: {text[:50]}...")
         
         # Forward to agents
-        await self.web_client.chat_postMessage(
-            channel=self.channel,
+        self._track(self.dispatcher.submit(
+            PRIORITY_SYSTEM,
+            self.channel,
             text=f"📢 Human command: {text[:200]}...",
             thread_ts=None  # Start new thread
-        )
+        ), "human command")
     
     async def write_to_queue(self, message_data: dict):
-        """Write message to file queue for agent pickup"""
-        import aiofiles
-        
-        queue_file = "/tmp/agent-mesh-slack-queue.jsonl"
-        
-        try:
-            async with aiofiles.open(queue_file, mode='a') as f:
-                await f.write(json.dumps(message_data) + '\n')
-            logger.info(f"✅ Wrote message to queue: {queue_file}")
-        except Exception as e:
-            logger.error(f"❌ Failed to write to queue: {e}")
+        """Hand message to the write-behind queue writer for agent pickup"""
+        trace = None
+        if mesh_metrics.tracing():
+            trace = hashlib.sha256(message_data.get("raw", "").encode("utf-8")).hexdigest()
+        with mesh_metrics.span("slack_write_to_queue", trace) as span:
+            queued = await self.queue_writer.put(message_data)
+            span.annotate(kind=message_data.get("kind"), queued=queued)
+        if queued:
+            logger.info(f"✅ Queued message (depth {self.queue_writer.depth})")
+        else:
+            logger.error(f"❌ Queue full — dropped message ({self.queue_writer.dropped} dropped)")
+    
+    async def on_channel_change(self, mode: str, reason: str):
+        """Announce a Matrix↔Slack switch decided by the health monitor"""
+        if mode == FALLBACK:
+            self.post_system_message(
+                f"Matrix unavailable ({reason}) — Switching to Slack fallback", priority="urgent")
+        else:
+            self.post_system_message(
+                f"Matrix recovered ({reason}) — Returning to Matrix coordination", priority="normal")
+    
+    @property
+    def bridging(self) -> bool:
+        """Always with SLACK_ENABLED=true; with auto, only while the monitor says fallback"""
+        return self.health is None or self.health.mode == FALLBACK
+    
+    def transport(self, **options) -> "SlackTransport":
+        """Message-bus factory bound to this bot (registered as "slack" while it runs)"""
+        return SlackTransport(self, **options)
+    
+    def stop(self):
+        """Request a clean shutdown (safe to call from signal handlers)"""
+        if self.shutdown:
+            self.shutdown.set()
+    
+    def metrics(self) -> dict:
+        return {
+            "healthy": bool(self.healthy and self.healthy.is_set()),
+            "event_queue_depth": self.events.qsize() if self.events else 0,
+            "stage_latency": {stage: h.snapshot() for stage, h in self.stage_latency.items()},
+            "dedupe": self.dedupe.metrics(),
+            "queue_writer": self.queue_writer.metrics(),
+            "dispatcher": self.dispatcher.metrics() if self.dispatcher else None,
+            "health": self.health.metrics() if self.health else None,
+        }
     
     async def start(self):
-        """Start Slack fallback bot"""
+        """Start Slack fallback bot and run until stop() or SIGINT/SIGTERM"""
+        self.shutdown = asyncio.Event()
+        self.healthy = asyncio.Event()
+        self.events = asyncio.Queue(maxsize=self.event_queue_max)
+        
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread / unsupported platform
+        
+        mesh_metrics.REGISTRY.gauge("agent_mesh_slack_event_queue_depth", self.events.qsize)
+        mesh_metrics.REGISTRY.gauge("agent_mesh_queue_depth", lambda: self.queue_writer.depth)
+        if self.metrics_port:
+            mesh_metrics.enable()
+            self.metrics_server = mesh_metrics.serve(self.metrics_port)
+            logger.info(f"📊 Prometheus metrics on :{self.metrics_port}/metrics")
+        
+        health_task = None
         try:
+            await self.queue_writer.start()
+            await self.open_outbound()
+            register_transport("slack", self.transport)
+            self.workers = [
+                asyncio.create_task(self.event_worker()) for _ in range(self.event_workers)
+            ]
+            
             self.socket_client = SocketModeClient(
                 app_token=self.app_token,
                 web_client=self.web_client
@@ -261,63 +489,151 @@ class SlackFallbackBot:
             self.socket_client.socket_mode_request_listeners.append(self.handle_message)
             
             await self.socket_client.connect()
+            self.healthy.set()
             logger.info("🔌 Slack fallback bot connected — Standing by")
             
-            # Post startup message
-            await self.post_system_message(
-                "Slack fallback channel active — Ready for coordination",
-                priority="normal"
-            )
+            # Post startup message; in auto mode on_channel_change announces the switch instead
+            if not self.health:
+                self.post_system_message(
+                    "Slack fallback channel active — Ready for coordination",
+                    priority="normal"
+                )
+            
+            if self.health:
+                health_task = asyncio.create_task(self.health.run(self.shutdown))
+                logger.info("🩺 Auto-failover on — probing Matrix health")
             
-            # Keep running
-            while True:
-                await asyncio.sleep(1)
+            await self.shutdown.wait()
+            logger.info("🛑 Shutting down Slack fallback bot")
                 
         except KeyboardInterrupt:
             logger.info("🛑 Shutting down Slack fallback bot")
         except Exception as e:
             logger.error(f"❌ Error in Slack bot: {e}")
             raise
+        finally:
+            self.healthy.clear()
+            if TRANSPORTS.get("slack") == self.transport:
+                del TRANSPORTS["slack"]
+            if health_task:
+                health_task.cancel()
+                await asyncio.gather(health_task, return_exceptions=True)
+            if self.socket_client:
+                await self.socket_client.close()
+            # Finish events already acked to Slack before closing the queue
+            if self.workers:
+                await self.events.join()
+                for worker in self.workers:
+                    worker.cancel()
+                await asyncio.gather(*self.workers, return_exceptions=True)
+                self.workers = []
+            await self.close_outbound()
+            await self.queue_writer.close()
+            self.dedupe.close()
+            if self.metrics_server:
+                self.metrics_server.shutdown()
+                self.metrics_server = None
+            logger.info(f"📊 Bot metrics: {json.dumps(self.metrics())}")
+
+
+class SlackTransport(Transport):
+    """The Slack bot as a message-bus transport; send() returns Slack's response to the post
+
+    The bus buffers each transport separately, so waiting here for the rate
+    limiter and Slack holds up only this route, and a failed post counts as
+    failed rather than delivered.
+    """
+
+    name = "slack"
+
+    def __init__(self, bot: SlackFallbackBot, kinds=None):
+        super().__init__(kinds)
+        self.bot = bot
+        self._owns_outbound = False
+
+    async def start(self):
+        if not self.bot.dispatcher:
+            await self.bot.open_outbound()
+            self._owns_outbound = True
+
+    async def close(self):
+        if self._owns_outbound:
+            await self.bot.close_outbound()
+
+    async def send(self, envelope: Envelope):
+        kind, agent, meta = envelope.kind or "", envelope.agent, envelope.meta
+        if kind.startswith("research"):
+            post = self.bot.post_research(agent, envelope.content, meta.get("signed", False))
+        elif kind == "synthesis":
+            post = self.bot.post_synthesis(agent, envelope.content, meta.get("contributors"))
+        elif kind == "ack":
+            post = self.bot.post_ack(agent, envelope.content)
+        elif envelope.prefix == "[SYSTEM]":
+            post = self.bot.post_system_message(envelope.content, meta.get("priority", "normal"))
+        else:
+            post = self.bot._track(self.bot.dispatcher.submit(
+                PRIORITY_RESEARCH, self.bot.channel, text=envelope.text[:3000]
+            ), f"{envelope.prefix} from {agent}")
+        return await post
+
+    async def probe(self) -> bool:
+        response = await self.bot.web_client.auth_test()
+        return bool(response.get("ok"))
+
+    def metrics(self) -> dict:
+        return self.bot.dispatcher.metrics() if self.bot.dispatcher else {}
 
 
-def test_mode():
-    """Test Slack fallback without full bot"""
-    import asyncio
+def test_mode(bot: SlackFallbackBot) -> int:
+    """Post one message of each kind and wait for Slack's answers; returns the failure count"""
     
     async def test():
-        bot = SlackFallbackBot()
-        
-        # Test post research
-        await bot.post_research(
-            agent="neuromancer",
-            content="Test research message from Slack fallback",
-            signed=True
-        )
-        
-        # Test post synthesis
-        await bot.post_synthesis(
-            agent="clawdy",
-            content="Test synthesis message via Slack",
-            contributors=["neuromancer", "clawdy"]
-        )
-        
-        # Test system message
-        await bot.post_system_message(
-            "Test system alert — Slack fallback working",
-            priority="warning"
-        )
+        await bot.open_outbound()
+        try:
+            posts = {
+                "research": bot.post_research(
+                    agent="neuromancer",
+                    content="Test research message from Slack fallback",
+                    signed=True
+                ),
+                "synthesis": bot.post_synthesis(
+                    agent="clawdy",
+                    content="Test synthesis message via Slack",
+                    contributors=["neuromancer", "clawdy"]
+                ),
+                "system message": bot.post_system_message(
+                    "Test system alert — Slack fallback working",
+                    priority="warning"
+                ),
+            }
+            results = await asyncio.gather(*posts.values(), return_exceptions=True)
+        finally:
+            await bot.close_outbound()
         
-        logger.info("✅ Test messages posted successfully")
+        failed = [what for what, result in zip(posts, results) if isinstance(result, Exception)]
+        if failed:
+            logger.error(f"❌ {len(failed)}/{len(posts)} test messages failed: {', '.join(failed)}")
+        else:
+            logger.info("✅ Test messages posted successfully")
+        return len(failed)
     
-    asyncio.run(test())
+    return asyncio.run(test())
 
 
 if __name__ == "__main__":
+    try:
+        bot = SlackFallbackBot()
+    except SlackDisabled as e:
+        logger.warning(f"⚠️  {e}")
+        sys.exit(0)
+    except SlackConfigError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    
     # Check for test mode
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         logger.info("🧪 Running in test mode")
-        test_mode()
+        sys.exit(1 if test_mode(bot) else 0)
     else:
         # Run full bot
-        bot = SlackFallbackBot()
         asyncio.run(bot.start())
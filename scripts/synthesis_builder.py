@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Build a task's synthesis branch from its agent branches without a checkout
+Usage: python3 scripts/synthesis_builder.py <task-YYYY-MM-DD-description> [--repo PATH]
+           [--base main] [--remote origin] [--agent ID ...] [--dry-run] [--force]
+
+docs/git-workflow-v1.1.md has the synthesizer check out the synthesis
+branch and `git merge` each {agent-id} branch in turn. This tool does the
+same merge in the object database only: every agent's changed paths are
+collected in parallel, then the base and agent heads are combined in a
+tournament of `git merge-tree --write-tree` merges. Each round's pairs run
+concurrently, so N branches take log2(N+1) rounds instead of N checkouts.
+
+Conflicts are reported, with the agents whose branches touched each path,
+before anything is written. A clean plan becomes one synthesis commit
+whose parents are the base and every agent head, stored with commit-tree
+and update-ref; the working tree and index are never touched, so this
+works in bare repositories too. Branch names follow git_workflow in
+agents.yaml. Requires git >= 2.38.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_BRANCH_PATTERN = "task-YYYY-MM-DD-{description}/{agent-id}"
+DEFAULT_SYNTHESIS_PATTERN = "task-YYYY-MM-DD-{description}/synthesis"
+TASK_PLACEHOLDER = "task-YYYY-MM-DD-{description}"
+AGENT_PLACEHOLDER = "{agent-id}"
+BASE = "base"  # label for the base branch in conflict reports
+
+# Identity for the throwaway commits between tournament rounds
+INTERMEDIATE_IDENTITY = {
+    "GIT_AUTHOR_NAME": "agent-mesh synthesis",
+    "GIT_AUTHOR_EMAIL": "synthesis@agent-mesh",
+    "GIT_COMMITTER_NAME": "agent-mesh synthesis",
+    "GIT_COMMITTER_EMAIL": "synthesis@agent-mesh",
+}
+
+
+class GitError(Exception):
+    """A git command failed or the repository is not in the expected state"""
+
+
+class AgentBranch(NamedTuple):
+    agent: str
+    ref: str
+    commit: str
+    changed: FrozenSet[str]  # paths changed since the branch left the base
+
+
+class Conflict(NamedTuple):
+    path: str
+    agents: Tuple[str, ...]  # branches (or BASE) that changed the path
+
+
+class SynthesisPlan(NamedTuple):
+    task: str
+    synthesis_branch: str
+    base: str
+    base_commit: str
+    branches: Tuple[AgentBranch, ...]
+    tree: Optional[str]
+    conflicts: Tuple[Conflict, ...]
+
+    @property
+    def clean(self) -> bool:
+        return self.tree is not None and not self.conflicts
+
+
+class Git:
+    """Thin subprocess wrapper around one repository"""
+
+    def __init__(self, repo: str = "."):
+        self.repo = str(repo)
+
+    def run(self, *args: str, ok: Sequence[int] = (0,), env: Optional[dict] = None) -> tuple:
+        """Run git, returning (returncode, stdout); other codes raise GitError"""
+        proc = subprocess.run(["git", "-C", self.repo, *args], capture_output=True,
+                              env={**os.environ, **env} if env else None)
+        if proc.returncode not in ok:
+            raise GitError(f"git {args[0]} failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+        return proc.returncode, proc.stdout.decode("utf-8", "replace")
+
+    def rev_parse(self, ref: str) -> Optional[str]:
+        code, out = self.run("rev-parse", "--verify", "-q", f"{ref}^{{commit}}", ok=(0, 1))
+        return out.strip() if code == 0 else None
+
+    def changed_paths(self, old: str, new: str) -> FrozenSet[str]:
+        _, out = self.run("diff", "--name-only", "-z", "--no-renames", old, new)
+        return frozenset(path for path in out.split("\0") if path)
+
+    def merge_tree(self, ours: str, theirs: str) -> Tuple[str, List[str]]:
+        """(tree, conflicted paths) of merging two commits, computed in the object store"""
+        code, out = self.run("merge-tree", "--write-tree", "--name-only", "--no-messages", "-z",
+                             ours, theirs, ok=(0, 1))
+        fields = out.split("\0")
+        return fields[0], [path for path in fields[1:] if path] if code == 1 else []
+
+    def commit_tree(self, tree: str, parents: Sequence[str], message: str,
+                    env: Optional[dict] = None) -> str:
+        args = ["commit-tree", tree, "-m", message]
+        for parent in parents:
+            args += ["-p", parent]
+        return self.run(*args, env=env)[1].strip()
+
+
+def branch_name(pattern: str, task: str, agent: str = "") -> str:
+    return pattern.replace(TASK_PLACEHOLDER, task).replace(AGENT_PLACEHOLDER, agent)
+
+
+def workflow_patterns(registry_path=None) -> Tuple[str, str]:
+    """(branch_pattern, synthesis_branch_pattern) from agents.yaml, else the v1.1 defaults"""
+    try:
+        from agent_registry import load_registry
+        workflow = load_registry(registry_path).protocol.get("git_workflow") or {}
+    except (FileNotFoundError, ImportError):
+        workflow = {}
+    return (workflow.get("branch_pattern", DEFAULT_BRANCH_PATTERN),
+            workflow.get("synthesis_branch_pattern", DEFAULT_SYNTHESIS_PATTERN))
+
+
+class SynthesisBuilder:
+    """Plans and writes one task's synthesis merge"""
+
+    def __init__(self, repo: str, task: str, base: str = "main", remote: Optional[str] = None,
+                 agents: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+                 branch_pattern: str = DEFAULT_BRANCH_PATTERN,
+                 synthesis_pattern: str = DEFAULT_SYNTHESIS_PATTERN):
+        if AGENT_PLACEHOLDER not in branch_pattern:
+            raise ValueError(f"branch pattern has no {AGENT_PLACEHOLDER}: {branch_pattern}")
+        self.git = Git(repo)
+        self.task = task
+        self.base = base
+        self.remote = remote
+        self.agents = set(agents) if agents else None
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.branch_pattern = branch_pattern
+        self.synthesis_branch = branch_name(synthesis_pattern, task)
+
+    def discover(self) -> List[Tuple[str, str, str]]:
+        """(agent, ref, commit) for every agent branch of the task, sorted by agent"""
+        prefix, suffix = branch_name(self.branch_pattern, self.task, "\0").split("\0")
+        namespace = f"refs/remotes/{self.remote}/" if self.remote else "refs/heads/"
+        synthesis = self.synthesis_branch[len(prefix):] if self.synthesis_branch.startswith(prefix) else None
+        _, out = self.git.run("for-each-ref", "--format=%(objectname) %(refname)",
+                              namespace + prefix.rsplit("/", 1)[0] if "/" in prefix else namespace)
+        found = []
+        for line in out.splitlines():
+            commit, ref = line.split(" ", 1)
+            name = ref[len(namespace):]
+            if not name.startswith(prefix) or not name.endswith(suffix):
+                continue
+            agent = name[len(prefix):len(name) - len(suffix)]
+            if not agent or "/" in agent or agent == synthesis or agent.startswith("synthesis"):
+                continue
+            if self.agents is not None and agent not in self.agents:
+                continue
+            found.append((agent, ref, commit))
+        return sorted(found)
+
+    def plan(self) -> SynthesisPlan:
+        """Merge everything in memory; nothing is referenced until write()"""
+        base_ref = f"{self.remote}/{self.base}" if self.remote else self.base
+        base_commit = self.git.rev_parse(base_ref)
+        if base_commit is None:
+            raise GitError(f"Base branch not found: {base_ref}")
+        heads = self.discover()
+        if not heads:
+            raise GitError(f"No agent branches found for {self.task}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            changed = pool.map(lambda head: self._changed_since_fork(head[2], base_commit), heads)
+            branches = tuple(AgentBranch(agent, ref, commit, paths)
+                             for (agent, ref, commit), paths in zip(heads, changed))
+            touched: Dict[str, FrozenSet[str]] = {b.agent: b.changed for b in branches}
+            touched[BASE] = self._base_changes(base_commit, [b.commit for b in branches])
+
+            tree, conflicts = self._tournament(pool, base_commit, branches, touched)
+
+        return SynthesisPlan(self.task, self.synthesis_branch, base_ref, base_commit,
+                             branches, tree, tuple(conflicts))
+
+    def _changed_since_fork(self, commit: str, base_commit: str) -> FrozenSet[str]:
+        _, out = self.git.run("merge-base", base_commit, commit, ok=(0, 1))
+        fork = out.strip() or base_commit
+        return self.git.changed_paths(fork, commit)
+
+    def _base_changes(self, base_commit: str, commits: List[str]) -> FrozenSet[str]:
+        code, out = self.git.run("merge-base", "--octopus", base_commit, *commits, ok=(0, 1))
+        if code != 0 or not out.strip():
+            return frozenset()
+        return self.git.changed_paths(out.strip(), base_commit)
+
+    def _tournament(self, pool: ThreadPoolExecutor, base_commit: str,
+                    branches: Sequence[AgentBranch], touched: Dict[str, FrozenSet[str]]) -> tuple:
+        """Pairwise-merge (commit, agents) entries round by round until one is left
+
+        A conflicted pair still yields its merge-tree result (with markers) so
+        later rounds keep reporting conflicts on other paths.
+        """
+        entries = [(base_commit, (BASE,))] + [(b.commit, (b.agent,)) for b in branches]
+        conflicts: Dict[str, Conflict] = {}
+        tree = None  # always set: there is at least the base and one agent
+
+        def merge(pair):
+            (ours, ours_agents), (theirs, theirs_agents) = pair
+            tree, paths = self.git.merge_tree(ours, theirs)
+            agents = ours_agents + theirs_agents
+            commit = self.git.commit_tree(tree, [ours, theirs], f"synthesis: {', '.join(agents)}",
+                                          env=INTERMEDIATE_IDENTITY)
+            return (commit, agents), tree, paths
+
+        while len(entries) > 1:
+            pairs = [entries[i:i + 2] for i in range(0, len(entries) - 1, 2)]
+            leftover = entries[-1:] if len(entries) % 2 else []
+            merged = []
+            for entry, tree, paths in pool.map(merge, pairs):
+                merged.append(entry)
+                for path in paths:
+                    if path not in conflicts:
+                        agents = tuple(a for a in entry[1] if path in touched.get(a, ()))
+                        conflicts[path] = Conflict(path, agents)
+            entries = merged + leftover
+
+        return tree, [conflicts[path] for path in sorted(conflicts)]
+
+    def message(self, plan: SynthesisPlan) -> str:
+        lines = [f"Synthesis: {plan.task}", "", f"Merged onto {plan.base} ({plan.base_commit[:12]}):"]
+        lines += [f"- {b.agent} ({b.commit[:12]}, {len(b.changed)} files)" for b in plan.branches]
+        return "\n".join(lines) + "\n"
+
+    def write(self, plan: SynthesisPlan, message: Optional[str] = None, force: bool = False) -> str:
+        """Commit a clean plan and point the synthesis branch at it"""
+        if not plan.clean:
+            raise GitError(f"{len(plan.conflicts)} conflicting paths; synthesis not written")
+        parents = [plan.base_commit] + [b.commit for b in plan.branches]
+        commit = self.git.commit_tree(plan.tree, parents, message or self.message(plan))
+        ref = f"refs/heads/{plan.synthesis_branch}"
+        if force:
+            self.git.run("update-ref", "-m", "synthesis_builder", ref, commit)
+        else:
+            code, _ = self.git.run("update-ref", "-m", "synthesis_builder", ref, commit, "",
+                                   ok=(0, 1, 128))
+            if code != 0:
+                raise GitError(f"{plan.synthesis_branch} already exists (use --force to replace)")
+        return commit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a synthesis branch without a checkout")
+    parser.add_argument("task", help="Task name, e.g. task-2026-02-13-mcp-security")
+    parser.add_argument("--repo", default=".", help="Repository (bare or not; default: .)")
+    parser.add_argument("--base", default="main", help="Branch the synthesis starts from")
+    parser.add_argument("--remote", default=None, help="Read agent branches from this remote's refs")
+    parser.add_argument("--agent", action="append", default=None, help="Only merge these agents")
+    parser.add_argument("--registry", default=None, help="agents.yaml for git_workflow patterns")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel git processes")
+    parser.add_argument("--dry-run", action="store_true", help="Report the plan, write nothing")
+    parser.add_argument("--force", action="store_true", help="Replace an existing synthesis branch")
+    args = parser.parse_args()
+
+    branch_pattern, synthesis_pattern = workflow_patterns(args.registry)
+    builder = SynthesisBuilder(args.repo, args.task, args.base, args.remote, args.agent,
+                               args.workers, branch_pattern, synthesis_pattern)
+    try:
+        plan = builder.plan()
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+
+    print(f"🔀 {plan.task}: {len(plan.branches)} agent branches onto {plan.base} "
+          f"({plan.base_commit[:12]})")
+    for branch in plan.branches:
+        print(f"   {branch.agent:<16} {branch.commit[:12]}  {len(branch.changed)} files changed")
+
+    if plan.conflicts:
+        print(f"❌ {len(plan.conflicts)} conflicting paths:")
+        for conflict in plan.conflicts:
+            print(f"   {conflict.path}  ({', '.join(conflict.agents) or 'unattributed'})")
+        sys.exit(1)
+
+    if args.dry_run:
+        print(f"✅ Clean merge (tree {plan.tree[:12]}); dry run, nothing written")
+        return
+
+    try:
+        commit = builder.write(plan, force=args.force)
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"✅ {plan.synthesis_branch} → {commit[:12]}")
+
+
+if __name__ == "__main__":
+    main()
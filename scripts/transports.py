@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Pluggable transports and an in-process async message bus
+Usage: python3 scripts/transports.py publish <message.md> --agent ID [--channels file_queue,git_issues]
+       python3 scripts/transports.py probe [--channels ...]
+Environment: SLACK_QUEUE_DIR (file_queue), MESH_GIT_REPO / MESH_GIT_ISSUE (git_issues)
+
+One outbound protocol message is published once and fanned out to every
+active transport concurrently. Each transport has its own bounded buffer
+and delivery task, so a slow or dead channel never holds up the others;
+when a buffer is full the transport's overflow policy applies ("block"
+back-pressures the publisher, "drop_newest"/"drop_oldest" shed load).
+
+Transports implement send() and probe(); probe() has the shape
+health_monitor.HealthMonitor expects, so any transport can be health
+checked. Channel names follow protocol.communication.fallback_channels in
+agents.yaml: file_queue and git_issues live here, slack is registered by
+a running slack_fallback_bot.py, and loopback is an in-memory subscriber
+for tests and in-process consumers.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import argparse
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from mesh_metrics import Histogram
+from mesh_protocol import get_parser
+from queue_writer import QueueWriter, OVERFLOW_POLICIES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER = 1000
+_STOP = object()
+
+
+class Envelope(NamedTuple):
+    """One outbound protocol message, parsed once for every transport"""
+    text: str
+    agent: str
+    kind: Optional[str]
+    prefix: str
+    content: str
+    meta: dict
+
+    @classmethod
+    def create(cls, text: str, agent: str, parser=None, **meta) -> "Envelope":
+        """meta: transport hints such as signed=True, contributors=[...], priority="urgent" """
+        message = (parser or get_parser()).parse(text)
+        return cls(text, agent, message.kind, message.prefix, message.content, meta)
+
+    def to_record(self, source: str) -> dict:
+        """Queue record in the same schema as inbound Slack messages"""
+        return {
+            "source": source,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "user": self.agent,
+            "prefix": self.prefix,
+            "kind": self.kind,
+            "content": self.content,
+            "raw": self.text,
+        }
+
+
+class Transport(ABC):
+    """A delivery channel; kinds limits which protocol kinds it carries (None = all)"""
+
+    name = "transport"
+
+    def __init__(self, kinds: Optional[Iterable[str]] = None):
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.active = True
+
+    def accepts(self, envelope: Envelope) -> bool:
+        return self.active and (self.kinds is None or envelope.kind in self.kinds)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def send(self, envelope: Envelope) -> Any:
+        """Deliver (or hand off) one message; raise on failure"""
+
+    async def probe(self) -> bool:
+        """True if the channel is usable right now"""
+        return True
+
+    def metrics(self) -> dict:
+        return {}
+
+
+class LoopbackTransport(Transport):
+    """In-memory subscriber: delivered messages are kept and can be awaited"""
+
+    name = "loopback"
+
+    def __init__(self, name: str = "loopback", kinds: Optional[Iterable[str]] = None, keep: bool = True):
+        super().__init__(kinds)
+        self.name = name
+        self.keep = keep
+        self.delivered: List[Envelope] = []
+        self._inbox: Optional[asyncio.Queue] = None  # created on the running loop
+
+    @property
+    def inbox(self) -> asyncio.Queue:
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        return self._inbox
+
+    async def send(self, envelope: Envelope):
+        if self.keep:
+            self.delivered.append(envelope)
+        self.inbox.put_nowait(envelope)
+
+    async def receive(self) -> Envelope:
+        return await self.inbox.get()
+
+
+class FileQueueTransport(Transport):
+    """Appends to the agent-mesh file queue through a write-behind QueueWriter"""
+
+    name = "file_queue"
+
+    def __init__(self, sink=None, kinds: Optional[Iterable[str]] = None, **writer_options):
+        """sink: FileQueue, JSONL path or queue directory (default: $SLACK_QUEUE_DIR)"""
+        super().__init__(kinds)
+        if sink is None or (isinstance(sink, (str, Path)) and not str(sink).endswith(".jsonl")):
+            from file_queue import FileQueue, DEFAULT_QUEUE_DIR
+            sink = FileQueue(str(sink or os.environ.get("SLACK_QUEUE_DIR", DEFAULT_QUEUE_DIR)))
+        self.writer = QueueWriter(str(sink) if isinstance(sink, Path) else sink, **writer_options)
+
+    async def start(self):
+        await self.writer.start()
+
+    async def close(self):
+        await self.writer.close()
+
+    async def send(self, envelope: Envelope) -> bool:
+        if not await self.writer.put(envelope.to_record(source="bus")):
+            raise BufferError("file queue writer dropped the record")
+        return True
+
+    async def probe(self) -> bool:
+        return self.writer._task is not None and not self.writer._task.done()
+
+    def metrics(self) -> dict:
+        return self.writer.metrics()
+
+
+class GitIssuesTransport(Transport):
+    """Posts messages as GitHub issue comments (or new issues) with the gh CLI"""
+
+    name = "git_issues"
+
+    def __init__(self, repo: Optional[str] = None, issue: Optional[str] = None,
+                 label: Optional[str] = "agent-mesh", gh: str = "gh",
+                 kinds: Optional[Iterable[str]] = None):
+        super().__init__(kinds)
+        self.repo = repo or os.environ.get("MESH_GIT_REPO")
+        self.issue = issue or os.environ.get("MESH_GIT_ISSUE")
+        self.label = label
+        self.gh = gh
+
+    def command(self, envelope: Envelope) -> List[str]:
+        if self.issue:
+            args = [self.gh, "issue", "comment", str(self.issue), "--body-file", "-"]
+        else:
+            title = envelope.text.split("\n", 1)[0][:200]
+            args = [self.gh, "issue", "create", "--title", title, "--body-file", "-"]
+            if self.label:
+                args += ["--label", self.label]
+        if self.repo:
+            args += ["--repo", self.repo]
+        return args
+
+    async def _run(self, args: List[str], stdin: Optional[bytes] = None) -> tuple:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE)
+        stdout, stderr = await process.communicate(stdin)
+        return process.returncode, stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+
+    async def send(self, envelope: Envelope) -> str:
+        body = f"**From:** {envelope.agent}\n\n{envelope.text}"
+        code, stdout, stderr = await self._run(self.command(envelope), body.encode("utf-8"))
+        if code != 0:
+            raise RuntimeError(f"gh exited {code}: {stderr.strip()}")
+        return stdout.strip()  # URL of the comment or issue
+
+    async def probe(self) -> bool:
+        try:
+            code, _, _ = await self._run([self.gh, "auth", "status"])
+        except OSError:
+            return False
+        return code == 0
+
+
+# Transport factories by channel name; plugins register themselves here
+TRANSPORTS: Dict[str, Callable[..., Transport]] = {
+    "loopback": LoopbackTransport,
+    "file_queue": FileQueueTransport,
+    "git_issues": GitIssuesTransport,
+}
+
+
+def register_transport(name: str, factory: Callable[..., Transport]):
+    TRANSPORTS[name] = factory
+
+
+class _Route:
+    """Bounded buffer plus delivery task for one transport"""
+
+    def __init__(self, transport: Transport, buffer: int, overflow: str):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.transport = transport
+        self.buffer = buffer
+        self.overflow = overflow
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.latency = Histogram()
+
+    def offer(self, item: tuple, wait: bool) -> Optional[Any]:
+        """Enqueue without waiting; returns an awaitable if the caller must block"""
+        try:
+            self.queue.put_nowait(item)
+            return None
+        except asyncio.QueueFull:
+            pass
+        if self.overflow == "block" and wait:
+            return self.queue.put(item)
+        self.dropped += 1
+        if self.overflow == "drop_oldest":
+            _, _, future = self.queue.get_nowait()
+            future.cancel()
+            self.queue.task_done()
+            self.queue.put_nowait(item)
+        else:
+            item[2].cancel()
+        return None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                envelope, queued, future = item
+                if future.cancelled():
+                    continue
+                try:
+                    result = await self.transport.send(envelope)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"❌ {self.transport.name}: {e}")
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                self.sent += 1
+                self.latency.observe(loop.time() - queued)
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    def metrics(self) -> dict:
+        return {
+            "active": self.transport.active,
+            "buffered": self.queue.qsize() if self.queue else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "latency": self.latency.snapshot(),
+            "transport": self.transport.metrics(),
+        }
+
+
+def _mark_retrieved(future: asyncio.Future):
+    # Failures are logged by the route; callers that don't await the receipt get no warning
+    if not future.cancelled():
+        future.exception()
+
+
+class MessageBus:
+    """Fans each published message out to all active transports"""
+
+    def __init__(self, transports: Iterable[Transport] = (), buffer: int = DEFAULT_BUFFER,
+                 overflow: str = "block"):
+        self.buffer = buffer
+        self.overflow = overflow
+        self.routes: Dict[str, _Route] = {}
+        self._started = False
+        for transport in transports:
+            self.add(transport)
+
+    def add(self, transport: Transport, buffer: Optional[int] = None,
+            overflow: Optional[str] = None) -> Transport:
+        if transport.name in self.routes:
+            raise ValueError(f"Transport '{transport.name}' already on the bus")
+        route = self.routes[transport.name] = _Route(
+            transport, buffer or self.buffer, overflow or self.overflow)
+        if self._started:
+            self._open(route)
+        return transport
+
+    def subscribe(self, name: str, kinds: Optional[Iterable[str]] = None) -> LoopbackTransport:
+        """In-process subscriber; `await sub.receive()` yields matching messages"""
+        return self.add(LoopbackTransport(name, kinds, keep=False))
+
+    def set_active(self, name: str, active: bool):
+        self.routes[name].transport.active = active
+
+    def _open(self, route: _Route):
+        route.queue = asyncio.Queue(maxsize=route.buffer)
+        route.task = asyncio.create_task(route.run())
+
+    async def start(self):
+        if self._started:
+            return
+        self._started = True
+        await asyncio.gather(*(route.transport.start() for route in self.routes.values()))
+        for route in self.routes.values():
+            self._open(route)
+
+    async def close(self):
+        """Deliver everything buffered, stop the routes and close the transports"""
+        if not self._started:
+            return
+        for route in self.routes.values():
+            await route.queue.put(_STOP)
+        await asyncio.gather(*(route.task for route in self.routes.values()))
+        await asyncio.gather(*(route.transport.close() for route in self.routes.values()),
+                             return_exceptions=True)
+        self._started = False
+
+    def _fan_out(self, envelope: Envelope, wait: bool) -> tuple:
+        loop = asyncio.get_running_loop()
+        receipts, blocked = {}, []
+        for name, route in self.routes.items():
+            if not route.transport.accepts(envelope):
+                continue
+            future = loop.create_future()
+            future.add_done_callback(_mark_retrieved)
+            pending = route.offer((envelope, loop.time(), future), wait)
+            if pending is not None:
+                blocked.append(pending)
+            receipts[name] = future
+        return receipts, blocked
+
+    async def publish(self, envelope: Envelope) -> Dict[str, asyncio.Future]:
+        """Queue for every transport; waits only while a "block" buffer is full
+
+        Returns one future per transport resolving to that transport's
+        send() result; dropped messages come back cancelled.
+        """
+        receipts, blocked = self._fan_out(envelope, wait=True)
+        if blocked:
+            await asyncio.gather(*blocked)
+        return receipts
+
+    def publish_nowait(self, envelope: Envelope) -> Dict[str, asyncio.Future]:
+        """Never waits: a full buffer drops the message for that transport"""
+        return self._fan_out(envelope, wait=False)[0]
+
+    async def probe(self) -> Dict[str, bool]:
+        """Probe every transport concurrently"""
+        names = list(self.routes)
+        results = await asyncio.gather(*(self.routes[n].transport.probe() for n in names),
+                                       return_exceptions=True)
+        return {name: result is True for name, result in zip(names, results)}
+
+    def metrics(self) -> dict:
+        return {name: route.metrics() for name, route in self.routes.items()}
+
+
+def build_bus(channels: Optional[Iterable[str]] = None, registry=None, **options) -> MessageBus:
+    """Bus over the named channels (default: agents.yaml fallback_channels we can build)"""
+    if channels is None:
+        if registry is None:
+            from agent_registry import load_registry
+            registry = load_registry()
+        channels = (registry.protocol.get("communication") or {}).get("fallback_channels") or []
+        channels = [name for name in channels if name in TRANSPORTS]
+    bus = MessageBus(**options)
+    for name in channels:
+        if name not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{name}' (known: {', '.join(sorted(TRANSPORTS))})")
+        bus.add(TRANSPORTS[name]())
+    return bus
+
+
+async def _publish_cli(args) -> int:
+    bus = build_bus(args.channels)
+    await bus.start()
+    try:
+        text = Path(args.message).read_text(encoding="utf-8")
+        receipts = await bus.publish(Envelope.create(text, args.agent))
+        failed = 0
+        for name, receipt in receipts.items():
+            try:
+                result = await receipt
+                print(f"✅ {name}: {result if isinstance(result, str) else 'delivered'}")
+            except (Exception, asyncio.CancelledError) as e:
+                failed += 1
+                print(f"❌ {name}: {e or 'dropped'}")
+        return 1 if failed else 0
+    finally:
+        await bus.close()
+
+
+async def _probe_cli(args) -> int:
+    bus = build_bus(args.channels)
+    await bus.start()
+    try:
+        results = await bus.probe()
+    finally:
+        await bus.close()
+    for name, ok in results.items():
+        print(f"{'🟢' if ok else '🔴'} {name}")
+    return 0 if all(results.values()) else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish to the mesh fallback channels")
+    parser.add_argument("command", choices=["publish", "probe"])
+    parser.add_argument("message", nargs="?", help="Message file for 'publish'")
+    parser.add_argument("--agent", default=os.environ.get("AGENT_ID", "unknown"))
+    parser.add_argument("--channels", type=lambda s: [c for c in s.split(",") if c], default=None,
+                        help="Comma-separated transports (default: fallback_channels)")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        if not args.message:
+            parser.error("publish needs a message file")
+        sys.exit(asyncio.run(_publish_cli(args)))
+    sys.exit(asyncio.run(_probe_cli(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of successful signature verifications
+A message whose payload hash, signature, signer key fingerprint and
+agents.yaml version all match an earlier successful check is known good
+without redoing the Ed25519/ssh-keygen verification. Any change to the
+payload, the signature, the agent's key or agents.yaml changes the key, so
+stale entries simply stop matching and age out. Keys are HMACs under a
+per-user secret (verify-cache.key, mode 0600), so whoever can write the
+cache file still cannot mark a forged message as verified.
+
+On disk the cache is a header plus 32-byte keys in least- to
+most-recently-used order. Lookups and inserts are appended; the file is
+rewritten (dropping evicted and repeated keys) once it holds twice the
+capacity, after re-reading it so entries other processes appended survive.
+"""
+
+import os
+import hmac
+import struct
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import FrozenSet, Iterable
+
+CACHE_MAGIC = b"AMVCACHE"
+CACHE_FORMAT = 2  # 2: keys are HMAC-SHA256 under the cache secret
+# magic, format, key size
+CACHE_HEADER = struct.Struct("<8sII")
+KEY_SIZE = 32
+SECRET_SIZE = 32
+DEFAULT_CAPACITY = 100000
+
+
+def default_cache_path() -> Path:
+    cache_dir = Path(os.environ.get("AGENT_MESH_CACHE_DIR",
+                                    Path.home() / ".cache" / "agent-mesh"))
+    return cache_dir / "verify-cache.bin"
+
+
+def load_secret(path: Path) -> bytes:
+    """The per-user cache secret, created 0600 (in a 0700 directory) on first use
+
+    A secret that other users could read or replace is not used; neither is
+    one that cannot be created. A fresh in-memory secret is returned instead,
+    so nothing persisted under it will match again (the cache stays cold).
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except FileNotFoundError:
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # another process created it first
+            return load_secret(path)
+        except OSError:
+            return os.urandom(SECRET_SIZE)
+        secret = os.urandom(SECRET_SIZE)
+        with os.fdopen(fd, "wb") as f:
+            f.write(secret)
+        return secret
+    except OSError:
+        return os.urandom(SECRET_SIZE)
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        secret = f.read()
+    if st.st_uid != os.getuid() or st.st_mode & 0o077 or len(secret) != SECRET_SIZE:
+        return os.urandom(SECRET_SIZE)
+    return secret
+
+
+def cache_key(secret: bytes, payload_sha256: bytes, signature: str, fingerprint: str,
+              registry_version: str) -> bytes:
+    """32-byte key for one (payload, signature, signer key, registry) combination"""
+    h = hmac.new(secret, b"agent-mesh verify cache\0", hashlib.sha256)
+    h.update(payload_sha256)
+    h.update(hashlib.sha256(signature.encode("ascii", "replace")).digest())
+    h.update(fingerprint.encode("utf-8") + b"\0")
+    h.update(registry_version.encode("utf-8"))
+    return h.digest()
+
+
+class VerificationCache:
+    """LRU set of verified cache keys, persisted as an append-only key log"""
+
+    def __init__(self, path=None, capacity: int = DEFAULT_CAPACITY):
+        self.path = Path(path) if path else default_cache_path()
+        self.capacity = capacity
+        self.secret = load_secret(self.path.with_suffix(".key"))
+        self._entries: "OrderedDict[bytes, None]" = OrderedDict()
+        self._pending = []
+        self._records = 0  # keys currently in the file, repeats included
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _read(self) -> list:
+        """Keys in the file, oldest first (repeats included)"""
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return []
+        if len(data) < CACHE_HEADER.size:
+            return []
+        magic, fmt, key_size = CACHE_HEADER.unpack_from(data, 0)
+        if (magic, fmt, key_size) != (CACHE_MAGIC, CACHE_FORMAT, KEY_SIZE):
+            return []
+        end = len(data) - (len(data) - CACHE_HEADER.size) % KEY_SIZE  # ignore a torn tail
+        return [data[offset:offset + KEY_SIZE] for offset in range(CACHE_HEADER.size, end, KEY_SIZE)]
+
+    def _load(self):
+        records = self._read()
+        entries = self._entries
+        for key in records:
+            entries[key] = None
+            entries.move_to_end(key)
+        self._records = len(records)
+        while len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def key(self, payload_sha256: bytes, signature: str, fingerprint: str,
+            registry_version: str) -> bytes:
+        return cache_key(self.secret, payload_sha256, signature, fingerprint, registry_version)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> FrozenSet[bytes]:
+        """Snapshot for read-only lookups in worker processes"""
+        return frozenset(self._entries)
+
+    def lookup(self, key: bytes) -> bool:
+        """True (and mark recently used) if key was verified before"""
+        if key not in self._entries:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.touch(key)
+        return True
+
+    def touch(self, key: bytes):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._pending.append(key)
+
+    def add(self, key: bytes):
+        """Record a successful verification"""
+        self._entries[key] = None
+        self._entries.move_to_end(key)
+        self._pending.append(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def update(self, keys: Iterable[bytes]):
+        for key in keys:
+            self.add(key)
+
+    def save(self):
+        """Persist pending changes; a read-only cache dir is not an error"""
+        if not self._pending:
+            return
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if self._records == 0 or self._records + len(self._pending) > 2 * self.capacity:
+                self._merge()
+                self._rewrite()
+            else:
+                with open(self.path, "ab") as f:
+                    f.write(b"".join(self._pending))
+                self._records += len(self._pending)
+        except OSError:
+            pass
+        self._pending = []
+
+    def _merge(self):
+        """Fold in keys other processes wrote since we loaded; ours count as more recent"""
+        merged = OrderedDict.fromkeys(self._read())
+        for key in self._entries:
+            merged[key] = None
+            merged.move_to_end(key)
+        while len(merged) > self.capacity:
+            merged.popitem(last=False)
+        self._entries = merged
+
+    def _rewrite(self):
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_FORMAT, KEY_SIZE))
+            f.write(b"".join(self._entries))
+        os.replace(tmp, self.path)
+        self._records = len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._pending = []
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+        self._records = 0
+
+    def metrics(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
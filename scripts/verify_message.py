@@ -1,22 +1,52 @@
 #!/usr/bin/env python3
 """
 Verify agent message signature against agents.yaml registry
-Usage: python3 scripts/verify_message.py <message.md> <agent_name>
+Usage: python3 scripts/verify_message.py <message.md> [agent_name] [--no-cache]
+       python3 scripts/verify_message.py --batch <dir|glob> [--workers N] [--no-cache]
+Payloads are streamed; the authentication block is located by seeking from EOF.
+Successful checks are remembered in verify_cache, so an unchanged message
+signed with an unchanged key is not re-verified. Signers are resolved from
+the key embedded in the signature via mesh_keyring, so retired keys still
+verify history and the agent name may be omitted.
+Checks are counted and timed in mesh_metrics; with AGENT_MESH_TRACE_LOG set
+each message's check is traced under its payload hash.
 """
 
+import io
+import os
 import sys
+import glob
+import json
+import time
 import hashlib
 import base64
 import re
-import yaml
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import sshsig
+import mesh_metrics
+import mesh_protocol
+from agent_registry import load_registry
+from mesh_keyring import load_keyring
+from verify_cache import VerificationCache, cache_key
+
+# sign_message.py appends this separator; the signed payload is everything before it
+AUTH_SEPARATOR = "\n\n---\n\n### Message Authentication"
+AGENT_PATTERN = re.compile(r'\*\*Agent:\*\* (\S+)')
+SIG_PATTERN = re.compile(r'-----BEGIN SSH SIGNATURE-----\n(.*?)\n-----END SSH SIGNATURE-----', re.DOTALL)
+HASH_PATTERN = re.compile(r'\*\*Payload Hash \(SHA256\):\*\* ([a-f0-9]{64})')
+
+CHUNK_SIZE = 1 << 20
+TAIL_WINDOW = 16 * 1024   # first look this far back from EOF for the block
+MAX_TAIL = 1 << 20        # give up (and fall back to a full read) beyond this
+
 def extract_signature(message_content: str) -> tuple:
     """Extract payload, signature, and hash from signed message"""
     
     # Find signature block
-    sig_pattern = r'-----BEGIN SSH SIGNATURE-----\n(.*?)\n-----END SSH SIGNATURE-----'
-    sig_match = re.search(sig_pattern, message_content, re.DOTALL)
+    sig_match = SIG_PATTERN.search(message_content)
     
     if not sig_match:
         return None, None, None, "No signature block found"
@@ -24,8 +54,7 @@ def extract_signature(message_content: str) -> tuple:
     signature_b64 = sig_match.group(1).strip()
     
     # Extract hash
-    hash_pattern = r'\*\*Payload Hash \(SHA256\):\*\* ([a-f0-9]{64})'
-    hash_match = re.search(hash_pattern, message_content)
+    hash_match = HASH_PATTERN.search(message_content)
     
     if not hash_match:
         return None, None, None, "No hash found in message"
@@ -34,43 +63,98 @@ def extract_signature(message_content: str) -> tuple:
     
     # Extract original payload (everything before authentication section)
     auth_section = "### Message Authentication"
-    if auth_section in message_content:
+    separator_pos = message_content.rfind(AUTH_SEPARATOR)
+    if separator_pos != -1:
+        payload = message_content[:separator_pos]
+    elif auth_section in message_content:
         payload = message_content.split(auth_section)[0].rstrip()
     else:
         payload = message_content[:sig_match.start()].rstrip()
     
     return payload, signature_b64, claimed_hash, None
 
-def load_public_key(agent_name: str) -> str:
-    """Load public key from agents.yaml"""
-    
-    agents_yaml = Path('agents/agents.yaml')
-    
-    if not agents_yaml.exists():
-        return None, "agents.yaml not found"
-    
-    with open(agents_yaml, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    if 'agents' not in config or agent_name not in config['agents']:
-        return None, f"Agent '{agent_name}' not found in registry"
-    
-    agent_config = config['agents'][agent_name]
-    
-    if 'authentication' not in agent_config:
-        return None, f"No authentication config for agent '{agent_name}'"
-    
-    auth_config = agent_config['authentication']
+def find_auth_block(f) -> tuple:
+    """Seek back from EOF for the appended authentication block
+
+    Returns (payload_length, block_text), or (None, None) if the standard
+    separator is not within MAX_TAIL bytes of the end.
+    """
+    size = f.seek(0, os.SEEK_END)
+    separator = AUTH_SEPARATOR.encode('utf-8')
+    window = TAIL_WINDOW
+    
+    while True:
+        start = max(0, size - window)
+        f.seek(start)
+        tail = f.read(size - start)
+        pos = tail.rfind(separator)
+        if pos != -1:
+            return start + pos, tail[pos:].decode('utf-8', 'replace')
+        if start == 0 or window >= MAX_TAIL:
+            return None, None
+        window *= 4
+
+def read_signed_message(f) -> tuple:
+    """Parse a signed message opened in binary mode without loading its payload
+
+    Returns (source, payload_length, signature_b64, claimed_hash, agent_name, error);
+    the payload is the first payload_length bytes of source.
+    """
+    payload_length, block = find_auth_block(f)
+    
+    if payload_length is None:
+        # Legacy layout without the standard separator: parse in memory
+        f.seek(0)
+        content = f.read().decode('utf-8', 'replace')
+        payload, signature_b64, claimed_hash, error = extract_signature(content)
+        if error:
+            return None, None, None, None, None, error
+        payload_bytes = payload.encode('utf-8')
+        agent_match = AGENT_PATTERN.search(content, len(payload))
+        agent_name = agent_match.group(1) if agent_match else None
+        return (io.BytesIO(payload_bytes), len(payload_bytes), signature_b64,
+                claimed_hash, agent_name, None)
+    
+    sig_match = SIG_PATTERN.search(block)
+    if not sig_match:
+        return None, None, None, None, None, "No signature block found"
     
-    if auth_config.get('status') == 'pending_generation':
-        return None, f"Agent '{agent_name}' key pending generation"
+    hash_match = HASH_PATTERN.search(block)
+    if not hash_match:
+        return None, None, None, None, None, "No hash found in message"
     
-    public_key = auth_config.get('public_key')
+    agent_match = AGENT_PATTERN.search(block)
+    agent_name = agent_match.group(1) if agent_match else None
+    return f, payload_length, sig_match.group(1).strip(), hash_match.group(1), agent_name, None
+
+def iter_payload(source, payload_length: int):
+    """Yield the payload in CHUNK_SIZE pieces"""
+    source.seek(0)
+    remaining = payload_length
+    while remaining > 0:
+        chunk = source.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+def hash_payload(source, payload_length: int) -> dict:
+    """Stream the payload once, returning {algorithm: digest} for SHA256 and SHA512"""
+    hashers = {"sha256": hashlib.sha256(), "sha512": hashlib.sha512()}
+    for chunk in iter_payload(source, payload_length):
+        for hasher in hashers.values():
+            hasher.update(chunk)
+    return {name: hasher.digest() for name, hasher in hashers.items()}
+
+def load_public_key(agent_name: str) -> str:
+    """Load public key from the agents.yaml registry index"""
     
-    if not public_key or public_key == 'PENDING_GENERATION':
-        return None, f"No public key for agent '{agent_name}'"
+    try:
+        registry = load_registry()
+    except FileNotFoundError:
+        return None, "agents.yaml not found"
     
-    return public_key, None
+    return registry.public_key(agent_name)
 
 def verify_hash(payload: str, claimed_hash: str) -> bool:
     """Verify SHA256 hash of payload"""
@@ -78,38 +162,53 @@ def verify_hash(payload: str, claimed_hash: str) -> bool:
     return calculated_hash == claimed_hash
 
 def verify_signature(payload: str, signature_b64: str, public_key: str) -> tuple:
-    """Verify Ed25519 signature (simplified - would use ssh-keygen -Y verify in production)"""
+    """Verify Ed25519 signature over an in-memory payload with ssh-keygen -Y verify"""
+    payload_bytes = payload.encode('utf-8')
+    return verify_signature_stream(io.BytesIO(payload_bytes), len(payload_bytes),
+                                   signature_b64, public_key)
+
+def verify_signature_stream(source, payload_length: int, signature_b64: str,
+                            public_key: str = None, allowed_signers: str = None,
+                            identity: str = 'agent') -> tuple:
+    """Verify Ed25519 signature with ssh-keygen -Y verify, piping the payload in chunks
+
+    Pass either one public_key or an existing allowed_signers file plus the
+    identity (agent id) to check against.
+    """
     
     import tempfile
     import subprocess
-    import os
-    
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.pub', delete=False) as f:
-        f.write(public_key + '\n')
-        pubkey_file = f.name
     
-    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-        f.write(payload)
-        payload_file = f.name
+    # Create temporary files (ssh-keygen -Y verify takes an allowed_signers file)
+    pubkey_file = None
+    if allowed_signers is None:
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.pub', delete=False) as f:
+            f.write(f"{identity} {public_key}\n")
+            pubkey_file = allowed_signers = f.name
     
     with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
         f.write(base64.b64decode(signature_b64))
         sig_file = f.name
     
     try:
-        # Verify using ssh-keygen
-        result = subprocess.run([
+        # Verify using ssh-keygen (the signed payload is read from stdin)
+        proc = subprocess.Popen([
             'ssh-keygen', '-Y', 'verify',
-            '-f', pubkey_file,
-            '-I', 'agent',
+            '-f', str(allowed_signers),
+            '-I', identity,
             '-n', 'agent-mesh',
-            '-s', sig_file,
-            payload_file
-        ], capture_output=True, text=True)
+            '-s', sig_file
+        ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        try:
+            for chunk in iter_payload(source, payload_length):
+                proc.stdin.write(chunk)
+        except BrokenPipeError:
+            pass
         
-        is_valid = result.returncode == 0
-        error_msg = result.stderr if not is_valid else None
+        _, stderr = proc.communicate()
+        is_valid = proc.returncode == 0
+        error_msg = stderr.decode('utf-8', 'replace') if not is_valid else None
         
     except Exception as e:
         is_valid = False
@@ -117,54 +216,107 @@ def verify_signature(payload: str, signature_b64: str, public_key: str) -> tuple
     
     finally:
         # Cleanup
-        os.unlink(pubkey_file)
-        os.unlink(payload_file)
+        if pubkey_file:
+            os.unlink(pubkey_file)
         os.unlink(sig_file)
     
     return is_valid, error_msg
 
-def verify_message(message_file: str, agent_name: str) -> bool:
-    """Full verification workflow"""
+def verify_message(message_file: str, agent_name: str = None, use_cache: bool = True) -> bool:
+    """Full verification workflow; without agent_name the signer is looked up by key"""
     
     print(f"🔍 Verifying: {message_file}")
-    print(f"   Agent: {agent_name}")
+    print(f"   Agent: {agent_name or '(from signing key)'}")
     
-    # Read message
+    # Open message (payload is streamed, never read whole)
     try:
-        with open(message_file, 'r') as f:
-            content = f.read()
+        f = open(message_file, 'rb')
     except FileNotFoundError:
         print(f"❌ Message file not found: {message_file}")
         return False
     
+    cache = VerificationCache() if use_cache else None
+    with f, mesh_metrics.span("verify", mode="single") as span:
+        is_valid = _verify_open_message(f, agent_name, cache, span)
+        span.annotate(valid=is_valid)
+    if cache is not None:
+        cache.save()
+    mesh_metrics.inc("agent_mesh_verifications_total", result="valid" if is_valid else "invalid")
+    return is_valid
+
+def _resolve_signer(signature_b64: str, agent_name: str, claimed_agent: str) -> tuple:
+    """(keyring entry, keyring, error) for the key embedded in the signature"""
+    
+    try:
+        keyring = load_keyring()
+    except FileNotFoundError:
+        return None, None, "agents.yaml not found"
+    
+    if agent_name and not keyring.keys_for(agent_name):
+        # Same errors as before keyrings: unknown agent, pending key, ...
+        error = load_public_key(agent_name)[1] or f"No public key for agent '{agent_name}'"
+        return None, keyring, error
+    
+    try:
+        armored = base64.b64decode(signature_b64).decode('ascii')
+    except ValueError:
+        return None, keyring, "Signature is not valid base64"
+    
+    entry, error = keyring.attribute(armored, agent_name)
+    if error:
+        return None, keyring, error
+    if claimed_agent and claimed_agent != entry.agent:
+        return None, keyring, f"Message claims agent '{claimed_agent}' but was signed by '{entry.agent}'"
+    return entry, keyring, None
+
+def _verify_open_message(f, agent_name: str = None, cache: VerificationCache = None,
+                         span=None) -> bool:
     # Extract components
-    payload, signature_b64, claimed_hash, error = extract_signature(content)
+    source, payload_length, signature_b64, claimed_hash, claimed_agent, error = read_signed_message(f)
     
     if error:
         print(f"❌ Extraction failed: {error}")
         return False
     
+    if span is not None:
+        span.annotate(claimed_hash)
     print(f"   Hash: {claimed_hash[:16]}...")
     
-    # Load public key
-    public_key, error = load_public_key(agent_name)
+    # Resolve the signing key (any active or retired key of the agent)
+    signer, keyring, error = _resolve_signer(signature_b64, agent_name, claimed_agent)
     
     if error:
         print(f"❌ Key lookup failed: {error}")
         return False
     
-    print(f"   Public key loaded from agents.yaml")
+    agent_name = signer.agent
+    print(f"   Public key loaded from agents.yaml ({signer.status} key {signer.fingerprint})")
     
     # Verify hash
-    if not verify_hash(payload, claimed_hash):
+    payload_sha256 = hash_payload(source, payload_length)["sha256"]
+    if payload_sha256.hex() != claimed_hash:
         print(f"❌ Hash verification failed")
         print(f"   Message may have been tampered with")
         return False
     
     print(f"   ✅ Hash verified (SHA256)")
     
-    # Verify signature
-    is_valid, error = verify_signature(payload, signature_b64, public_key)
+    # Verify signature (skipped if this exact check already succeeded)
+    key = None
+    if cache is not None:
+        key = cache.key(payload_sha256, signature_b64, signer.fingerprint, keyring.version)
+        if cache.lookup(key):
+            mesh_metrics.inc("agent_mesh_verify_cache_hits_total")
+            print(f"   ✅ Ed25519 signature valid (cached)")
+            print(f"\n🛡️  Message AUTHENTIC — Sent by {agent_name}")
+            return True
+    
+    try:
+        allowed_signers = keyring.allowed_signers_path()
+    except OSError:
+        allowed_signers = None
+    is_valid, error = verify_signature_stream(source, payload_length, signature_b64,
+                                              signer.public_key, allowed_signers, agent_name)
     
     if not is_valid:
         print(f"❌ Signature verification failed")
@@ -172,16 +324,270 @@ def verify_message(message_file: str, agent_name: str) -> bool:
             print(f"   Error: {error}")
         return False
     
+    if key is not None:
+        cache.add(key)
     print(f"   ✅ Ed25519 signature valid")
     print(f"\n🛡️  Message AUTHENTIC — Sent by {agent_name}")
     
     return True
 
-if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python3 scripts/verify_message.py <message.md> <agent_name>")
-        print("Example: python3 scripts/verify_message.py research.md clawdy")
-        sys.exit(1)
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+# Public keys for the current batch worker, keyed by agent id → (key bytes, error)
+_batch_keys = {}
+# Every registry key, keyed by fingerprint → (agent id, key bytes, status)
+_batch_fingerprints = {}
+# Verification cache keys known good when the batch started (None: cache disabled)
+_batch_cached = None
+_batch_secret = b""
+_batch_registry_version = ""
+
+def load_registry_keys(with_version: bool = False):
+    """Resolve every agent's public key from the registry in one pass
+
+    With with_version, returns (keys, registry version) for cache keys.
+    """
     
-    is_valid = verify_message(sys.argv[1], sys.argv[2])
+    try:
+        registry = load_registry()
+    except FileNotFoundError:
+        return ({}, "") if with_version else {}
+    
+    keys = {}
+    for agent_name in registry.agents:
+        public_key, error = registry.public_key(agent_name)
+        if not error:
+            try:
+                public_key = sshsig.parse_public_key(public_key)
+            except sshsig.SSHSigError as e:
+                public_key, error = None, f"Invalid public key for agent '{agent_name}': {e}"
+        keys[agent_name] = (public_key, error)
+    return (keys, registry.version) if with_version else keys
+
+def load_fingerprint_index() -> dict:
+    """Every active, retired and revoked key from the keyring, by fingerprint"""
+    
+    try:
+        keyring = load_keyring()
+    except FileNotFoundError:
+        return {}
+    return {fp: (entry.agent, entry.key, entry.status)
+            for fp, entry in keyring.by_fingerprint.items()}
+
+def _init_batch_worker(keys: dict, cached: frozenset = None, registry_version: str = "",
+                       fingerprints: dict = None, secret: bytes = b""):
+    global _batch_keys, _batch_cached, _batch_secret, _batch_registry_version, _batch_fingerprints
+    _batch_keys = keys
+    _batch_cached = cached
+    _batch_secret = secret
+    _batch_registry_version = registry_version
+    _batch_fingerprints = fingerprints or {}
+
+def _batch_initargs(use_cache: bool = True) -> tuple:
+    """(cache or None, _init_batch_worker args): keys, cache snapshot, version, fingerprints, secret"""
+    keys, registry_version = load_registry_keys(with_version=True)
+    cache = VerificationCache() if use_cache else None
+    if cache is None:
+        return None, (keys, None, registry_version, load_fingerprint_index())
+    return cache, (keys, cache.keys(), registry_version, load_fingerprint_index(), cache.secret)
+
+def init_verifier(use_cache: bool = True):
+    """Set up this process for verify_file() exactly as verify_batch() does
+
+    Loads every registry key, the keyring's fingerprint index (so retired
+    keys and messages without an **Agent:** line verify) and a snapshot of
+    the verification cache. Returns the cache (None with use_cache=False);
+    pass each result to record_result() and save() the cache when done.
+    """
+    cache, initargs = _batch_initargs(use_cache)
+    _init_batch_worker(*initargs)
+    return cache
+
+def record_result(result: dict, cache=None) -> dict:
+    """Count a verify_file() result and fold its cache key into cache"""
+    mesh_metrics.inc("agent_mesh_verifications_total", result=result["status"])
+    key = result.pop("cache_key", None)
+    if cache is None or not key:
+        return result
+    if result.get("cached"):
+        mesh_metrics.inc("agent_mesh_verify_cache_hits_total")
+        cache.touch(bytes.fromhex(key))
+    else:
+        cache.add(bytes.fromhex(key))
+    return result
+
+def _embedded_signer(signature_b64: str):
+    """(agent, key bytes, status) for the key inside the signature, if registered"""
+    try:
+        armored = base64.b64decode(signature_b64).decode('ascii')
+        public_key = sshsig.parse_signature(armored)["public_key"]
+    except (ValueError, sshsig.SSHSigError):
+        return None
+    return _batch_fingerprints.get(sshsig.fingerprint(public_key))
+
+def verify_file(message_file: str) -> dict:
+    """Verify one signed message in-process, returning a JSON-able result
+
+    With the cache enabled, valid results carry their hex "cache_key" for
+    the parent process to record; cache hits are also marked "cached".
+    """
+    
+    with mesh_metrics.span("verify", mode="batch") as span:
+        result = _verify_file(message_file)
+        span.annotate(result.get("hash"), agent=result["agent"], status=result["status"],
+                      cached=bool(result.get("cached")))
+    return result
+
+def _verify_file(message_file: str) -> dict:
+    result = {"file": message_file, "agent": None, "prefix": None, "status": "invalid", "error": None}
+    
+    try:
+        f = open(message_file, 'rb')
+    except OSError as e:
+        result["error"] = f"Unreadable message: {e}"
+        return result
+    
+    with f:
+        source, payload_length, signature_b64, claimed_hash, agent_name, error = \
+            read_signed_message(f)
+        
+        if error:
+            result["error"] = error
+            return result
+        
+        signer = _embedded_signer(signature_b64)
+        
+        if not agent_name and signer:
+            agent_name = signer[0]
+            result["attributed"] = True
+        
+        if not agent_name:
+            result["error"] = "No agent found in message"
+            return result
+        
+        result["agent"] = agent_name
+        result["hash"] = claimed_hash
+        
+        if signer and signer[0] == agent_name:
+            # Any of the agent's keys, including retired ones, verifies its history
+            public_key, error = signer[1], None
+            if signer[2] == "revoked":
+                result["error"] = f"Signing key of agent '{agent_name}' is revoked"
+                return result
+        else:
+            public_key, error = _batch_keys.get(
+                agent_name, (None, f"Agent '{agent_name}' not found in registry"))
+        
+        if error:
+            result["status"] = "unknown_agent"
+            result["error"] = error
+            return result
+        
+        digests = hash_payload(source, payload_length)
+        source.seek(0)
+        head = source.read(min(payload_length, mesh_protocol.MAX_PREFIX_LEN))
+        result["prefix"] = mesh_protocol.parse(head.decode('utf-8', 'replace')).prefix
+    
+    if digests["sha256"].hex() != claimed_hash:
+        result["error"] = "Hash verification failed"
+        return result
+    
+    key = None
+    if _batch_cached is not None:
+        key = cache_key(_batch_secret, digests["sha256"], signature_b64,
+                        sshsig.fingerprint(public_key), _batch_registry_version)
+        if key in _batch_cached:
+            result.update(status="valid", cached=True, cache_key=key.hex())
+            return result
+    
+    try:
+        armored = base64.b64decode(signature_b64).decode('ascii')
+    except ValueError:
+        result["error"] = "Signature is not valid base64"
+        return result
+    
+    is_valid, error = sshsig.verify_digest(public_key, digests, armored)
+    
+    if not is_valid:
+        result["error"] = error
+        return result
+    
+    result["status"] = "valid"
+    if key is not None:
+        result["cache_key"] = key.hex()
+    return result
+
+def find_messages(target: str) -> list:
+    """Expand a directory (recursively, *.md) or glob pattern into message paths"""
+    
+    if os.path.isdir(target):
+        return sorted(str(p) for p in Path(target).rglob('*.md'))
+    return sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+
+def verify_batch(target: str, workers: int = None, out=None, use_cache: bool = True) -> dict:
+    """Verify many messages with one registry load, streaming JSONL results"""
+    
+    out = out or sys.stdout
+    started = time.perf_counter()
+    files = find_messages(target)
+    summary = {"total": 0, "valid": 0, "invalid": 0, "unknown_agent": 0, "cached": 0}
+    
+    # Workers get a read-only snapshot; only this process updates the cache
+    cache, initargs = _batch_initargs(use_cache)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1 or len(files) < 2:
+        _init_batch_worker(*initargs)
+        results = map(verify_file, files)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                       initargs=initargs)
+        results = executor.map(verify_file, files, chunksize=max(1, len(files) // (workers * 4)))
+    
+    try:
+        for result in results:
+            summary["total"] += 1
+            summary[result["status"]] += 1
+            summary["cached"] += bool(result.get("cached"))
+            record_result(result, cache)
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+    finally:
+        if executor:
+            executor.shutdown()
+        if cache is not None:
+            cache.save()
+    
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    out.write(json.dumps({"summary": summary}) + '\n')
+    out.flush()
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Verify agent message signature against agents.yaml registry",
+        epilog="Example: python3 scripts/verify_message.py research.md clawdy"
+    )
+    parser.add_argument("message_file", nargs="?", help="Signed markdown message")
+    parser.add_argument("agent_name", nargs="?",
+                        help="Agent id expected to have signed it (default: attribute by key)")
+    parser.add_argument("--batch", metavar="DIR|GLOB",
+                        help="Verify every signed message under a directory or glob (JSONL output)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Batch worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-verify every signature, bypassing the verification cache")
+    args = parser.parse_args()
+    
+    if args.batch:
+        summary = verify_batch(args.batch, args.workers, use_cache=not args.no_cache)
+        sys.exit(0 if summary["valid"] == summary["total"] else 1)
+    
+    if not args.message_file:
+        parser.error("message_file is required unless --batch is given")
+    
+    is_valid = verify_message(args.message_file, args.agent_name, use_cache=not args.no_cache)
     sys.exit(0 if is_valid else 1)
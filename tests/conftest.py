@@ -13,6 +13,13 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(temp_dir, monkeypatch):
+    """Keep registry snapshots, keyrings and verify caches out of ~/.cache/agent-mesh"""
+    monkeypatch.setenv("AGENT_MESH_CACHE_DIR", str(temp_dir / "cache"))
+    return temp_dir / "cache"
+
+
 @pytest.fixture
 def sample_message(temp_dir):
     """Create a sample message file for testing"""
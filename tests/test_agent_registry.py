@@ -0,0 +1,103 @@
+"""Tests for the compiled agent registry index"""
+
+import pytest
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+REPO_REGISTRY = Path(__file__).parent.parent / "agents" / "agents.yaml"
+
+
+@pytest.fixture
+def registry_file(temp_dir, monkeypatch):
+    """Private copy of agents.yaml"""
+    import agent_registry
+
+    monkeypatch.setattr(agent_registry, "_loaded", {})
+    path = temp_dir / "agents.yaml"
+    shutil.copy(REPO_REGISTRY, path)
+    return path
+
+
+def _forbid_yaml(monkeypatch):
+    import agent_registry
+
+    def fail(*args, **kwargs):
+        raise AssertionError("agents.yaml was re-parsed")
+    monkeypatch.setattr(agent_registry.yaml, "safe_load", fail)
+
+
+class TestRegistryIndex:
+    """Lookups over the compiled index"""
+
+    def test_lookup_by_id_and_fingerprint(self, registry_file):
+        from agent_registry import load_registry
+
+        registry = load_registry(registry_file)
+        clawdy = registry.get("clawdy")
+
+        assert clawdy.synthesizer_priority == 1
+        assert "creative_synthesis" in clawdy.capabilities
+        assert clawdy.availability == "follows_human_schedule"
+        assert registry.by_key_fingerprint(clawdy.fingerprint) is clawdy
+        assert clawdy.fingerprint == "SHA256:pF74cYsmLkM7Y7qtMKUp6sFnC+n53grkURiE4MtfgBo"
+        assert registry.prefixes["research"] == "[RESEARCH]"
+        assert registry.fallback_chain[0] == "clawdy"
+
+    def test_public_key_errors(self, registry_file):
+        from agent_registry import load_registry
+
+        registry_file.write_text("""agents:
+  pending:
+    authentication:
+      status: "pending_generation"
+  nokey:
+    name: "No Key"
+""")
+        registry = load_registry(registry_file)
+
+        assert registry.public_key("ghost") == (None, "Agent 'ghost' not found in registry")
+        assert registry.public_key("pending")[1] == "Agent 'pending' key pending generation"
+        assert registry.public_key("nokey")[1] == "No authentication config for agent 'nokey'"
+
+
+class TestRegistrySnapshot:
+    """Snapshot cache invalidation by mtime and content hash"""
+
+    def test_snapshot_skips_yaml_parsing(self, registry_file, monkeypatch):
+        import agent_registry
+
+        first = agent_registry.load_registry(registry_file)
+        monkeypatch.setattr(agent_registry, "_loaded", {})
+        _forbid_yaml(monkeypatch)
+
+        second = agent_registry.load_registry(registry_file)
+        assert second.version == first.version
+        assert second.get("moltdude") == first.get("moltdude")
+
+    def test_touch_without_change_reuses_snapshot(self, registry_file, monkeypatch):
+        import agent_registry
+
+        agent_registry.load_registry(registry_file)
+        stat = registry_file.stat()
+        os.utime(registry_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        _forbid_yaml(monkeypatch)
+
+        assert agent_registry.load_registry(registry_file).get("clawdy") is not None
+
+    def test_content_change_rebuilds_index(self, registry_file):
+        import agent_registry
+
+        before = agent_registry.load_registry(registry_file)
+        registry_file.write_text(registry_file.read_text().replace(
+            'synthesizer_priority: 3', 'synthesizer_priority: 4'))
+        stat = registry_file.stat()
+        os.utime(registry_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        after = agent_registry.load_registry(registry_file)
+        assert after.version != before.version
+        assert after.get("moltdude").synthesizer_priority == 4
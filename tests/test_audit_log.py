@@ -0,0 +1,255 @@
+"""Tests for the hash-chained Merkle audit log"""
+
+import pytest
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def audit_env(temp_dir, mock_agent_keys, monkeypatch):
+    """Registry with the test key, an audit dir and a cache dir"""
+    import agent_registry
+    import mesh_keyring
+
+    registry = temp_dir / "agents" / "agents.yaml"
+    registry.parent.mkdir()
+    registry.write_text(f"""agents:
+  test_agent:
+    authentication:
+      public_key: "{mock_agent_keys['public_key'].read_text().strip()}"
+""")
+    monkeypatch.chdir(temp_dir)
+    monkeypatch.setenv("AGENT_MESH_SIGNER_SOCKET", str(temp_dir / "no-daemon.sock"))
+    monkeypatch.setattr(agent_registry, "_loaded", {})
+    monkeypatch.setattr(mesh_keyring, "_keyrings", {})
+    return temp_dir / "audit"
+
+
+def _fill(log, count, start=0):
+    for i in range(start, start + count):
+        log.append("test_agent", hashlib.sha256(b"%d" % i).hexdigest(), f"sig-{i}",
+                   when="2026-01-01T00:00:00+00:00")
+
+
+class TestMerkleTree:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 13, 64])
+    def test_every_leaf_has_a_log_size_proof(self, temp_dir, size):
+        from audit_log import AuditLog, entry_leaf, verify_inclusion
+
+        log = AuditLog(temp_dir / "audit")
+        _fill(log, size)
+        for _, _, entry in log._scan(0):
+            path = log.inclusion_path(entry["seq"], size)
+            assert len(path) <= (size - 1).bit_length()
+            assert verify_inclusion(entry_leaf(entry), entry["seq"], size, path, log.root())
+            if size > 1:
+                assert not verify_inclusion(entry_leaf(entry), entry["seq"] ^ 1, size, path, log.root())
+
+    def test_historic_root_matches_rebuilt_tree(self, temp_dir):
+        from audit_log import AuditLog
+
+        log = AuditLog(temp_dir / "audit")
+        _fill(log, 5)
+        root5 = log.root()
+        _fill(log, 6, start=5)
+        assert log.root(5) == root5
+        assert log.subtree(0, 5) == root5
+
+    def test_recovers_from_torn_writes(self, temp_dir):
+        from audit_log import AuditLog
+
+        log = AuditLog(temp_dir / "audit")
+        _fill(log, 9)
+        root, chain = log.root(), log.chain
+        # Crash: a half-written entry and a stray tree node
+        with open(log.entries_path, "ab") as f:
+            f.write(b'{"seq": 9, "ti')
+        with open(log._level_path(0), "ab") as f:
+            f.write(b"\x00" * 32)
+
+        reopened = AuditLog(temp_dir / "audit")
+        assert (reopened.size, reopened.root(), reopened.chain) == (9, root, chain)
+        _fill(reopened, 1, start=9)
+        assert reopened.size == 10
+
+    def test_concurrent_writers_in_separate_processes(self, temp_dir):
+        import multiprocessing
+        from audit_log import AuditLog, Auditor
+
+        directory = temp_dir / "audit"
+        AuditLog(directory)
+
+        def writer(n):
+            log = AuditLog(directory)
+            for i in range(25):
+                log.append(f"agent_{n}", hashlib.sha256(b"%d-%d" % (n, i)).hexdigest(), f"sig-{n}-{i}")
+
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=writer, args=(n,)) for n in range(8)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert all(process.exitcode == 0 for process in processes)
+
+        log = AuditLog(directory)
+        assert log.size == 200
+        assert [entry["seq"] for _, _, entry in log._scan(0)] == list(range(200))
+        report = Auditor(log, state_path=temp_dir / "auditor.json").audit()
+        assert report["pending"] == 200
+
+
+class TestCheckpointsAndAudit:
+    def test_incremental_audit_reads_only_new_entries(self, audit_env, monkeypatch):
+        import audit_log
+        from audit_log import AuditLog, Auditor, key_signer
+
+        log = AuditLog(audit_env, checkpoint_every=4, signer=key_signer("test_agent"))
+        _fill(log, 10)
+        assert [c["size"] for c in log.checkpoints()] == [4, 8]
+
+        report = Auditor(log).audit()
+        assert (report["checkpoints"], report["entries"], report["pending"], report["size"]) == (2, 8, 2, 8)
+
+        _fill(log, 2, start=10)
+        checked = []
+        original = audit_log.entry_leaf
+        monkeypatch.setattr(audit_log, "entry_leaf", lambda e: checked.append(e["seq"]) or original(e))
+        report = Auditor(log).audit()
+        assert (report["checkpoints"], report["size"]) == (1, 12)
+        assert checked == [8, 9, 10, 11]
+
+    def test_tampered_entry_is_detected(self, audit_env):
+        from audit_log import AuditLog, AuditError, Auditor, key_signer
+
+        log = AuditLog(audit_env, checkpoint_every=4, signer=key_signer("test_agent"))
+        _fill(log, 8)
+        lines = log.entries_path.read_text().splitlines()
+        entry = json.loads(lines[5])
+        entry["agent"] = "mallory"
+        lines[5] = json.dumps(entry)
+        log.entries_path.write_text("\n".join(lines) + "\n")
+
+        auditor = Auditor(log)
+        with pytest.raises(AuditError, match="chain broken at entry 5"):
+            auditor.audit()
+        assert auditor.state["size"] == 4
+
+    def test_garbled_entry_is_not_pending(self, audit_env):
+        from audit_log import AuditLog, AuditError, Auditor
+
+        log = AuditLog(audit_env)
+        _fill(log, 8)
+        lines = log.entries_path.read_text().splitlines()
+        lines[5] = "{" + lines[5]
+        log.entries_path.write_text("\n".join(lines) + "\n")
+
+        with pytest.raises(AuditError, match="Garbled entry"):
+            Auditor(log).audit()
+        with pytest.raises(AuditError, match="Garbled entry"):
+            AuditLog(audit_env)
+
+    def test_forged_checkpoint_is_rejected(self, audit_env, temp_dir):
+        import subprocess
+        import sshsig
+        from audit_log import AuditLog, AuditError, Auditor, key_signer
+
+        other = temp_dir / "other_key"
+        subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(other), "-N", "", "-q"], check=True)
+        forger = sshsig.load_private_key(other)
+        log = AuditLog(audit_env, signer=lambda s: ("test_agent", forger.sign(s, "agent-mesh-audit")))
+        _fill(log, 3)
+        log.checkpoint()
+        with pytest.raises(AuditError, match="Unknown signing key"):
+            Auditor(log).audit()
+
+        log.checkpoint(key_signer("test_agent"))
+        with pytest.raises(AuditError):
+            Auditor(log).audit()
+
+    def test_reading_does_not_create_the_log(self, audit_env):
+        from audit_log import AuditLog, Auditor
+
+        log = AuditLog(audit_env)
+        assert log.size == 0 and log.checkpoints() == []
+        assert Auditor(log).audit()["entries"] == 0
+        assert not audit_env.exists()
+
+        _fill(log, 1)
+        assert (audit_env / "tree").is_dir() and AuditLog(audit_env).size == 1
+
+
+class TestSignedMessages:
+    def test_sign_message_records_and_proves(self, audit_env, mock_agent_keys, monkeypatch):
+        from sign_message import sign_message
+        from audit_log import AuditLog, key_signer, verify_proof
+        from verify_message import read_signed_message
+
+        monkeypatch.setenv("AGENT_MESH_AUDIT_DIR", str(audit_env))
+        messages = audit_env.parent / "messages"
+        messages.mkdir()
+        for i in range(3):
+            path = messages / f"research-{i}.md"
+            path.write_text(f"[RESEARCH] test_agent — finding {i}\n")
+            sign_message(str(path), mock_agent_keys["agent_name"])
+
+        log = AuditLog(audit_env)
+        assert log.size == 3
+        assert log.find(hashlib.sha256(b"x").hexdigest()) == []
+        log.checkpoint(key_signer("test_agent"))
+
+        with open(messages / "research-1.md", "rb") as f:
+            payload_hash = read_signed_message(f)[3]
+        proof = json.loads(json.dumps(log.prove(payload_hash)))
+        assert proof["entry"]["seq"] == 1 and proof["entry"]["source"].endswith("research-1.md")
+        assert verify_proof(proof) is None
+
+        proof["entry"]["payload_hash"] = hashlib.sha256(b"forged").hexdigest()
+        proof["entry"].pop("leaf")
+        assert "does not reach" in verify_proof(proof)
+
+    def test_signer_is_only_used_when_a_checkpoint_is_due(self, audit_env, mock_agent_keys,
+                                                         monkeypatch):
+        import audit_log
+        import signing_daemon
+        from sign_message import sign_message
+
+        connects = []
+        monkeypatch.setattr(signing_daemon, "connect", lambda agent: connects.append(agent))
+        monkeypatch.setattr(audit_log, "CHECKPOINT_EVERY", 2)
+        monkeypatch.setenv("AGENT_MESH_AUDIT_DIR", str(audit_env))
+        for i in range(3):
+            path = audit_env.parent / f"msg-{i}.md"
+            path.write_text(f"[ACK] {i}\n")
+            sign_message(str(path), mock_agent_keys["agent_name"])
+        assert connects == ["test_agent"]
+        assert [c["size"] for c in audit_log.AuditLog(audit_env).checkpoints()] == [2]
+
+    def test_no_audit_dir_means_no_log(self, audit_env, mock_agent_keys, temp_dir, monkeypatch):
+        from sign_message import sign_message
+
+        monkeypatch.delenv("AGENT_MESH_AUDIT_DIR", raising=False)
+        path = temp_dir / "msg.md"
+        path.write_text("[ACK] nothing to record\n")
+        sign_message(str(path), mock_agent_keys["agent_name"])
+        assert not audit_env.exists()
+
+    def test_audit_failure_does_not_fail_signing(self, audit_env, mock_agent_keys, temp_dir,
+                                                 monkeypatch, capsys):
+        from sign_message import sign_message
+        from verify_message import verify_message
+
+        audit_env.mkdir()
+        (audit_env / "head.json").write_text("{not json")
+        monkeypatch.setenv("AGENT_MESH_AUDIT_DIR", str(audit_env))
+        path = temp_dir / "msg.md"
+        path.write_text("[ACK] signed despite the log\n")
+        sign_message(str(path), mock_agent_keys["agent_name"])
+
+        assert "Audit log not updated" in capsys.readouterr().err
+        assert verify_message(str(path), mock_agent_keys["agent_name"])
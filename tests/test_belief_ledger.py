@@ -0,0 +1,214 @@
+"""Tests for the Bayesian belief ledger"""
+
+import pytest
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+np = pytest.importorskip("numpy")
+
+UPDATE = """[BAYESIAN-UPDATE] Task #5 — Architecture Decision
+
+**Prior:** "Use Slack as primary" (confidence: 40%)
+  — Reasoning: Matrix E2E is stable, but user requested Slack
+
+**Evidence:** "Stick with Matrix as primary" (your preference stated)
+**Strength:** High (user is authority on infrastructure preferences)
+
+**Posterior:** "Matrix primary, Slack backup" (confidence: 85%)
+**Update:** +45% based on explicit user preference
+
+**Residual Uncertainty (15%):**
+  — If Matrix fails, Slack bridge startup adds 30-second delay
+"""
+
+CORRECTION = """[BAYESIAN-CORRECTION] Neuromancer → Clawdy
+
+**Prior Confidence:** ~85% that "Slack is operational for 3-agent coordination"
+**Confidence Update:** -70% → ~15%
+**Posterior confidence:**
+- "Slack bot can POST messages" → 95% (API success confirms)
+- "3-agent coordination in Slack" → 10% (needs bi-directional sync)
+**Outcome:** false
+"""
+
+CONFLICT = """[CONFLICT] Neuromancer vs Clawdy on Task #3
+
+Neuromancer's position:
+  Prior: 90% "Fine-tuning is cost-effective"
+  Residual: 10% — governance overhead unclear
+
+Clawdy's position:
+  Prior: 70% "Prompt engineering first"
+"""
+
+
+class TestParsing:
+    def test_update_message(self):
+        from belief_ledger import parse_update
+
+        update = parse_update(UPDATE)
+        assert update.kind == "bayesian_update"
+        assert update.title == "Task #5 — Architecture Decision"
+        assert [(c.text, c.confidence) for c in update.priors] == [("Use Slack as primary", 0.4)]
+        assert [(c.text, c.confidence) for c in update.posteriors] == [("Matrix primary, Slack backup", 0.85)]
+        assert update.update == pytest.approx(0.45)
+        assert (update.residual, update.strength, update.tier) == (0.15, "high", "substantive")
+
+    def test_correction_revises_prior_and_lists_posteriors(self):
+        from belief_ledger import parse_update
+
+        update = parse_update(CORRECTION)
+        assert update.agent == "Neuromancer"
+        assert update.shift == pytest.approx(-0.7)
+        assert update.tier == "major"
+        posteriors = {c.text: c.confidence for c in update.posteriors}
+        assert posteriors["Slack is operational for 3-agent coordination"] == pytest.approx(0.15)
+        assert posteriors["Slack bot can POST messages"] == pytest.approx(0.95)
+        assert update.outcomes == [(None, False)]
+
+    def test_conflict_attributes_priors_to_speakers(self):
+        from belief_ledger import parse_update
+
+        update = parse_update(CONFLICT)
+        assert update.tier == "conflict"
+        assert [(c.agent, c.confidence) for c in update.priors] == [("Neuromancer", 0.9), ("Clawdy", 0.7)]
+
+    def test_other_messages_are_ignored(self):
+        from belief_ledger import parse_update
+
+        assert parse_update("[RESEARCH] 90% of agents agree") is None
+
+    @pytest.mark.parametrize("shift,tier", [(0.1, "trivial"), (-0.2, "substantive"), (0.5, "substantive"),
+                                            (-0.7, "major"), (None, "unstated")])
+    def test_protocol_tiers(self, shift, tier):
+        from belief_ledger import protocol_tier
+
+        assert protocol_tier(shift) == tier
+        assert protocol_tier(shift, conflict=True) == "conflict"
+
+
+class TestLedger:
+    def test_rows_are_columnar_and_deduplicated(self, temp_dir):
+        from belief_ledger import BeliefLedger, PRIOR, POSTERIOR
+
+        ledger = BeliefLedger(temp_dir)
+        assert ledger.ingest_text(UPDATE, agent="clawdy", timestamp=100.0) == 2
+        assert ledger.ingest_text(UPDATE, agent="clawdy") == 0
+
+        reopened = BeliefLedger(temp_dir)
+        assert len(reopened) == 2
+        assert list(reopened.columns["role"]) == [PRIOR, POSTERIOR]
+        assert reopened.columns["confidence"].dtype == np.float32
+        assert reopened.agents.values == ["clawdy"]
+        assert reopened.ingest_text(UPDATE) == 0
+
+    def test_outcome_line_scores_the_prior_not_the_posterior(self, temp_dir):
+        from belief_ledger import BeliefLedger
+
+        ledger = BeliefLedger(temp_dir)
+        ledger.ingest_text(CORRECTION, timestamp=100.0)
+        scores = ledger.brier_scores()
+        assert scores["neuromancer"]["n"] == 1
+        assert scores["neuromancer"]["brier"] == pytest.approx(0.85 ** 2)
+
+    def test_resolve_scores_earlier_statements(self, temp_dir):
+        from belief_ledger import BeliefLedger
+
+        ledger = BeliefLedger(temp_dir)
+        ledger.ingest_text(CONFLICT, timestamp=100.0)
+        ledger.resolve("Fine-tuning is cost-effective", False, timestamp=200.0)
+        ledger.resolve("fine-tuning is cost-effective.", True, timestamp=300.0)  # latest wins
+
+        scores = BeliefLedger(temp_dir).brier_scores()
+        assert scores["neuromancer"]["brier"] == pytest.approx(0.1 ** 2)
+        assert "clawdy" not in scores
+
+    def test_calibration_feedback(self, temp_dir):
+        from belief_ledger import BeliefLedger
+
+        ledger = BeliefLedger(temp_dir)
+        for i in range(20):
+            ledger.ingest_text(f'[BAYESIAN-UPDATE] Claim {i}\n**Prior:** "claim {i}" (confidence: 95%)\n',
+                               agent="neuromancer", timestamp=float(i))
+            ledger.resolve(f"claim {i}", i % 5 < 3, timestamp=1000.0)  # 60% held
+
+        report = ledger.report(min_count=5)["neuromancer"]
+        assert report["resolved"] == 20
+        (cell,) = report["curve"]
+        assert cell["bin"] == "90-100%"
+        assert cell["confidence"] == pytest.approx(0.95)
+        assert cell["observed"] == pytest.approx(0.6)
+        assert report["feedback"] == ["Your 95% should have been 60% (overconfident, n=20)"]
+        assert report["tiers"] == {"unstated": 20}
+
+    def test_torn_column_append_is_truncated(self, temp_dir):
+        from belief_ledger import BeliefLedger
+
+        ledger = BeliefLedger(temp_dir)
+        ledger.ingest_text(UPDATE, agent="clawdy")
+        with open(temp_dir / "confidence.bin", "ab") as f:
+            f.write(b"\0\0\0\0")
+        with open(temp_dir / "message.bin", "ab") as f:
+            f.write(b"\0\0\0")
+
+        reopened = BeliefLedger(temp_dir)
+        assert len(reopened) == 2
+        assert len(reopened.columns["confidence"]) == 2
+
+    def test_ingest_queue_uses_a_cursor(self, temp_dir):
+        from belief_ledger import BeliefLedger
+        from file_queue import FileQueue
+        from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+        parser = ProtocolParser(DEFAULT_PREFIXES)
+        queue = FileQueue(str(temp_dir / "queue"), agents=["clawdy"])
+        queue.append_batch([
+            parser.parse(UPDATE).to_record(source="slack", timestamp="1707912345.0001", user="U123",
+                                           agent="clawdy"),
+            parser.parse("[RESEARCH] unrelated").to_record(source="slack", timestamp="1707912346.0", user="U123"),
+        ])
+        queue.sync()
+
+        ledger = BeliefLedger(temp_dir / "ledger")
+        stats = ledger.ingest_queue(str(temp_dir / "queue"))
+        assert (stats["records"], stats["messages"], stats["rows"]) == (2, 1, 2)
+        assert ledger.columns["timestamp"][0] == pytest.approx(1707912345.0001)
+        assert ledger.ingest_queue(str(temp_dir / "queue"))["records"] == 0
+
+    def test_queue_records_are_attributed_through_the_registry(self, temp_dir):
+        from belief_ledger import BeliefLedger
+        from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+        parser = ProtocolParser(DEFAULT_PREFIXES)
+        named = UPDATE.replace("Task #5", "Neuromancer — Task #5", 1)
+        records = [parser.parse(text).to_record(source="slack", timestamp="1707912345.0", user="U123")
+                   for text in (named, UPDATE)]
+
+        ledger = BeliefLedger(temp_dir)
+        stats = ledger.ingest_records(records, ids={"neuromancer": "neuromancer"})
+        assert (stats["messages"], stats["unattributed"]) == (1, 1)
+        assert ledger.agents.values == ["neuromancer"]
+
+    def test_ingest_signed_markdown(self, temp_dir):
+        from belief_ledger import BeliefLedger
+
+        messages = temp_dir / "messages"
+        messages.mkdir()
+        (messages / "update.md").write_text(
+            UPDATE + "\n**Timestamp:** 2026-02-14T15:00:00Z\n\n---\n\n### Message Authentication\n\n"
+            "**Agent:** clawdy\n**Payload Hash (SHA256):** " + "0" * 64 + "\n\n"
+            "-----BEGIN SSH SIGNATURE-----\nAAAA\n-----END SSH SIGNATURE-----\n")
+        (messages / "notes.md").write_text("# Notes\n")
+
+        ledger = BeliefLedger(temp_dir / "ledger")
+        stats = ledger.ingest_signed(str(messages))
+        assert (stats["files"], stats["messages"], stats["rows"]) == (2, 1, 2)
+        assert ledger.agents.values == ["clawdy"]
+        assert ledger.columns["timestamp"][0] == pytest.approx(1771081200.0)
+
+        report = json.loads(json.dumps(ledger.report()))  # JSON-able
+        assert report["clawdy"]["tiers"] == {"substantive": 1}
@@ -0,0 +1,150 @@
+"""Tests for calibration-weighted conflict resolution"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+np = pytest.importorskip("numpy")
+
+CONFLICT = """[BAYESIAN-CONFLICT] Task #8 — Model Selection
+
+**Neuromancer Prior:** "Use GPT-4" (confidence: 75%)
+**Clawdy Prior:** "Use Claude-3.5-Sonnet" (confidence: 60%)
+**Evidence:** Both surfaced different optimization criteria
+"""
+
+
+def _conflict(*positions, title="Task"):
+    from conflict_resolver import Conflict, Position
+
+    return Conflict(title, [Position(*p) for p in positions])
+
+
+class TestPooling:
+    def test_positions_become_distributions(self):
+        from conflict_resolver import load_conflicts, pool
+
+        (conflict,) = load_conflicts([CONFLICT])
+        assert conflict.agents == ["neuromancer", "clawdy"]
+        (resolution,) = pool([conflict], "linear")
+        assert resolution.options == ["Use GPT-4", "Use Claude-3.5-Sonnet"]
+        assert np.allclose(resolution.distributions, [[0.75, 0.25], [0.4, 0.6]])
+        assert np.allclose(resolution.pooled, [0.575, 0.425])
+
+    def test_log_pooling_is_weighted_log_odds_for_two_options(self):
+        from conflict_resolver import pool
+
+        conflict = _conflict(("a", "claim", 0.9), ("b", "claim", 0.3))
+        (resolution,) = pool([conflict], "log", weights={"a": 3.0, "b": 1.0})
+        assert resolution.options == ["claim", "Not: claim"]
+
+        logit = lambda p: np.log(p / (1 - p))
+        expected = 1 / (1 + np.exp(-(0.75 * logit(0.9) + 0.25 * logit(0.3))))
+        assert resolution.pooled[0] == pytest.approx(expected)
+
+    def test_batch_matches_one_at_a_time(self):
+        from conflict_resolver import pool
+
+        conflicts = [
+            _conflict(("a", "x", 0.9), ("b", "y", 0.6)),
+            _conflict(("a", "x", 0.2), ("b", "y", 0.5), ("c", "z", 0.7), ("c", "x", 0.1)),
+            _conflict(("b", "solo", 0.8), ("c", "solo", 0.4)),
+        ]
+        weights = {"a": 0.9, "b": 0.3, "c": 0.6}
+        for method in ("log", "linear"):
+            batched = pool(conflicts, method, weights)
+            for conflict, resolution in zip(conflicts, batched):
+                (single,) = pool([conflict], method, weights)
+                assert np.allclose(resolution.pooled, single.pooled)
+                assert resolution.pooled.sum() == pytest.approx(1.0)
+
+    def test_unknown_method(self):
+        from conflict_resolver import pool
+
+        with pytest.raises(ValueError):
+            pool([_conflict(("a", "x", 0.5), ("b", "y", 0.5))], "median")
+
+
+class TestWeights:
+    def test_better_calibrated_agent_counts_more(self, temp_dir):
+        from belief_ledger import BeliefLedger
+        from conflict_resolver import calibration_weights, resolve
+
+        ledger = BeliefLedger(temp_dir)
+        for i in range(40):
+            ledger.ingest_text(f'[BAYESIAN-UPDATE] {i}\n**Prior:** "good {i}" (confidence: 90%)\n',
+                               agent="clawdy", timestamp=float(i))
+            ledger.ingest_text(f'[BAYESIAN-UPDATE] {i}\n**Prior:** "bad {i}" (confidence: 90%)\n',
+                               agent="neuromancer", timestamp=float(i))
+            ledger.resolve(f"good {i}", True, timestamp=100.0)
+            ledger.resolve(f"bad {i}", i % 2 == 0, timestamp=100.0)
+
+        clawdy, neuromancer, newcomer = calibration_weights(["clawdy", "neuromancer", "moltdude"], ledger)
+        assert clawdy > newcomer > neuromancer
+
+        (resolution,) = resolve([_conflict(("clawdy", "x", 0.8), ("neuromancer", "y", 0.8))], "log", ledger)
+        assert resolution.options[resolution.best] == "x"
+
+    def test_names_map_to_registry_ids(self):
+        from conflict_resolver import agent_ids, load_conflicts
+
+        registry = SimpleNamespace(agents={
+            "neuromancer": SimpleNamespace(name="Neuromancer"),
+            "clawdy": SimpleNamespace(name="Clawdy (Tatooine)"),
+        })
+        ids = agent_ids(registry)
+        assert ids["clawdy (tatooine)"] == "clawdy"
+        (conflict,) = load_conflicts([CONFLICT], ids)
+        assert conflict.agents == ["neuromancer", "clawdy"]
+
+    def test_single_agent_is_not_a_conflict(self):
+        from conflict_resolver import load_conflicts
+
+        text = '[CONFLICT] Solo\n**Neuromancer Prior:** "x" (confidence: 60%)\n'
+        assert load_conflicts([text, "[RESEARCH] not a conflict"]) == []
+
+
+class TestSynthesis:
+    def test_renders_signable_synthesis(self):
+        from conflict_resolver import load_conflicts, resolve, render_synthesis
+        from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+        resolutions = resolve(load_conflicts([CONFLICT]) + [_conflict(
+            ("neuromancer", "Ship it", 0.95), ("clawdy", "Ship it", 0.9), title="Task #9")])
+        text = render_synthesis(resolutions, synthesizer="clawdy", names={"clawdy": "Clawdy"})
+
+        assert ProtocolParser(DEFAULT_PREFIXES).parse(text).kind == "synthesis"
+        assert "**Synthesized by:** Clawdy" in text
+        assert "**Confidence:** Low" in text  # Task #8 stays a human decision
+        assert "- Task #8 — Model Selection: \"Use GPT-4\"" in text
+        assert "1. Task #9: adopt \"Ship it\" (high confidence)" in text
+
+
+class TestQueue:
+    def test_compaction_between_reads_keeps_unread_conflicts(self, temp_dir):
+        from conflict_resolver import read_queue
+        from file_queue import FileQueue
+        from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+        parser = ProtocolParser(DEFAULT_PREFIXES)
+        record = parser.parse(CONFLICT).to_record(source="slack", timestamp="1707912345.0", user="U1")
+        queue = FileQueue(str(temp_dir / "queue"), segment_max_bytes=512, agents=["clawdy"])
+        queue.append_batch([record])
+        queue.sync()
+
+        texts, cursor = read_queue(queue)
+        assert len(texts) == 1
+        queue.ack("conflict-resolver", cursor)
+
+        for _ in range(5):
+            queue.append_batch([record])
+        queue.sync()
+        queue.consume("clawdy")
+        assert queue.compact()  # only segments the resolver has already read
+
+        texts, _ = read_queue(queue)
+        assert len(texts) == 5
@@ -0,0 +1,80 @@
+"""Tests for Slack event redelivery suppression"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class TestDedupeCache:
+    """LRU+TTL cache and the persistent bloom filter"""
+
+    def test_same_envelope_or_message_is_duplicate(self):
+        from dedupe import DedupeCache
+
+        cache = DedupeCache()
+        assert not cache.is_duplicate("C1", "1.0", "env-1")
+        # Socket Mode retry of the same envelope
+        assert cache.is_duplicate("C1", "1.0", "env-1")
+        # Same message redelivered in a new envelope after reconnect
+        assert cache.is_duplicate("C1", "1.0", "env-2")
+        # Same ts in another channel is a different message
+        assert not cache.is_duplicate("C2", "1.0", "env-3")
+        assert cache.metrics()["duplicates_suppressed"] == 2
+
+    def test_ttl_expiry(self, monkeypatch):
+        import dedupe
+
+        now = [1000.0]
+        monkeypatch.setattr(dedupe.time, "monotonic", lambda: now[0])
+
+        cache = dedupe.DedupeCache(ttl=10)
+        assert not cache.is_duplicate("C1", "1.0", None)
+        now[0] += 5
+        assert cache.is_duplicate("C1", "1.0", None)
+        now[0] += 11
+        assert not cache.is_duplicate("C1", "1.0", None)
+        assert cache.expired == 1
+
+    def test_lru_bound(self):
+        from dedupe import DedupeCache
+
+        cache = DedupeCache(max_entries=100)
+        for i in range(500):
+            cache.is_duplicate("C1", f"{i}.0", None)
+        assert len(cache) == 100
+        assert cache.evicted == 400
+        assert cache.is_duplicate("C1", "499.0", None)
+        assert not cache.is_duplicate("C1", "0.0", None)
+
+    def test_bloom_survives_restart(self, temp_dir):
+        from dedupe import DedupeCache
+
+        cache = DedupeCache(bloom_dir=str(temp_dir / "bloom"))
+        for i in range(50):
+            cache.is_duplicate("C1", f"{i}.0", f"env-{i}")
+        cache.close()
+
+        restarted = DedupeCache(bloom_dir=str(temp_dir / "bloom"))
+        assert restarted.is_duplicate("C1", "7.0", "env-new")
+        assert restarted.bloom_hits == 1
+        assert not restarted.is_duplicate("C1", "999.0", "env-999")
+        restarted.close()
+
+    def test_bloom_generations_rotate(self, temp_dir):
+        from dedupe import GenerationalBloom
+
+        bloom = GenerationalBloom(str(temp_dir / "bloom"), capacity=10, error_rate=1e-4)
+        for i in range(10):
+            bloom.add(f"old-{i}".encode())
+        for i in range(10):
+            bloom.add(f"mid-{i}".encode())
+        assert b"old-3" in bloom and b"mid-3" in bloom
+
+        # Third generation evicts the oldest
+        bloom.add(b"new-0")
+        assert b"old-3" not in bloom
+        assert b"mid-3" in bloom and b"new-0" in bloom
+        bloom.close()
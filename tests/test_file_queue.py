@@ -0,0 +1,130 @@
+"""Tests for the segmented file queue and per-agent cursors"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def queue(temp_dir):
+    from file_queue import FileQueue
+
+    q = FileQueue(temp_dir / "queue", segment_max_bytes=4096, index_interval=8,
+                  agents=["clawdy", "neuromancer"])
+    yield q
+    q.close()
+
+
+def _fill(queue, count: int, start: int = 0):
+    for i in range(start, start + count, 10):
+        queue.append_batch([{"seq": n, "text": "x" * 40} for n in range(i, min(i + 10, start + count))])
+
+
+class TestFileQueue:
+    """Segment rotation, indexed reads and cursors"""
+
+    def test_rotation_and_read_since(self, queue):
+        _fill(queue, 500)
+
+        assert len(queue.segments()) > 3
+        records, cursor = queue.read_since(0)
+        assert [r["seq"] for r in records] == list(range(500))
+        assert cursor == 500
+
+        records, cursor = queue.read_since(437)
+        assert [r["seq"] for r in records] == list(range(437, 500))
+
+        records, cursor = queue.read_since(100, limit=5)
+        assert [r["seq"] for r in records] == [100, 101, 102, 103, 104]
+        assert cursor == 105
+
+    def test_cursor_only_returns_new_messages(self, queue):
+        _fill(queue, 30)
+        assert len(queue.consume("clawdy")) == 30
+        assert queue.consume("clawdy") == []
+
+        _fill(queue, 5, start=30)
+        assert [r["seq"] for r in queue.consume("clawdy")] == [30, 31, 32, 33, 34]
+        assert queue.cursor("clawdy") == 35
+        assert queue.cursor("neuromancer") == 0
+
+    def test_reopen_recovers_sequence_and_drops_torn_line(self, queue, temp_dir):
+        from file_queue import FileQueue
+
+        _fill(queue, 25)
+        queue.close()
+        last = queue.segments()[-1]
+        with open(last.path, "ab") as f:
+            f.write(b'{"seq": "torn')
+
+        reopened = FileQueue(temp_dir / "queue", segment_max_bytes=4096, index_interval=8,
+                             agents=["clawdy"])
+        reopened.append_batch([{"seq": 25}])
+        records, _ = reopened.read_since(20)
+        assert [r["seq"] for r in records] == [20, 21, 22, 23, 24, 25]
+        reopened.close()
+
+    def test_compaction_waits_for_every_agent(self, queue):
+        _fill(queue, 500)
+        segments_before = len(queue.segments())
+
+        queue.consume("clawdy")
+        assert queue.compact() == []
+
+        queue.ack("neuromancer", 250)
+        removed = queue.compact()
+        assert removed
+        assert len(queue.segments()) == segments_before - len(removed)
+
+        records, _ = queue.read_since(250)
+        assert [r["seq"] for r in records] == list(range(250, 500))
+        records, _ = queue.read_since(0)
+        assert records[0]["seq"] > 0
+
+    def test_compaction_waits_for_registered_consumers(self, queue):
+        _fill(queue, 500)
+        queue.register("belief-ledger")
+        queue.consume("clawdy")
+        queue.ack("neuromancer", 500)
+        assert queue.compact() == []
+        assert queue.stats()["cursors"] == {"clawdy": 500, "neuromancer": 500, "belief-ledger": 0}
+
+        queue.ack("belief-ledger", 250)
+        assert queue.compact()
+        queue.register("belief-ledger")  # already registered: cursor stays put
+        records, _ = queue.read_since(queue.cursor("belief-ledger"))
+        assert [r["seq"] for r in records] == list(range(250, 500))
+
+    def test_unregistered_consumer_no_longer_pins_segments(self, queue):
+        _fill(queue, 500)
+        queue.register("retired-tool")
+        queue.ack("clawdy", 500)
+        queue.ack("neuromancer", 500)
+        assert queue.compact() == []
+
+        assert queue.unregister("retired-tool")
+        assert not queue.unregister("retired-tool")
+        with pytest.raises(ValueError):
+            queue.unregister("clawdy")
+        assert queue.compact()
+        assert "retired-tool" not in queue.stats()["cursors"]
+
+    def test_queue_writer_feeds_segments(self, temp_dir):
+        from file_queue import FileQueue
+        from queue_writer import QueueWriter
+
+        file_queue = FileQueue(temp_dir / "queue", agents=["clawdy"])
+
+        async def run():
+            writer = QueueWriter(file_queue, flush_interval=0.01)
+            await writer.start()
+            for i in range(100):
+                await writer.put({"seq": i})
+            await writer.close()
+
+        asyncio.run(run())
+        assert [r["seq"] for r in FileQueue(temp_dir / "queue").consume("clawdy")] == list(range(100))
@@ -0,0 +1,172 @@
+"""Tests for the agent liveness and channel health monitor"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimingWheel:
+    def test_rearmed_timer_does_not_fire(self):
+        from health_monitor import TimingWheel
+
+        wheel = TimingWheel(tick=1.0, slots=8)
+        wheel.schedule("a", 5.0)
+        wheel.schedule("b", 6.0)
+        wheel.schedule("a", 9.5)
+        assert wheel.advance(6.0) == ["b"]
+        assert wheel.advance(9.0) == []
+        assert wheel.advance(10.0) == ["a"]
+        assert len(wheel) == 0
+
+    def test_timers_beyond_one_revolution(self):
+        from health_monitor import TimingWheel
+
+        wheel = TimingWheel(tick=1.0, slots=8)
+        wheel.schedule("far", 20.0)   # same slot as 4.0 and 12.0
+        assert wheel.advance(4.0) == []
+        assert wheel.advance(12.0) == []
+        assert wheel.advance(100.0) == ["far"]
+
+
+class TestHysteresis:
+    def test_fails_over_after_consecutive_failures(self):
+        from health_monitor import HealthMonitor, StubProbe, FALLBACK
+
+        monitor = HealthMonitor(StubProbe(), fail_after=3, clock=FakeClock())
+        assert monitor.record_probe(False, 1000) is None
+        assert monitor.record_probe(True, 1002) is None   # streak broken
+        assert monitor.record_probe(False, 1004) is None
+        assert monitor.record_probe(False, 1006) is None
+        assert monitor.record_probe(False, 1008) == FALLBACK
+        assert monitor.failover_latency.max == 4
+
+    def test_recovery_needs_streak_and_dwell(self):
+        from health_monitor import HealthMonitor, StubProbe, PRIMARY
+
+        monitor = HealthMonitor(StubProbe(), fail_after=1, recover_after=3,
+                                min_dwell=60, clock=FakeClock())
+        monitor.record_probe(False, 1000)
+        for t in (1002, 1004, 1006, 1008):
+            assert monitor.record_probe(True, t) is None   # still inside min_dwell
+        assert monitor.record_probe(False, 1010) is None   # flap resets the streak
+        assert monitor.record_probe(True, 1060) is None
+        assert monitor.record_probe(True, 1062) is None
+        assert monitor.record_probe(True, 1064) == PRIMARY
+        assert monitor.switches == 2
+
+    def test_force_overrides_and_rejects_unknown_mode(self, temp_dir):
+        from health_monitor import HealthMonitor, StubProbe, read_state, FALLBACK
+
+        state = temp_dir / "health.json"
+        monitor = HealthMonitor(StubProbe(), state_path=state, clock=FakeClock())
+        assert monitor.force(FALLBACK) == FALLBACK
+        assert read_state(state)["mode"] == FALLBACK
+        with pytest.raises(ValueError):
+            monitor.force("carrier-pigeon")
+
+    def test_manual_override_sticks_until_cleared(self, temp_dir):
+        import subprocess
+        from health_monitor import HealthMonitor, StubProbe, read_state, FALLBACK, PRIMARY
+
+        state = temp_dir / "health.json"
+        monitor = HealthMonitor(StubProbe(), fail_after=1, recover_after=2, min_dwell=0,
+                                state_path=state, clock=FakeClock())
+        monitor.save()
+        script = Path(__file__).parent.parent / "scripts" / "health_monitor.py"
+        subprocess.run([sys.executable, str(script), "force", "fallback", "--state", str(state)],
+                       check=True, capture_output=True)
+        assert monitor._read_override() == FALLBACK
+        for t in range(1000, 1010):
+            assert monitor.record_probe(True, t) is None  # Matrix is up, but the override holds
+        assert read_state(state)["override"] == FALLBACK
+
+        subprocess.run([sys.executable, str(script), "clear", "--state", str(state)],
+                       check=True, capture_output=True)
+        assert monitor._read_override() is None
+        assert monitor.record_probe(True, 1010) is None
+        assert monitor.record_probe(True, 1011) == PRIMARY
+
+
+class TestLoop:
+    def test_dead_primary_switches_within_a_few_intervals(self, temp_dir):
+        from health_monitor import HealthMonitor, StubProbe, read_state, FALLBACK
+
+        changes = []
+        probe = StubProbe(results=[True, True], up=False)
+        state = temp_dir / "health.json"
+
+        async def run():
+            stop = asyncio.Event()
+
+            async def on_change(mode, reason):
+                changes.append(mode)
+                stop.set()
+
+            monitor = HealthMonitor(probe, interval=0.01, fail_after=3,
+                                    state_path=state, on_change=on_change)
+            await asyncio.wait_for(monitor.run(stop), 5)
+
+        asyncio.run(run())
+        assert changes == [FALLBACK]
+        assert probe.calls == 5
+        assert read_state(state)["mode"] == FALLBACK
+
+    def test_hung_probe_counts_as_failure(self):
+        from health_monitor import HealthMonitor
+
+        class Hang:
+            async def probe(self):
+                await asyncio.sleep(10)
+
+        monitor = HealthMonitor(Hang(), fail_after=1, probe_timeout=0.01)
+        assert asyncio.run(monitor.probe_once()) == "fallback"
+
+    def test_missing_state_file_reads_as_primary(self, temp_dir):
+        from health_monitor import read_state, PRIMARY
+
+        assert read_state(temp_dir / "absent.json")["mode"] == PRIMARY
+
+
+class TestAgentLiveness:
+    def test_silent_agent_reported_down_then_up(self):
+        from health_monitor import HealthMonitor, StubProbe, agent_from_text
+
+        events = []
+        clock = FakeClock(0.0)
+        monitor = HealthMonitor(StubProbe(), heartbeat_timeout=300, clock=clock,
+                                on_agent=lambda agent, up: events.append((agent, up)))
+        ids = {"clawdy": "clawdy", "neuromancer": "neuromancer"}
+        monitor.heartbeat(agent_from_text("[ACK] clawdy: on it", ids), now=0)
+        monitor.heartbeat(agent_from_text("[RESEARCH] Neuromancer — CVE sweep", ids), now=0)
+        monitor.heartbeat("clawdy", now=250)
+
+        assert monitor.check_agents(now=301) == ["neuromancer"]
+        assert monitor.check_agents(now=549) == []
+        assert monitor.check_agents(now=551) == ["clawdy"]
+        monitor.heartbeat("neuromancer", now=600)
+        assert events == [("neuromancer", False), ("clawdy", False), ("neuromancer", True)]
+        assert monitor.down == {"clawdy"}
+
+    def test_down_set_changes_are_saved(self, temp_dir):
+        from health_monitor import HealthMonitor, StubProbe, read_state
+
+        state = temp_dir / "health.json"
+        monitor = HealthMonitor(StubProbe(), heartbeat_timeout=300, clock=FakeClock(0.0),
+                                state_path=state)
+        monitor.heartbeat("clawdy", now=0)
+        monitor.check_agents(now=301)
+        assert read_state(state)["agents_down"] == ["clawdy"]
+        monitor.heartbeat("clawdy", now=400)
+        assert read_state(state)["agents_down"] == []
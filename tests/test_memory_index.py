@@ -0,0 +1,157 @@
+"""Tests for the memory package: chunking and the incremental BM25 index"""
+
+import pytest
+import os
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+DAY_ONE = """# 2026-02-13
+
+## Decision: use Slack as fallback
+Matrix homeserver was down; we chose Slack Socket Mode over email.
+
+## Status check
+All agents online.
+"""
+
+DAY_TWO = """# 2026-02-14
+
+### Error: S3 Tables bug
+**Error:** partition pruning returned stale rows
+**Fix:** pinned the Iceberg catalog version
+**Lesson:** pin catalog versions in every environment
+"""
+
+
+@pytest.fixture
+def workspace(temp_dir):
+    (temp_dir / "memory").mkdir()
+    (temp_dir / "MEMORY.md").write_text("# Memory\n\nClawdy synthesizes; Neuromancer researches CVEs.\n")
+    (temp_dir / "memory" / "2026-02-13.md").write_text(DAY_ONE)
+    (temp_dir / "memory" / "2026-02-14.md").write_text(DAY_TWO)
+    return temp_dir
+
+
+class TestChunking:
+    """Section chunks with byte and line offsets"""
+
+    def test_sections_and_offsets(self):
+        from memory import chunk_markdown
+
+        data = DAY_ONE.encode()
+        chunks = list(chunk_markdown(data))
+        assert [c.line_start for c in chunks] == [1, 3, 6]
+        assert chunks[1].text.startswith("## Decision")
+        for chunk in chunks:
+            assert data[chunk.byte_start:chunk.byte_end].decode() == chunk.text
+
+    def test_headings_in_code_fences_do_not_split(self):
+        from memory import chunk_markdown
+
+        data = b"# Top\n```bash\n# not a heading\n```\ntext\n"
+        assert len(list(chunk_markdown(data))) == 1
+
+    def test_oversized_section_is_split(self):
+        from memory import chunk_markdown
+
+        data = b"# Big\n" + b"line of text\n" * 1000
+        chunks = list(chunk_markdown(data, max_bytes=1024))
+        assert len(chunks) > 10
+        assert all(c.byte_end - c.byte_start <= 1024 for c in chunks)
+        assert chunks[-1].byte_end == len(data)
+
+
+class TestMemoryIndex:
+    """Search, incremental updates and snippet retrieval"""
+
+    def test_search_ranks_relevant_section(self, workspace):
+        from memory import MemoryIndex
+
+        index = MemoryIndex(workspace)
+        assert index.update()["added"] == 3
+        hits = index.search("S3 tables catalog lesson")
+        assert hits[0].path == "memory/2026-02-14.md"
+        assert hits[0].line_start == 3
+        assert "pinned the Iceberg catalog" in index.get(hits[0].path, hits[0].byte_start, hits[0].byte_end)
+        index.close()
+
+    def test_unchanged_files_are_not_reindexed(self, workspace):
+        from memory import MemoryIndex
+
+        index = MemoryIndex(workspace)
+        index.update()
+        segments = index.stats()["segments"]
+
+        stats = index.update()
+        assert stats["unchanged"] == 3
+        assert index.stats()["segments"] == segments
+
+        # Touch without editing: hash matches, nothing re-indexed
+        os.utime(workspace / "MEMORY.md", None)
+        stats = MemoryIndex(workspace).update()
+        assert stats["unchanged"] == 3 and stats["changed"] == 0
+        index.close()
+
+    def test_edit_replaces_old_chunks(self, workspace):
+        from memory import MemoryIndex
+
+        index = MemoryIndex(workspace)
+        index.update()
+        assert index.search("socket")
+
+        path = workspace / "memory" / "2026-02-13.md"
+        path.write_text(DAY_ONE.replace("Socket Mode", "webhooks"))
+        stats = index.update()
+        assert stats["changed"] == 1
+
+        assert index.search("socket") == []
+        assert index.search("webhooks")[0].path == "memory/2026-02-13.md"
+        index.close()
+
+    def test_deleted_file_disappears(self, workspace):
+        from memory import MemoryIndex
+
+        index = MemoryIndex(workspace)
+        index.update()
+        (workspace / "memory" / "2026-02-14.md").unlink()
+        assert index.update()["removed"] == 1
+        assert index.search("iceberg") == []
+        index.close()
+
+    def test_new_days_add_segments_and_merge(self, workspace):
+        from memory import MemoryIndex
+
+        index = MemoryIndex(workspace, max_segments=3)
+        index.update()
+        for day in range(15, 25):
+            (workspace / "memory" / f"2026-02-{day}.md").write_text(
+                f"# 2026-02-{day}\n\n## Note\nheartbeat topic{day} observed\n")
+            index.update()
+            assert index.stats()["segments"] <= 3
+
+        hits = index.search("topic17")
+        assert [h.path for h in hits] == ["memory/2026-02-17.md"]
+        assert index.search("iceberg")[0].path == "memory/2026-02-14.md"
+        on_disk = {p.stem for p in (workspace / ".memory-index").glob("seg-*.docs")}
+        assert on_disk == set(index.manifest["segments"])
+        index.close()
+
+    def test_index_survives_reopen(self, workspace):
+        from memory import MemoryIndex, memory_search
+
+        index = MemoryIndex(workspace)
+        index.update()
+        index.close()
+
+        hits = memory_search("decision slack fallback", root=str(workspace), update=False)
+        assert hits[0].path == "memory/2026-02-13.md"
+
+    def test_memory_get_rejects_escaping_paths(self, workspace):
+        from memory import memory_get
+
+        with pytest.raises(ValueError):
+            memory_get("../outside.md", 0, 10, root=str(workspace))
@@ -0,0 +1,160 @@
+"""Tests for the offline vector search tier"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+np = pytest.importorskip("numpy")
+
+
+class CountingEmbedder:
+    """Wraps an embedder and counts texts it is asked to embed"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.dim = inner.dim
+        self.calls = 0
+
+    @property
+    def name(self):
+        return self.inner.name
+
+    def embed(self, texts):
+        self.calls += len(texts)
+        return self.inner.embed(texts)
+
+
+def _clustered(n: int, dim: int, clusters: int, seed: int = 0):
+    from memory.vector import normalize
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return normalize(points.astype(np.float32))
+
+
+class TestHashingEmbedder:
+    def test_deterministic_unit_vectors(self):
+        from memory.vector import HashingEmbedder
+
+        embedder = HashingEmbedder(dim=64)
+        a = embedder.embed(["slack fallback decision", ""])
+        b = HashingEmbedder(dim=64).embed(["slack fallback decision", ""])
+        assert np.array_equal(a, b)
+        assert abs(np.linalg.norm(a[0]) - 1) < 1e-5
+        assert not a[1].any()
+
+    def test_related_text_scores_higher(self):
+        from memory.vector import HashingEmbedder
+
+        embedder = HashingEmbedder()
+        query, related, unrelated = embedder.embed([
+            "S3 tables catalog bug",
+            "Error: S3 tables returned stale rows; fix pinned the catalog",
+            "heartbeat status check all agents online",
+        ])
+        assert query @ related > query @ unrelated
+
+
+class TestEmbeddingCache:
+    def test_unchanged_text_is_not_reembedded(self, temp_dir):
+        from memory.vector import EmbeddingCache, HashingEmbedder
+
+        embedder = CountingEmbedder(HashingEmbedder(dim=32))
+        cache = EmbeddingCache(temp_dir, embedder)
+        first, embedded = cache.embed(["alpha", "beta", "alpha"])
+        assert embedded == 2 and embedder.calls == 2
+
+        reopened = EmbeddingCache(temp_dir, embedder)
+        second, embedded = reopened.embed(["beta", "alpha", "gamma"])
+        assert embedded == 1 and embedder.calls == 3
+        assert np.array_equal(second[0], first[1])
+
+    def test_torn_append_is_truncated(self, temp_dir):
+        from memory.vector import EmbeddingCache, HashingEmbedder
+
+        embedder = HashingEmbedder(dim=32)
+        cache = EmbeddingCache(temp_dir, embedder)
+        cache.embed(["alpha", "beta"])
+        with open(cache.vectors_path, "ab") as f:
+            f.write(b"\0" * 10)
+
+        reopened = EmbeddingCache(temp_dir, embedder)
+        assert len(reopened) == 2
+        assert reopened.vectors_path.stat().st_size == 2 * 32 * 4
+
+
+class TestVectorStore:
+    @pytest.mark.parametrize("quantize", ["float32", "int8"])
+    def test_exact_search_finds_self(self, temp_dir, quantize):
+        from memory.vector import VectorStore
+
+        vectors = _clustered(3000, 48, 20)
+        store = VectorStore.write(temp_dir / "store", vectors, quantize)
+        scores, ids = store.search(vectors[[5, 1234, 2999]], k=5)
+        assert list(ids[:, 0]) == [5, 1234, 2999]
+        assert np.all(np.diff(scores, axis=1) <= 1e-6)
+
+    def test_ivf_recall(self, temp_dir):
+        from memory.vector import VectorStore
+
+        vectors = _clustered(5000, 32, 40, seed=1)
+        store = VectorStore.write(temp_dir / "store", vectors)
+        store.train_ivf(nlist=40)
+        queries = vectors[::250] + 0.01
+        _, exact = store.search(queries, k=10, mode="exact")
+        _, approx = store.search(queries, k=10, mode="ivf", nprobe=8)
+        recall = np.mean([len(set(e) & set(a)) / 10 for e, a in zip(exact, approx)])
+        assert recall >= 0.9
+
+        reopened = VectorStore(temp_dir / "store")
+        _, again = reopened.search(queries, k=10, mode="ivf", nprobe=8)
+        assert np.array_equal(again, approx)
+
+    def test_fewer_rows_than_k(self, temp_dir):
+        from memory.vector import VectorStore
+
+        store = VectorStore.write(temp_dir / "store", _clustered(3, 8, 1))
+        _, ids = store.search(_clustered(1, 8, 1, seed=9), k=5)
+        assert sorted(ids[0][:3]) == [0, 1, 2]
+        assert list(ids[0][3:]) == [-1, -1]
+
+    @pytest.mark.parametrize("quantize", ["float32", "int8"])
+    def test_rewrite_leaves_open_readers_consistent(self, temp_dir, quantize):
+        from memory.vector import VectorStore
+
+        vectors = _clustered(1000, 16, 10)
+        reader = VectorStore.write(temp_dir / "store", vectors, quantize)
+        before = reader.search(vectors[[7, 900]], k=3)
+
+        rewritten = VectorStore.write(temp_dir / "store", vectors[:10], quantize)
+        assert rewritten.count == 10
+        assert not list((temp_dir / "store").glob("*.tmp"))
+        after = reader.search(vectors[[7, 900]], k=3)  # still the old 1000 rows
+        assert np.array_equal(after[1], before[1])
+        assert list(after[1][:, 0]) == [7, 900]
+
+
+class TestVectorIndex:
+    def test_semantic_search_over_memory(self, temp_dir):
+        from memory.vector import HashingEmbedder, VectorIndex
+
+        (temp_dir / "memory").mkdir()
+        (temp_dir / "memory" / "2026-02-14.md").write_text(
+            "# 2026-02-14\n\n## Error: S3 Tables bug\nstale rows; fix pinned the catalog\n\n"
+            "## Status\nall agents online\n")
+        (temp_dir / "MEMORY.md").write_text("# Memory\n\nClawdy synthesizes research.\n")
+
+        embedder = CountingEmbedder(HashingEmbedder())
+        index = VectorIndex(temp_dir, embedder=embedder)
+        assert index.update()["embedded"] == 4
+        hit = index.search("catalog bug in s3 tables", k=1)[0]
+        assert (hit.path, hit.line_start) == ("memory/2026-02-14.md", 3)
+
+        assert index.update()["unchanged"]
+        (temp_dir / "MEMORY.md").write_text("# Memory\n\nClawdy synthesizes research.\n\n## New\nfresh note\n")
+        stats = VectorIndex(temp_dir, embedder=embedder).update()
+        assert stats["embedded"] == 1  # only the new section
@@ -0,0 +1,185 @@
+"""Tests for the multi-key, fingerprint-indexed keyring"""
+
+import pytest
+import hashlib
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def _keygen(path: Path) -> str:
+    subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(path), "-N", "", "-q"], check=True)
+    return Path(f"{path}.pub").read_text().strip()
+
+
+def _sign(message: Path, key_path: Path, agent: str = "test_agent", label: bool = True):
+    """Sign with a specific key file, as sign_message.py would"""
+    import sshsig
+    from sign_message import signature_block
+
+    payload = message.read_bytes()
+    armored = sshsig.load_private_key(key_path).sign(payload)
+    block = signature_block(agent, hashlib.sha256(payload).hexdigest(), armored, str(message))
+    if not label:
+        block = block.replace(f"**Agent:** {agent}\n", "")
+    message.write_text(message.read_text() + block)
+
+
+@pytest.fixture
+def rotated(temp_dir, monkeypatch):
+    """test_agent with a current, a retired and a revoked key"""
+    import agent_registry
+    import mesh_keyring
+
+    monkeypatch.setattr(agent_registry, "_loaded", {})
+    monkeypatch.setattr(mesh_keyring, "_keyrings", {})
+    monkeypatch.chdir(temp_dir)
+
+    keys = {name: temp_dir / f"{name}_key" for name in ("current", "retired", "revoked", "other")}
+    public = {name: _keygen(path) for name, path in keys.items()}
+    registry = temp_dir / "agents" / "agents.yaml"
+    registry.parent.mkdir()
+    registry.write_text(f"""agents:
+  test_agent:
+    authentication:
+      method: "ed25519"
+      public_key: "{public['current']}"
+      keys:
+        - public_key: "{public['retired']}"
+          status: "retired"
+          valid_from: 2025-06-01
+        - public_key: "{public['revoked']}"
+          status: "revoked"
+  other_agent:
+    authentication:
+      public_key: "{public['other']}"
+""")
+    messages = temp_dir / "messages"
+    messages.mkdir()
+    return keys, messages
+
+
+class TestKeyring:
+    def test_every_key_is_indexed_by_fingerprint(self, rotated):
+        import sshsig
+        from agent_registry import load_registry
+        from mesh_keyring import load_keyring
+
+        keys, _ = rotated
+        keyring = load_keyring()
+        statuses = {name: keyring.lookup(sshsig.load_private_key(path).fingerprint)
+                    for name, path in keys.items()}
+        assert {n: (e.agent, e.status) for n, e in statuses.items()} == {
+            "current": ("test_agent", "active"),
+            "retired": ("test_agent", "retired"),
+            "revoked": ("test_agent", "revoked"),
+            "other": ("other_agent", "active"),
+        }
+        # The registry's current key is still the top-level public_key
+        registry = load_registry()
+        assert registry.get("test_agent").fingerprint == statuses["current"].fingerprint
+        assert registry.by_key_fingerprint(statuses["retired"].fingerprint).id == "test_agent"
+
+    def test_resolve_checks_agent_and_status(self, rotated):
+        import sshsig
+        from mesh_keyring import load_keyring
+
+        keys, _ = rotated
+        keyring = load_keyring()
+        retired = sshsig.load_private_key(keys["retired"]).fingerprint
+        revoked = sshsig.load_private_key(keys["revoked"]).fingerprint
+
+        assert keyring.resolve(retired)[0].status == "retired"
+        assert "revoked" in keyring.resolve(revoked)[1]
+        assert "belongs to" in keyring.resolve(retired, agent="other_agent")[1]
+
+    def test_snapshot_preserves_key_history(self, rotated, monkeypatch):
+        import agent_registry
+
+        first = agent_registry.load_registry()
+        monkeypatch.setattr(agent_registry, "_loaded", {})
+        monkeypatch.setattr(agent_registry.yaml, "safe_load",
+                            lambda *a, **k: pytest.fail("agents.yaml was re-parsed"))
+        assert agent_registry.load_registry().get("test_agent").keys == first.get("test_agent").keys
+
+    def test_allowed_signers_is_cached_and_usable_by_ssh_keygen(self, rotated):
+        from mesh_keyring import load_keyring
+
+        keys, messages = rotated
+        keyring = load_keyring()
+        path = keyring.allowed_signers_path()
+        assert keyring.allowed_signers_path() == path
+        text = path.read_text()
+        assert text.count("test_agent ") == 2 and text.count("other_agent ") == 1
+        assert 'valid-after="20250601000000Z"' in text
+
+        message = messages / "old.md"
+        message.write_text("[RESEARCH] signed before rotation\n")
+        subprocess.run(["ssh-keygen", "-Y", "sign", "-f", str(keys["retired"]), "-n", "agent-mesh",
+                        str(message)], check=True, capture_output=True)
+        with open(message, "rb") as f:
+            result = subprocess.run(["ssh-keygen", "-Y", "verify", "-f", str(path), "-I", "test_agent",
+                                     "-n", "agent-mesh", "-s", f"{message}.sig"], stdin=f,
+                                    capture_output=True)
+        assert result.returncode == 0, result.stderr
+
+
+class TestVerificationWithKeyring:
+    def test_history_signed_with_retired_key_still_verifies(self, rotated):
+        from verify_message import verify_message
+
+        keys, messages = rotated
+        message = messages / "old.md"
+        message.write_text("[RESEARCH] signed before rotation\n")
+        _sign(message, keys["retired"])
+        assert verify_message(str(message), "test_agent", use_cache=False)
+        assert not verify_message(str(message), "other_agent", use_cache=False)
+
+    def test_unlabeled_message_is_attributed(self, rotated, capsys):
+        from verify_message import verify_message
+
+        keys, messages = rotated
+        message = messages / "anon.md"
+        message.write_text("[ACK] who am I\n")
+        _sign(message, keys["current"], label=False)
+        assert verify_message(str(message), use_cache=False)
+        assert "Sent by test_agent" in capsys.readouterr().out
+
+    def test_batch_accepts_retired_rejects_revoked(self, rotated):
+        import json
+        from verify_message import verify_batch
+
+        keys, messages = rotated
+        for name, label in (("current", True), ("retired", True), ("revoked", True), ("current", False)):
+            message = messages / f"{name}-{label}.md"
+            message.write_text(f"[RESEARCH] signed with the {name} key\n")
+            _sign(message, keys[name], label=label)
+
+        out = io.StringIO()
+        summary = verify_batch(str(messages), workers=1, out=out, use_cache=False)
+        results = {Path(r["file"]).name: r for r in map(json.loads, out.getvalue().splitlines()[:-1])}
+        assert (summary["valid"], summary["invalid"]) == (3, 1)
+        assert "revoked" in results["revoked-True.md"]["error"]
+        assert results["current-False.md"]["attributed"] is True
+        assert results["current-False.md"]["agent"] == "test_agent"
+
+    def test_ledger_ingest_verifies_like_batch(self, rotated):
+        pytest.importorskip("numpy")
+        from belief_ledger import BeliefLedger
+
+        keys, messages = rotated
+        update = '[BAYESIAN-UPDATE] {}\n**Prior:** "Ship it" (confidence: 40%)\n' \
+                 '**Posterior:** "Ship it" (confidence: 80%)\n'
+        for name, label in (("retired", True), ("current", False), ("revoked", True)):
+            message = messages / f"{name}-{label}.md"
+            message.write_text(update.format(name))
+            _sign(message, keys[name], label=label)
+
+        ledger = BeliefLedger(messages.parent / "ledger")
+        stats = ledger.ingest_signed(str(messages), verify=True)
+        assert (stats["files"], stats["invalid"], stats["messages"]) == (3, 1, 2)
+        assert ledger.agents.values == ["test_agent"]
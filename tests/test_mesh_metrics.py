@@ -0,0 +1,159 @@
+"""Tests for the process-wide metrics registry, spans and trace log"""
+
+import pytest
+import asyncio
+import hashlib
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def metrics(temp_dir):
+    """Enabled metrics with a trace log; restored to disabled afterwards"""
+    import mesh_metrics
+
+    mesh_metrics.disable()
+    mesh_metrics.REGISTRY.clear()
+    trace_log = temp_dir / "trace.jsonl"
+    mesh_metrics.enable(trace_log=str(trace_log))
+    yield mesh_metrics, trace_log
+    mesh_metrics.disable()
+    mesh_metrics.REGISTRY.clear()
+
+
+def _traces(trace_log: Path) -> list:
+    return [json.loads(line) for line in trace_log.read_text().splitlines()]
+
+
+class TestRegistry:
+    def test_prometheus_text_format(self, metrics):
+        mesh_metrics, _ = metrics
+        mesh_metrics.inc("agent_mesh_things_total", kind='a"b')
+        mesh_metrics.inc("agent_mesh_things_total", 2, kind='a"b')
+        mesh_metrics.observe("agent_mesh_wait_seconds", 0.003)
+        mesh_metrics.REGISTRY.gauge("agent_mesh_depth", lambda: 7)
+
+        text = mesh_metrics.REGISTRY.prometheus()
+        assert "# TYPE agent_mesh_things_total counter\nagent_mesh_things_total{kind=\"a\\\"b\"} 3\n" in text
+        assert 'agent_mesh_wait_seconds_bucket{le="0.0025"} 0' in text
+        assert 'agent_mesh_wait_seconds_bucket{le="0.005"} 1' in text
+        assert 'agent_mesh_wait_seconds_bucket{le="+Inf"} 1' in text
+        assert "agent_mesh_wait_seconds_count 1" in text
+        assert "agent_mesh_depth 7" in text
+
+    def test_type_conflict_is_rejected(self, metrics):
+        mesh_metrics, _ = metrics
+        mesh_metrics.inc("agent_mesh_mixed")
+        with pytest.raises(ValueError):
+            mesh_metrics.observe("agent_mesh_mixed", 1.0)
+
+    def test_file_dump_and_http_endpoint(self, metrics, temp_dir):
+        mesh_metrics, _ = metrics
+        mesh_metrics.inc("agent_mesh_things_total")
+
+        mesh_metrics.write_prometheus(str(temp_dir / "metrics-{pid}.prom"))
+        dumped = list(temp_dir.glob("metrics-*.prom"))
+        assert len(dumped) == 1 and "agent_mesh_things_total 1" in dumped[0].read_text()
+
+        server = mesh_metrics.serve(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert "agent_mesh_things_total 1" in response.read().decode()
+        finally:
+            server.shutdown()
+
+
+class TestSpans:
+    def test_span_times_counts_errors_and_traces(self, metrics):
+        mesh_metrics, trace_log = metrics
+        with mesh_metrics.span("work", kind="a") as span:
+            span.annotate("abc123", agent="test_agent")
+        with pytest.raises(RuntimeError):
+            with mesh_metrics.span("work", "def456", kind="a"):
+                raise RuntimeError("boom")
+        with mesh_metrics.span("work", kind="a"):
+            pass  # no message hash: timed, not traced
+
+        registry = mesh_metrics.REGISTRY
+        assert registry.histogram("agent_mesh_work_seconds", kind="a").count == 3
+        assert registry.counter("agent_mesh_work_errors_total", kind="a").value == 1
+        traces = _traces(trace_log)
+        assert [(t["trace"], t.get("agent"), t.get("error")) for t in traces] == [
+            ("abc123", "test_agent", None), ("def456", None, "RuntimeError")]
+
+    def test_disabled_is_a_cheap_no_op(self, metrics):
+        mesh_metrics, trace_log = metrics
+        mesh_metrics.disable()
+        with mesh_metrics.span("work", "abc123") as span:
+            span.annotate("abc123")
+        mesh_metrics.inc("agent_mesh_things_total")
+        assert mesh_metrics.REGISTRY.prometheus() == ""
+        assert not mesh_metrics.tracing()
+
+        n = 100000
+        started = time.perf_counter()
+        for _ in range(n):
+            with mesh_metrics.span("work"):
+                pass
+            mesh_metrics.inc("agent_mesh_things_total")
+        # Generous bound for slow CI machines; bench_metrics.py measures the real figure
+        assert (time.perf_counter() - started) / n < 5e-6
+
+
+class TestInstrumentation:
+    def test_sign_and_verify_report_and_trace_by_hash(self, metrics, temp_dir, mock_agent_keys,
+                                                      monkeypatch):
+        import agent_registry
+        import mesh_keyring
+        from sign_message import sign_stream
+        from verify_message import verify_message
+
+        mesh_metrics, trace_log = metrics
+        registry = temp_dir / "agents" / "agents.yaml"
+        registry.parent.mkdir()
+        registry.write_text(f"""agents:
+  test_agent:
+    authentication:
+      public_key: "{mock_agent_keys['public_key'].read_text().strip()}"
+""")
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setenv("AGENT_MESH_SIGNER_SOCKET", str(temp_dir / "no-daemon.sock"))
+        monkeypatch.setattr(agent_registry, "_loaded", {})
+        monkeypatch.setattr(mesh_keyring, "_keyrings", {})
+
+        message = temp_dir / "research.md"
+        message.write_text("[RESEARCH] test_agent — traced\n")
+        payload_hash = hashlib.sha256(message.read_bytes()).hexdigest()
+        sign_stream(str(message), "test_agent", backend="native")
+        assert verify_message(str(message), "test_agent", use_cache=False)
+
+        registry = mesh_metrics.REGISTRY
+        assert registry.counter("agent_mesh_signatures_total", backend="native").value == 1
+        assert registry.counter("agent_mesh_verifications_total", result="valid").value == 1
+        spans = {t["span"]: t for t in _traces(trace_log) if t["trace"] == payload_hash}
+        assert spans["sign"]["agent"] == "test_agent"
+        assert spans["verify"]["valid"] is True
+
+    def test_queue_writer_reports_commits(self, metrics, temp_dir):
+        from queue_writer import QueueWriter
+
+        mesh_metrics, _ = metrics
+        writer = QueueWriter(str(temp_dir / "queue.jsonl"), fsync_interval=None)
+
+        async def run():
+            await writer.start()
+            for i in range(5):
+                await writer.put({"i": i})
+            await writer.close()
+
+        asyncio.run(run())
+        registry = mesh_metrics.REGISTRY
+        assert registry.counter("agent_mesh_queue_records_written_total").value == 5
+        assert registry.histogram("agent_mesh_queue_commit_seconds").count == writer.batches
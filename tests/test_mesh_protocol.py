@@ -0,0 +1,70 @@
+"""Tests for protocol prefix parsing"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def parser():
+    from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+    return ProtocolParser(DEFAULT_PREFIXES)
+
+
+class TestProtocolParser:
+    """Prefix classification and the queue record schema"""
+
+    @pytest.mark.parametrize("text,kind,prefix,content", [
+        ("[RESEARCH] Found 3 CVEs", "research", "[RESEARCH]", "Found 3 CVEs"),
+        ("[RESEARCH-VPS]  uptime ok ", "research_vps", "[RESEARCH-VPS]", "uptime ok"),
+        ("[ACK]", "ack", "[ACK]", ""),
+        ("[SYNTHESIS]\nmerged [CONFLICT] notes", "synthesis", "[SYNTHESIS]", "merged [CONFLICT] notes"),
+        ("[TODO] not registered", None, "[TODO]", "not registered"),
+        ("plain text", None, "[MESSAGE]", "plain text"),
+        ("[never closed", None, "[MESSAGE]", "[never closed"),
+        ("", None, "[MESSAGE]", ""),
+    ])
+    def test_parse(self, parser, text, kind, prefix, content):
+        message = parser.parse(text)
+        assert message.kind == kind
+        assert message.prefix == prefix
+        assert message.content == content
+        assert message.is_protocol == (kind is not None)
+
+    def test_overlong_bracket_is_not_a_prefix(self, parser):
+        text = "[" + "x" * 100 + "] tail"
+        assert parser.parse(text).prefix == "[MESSAGE]"
+
+    def test_record_keeps_queue_schema(self, parser):
+        record = parser.parse("[QUESTION] which model?").to_record(
+            source="slack", timestamp="1.0", user="U1")
+        assert list(record) == ["source", "timestamp", "user", "prefix", "kind", "content", "raw"]
+        assert record["raw"] == "[QUESTION] which model?"
+        assert record["content"] == "which model?"
+
+    def test_message_has_no_dict(self, parser):
+        message = parser.parse("[RUSH] now")
+        with pytest.raises(AttributeError):
+            message.extra = 1
+
+    def test_format_round_trips(self, parser):
+        text = parser.format("conflict", "sources disagree")
+        assert text == "[CONFLICT] sources disagree"
+        assert parser.parse(text).kind == "conflict"
+
+    def test_registry_prefixes_are_used(self, temp_dir):
+        import yaml
+        from agent_registry import load_registry
+        from mesh_protocol import get_parser
+
+        path = temp_dir / "agents.yaml"
+        path.write_text(yaml.safe_dump({
+            "agents": {},
+            "protocol": {"communication": {"prefixes": {"bayes": "[BAYESIAN-UPDATE]"}}},
+        }))
+        parser = get_parser(load_registry(path, use_cache=False))
+        assert parser.parse("[BAYESIAN-UPDATE] p=0.7").kind == "bayes"
+        assert parser.parse("[RESEARCH] x").kind is None
@@ -0,0 +1,123 @@
+"""Tests for the write-behind Slack queue writer"""
+
+import pytest
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def _read_records(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestQueueWriter:
+    """Group commit, overflow policies and clean shutdown"""
+
+    def test_burst_is_group_committed(self, temp_dir):
+        """A burst of messages lands in far fewer commits than messages"""
+        from queue_writer import QueueWriter
+
+        queue_file = temp_dir / "queue.jsonl"
+
+        async def run():
+            writer = QueueWriter(str(queue_file), batch_size=64, flush_interval=0.01)
+            await writer.start()
+            for i in range(500):
+                await writer.put({"seq": i})
+            await writer.close()
+            return writer
+
+        writer = asyncio.run(run())
+
+        assert [r["seq"] for r in _read_records(queue_file)] == list(range(500))
+        assert writer.written == 500
+        assert writer.batches < 50
+        assert writer.metrics()["batch_size"]["max"] <= 64
+        assert writer.metrics()["commit_latency"]["count"] == writer.batches
+
+    def test_drop_newest_when_full(self, temp_dir):
+        """With drop_newest, put() refuses records once the queue is full"""
+        from queue_writer import QueueWriter
+
+        async def run():
+            writer = QueueWriter(str(temp_dir / "queue.jsonl"), max_queue=3, overflow="drop_newest")
+            # Not started: nothing drains the queue
+            results = [await writer.put({"seq": i}) for i in range(5)]
+            return writer, results
+
+        writer, results = asyncio.run(run())
+        assert results == [True, True, True, False, False]
+        assert writer.dropped == 2
+        assert writer.depth == 3
+
+    def test_drop_oldest_keeps_latest(self, temp_dir):
+        """With drop_oldest, the newest records survive an overflow"""
+        from queue_writer import QueueWriter
+
+        queue_file = temp_dir / "queue.jsonl"
+
+        async def run():
+            writer = QueueWriter(str(queue_file), max_queue=3, overflow="drop_oldest")
+            for i in range(5):
+                await writer.put({"seq": i})
+            await writer.start()
+            await writer.close()
+
+        asyncio.run(run())
+        assert [r["seq"] for r in _read_records(queue_file)] == [2, 3, 4]
+
+    def test_put_after_close_fails(self, temp_dir):
+        from queue_writer import QueueWriter
+
+        async def run():
+            writer = QueueWriter(str(temp_dir / "queue.jsonl"))
+            await writer.start()
+            await writer.close()
+            with pytest.raises(RuntimeError):
+                await writer.put({"seq": 0})
+
+        asyncio.run(run())
+
+    def test_bad_record_does_not_stop_the_writer(self, temp_dir):
+        from queue_writer import QueueWriter
+
+        queue_file = temp_dir / "queue.jsonl"
+
+        async def run():
+            writer = QueueWriter(str(queue_file), max_queue=2, flush_interval=0)
+            await writer.start()
+            await writer.put({"x": object()})
+            await asyncio.sleep(0.05)
+            for i in range(5):  # "block" would hang here if the writer had died
+                await asyncio.wait_for(writer.put({"seq": i}), 1)
+            await asyncio.wait_for(writer.close(), 1)
+            return writer
+
+        writer = asyncio.run(run())
+        assert writer.errors == 1
+        assert [r["seq"] for r in _read_records(queue_file)] == list(range(5))
+
+    def test_put_and_close_fail_once_the_task_is_gone(self, temp_dir):
+        from queue_writer import QueueWriter
+
+        async def run():
+            writer = QueueWriter(str(temp_dir / "queue.jsonl"))
+            await writer.start()
+            writer._task.cancel()
+            await asyncio.gather(writer._task, return_exceptions=True)
+            with pytest.raises(RuntimeError, match="task has stopped"):
+                await writer.put({"seq": 0})
+            with pytest.raises(RuntimeError, match="task has stopped"):
+                await writer.close()
+
+        asyncio.run(run())
+
+    def test_unknown_overflow_policy_rejected(self, temp_dir):
+        from queue_writer import QueueWriter
+
+        with pytest.raises(ValueError):
+            QueueWriter(str(temp_dir / "queue.jsonl"), overflow="spill")
@@ -0,0 +1,136 @@
+"""Tests for the capability-aware task scheduler"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+REPO_REGISTRY = Path(__file__).parent.parent / "agents" / "agents.yaml"
+
+NOON = 12 * 3600.0
+MIDNIGHT = 86400.0 * 3
+
+
+@pytest.fixture
+def registry():
+    import agent_registry
+
+    return agent_registry.load_registry(REPO_REGISTRY, use_cache=False)
+
+
+def _scheduler(registry, **kwargs):
+    from scheduler import Scheduler
+
+    kwargs.setdefault("utc_offset", 0)
+    return Scheduler(registry, **kwargs)
+
+
+class TestRoutes:
+    def test_tables_compile_into_routes(self, registry):
+        from scheduler import compile_routes, DEFAULT_ROUTE
+
+        routes = compile_routes(registry)
+        assert routes["security_research"] == ("neuromancer", "clawdy", "moltdude")
+        assert routes["governance_policy_analysis"][0] == "clawdy"
+        assert routes["monitoring_background"][0] == "moltdude"
+        assert routes["web_research"][0] == "neuromancer"
+        assert routes[DEFAULT_ROUTE] == tuple(registry.fallback_chain)
+
+    def test_inactive_agents_never_routed(self):
+        from scheduler import compile_routes
+
+        agent = lambda status, priority, caps=(): SimpleNamespace(
+            status=status, synthesizer_priority=priority, capabilities=caps, availability="24/7")
+        registry = SimpleNamespace(
+            agents={"a": agent("active", 1), "b": agent("planned", 2, ("scan",))},
+            fallback_chain=["b", "a"], capability_routing={"scan": "b"}, synthesis_routing={})
+        routes = compile_routes(registry)
+        assert routes["scan"] == ("a",)
+        assert routes["*"] == ("a",)
+
+
+class TestAssignment:
+    def test_follows_route_and_concurrency_limit(self, registry):
+        scheduler = _scheduler(registry, limits={"neuromancer": 1, "clawdy": 1, "moltdude": 1})
+        (first,) = scheduler.submit("t1", "security_research", NOON)
+        (second,) = scheduler.submit("t2", "security_research", NOON)
+        (third,) = scheduler.submit("t3", "security_research", NOON)
+        assert [first.agent, second.agent, third.agent] == ["neuromancer", "clawdy", "moltdude"]
+
+        assert scheduler.submit("t4", "security_research", NOON) == []
+        assert scheduler.waiting() == 1
+        (freed,) = scheduler.complete("t2", NOON + 5)
+        assert (freed.task, freed.agent) == ("t4", "clawdy")
+
+    def test_human_schedule_agent_skipped_overnight(self, registry):
+        scheduler = _scheduler(registry)
+        (assignment,) = scheduler.submit("night", "creative_synthesis", MIDNIGHT + 2 * 3600)
+        assert assignment.agent == "neuromancer"
+        (assignment,) = scheduler.submit("day", "creative_synthesis", MIDNIGHT + NOON)
+        assert assignment.agent == "clawdy"
+
+    def test_waiting_task_placed_when_agent_comes_on_shift(self, registry):
+        from scheduler import Window
+
+        windows = {"neuromancer": Window(9, 17), "clawdy": Window(10, 18), "moltdude": Window(9, 17)}
+        scheduler = _scheduler(registry, windows=windows)
+        assert scheduler.submit("early", "web_research", MIDNIGHT + 3 * 3600) == []
+        assert scheduler.tick(MIDNIGHT + 8 * 3600) == []
+        (assignment,) = scheduler.tick(MIDNIGHT + 9 * 3600)
+        assert assignment.agent == "neuromancer"
+
+    def test_duplicate_task_rejected(self, registry):
+        scheduler = _scheduler(registry)
+        scheduler.submit("t1", "web_research", NOON)
+        with pytest.raises(ValueError):
+            scheduler.submit("t1", "web_research", NOON)
+
+
+class TestFailover:
+    def test_missed_ack_moves_down_the_route(self, registry):
+        scheduler = _scheduler(registry)
+        (first,) = scheduler.submit("t1", "security_research", NOON)
+        assert first.deadline == NOON + 60
+        assert scheduler.tick(NOON + 59.9) == []
+
+        (second,) = scheduler.tick(NOON + 60)
+        assert (second.agent, second.attempt) == ("clawdy", 2)
+        assert scheduler.failovers == 1
+        # unresponsive until it ACKs again, so new work skips it
+        (other,) = scheduler.submit("t2", "security_research", NOON + 61)
+        assert other.agent == "clawdy"
+
+        assert scheduler.ack("t1", "neuromancer", NOON + 62) is False  # too late
+        (third,) = scheduler.submit("t3", "security_research", NOON + 63)
+        assert third.agent == "neuromancer"
+
+    def test_acked_task_does_not_fail_over(self, registry):
+        scheduler = _scheduler(registry)
+        scheduler.submit("t1", "web_research", NOON)
+        assert scheduler.ack("t1", "neuromancer", NOON + 10)
+        assert scheduler.tick(NOON + 600) == []
+        assert scheduler.assignee("t1") == "neuromancer"
+
+    def test_exhausted_route_escalates(self, registry):
+        scheduler = _scheduler(registry)
+        scheduler.submit("t1", "web_research", NOON)
+        agents = []
+        for step in range(1, 4):
+            (assignment,) = scheduler.tick(NOON + 60 * step)
+            agents.append(assignment.agent)
+        assert agents == ["clawdy", "moltdude", None]
+        assert scheduler.escalated == 1 and "t1" not in scheduler.tasks
+
+    def test_unresponsive_agent_retried_after_cooldown(self, registry):
+        from scheduler import RETRY_AFTER
+
+        scheduler = _scheduler(registry, limits={"neuromancer": 1})
+        scheduler.submit("t1", "web_research", NOON)
+        scheduler.tick(NOON + 60)
+        (skipped,) = scheduler.submit("t2", "web_research", NOON + 61)
+        assert skipped.agent == "clawdy"
+        (retried,) = scheduler.submit("t3", "web_research", NOON + 60 + RETRY_AFTER)
+        assert retried.agent == "neuromancer"
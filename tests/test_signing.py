@@ -92,3 +92,111 @@ class TestEndToEnd:
         # Should succeed (exit code 0) or fail gracefully
         # Note: Full verification requires agents.yaml setup
         assert result.returncode == 0 or "not found" in result.stderr
+
+
+class TestBatchVerification:
+    """Batch verification across directories of signed messages"""
+    
+    @pytest.fixture
+    def signed_dir(self, temp_dir, mock_agent_keys, monkeypatch):
+        """Directory of signed messages plus a registry holding the test key"""
+        from sign_message import sign_message
+        
+        registry = temp_dir / "agents" / "agents.yaml"
+        registry.parent.mkdir()
+        public_key = mock_agent_keys["public_key"].read_text().strip()
+        registry.write_text(f"""agents:
+  test_agent:
+    authentication:
+      method: "ed25519"
+      public_key: "{public_key}"
+""")
+        monkeypatch.chdir(temp_dir)
+        
+        messages = temp_dir / "messages"
+        messages.mkdir()
+        for i in range(4):
+            path = messages / f"research-{i}.md"
+            path.write_text(f"[RESEARCH] test_agent — finding {i}\n")
+            sign_message(str(path), mock_agent_keys["agent_name"])
+        return messages
+    
+    def test_batch_reports_valid_invalid_and_unknown(self, signed_dir, mock_agent_keys):
+        """Tampered and unregistered-agent messages are reported separately"""
+        import io
+        import json
+        from verify_message import verify_batch
+        
+        tampered = signed_dir / "research-1.md"
+        tampered.write_text(tampered.read_text().replace("finding 1", "finding 9"))
+        
+        impostor = signed_dir / "research-2.md"
+        impostor.write_text(impostor.read_text().replace("**Agent:** test_agent", "**Agent:** impostor"))
+        
+        out = io.StringIO()
+        summary = verify_batch(str(signed_dir), workers=2, out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        
+        assert summary["total"] == 4
+        assert summary["valid"] == 2
+        assert summary["invalid"] == 1
+        assert summary["unknown_agent"] == 1
+        assert lines[-1]["summary"]["valid"] == 2
+        statuses = {Path(r["file"]).name: r["status"] for r in lines[:-1]}
+        assert statuses["research-1.md"] == "invalid"
+        assert statuses["research-2.md"] == "unknown_agent"
+    
+    def test_single_file_verify_accepts_signed_message(self, signed_dir, mock_agent_keys):
+        """The ssh-keygen path should accept what sign_message produced"""
+        from verify_message import verify_message
+        
+        assert verify_message(str(signed_dir / "research-0.md"), mock_agent_keys["agent_name"])
+
+
+class TestStreaming:
+    """Chunked signing and tail-seeking verification"""
+    
+    def test_stream_sign_matches_in_memory_sign(self, sample_message, mock_agent_keys, temp_dir):
+        """Streaming and in-memory signing append the same block"""
+        from sign_message import sign_message, sign_stream
+        
+        copy = temp_dir / "test_message_copy.md"
+        copy.write_text(sample_message.read_text())
+        
+        sign_message(str(sample_message), mock_agent_keys["agent_name"])
+        sign_stream(str(copy), mock_agent_keys["agent_name"])
+        
+        assert copy.read_text().replace(str(copy), str(sample_message)) == sample_message.read_text()
+    
+    def test_large_payload_roundtrip(self, temp_dir, mock_agent_keys, monkeypatch):
+        """Payloads larger than the chunk and tail windows verify correctly"""
+        import sshsig
+        import verify_message
+        from sign_message import sign_stream
+        
+        monkeypatch.setattr(verify_message, "CHUNK_SIZE", 4096)
+        message = temp_dir / "large.md"
+        message.write_text("[RESEARCH] large\n" + "### Message Authentication lookalike\n" * 20000)
+        sign_stream(str(message), mock_agent_keys["agent_name"])
+        
+        public_key = sshsig.parse_public_key(mock_agent_keys["public_key"].read_text())
+        verify_message._init_batch_worker({mock_agent_keys["agent_name"]: (public_key, None)})
+        
+        assert verify_message.verify_file(str(message))["status"] == "valid"
+        
+        with open(message, "r+b") as f:
+            f.seek(100)
+            f.write(b"X")
+        assert verify_message.verify_file(str(message))["error"] == "Hash verification failed"
+    
+    def test_stdin_signing_streams_to_stdout(self, mock_agent_keys, temp_dir):
+        """`sign_message.py -` writes payload plus block to stdout"""
+        scripts_dir = Path(__file__).parent.parent / "scripts"
+        
+        result = subprocess.run([
+            sys.executable, str(scripts_dir / "sign_message.py"), "-", mock_agent_keys["agent_name"]
+        ], input=b"[ACK] test_agent\n", capture_output=True)
+        
+        assert result.returncode == 0
+        assert result.stdout.startswith(b"[ACK] test_agent\n\n\n---\n\n### Message Authentication")
+        assert b"Message signed" in result.stderr
@@ -0,0 +1,131 @@
+"""Tests for the persistent signing daemon and its client"""
+
+import pytest
+import asyncio
+import hashlib
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def running_daemon(mock_agent_keys, temp_dir, monkeypatch):
+    """Daemon serving the test key on its own event loop thread"""
+    from signing_daemon import SigningDaemon
+
+    socket_path = temp_dir / "signer.sock"
+    monkeypatch.setenv("AGENT_MESH_SIGNER_SOCKET", str(socket_path))
+    daemon = SigningDaemon(socket_path, key_dir=mock_agent_keys["private_key"].parent)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    async def serve():
+        daemon.stop = asyncio.Event()
+        await daemon.start()
+        ready.set()
+        await daemon.stop.wait()
+        await daemon.close()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield daemon
+    loop.call_soon_threadsafe(daemon.stop.set)
+    thread.join(5)
+    loop.close()
+
+
+def _public_key(mock_agent_keys):
+    import sshsig
+    return sshsig.parse_public_key(mock_agent_keys["public_key"].read_text())
+
+
+class TestSigningDaemon:
+    def test_signature_matches_native_signing(self, running_daemon, mock_agent_keys):
+        import sshsig
+        from signing_daemon import connect
+
+        message = b"[ACK] test_agent\n"
+        with connect("test_agent") as client:
+            armored = client.sign("test_agent", message)
+
+        native = sshsig.load_private_key(mock_agent_keys["private_key"]).sign(message)
+        assert armored == native  # Ed25519 is deterministic
+        assert sshsig.verify(_public_key(mock_agent_keys), message, armored) == (True, None)
+        assert (running_daemon.socket_path.stat().st_mode & 0o777) == 0o600
+
+    def test_pipelined_batch_preserves_order(self, running_daemon, mock_agent_keys, monkeypatch):
+        import sshsig
+        import signing_daemon
+
+        monkeypatch.setattr(signing_daemon, "PIPELINE_WINDOW", 8)
+        digests = [hashlib.sha512(f"message {i}".encode()).digest() for i in range(20)]
+        with signing_daemon.connect() as client:
+            signatures = client.sign_many("test_agent", digests)
+
+        public_key = _public_key(mock_agent_keys)
+        for digest, armored in zip(digests, signatures):
+            assert sshsig.verify_digest(public_key, {"sha512": digest}, armored) == (True, None)
+        assert running_daemon.requests == 20
+        assert list(running_daemon.keys) == ["test_agent"]  # parsed once
+
+    def test_errors_are_per_request(self, running_daemon):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(running_daemon.socket_path))
+        digest = hashlib.sha512(b"x").hexdigest().encode()
+        sock.sendall(b'{"id": 1, "op": "sign", "agent": "../etc", "digest": "' + digest + b'"}\n'
+                     b'not json\n'
+                     b'{"id": 3, "op": "sign", "agent": "test_agent", "digest": "zz"}\n'
+                     b'{"id": 4, "op": "ping"}\n')
+        reader = sock.makefile("rb")
+        responses = [json.loads(reader.readline()) for _ in range(4)]
+        sock.close()
+
+        assert [r["ok"] for r in responses] == [False, False, False, True]
+        assert "Invalid agent id" in responses[0]["error"]
+        assert responses[3]["id"] == 4
+
+    def test_connect_returns_none_without_daemon_or_key(self, running_daemon, temp_dir):
+        from signing_daemon import connect
+
+        assert connect(socket_path=temp_dir / "missing.sock") is None
+        assert connect("someone_else") is None
+
+
+class TestSignMessageWithDaemon:
+    def test_cli_path_signs_through_daemon(self, running_daemon, sample_message, mock_agent_keys):
+        import sign_message
+
+        # The daemon holds the key; the CLI never parses it
+        sign_message._signing_keys.clear()
+        block = sign_message.sign_stream(str(sample_message), "test_agent")
+        assert "-----BEGIN SSH SIGNATURE-----" in block
+        assert running_daemon.requests == 2  # has_key + sign
+        assert sign_message._signing_keys == {}
+
+    def test_daemon_backend_requires_running_daemon(self, sample_message, mock_agent_keys,
+                                                    temp_dir, monkeypatch):
+        from sign_message import sign_stream
+
+        monkeypatch.setenv("AGENT_MESH_SIGNER_SOCKET", str(temp_dir / "missing.sock"))
+        with pytest.raises(SystemExit):
+            sign_stream(str(sample_message), "test_agent", backend="daemon")
+        assert "SSH SIGNATURE" in sign_stream(str(sample_message), "test_agent")
+
+    def test_daemon_module_is_only_imported_when_its_socket_exists(self, sample_message,
+                                                                   mock_agent_keys, temp_dir,
+                                                                   monkeypatch):
+        import sign_message
+
+        monkeypatch.setenv("AGENT_MESH_SIGNER_SOCKET", str(temp_dir / "missing.sock"))
+        monkeypatch.delitem(sys.modules, "signing_daemon", raising=False)
+        assert "SSH SIGNATURE" in sign_message.sign_stream(str(sample_message), "test_agent")
+        assert "signing_daemon" not in sys.modules
+
+        with pytest.raises(ValueError, match="signs by agent id"):
+            sign_message.create_signature(str(sample_message), temp_dir / "key", "daemon")
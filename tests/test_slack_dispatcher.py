@@ -0,0 +1,197 @@
+"""Tests for the rate-limited Slack outbound dispatcher"""
+
+import pytest
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class RateLimited(Exception):
+    """Shaped like slack_sdk.errors.SlackApiError for a 429"""
+
+    def __init__(self, retry_after: str):
+        super().__init__("ratelimited")
+        self.response = _Response(429, {"Retry-After": retry_after})
+
+
+class FakeSlack:
+    """Records chat.postMessage calls; optionally rate-limits the first N"""
+
+    def __init__(self, limited: int = 0, retry_after: str = "0.05"):
+        self.calls = []
+        self.times = []
+        self.limited = limited
+        self.retry_after = retry_after
+
+    async def post(self, channel: str, **kwargs):
+        self.times.append(time.monotonic())
+        if self.limited:
+            self.limited -= 1
+            raise RateLimited(self.retry_after)
+        self.calls.append(dict(channel=channel, **kwargs))
+        return {"ok": True, "ts": str(len(self.calls))}
+
+
+class TestOutboundDispatcher:
+    """Priority order, pacing, Retry-After and ACK coalescing"""
+
+    def test_priority_order(self):
+        from slack_dispatcher import (
+            OutboundDispatcher, PRIORITY_URGENT, PRIORITY_SYNTHESIS, PRIORITY_RESEARCH,
+        )
+
+        slack = FakeSlack()
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000)
+            await dispatcher.start()
+            # Queue everything before the sender task gets a chance to run
+            futures = [
+                dispatcher.submit(PRIORITY_RESEARCH, "c", text="research-1"),
+                dispatcher.submit(PRIORITY_SYNTHESIS, "c", text="synthesis"),
+                dispatcher.submit(PRIORITY_RESEARCH, "c", text="research-2"),
+                dispatcher.submit(PRIORITY_URGENT, "c", text="urgent"),
+            ]
+            await asyncio.gather(*futures)
+            await dispatcher.close()
+
+        asyncio.run(run())
+        assert [c["text"] for c in slack.calls] == ["urgent", "synthesis", "research-1", "research-2"]
+
+    def test_token_bucket_paces_a_channel(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_RESEARCH
+
+        slack = FakeSlack()
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=20, burst=2)
+            await dispatcher.start()
+            await asyncio.gather(*[
+                dispatcher.submit(PRIORITY_RESEARCH, "c", text=str(i)) for i in range(6)
+            ])
+            await dispatcher.close()
+
+        asyncio.run(run())
+        # 2 burst tokens, then 4 more at 20/s => at least ~0.2s end to end
+        assert slack.times[-1] - slack.times[0] >= 0.18
+        assert len(slack.calls) == 6
+
+    def test_retry_after_is_honoured(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_SYNTHESIS
+
+        slack = FakeSlack(limited=1, retry_after="0.2")
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000)
+            await dispatcher.start()
+            response = await dispatcher.submit(PRIORITY_SYNTHESIS, "c", text="synthesis")
+            await dispatcher.close()
+            return dispatcher, response
+
+        dispatcher, response = asyncio.run(run())
+        assert response["ok"]
+        assert slack.times[1] - slack.times[0] >= 0.19
+        assert dispatcher.rate_limited == 1
+        assert dispatcher.sent == 1
+
+    def test_paused_channel_does_not_stall_others(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_RESEARCH, PRIORITY_URGENT
+
+        slack = FakeSlack(limited=1, retry_after="0.3")
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000)
+            await dispatcher.start()
+            slow = dispatcher.submit(PRIORITY_RESEARCH, "paused", text="research")
+            await asyncio.sleep(0.05)  # "paused" is now inside its Retry-After
+            started = time.monotonic()
+            await dispatcher.submit(PRIORITY_RESEARCH, "other", text="elsewhere")
+            other_latency = time.monotonic() - started
+            urgent = dispatcher.submit(PRIORITY_URGENT, "paused", text="urgent")
+            await asyncio.gather(slow, urgent)
+            await dispatcher.close()
+            return other_latency
+
+        assert asyncio.run(run()) < 0.1
+        # The urgent post queued during the pause goes out first once it ends
+        assert [c["text"] for c in slack.calls] == ["elsewhere", "urgent", "research"]
+
+    def test_submit_before_start_fails_clearly(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_RESEARCH
+
+        async def run():
+            dispatcher = OutboundDispatcher(FakeSlack().post)
+            with pytest.raises(RuntimeError, match="start"):
+                dispatcher.submit(PRIORITY_RESEARCH, "c", text="x")
+            with pytest.raises(RuntimeError, match="start"):
+                dispatcher.submit_ack("c", "[ACK] x")
+
+        asyncio.run(run())
+
+    def test_gives_up_after_max_retries(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_RESEARCH
+
+        slack = FakeSlack(limited=10, retry_after="0")
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000, max_retries=2)
+            await dispatcher.start()
+            with pytest.raises(RateLimited):
+                await dispatcher.submit(PRIORITY_RESEARCH, "c", text="x")
+            await dispatcher.close()
+            return dispatcher
+
+        dispatcher = asyncio.run(run())
+        assert dispatcher.failed == 1
+        assert len(slack.times) == 3
+
+    def test_queued_acks_are_coalesced(self):
+        from slack_dispatcher import OutboundDispatcher, PRIORITY_RESEARCH
+
+        slack = FakeSlack()
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000)
+            await dispatcher.start()
+            futures = [dispatcher.submit_ack("c", f"[ACK] agent-{i}") for i in range(5)]
+            futures.append(dispatcher.submit(PRIORITY_RESEARCH, "c", text="research"))
+            futures.append(dispatcher.submit_ack("c", "[ACK] late"))
+            futures.append(dispatcher.submit_ack("other", "[ACK] other channel"))
+            await asyncio.gather(*futures)
+            await dispatcher.close()
+            return dispatcher
+
+        dispatcher = asyncio.run(run())
+        texts = [c["text"] for c in slack.calls]
+        assert "research" in texts
+        merged = [t for t in texts if t.startswith("[ACK] agent-0")]
+        assert merged == ["\n".join(f"[ACK] agent-{i}" for i in range(5)) + "\n[ACK] late"]
+        assert dispatcher.coalesced == 5
+        assert len(slack.calls) == 3
+
+    def test_large_ack_is_not_merged(self):
+        from slack_dispatcher import OutboundDispatcher
+
+        slack = FakeSlack()
+
+        async def run():
+            dispatcher = OutboundDispatcher(slack.post, rate=1000, burst=1000, ack_max_chars=20)
+            await dispatcher.start()
+            await asyncio.gather(
+                dispatcher.submit_ack("c", "[ACK] small"),
+                dispatcher.submit_ack("c", "[ACK] " + "x" * 100),
+            )
+            await dispatcher.close()
+
+        asyncio.run(run())
+        assert len(slack.calls) == 2
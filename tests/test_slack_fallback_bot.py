@@ -0,0 +1,299 @@
+"""Tests for SlackFallbackBot inbound event handling"""
+
+import pytest
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+pytest.importorskip("slack_sdk")
+pytest.importorskip("aiohttp")
+
+
+class FakeRequest:
+    def __init__(self, envelope_id: str, event: dict):
+        self.type = "events_api"
+        self.envelope_id = envelope_id
+        self.payload = {"event": event}
+
+
+class FakeSocketClient:
+    def __init__(self):
+        self.acked = []
+
+    async def send_socket_mode_response(self, response):
+        self.acked.append(response.envelope_id)
+
+
+@pytest.fixture
+def bot(temp_dir, monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setenv("SLACK_APP_TOKEN", "xapp-test")
+    monkeypatch.setenv("SLACK_ENABLED", "true")
+    monkeypatch.setenv("SLACK_FALLBACK_CHANNEL", "C-MESH")
+    monkeypatch.setenv("SLACK_QUEUE_FILE", str(temp_dir / "queue.jsonl"))
+    monkeypatch.setenv("SLACK_QUEUE_FSYNC_INTERVAL", "never")
+
+    from slack_fallback_bot import SlackFallbackBot
+    return SlackFallbackBot()
+
+
+def _message(ts: str, text: str, channel: str = "C-MESH") -> dict:
+    return {"type": "message", "channel": channel, "user": "U1", "ts": ts, "text": text}
+
+
+class TestInboundEvents:
+    """Ack-first handling with a bounded worker pool"""
+
+    def test_ack_is_sent_before_slow_queue_write(self, bot, temp_dir):
+        client = FakeSocketClient()
+
+        async def run():
+            bot.events = asyncio.Queue(maxsize=10)
+            release = asyncio.Event()
+
+            async def slow_write(message_data):
+                await release.wait()
+
+            bot.write_to_queue = slow_write
+            worker = asyncio.create_task(bot.event_worker())
+
+            await bot.handle_message(client, FakeRequest("env-1", _message("1.0", "[RESEARCH] a")))
+            await bot.handle_message(client, FakeRequest("env-2", _message("2.0", "[RESEARCH] b")))
+            # Both envelopes acked while the first write is still blocked
+            assert client.acked == ["env-1", "env-2"]
+
+            release.set()
+            await bot.events.join()
+            worker.cancel()
+
+        asyncio.run(run())
+        assert bot.stage_latency["ack"].count == 2
+        assert bot.stage_latency["queued"].count == 2
+
+    def test_events_reach_the_queue(self, bot, temp_dir):
+        client = FakeSocketClient()
+
+        async def run():
+            bot.events = asyncio.Queue(maxsize=10)
+            await bot.queue_writer.start()
+            workers = [asyncio.create_task(bot.event_worker()) for _ in range(3)]
+
+            for i in range(10):
+                await bot.handle_message(client, FakeRequest(f"env-{i}", _message(f"{i}.0", f"[RESEARCH] item {i}")))
+            await bot.handle_message(client, FakeRequest("env-x", _message("99.0", "[RESEARCH] elsewhere", channel="C-OTHER")))
+
+            await bot.events.join()
+            for worker in workers:
+                worker.cancel()
+            await bot.queue_writer.close()
+
+        asyncio.run(run())
+        records = [json.loads(line) for line in (temp_dir / "queue.jsonl").read_text().splitlines()]
+        assert sorted(r["content"] for r in records) == sorted(f"item {i}" for i in range(10))
+        assert all(r["prefix"] == "[RESEARCH]" for r in records)
+        assert bot.metrics()["stage_latency"]["total"]["count"] == 10
+
+    def test_redelivery_is_dropped_before_queueing(self, bot):
+        client = FakeSocketClient()
+
+        async def run():
+            bot.events = asyncio.Queue(maxsize=10)
+            await bot.handle_message(client, FakeRequest("env-1", _message("1.0", "[RESEARCH] a")))
+            await bot.handle_message(client, FakeRequest("env-1", _message("1.0", "[RESEARCH] a")))
+            await bot.handle_message(client, FakeRequest("env-2", _message("1.0", "[RESEARCH] a")))
+            return bot.events.qsize()
+
+        assert asyncio.run(run()) == 1
+        # Duplicates are still acked so Slack stops retrying
+        assert client.acked == ["env-1", "env-1", "env-2"]
+        assert bot.metrics()["dedupe"]["duplicates_suppressed"] == 2
+
+    def test_stop_ends_start(self, bot):
+        async def run():
+            bot.shutdown = asyncio.Event()
+            bot.stop()
+            assert bot.shutdown.is_set()
+
+        asyncio.run(run())
+
+
+class TestAutoFailover:
+    """SLACK_ENABLED=auto wires the Matrix health monitor into the bot"""
+
+    def test_auto_mode_tracks_agent_heartbeats(self, bot, temp_dir, monkeypatch):
+        monkeypatch.setenv("SLACK_ENABLED", "auto")
+        monkeypatch.setenv("MESH_HEALTH_FILE", str(temp_dir / "health.json"))
+
+        from slack_fallback_bot import SlackFallbackBot
+        auto = SlackFallbackBot()
+        assert auto.health is not None and bot.health is None
+
+        queued = []
+
+        async def run():
+            async def write(message_data):
+                queued.append(message_data["raw"])
+            auto.write_to_queue = write
+            await auto.process_event(_message("1.0", "[ACK] clawdy: on it"), 0.0, 0.0)
+            auto.health.force("fallback")
+            await auto.process_event(_message("2.0", "[ACK] clawdy: bridged"), 0.0, 0.0)
+
+        asyncio.run(run())
+        assert "clawdy" in auto.health.last_seen
+        assert queued == ["[ACK] clawdy: bridged"]  # nothing bridged while Matrix was healthy
+
+    def test_failover_is_announced(self, bot):
+        posted = []
+
+        async def run():
+            def post(message, priority="normal"):
+                posted.append((priority, message))
+            bot.post_system_message = post
+            await bot.on_channel_change("fallback", "3 failed probes")
+
+        asyncio.run(run())
+        assert posted[0][0] == "urgent" and "Switching to Slack" in posted[0][1]
+
+
+class TestSlackTransport:
+    """The bot as a message-bus plugin"""
+
+    def test_bus_receipts_wait_for_slack(self, bot):
+        from slack_dispatcher import OutboundDispatcher
+        from slack_fallback_bot import SlackTransport
+        from transports import Envelope, MessageBus
+
+        async def run():
+            gate = asyncio.Event()
+            posted = []
+
+            async def post(channel, **kwargs):
+                await gate.wait()
+                if "Broken" in kwargs["text"]:
+                    raise RuntimeError("channel_not_found")
+                posted.append(kwargs["text"])
+                return {"ok": True}
+
+            bot.dispatcher = OutboundDispatcher(post, rate=100, burst=100)
+            await bot.dispatcher.start()
+            bus = MessageBus([SlackTransport(bot)])
+            await bus.start()
+            done = (await bus.publish(Envelope.create("[SYNTHESIS] Done", "clawdy")))["slack"]
+            broken = (await bus.publish(Envelope.create("[SYNTHESIS] Broken", "clawdy")))["slack"]
+            await asyncio.sleep(0.01)
+            assert not done.done()  # publish() returned; the receipt waits for Slack
+            gate.set()
+            assert (await done)["ok"]
+            with pytest.raises(RuntimeError, match="channel_not_found"):
+                await broken
+            metrics = bus.metrics()["slack"]
+            await bus.close()
+            await bot.dispatcher.close()
+            return posted, metrics
+
+        posted, metrics = asyncio.run(run())
+        assert posted[0].startswith("[SYNTHESIS] clawdy")
+        assert (metrics["sent"], metrics["failed"]) == (1, 1)
+
+    def test_running_bot_registers_itself(self, bot, monkeypatch):
+        import slack_fallback_bot
+        from slack_dispatcher import OutboundDispatcher
+        from transports import TRANSPORTS
+
+        class FakeSocketModeClient:
+            def __init__(self, app_token, web_client):
+                self.socket_mode_request_listeners = []
+
+            async def connect(self):
+                pass
+
+            async def close(self):
+                pass
+
+        async def post(channel, **kwargs):
+            return {"ok": True}
+
+        async def open_outbound():
+            bot.dispatcher = OutboundDispatcher(post, rate=100, burst=100)
+            await bot.dispatcher.start()
+
+        monkeypatch.setattr(slack_fallback_bot, "SocketModeClient", FakeSocketModeClient)
+        monkeypatch.setattr(bot, "open_outbound", open_outbound)
+        assert "slack" not in TRANSPORTS  # importing the module no longer builds a bot
+
+        async def run():
+            task = asyncio.create_task(bot.start())
+            while not (bot.healthy and bot.healthy.is_set()):
+                await asyncio.sleep(0.01)
+            transport = TRANSPORTS["slack"](kinds=["synthesis"])
+            bot.stop()
+            await task
+            return transport
+
+        assert asyncio.run(run()).bot is bot
+        assert "slack" not in TRANSPORTS
+
+    def test_test_mode_reports_failed_posts(self, bot, monkeypatch):
+        from slack_dispatcher import OutboundDispatcher
+        from slack_fallback_bot import test_mode
+
+        async def post(channel, **kwargs):
+            if kwargs["text"].startswith("[SYNTHESIS]"):
+                raise RuntimeError("channel_not_found")
+            return {"ok": True}
+
+        async def open_outbound():
+            bot.dispatcher = OutboundDispatcher(post, rate=100, burst=100)
+            await bot.dispatcher.start()
+
+        monkeypatch.setattr(bot, "open_outbound", open_outbound)
+        assert test_mode(bot) == 1
+
+    def test_missing_configuration_raises(self, bot, monkeypatch):
+        from slack_fallback_bot import SlackFallbackBot, SlackConfigError, SlackDisabled
+
+        monkeypatch.setenv("SLACK_ENABLED", "false")
+        with pytest.raises(SlackDisabled):
+            SlackFallbackBot()
+        monkeypatch.delenv("SLACK_APP_TOKEN")
+        with pytest.raises(SlackConfigError, match="Missing Slack tokens"):
+            SlackFallbackBot()
+
+
+class TestMetrics:
+    """Bot stages and posts report into mesh_metrics"""
+
+    def test_events_and_queue_writes_are_counted_and_traced(self, bot, temp_dir):
+        import hashlib
+        import mesh_metrics
+
+        client = FakeSocketClient()
+        trace_log = temp_dir / "trace.jsonl"
+        mesh_metrics.enable(trace_log=str(trace_log))
+        try:
+            async def run():
+                bot.events = asyncio.Queue(maxsize=10)
+                await bot.queue_writer.start()
+                worker = asyncio.create_task(bot.event_worker())
+                await bot.handle_message(client, FakeRequest("env-1", _message("1.0", "[RESEARCH] a")))
+                await bot.handle_message(client, FakeRequest("env-1", _message("1.0", "[RESEARCH] a")))
+                await bot.events.join()
+                worker.cancel()
+                await bot.queue_writer.close()
+
+            asyncio.run(run())
+            text = mesh_metrics.REGISTRY.prometheus()
+        finally:
+            mesh_metrics.disable()
+            mesh_metrics.REGISTRY.clear()
+
+        assert 'agent_mesh_slack_events_total{type="events_api"} 2' in text
+        assert "agent_mesh_slack_duplicates_total 1" in text
+        assert 'agent_mesh_slack_stage_seconds_count{stage="total"} 1' in text
+        traces = [json.loads(line) for line in trace_log.read_text().splitlines()]
+        assert traces[0]["span"] == "slack_write_to_queue"
+        assert traces[0]["trace"] == hashlib.sha256(b"[RESEARCH] a").hexdigest()
@@ -0,0 +1,118 @@
+"""Tests for the in-process SSHSIG signing engine"""
+
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class TestNativeSigning:
+    """Native Ed25519 signatures must match ssh-keygen byte for byte"""
+
+    def test_signature_is_byte_identical_to_ssh_keygen(self, sample_message, mock_agent_keys):
+        """Ed25519 is deterministic, so both backends emit the same .sig file"""
+        import sshsig
+
+        subprocess.run([
+            "ssh-keygen", "-Y", "sign", "-f", str(mock_agent_keys["private_key"]),
+            "-n", "agent-mesh", str(sample_message)
+        ], check=True, capture_output=True)
+        expected = Path(str(sample_message) + ".sig").read_text()
+
+        key = sshsig.load_private_key(mock_agent_keys["private_key"])
+        assert key.sign(sample_message.read_bytes()) == expected
+
+    def test_ssh_keygen_accepts_native_signature(self, sample_message, mock_agent_keys, temp_dir):
+        """`ssh-keygen -Y verify` should accept natively produced signatures"""
+        import sshsig
+
+        key = sshsig.load_private_key(mock_agent_keys["private_key"])
+        sig_file = temp_dir / "native.sig"
+        sig_file.write_text(key.sign(sample_message.read_bytes()))
+
+        signers = temp_dir / "allowed_signers"
+        signers.write_text("agent " + mock_agent_keys["public_key"].read_text())
+
+        with open(sample_message, "rb") as f:
+            result = subprocess.run([
+                "ssh-keygen", "-Y", "verify", "-f", str(signers), "-I", "agent",
+                "-n", "agent-mesh", "-s", str(sig_file)
+            ], stdin=f, capture_output=True)
+        assert result.returncode == 0, result.stderr
+
+    def test_native_verify_rejects_tampering(self, mock_agent_keys):
+        """In-process verification should catch modified payloads"""
+        import sshsig
+
+        key = sshsig.load_private_key(mock_agent_keys["private_key"])
+        public_key = sshsig.parse_public_key(mock_agent_keys["public_key"].read_text())
+        armored = key.sign(b"[RESEARCH] original")
+
+        assert sshsig.verify(public_key, b"[RESEARCH] original", armored) == (True, None)
+        assert sshsig.verify(public_key, b"[RESEARCH] tampered", armored)[0] is False
+
+    def test_fingerprint_matches_ssh_keygen(self, mock_agent_keys):
+        """Fingerprints should match `ssh-keygen -l` output"""
+        import sshsig
+
+        result = subprocess.run(
+            ["ssh-keygen", "-l", "-f", str(mock_agent_keys["public_key"])],
+            check=True, capture_output=True, text=True
+        )
+        public_key = sshsig.parse_public_key(mock_agent_keys["public_key"].read_text())
+        assert sshsig.fingerprint(public_key) == result.stdout.split()[1]
+
+    def test_encrypted_key_is_refused_natively(self, sample_message, temp_dir):
+        """Passphrase-protected keys need ssh-keygen, which "auto" falls back to"""
+        import sshsig
+        from sign_message import create_signature
+
+        key_path = temp_dir / "encrypted_key"
+        subprocess.run([
+            "ssh-keygen", "-t", "ed25519", "-f", str(key_path), "-N", "secret", "-q"
+        ], check=True)
+
+        with pytest.raises(sshsig.SSHSigError):
+            sshsig.load_private_key(key_path)
+        with pytest.raises(sshsig.SSHSigError):
+            create_signature(str(sample_message), key_path, backend="native")
+
+    def test_malformed_key_raises_sshsig_error(self, mock_agent_keys):
+        import sshsig
+
+        text = mock_agent_keys["private_key"].read_text()
+        lines = text.splitlines()
+        lines[1] = "!" + lines[1][1:]
+        with pytest.raises(sshsig.SSHSigError, match="base64"):
+            sshsig.parse_private_key("\n".join(lines))
+
+    def test_signing_without_cryptography_falls_back_to_ssh_keygen(self, sample_message,
+                                                                 mock_agent_keys, monkeypatch):
+        import sshsig
+        from sign_message import create_signature
+
+        expected = create_signature(str(sample_message), mock_agent_keys["private_key"], "native")
+        monkeypatch.setattr(sshsig, "HAVE_CRYPTOGRAPHY", False)
+        with pytest.raises(sshsig.SSHSigError, match="cryptography"):
+            sshsig.load_private_key(mock_agent_keys["private_key"])
+        assert create_signature(str(sample_message), mock_agent_keys["private_key"]) == expected
+
+
+class TestSigningBackends:
+    """sign_message should produce the same block with either backend"""
+
+    def test_backends_produce_identical_output(self, sample_message, mock_agent_keys, temp_dir):
+        from sign_message import sign_message
+
+        original = sample_message.read_text()
+        other = temp_dir / "copy.md"
+        other.write_text(original)
+
+        native = sign_message(str(sample_message), mock_agent_keys["agent_name"], backend="native")
+        subprocess_output = sign_message(str(other), mock_agent_keys["agent_name"], backend="ssh-keygen")
+
+        assert native.replace(str(sample_message), "") == subprocess_output.replace(str(other), "")
+        assert not Path(str(other) + ".sig").exists()
@@ -0,0 +1,120 @@
+"""Tests for the checkout-free synthesis branch builder"""
+
+import pytest
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+TASK = "task-2026-02-13-mcp-security"
+AGENTS = [f"agent{i:02d}" for i in range(24)]
+
+
+def git(repo, *args, input=None):
+    return subprocess.run(["git", "-C", str(repo), *args], input=input, capture_output=True,
+                          check=True).stdout.decode().strip()
+
+
+def commit(repo, parent, files, message="research"):
+    """Commit files on top of parent using a private index (no working tree)"""
+    env = dict(os.environ, GIT_INDEX_FILE=str(Path(repo) / f"index-{os.getpid()}"))
+    if parent:
+        subprocess.run(["git", "-C", str(repo), "read-tree", parent], env=env, check=True)
+    else:
+        subprocess.run(["git", "-C", str(repo), "read-tree", "--empty"], env=env, check=True)
+    for path, content in files.items():
+        blob = git(repo, "hash-object", "-w", "--stdin", input=content.encode())
+        subprocess.run(["git", "-C", str(repo), "update-index", "--add", "--cacheinfo",
+                        f"100644,{blob},{path}"], env=env, check=True)
+    tree = subprocess.run(["git", "-C", str(repo), "write-tree"], env=env, capture_output=True,
+                          check=True).stdout.decode().strip()
+    args = ["commit-tree", tree, "-m", message] + (["-p", parent] if parent else [])
+    return git(repo, *args)
+
+
+@pytest.fixture
+def bare_repo(temp_dir, monkeypatch):
+    """Bare repo: main plus one branch per agent, each adding a large research file"""
+    for var, value in (("GIT_AUTHOR_NAME", "Test"), ("GIT_AUTHOR_EMAIL", "t@example.com"),
+                       ("GIT_COMMITTER_NAME", "Test"), ("GIT_COMMITTER_EMAIL", "t@example.com")):
+        monkeypatch.setenv(var, value)
+    repo = temp_dir / "mesh.git"
+    git(temp_dir, "init", "-q", "--bare", "-b", "main", str(repo))
+
+    base = commit(repo, None, {"README.md": "# Mesh\n", "shared/summary.md": "line 1\nline 2\n"})
+    git(repo, "update-ref", "refs/heads/main", base)
+    for i, agent in enumerate(AGENTS):
+        body = "".join(f"{agent} finding {n}: {'x' * 60}\n" for n in range(4000))  # ~300 KB
+        head = commit(repo, base, {f"research/{agent}/findings.md": body})
+        git(repo, "update-ref", f"refs/heads/{TASK}/{agent}", head)
+
+    # Unrelated refs discovery must skip
+    git(repo, "update-ref", "refs/heads/task-2026-02-14-other/agent00", base)
+    git(repo, "update-ref", f"refs/heads/{TASK}/synthesis-clawdy", base)
+    return repo
+
+
+class TestSynthesisBuilder:
+    def test_discovers_only_this_tasks_agent_branches(self, bare_repo):
+        from synthesis_builder import SynthesisBuilder
+
+        heads = SynthesisBuilder(str(bare_repo), TASK).discover()
+        assert [agent for agent, _, _ in heads] == AGENTS
+
+    def test_clean_merge_writes_synthesis_without_checkout(self, bare_repo):
+        from synthesis_builder import SynthesisBuilder
+
+        builder = SynthesisBuilder(str(bare_repo), TASK, workers=8)
+        plan = builder.plan()
+        assert plan.clean
+        assert all(b.changed == {f"research/{b.agent}/findings.md"} for b in plan.branches)
+        assert git(bare_repo, "for-each-ref", f"refs/heads/{TASK}/synthesis") == ""
+
+        synthesis = builder.write(plan)
+        assert git(bare_repo, "rev-parse", f"{TASK}/synthesis") == synthesis
+        parents = git(bare_repo, "rev-list", "--parents", "-n1", synthesis).split()[1:]
+        assert parents[0] == git(bare_repo, "rev-parse", "main")
+        assert len(parents) == 1 + len(AGENTS)
+        files = git(bare_repo, "ls-tree", "-r", "--name-only", synthesis).splitlines()
+        assert len(files) == 2 + len(AGENTS)
+
+    def test_existing_synthesis_needs_force(self, bare_repo):
+        from synthesis_builder import SynthesisBuilder, GitError
+
+        builder = SynthesisBuilder(str(bare_repo), TASK, agents=AGENTS[:3])
+        first = builder.write(builder.plan())
+        with pytest.raises(GitError):
+            builder.write(builder.plan())
+        assert builder.write(builder.plan(), message="again\n", force=True) != first
+
+    def test_conflicts_are_attributed_and_nothing_is_written(self, bare_repo):
+        from synthesis_builder import SynthesisBuilder, GitError, BASE
+
+        main = git(bare_repo, "rev-parse", "main")
+        for agent, line in (("clawdy", "clawdy view\n"), ("neuromancer", "neuromancer view\n")):
+            head = commit(bare_repo, main, {"shared/summary.md": "line 1\n" + line})
+            git(bare_repo, "update-ref", f"refs/heads/{TASK}/{agent}", head)
+        # main moves on after the agents forked, touching another shared line
+        git(bare_repo, "update-ref", "refs/heads/main",
+            commit(bare_repo, main, {"README.md": "# Mesh v2\n"}))
+
+        builder = SynthesisBuilder(str(bare_repo), TASK)
+        plan = builder.plan()
+        assert not plan.clean
+        assert [(c.path, c.agents) for c in plan.conflicts] == [
+            ("shared/summary.md", ("clawdy", "neuromancer"))]
+        assert BASE not in plan.conflicts[0].agents
+        with pytest.raises(GitError):
+            builder.write(plan)
+        assert git(bare_repo, "for-each-ref", f"refs/heads/{TASK}/synthesis") == ""
+
+    def test_cli_dry_run(self, bare_repo):
+        script = Path(__file__).parent.parent / "scripts" / "synthesis_builder.py"
+        result = subprocess.run([sys.executable, str(script), TASK, "--repo", str(bare_repo),
+                                 "--dry-run"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert f"{len(AGENTS)} agent branches" in result.stdout
+        assert git(bare_repo, "for-each-ref", f"refs/heads/{TASK}/synthesis") == ""
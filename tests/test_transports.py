@@ -0,0 +1,201 @@
+"""Tests for the pluggable transports and the async message bus"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def _envelope(text="[RESEARCH] Neuromancer — CVE sweep\n\nFindings...", agent="neuromancer", **meta):
+    from transports import Envelope
+    from mesh_protocol import ProtocolParser, DEFAULT_PREFIXES
+
+    return Envelope.create(text, agent, ProtocolParser(DEFAULT_PREFIXES), **meta)
+
+
+def _slow_transport(gate: "asyncio.Event", name="slow"):
+    from transports import Transport
+
+    class Slow(Transport):
+        def __init__(self):
+            super().__init__()
+            self.name = name
+            self.sent = []
+
+        async def send(self, envelope):
+            await gate.wait()
+            self.sent.append(envelope)
+
+    return Slow()
+
+
+class TestEnvelope:
+    def test_parsed_once_into_queue_record(self):
+        envelope = _envelope(signed=True)
+        assert (envelope.kind, envelope.prefix) == ("research", "[RESEARCH]")
+        assert envelope.meta == {"signed": True}
+        record = envelope.to_record(source="bus")
+        assert record["user"] == "neuromancer"
+        assert record["raw"].startswith("[RESEARCH]")
+
+
+class TestFanOut:
+    def test_every_active_transport_gets_the_message(self):
+        from transports import MessageBus, LoopbackTransport
+
+        a, b, off = LoopbackTransport("a"), LoopbackTransport("b"), LoopbackTransport("off")
+
+        async def run():
+            bus = MessageBus([a, b, off])
+            bus.set_active("off", False)
+            await bus.start()
+            receipts = await bus.publish(_envelope())
+            await asyncio.gather(*receipts.values())
+            await bus.close()
+            return receipts
+
+        receipts = asyncio.run(run())
+        assert sorted(receipts) == ["a", "b"]
+        assert len(a.delivered) == len(b.delivered) == 1 and off.delivered == []
+
+    def test_kind_filter_and_subscriber(self):
+        from transports import MessageBus
+
+        async def run():
+            bus = MessageBus()
+            acks = bus.subscribe("acks", kinds={"ack"})
+            await bus.start()
+            await bus.publish(_envelope())
+            await bus.publish(_envelope("[ACK] clawdy: on it", "clawdy"))
+            received = await asyncio.wait_for(acks.receive(), 1)
+            await bus.close()
+            return received
+
+        assert asyncio.run(run()).agent == "clawdy"
+
+    def test_failing_transport_does_not_affect_others(self):
+        from transports import MessageBus, LoopbackTransport, Transport
+
+        class Broken(Transport):
+            name = "broken"
+
+            async def send(self, envelope):
+                raise ConnectionError("channel down")
+
+        good = LoopbackTransport()
+
+        async def run():
+            bus = MessageBus([Broken(), good])
+            await bus.start()
+            receipts = await bus.publish(_envelope())
+            with pytest.raises(ConnectionError):
+                await receipts["broken"]
+            await receipts["loopback"]
+            await bus.close()
+            return bus.metrics()
+
+        metrics = asyncio.run(run())
+        assert metrics["broken"]["failed"] == 1 and metrics["loopback"]["sent"] == 1
+
+
+class TestBackpressure:
+    def test_full_block_buffer_waits_but_others_keep_flowing(self):
+        from transports import MessageBus, LoopbackTransport
+
+        fast = LoopbackTransport("fast")
+
+        async def run():
+            gate = asyncio.Event()
+            slow = _slow_transport(gate)
+            bus = MessageBus([slow, fast], buffer=2)
+            await bus.start()
+            for _ in range(3):  # one in flight, two buffered
+                await bus.publish(_envelope())
+            blocked = asyncio.ensure_future(bus.publish(_envelope()))
+            await asyncio.sleep(0.05)
+            assert not blocked.done()
+            assert len(fast.delivered) == 4  # only the slow route is waited on
+            gate.set()
+            await asyncio.wait_for(blocked, 1)
+            await bus.close()
+            return slow
+
+        assert len(asyncio.run(run()).sent) == 4
+        assert len(fast.delivered) == 4
+
+    def test_drop_policies_shed_load_without_waiting(self):
+        from transports import MessageBus
+
+        async def run(overflow):
+            gate = asyncio.Event()
+            slow = _slow_transport(gate)
+            bus = MessageBus(buffer=1, overflow=overflow)
+            bus.add(slow)
+            await bus.start()
+            receipts = []
+            for i in range(4):
+                receipts.append(bus.publish_nowait(_envelope(f"[RESEARCH] {i}"))["slow"])
+                await asyncio.sleep(0)
+            gate.set()
+            await bus.close()
+            return [r.cancelled() for r in receipts], [e.content for e in slow.sent]
+
+        # first is in flight once the route task picks it up; the buffer holds one more
+        cancelled, sent = asyncio.run(run("drop_newest"))
+        assert sent == ["0", "1"] and cancelled == [False, False, True, True]
+        cancelled, sent = asyncio.run(run("drop_oldest"))
+        assert sent == ["0", "3"] and cancelled == [False, True, True, False]
+
+    def test_unknown_overflow_policy(self):
+        from transports import MessageBus, LoopbackTransport
+
+        with pytest.raises(ValueError):
+            MessageBus([LoopbackTransport()], overflow="spill")
+
+
+class TestTransports:
+    def test_file_queue_transport_is_readable_by_agents(self, temp_dir):
+        from transports import MessageBus, FileQueueTransport
+        from file_queue import FileQueue
+
+        async def run():
+            bus = MessageBus([FileQueueTransport(str(temp_dir / "queue"), fsync_interval=None)])
+            await bus.start()
+            for i in range(5):
+                await bus.publish(_envelope(f"[RESEARCH] item {i}"))
+            assert (await bus.probe()) == {"file_queue": True}
+            await bus.close()
+
+        asyncio.run(run())
+        records, _ = FileQueue(str(temp_dir / "queue")).read_since(0)
+        assert [r["content"] for r in records] == [f"item {i}" for i in range(5)]
+        assert all(r["source"] == "bus" and r["kind"] == "research" for r in records)
+
+    def test_git_issues_transport_shells_out_to_gh(self, temp_dir):
+        from transports import GitIssuesTransport
+
+        fake_gh = temp_dir / "gh"
+        log = temp_dir / "gh.log"
+        fake_gh.write_text(f'#!/bin/sh\necho "$@" >> {log}\ncat >> {log}\necho https://example.test/issues/7#c1\n')
+        fake_gh.chmod(0o755)
+
+        transport = GitIssuesTransport(repo="org/mesh", issue="7", gh=str(fake_gh))
+        url = asyncio.run(transport.send(_envelope()))
+        assert url == "https://example.test/issues/7#c1"
+        logged = log.read_text()
+        assert logged.startswith("issue comment 7 --body-file - --repo org/mesh")
+        assert "**From:** neuromancer" in logged
+        assert asyncio.run(GitIssuesTransport(gh=str(temp_dir / "missing")).probe()) is False
+
+    def test_build_bus_from_registry_channels(self):
+        from types import SimpleNamespace
+        from transports import build_bus
+
+        registry = SimpleNamespace(protocol={"communication": {
+            "fallback_channels": ["carrier_pigeon", "loopback"]}})
+        assert list(build_bus(registry=registry).routes) == ["loopback"]
+        with pytest.raises(ValueError):
+            build_bus(["carrier_pigeon"])
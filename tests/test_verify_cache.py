@@ -0,0 +1,165 @@
+"""Tests for the verification result cache"""
+
+import pytest
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def _write_registry(path: Path, public_key: str):
+    path.write_text(f"""agents:
+  test_agent:
+    authentication:
+      method: "ed25519"
+      public_key: "{public_key}"
+""")
+
+
+@pytest.fixture
+def signed_dir(temp_dir, mock_agent_keys, monkeypatch):
+    """Signed messages plus a registry holding the test key"""
+    from sign_message import sign_message
+
+    registry = temp_dir / "agents" / "agents.yaml"
+    registry.parent.mkdir()
+    _write_registry(registry, mock_agent_keys["public_key"].read_text().strip())
+    monkeypatch.chdir(temp_dir)
+
+    messages = temp_dir / "messages"
+    messages.mkdir()
+    for i in range(3):
+        path = messages / f"research-{i}.md"
+        path.write_text(f"[RESEARCH] test_agent — finding {i}\n")
+        sign_message(str(path), mock_agent_keys["agent_name"])
+    return messages
+
+
+def _no_signature_math(monkeypatch):
+    import sshsig
+    import verify_message
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature was re-verified")
+
+    monkeypatch.setattr(sshsig, "verify_digest", fail)
+    monkeypatch.setattr(verify_message, "verify_signature_stream", fail)
+
+
+class TestVerificationCache:
+    def test_persists_and_evicts_least_recently_used(self, temp_dir):
+        from verify_cache import VerificationCache
+
+        path = temp_dir / "cache.bin"
+        cache = VerificationCache(path, capacity=3)
+        keys = [bytes([i]) * 32 for i in range(4)]
+        cache.update(keys[:3])
+        assert cache.lookup(keys[0])        # 0 is now most recently used
+        cache.add(keys[3])                  # evicts 1
+        cache.save()
+
+        reloaded = VerificationCache(path, capacity=3)
+        assert [k in reloaded for k in keys] == [True, False, True, True]
+
+    def test_rewrites_log_and_ignores_torn_tail(self, temp_dir):
+        from verify_cache import VerificationCache, CACHE_HEADER
+
+        path = temp_dir / "cache.bin"
+        cache = VerificationCache(path, capacity=2)
+        for i in range(10):
+            cache.add(bytes([i]) * 32)
+            cache.save()
+        assert path.stat().st_size <= CACHE_HEADER.size + 4 * 32
+
+        with open(path, "ab") as f:
+            f.write(b"\x01" * 7)
+        assert len(VerificationCache(path, capacity=2)) == 2
+
+    def test_first_save_keeps_keys_other_processes_wrote(self, temp_dir):
+        from verify_cache import VerificationCache
+
+        path = temp_dir / "cache.bin"
+        first, second = VerificationCache(path), VerificationCache(path)
+        first.add(b"\x01" * 32)
+        first.save()
+        second.add(b"\x02" * 32)
+        second.save()
+        assert len(VerificationCache(path)) == 2
+
+    def test_keys_are_keyed_by_a_private_secret(self, temp_dir):
+        import hashlib
+        from verify_cache import VerificationCache
+
+        directory = temp_dir / "cache"
+        cache = VerificationCache(directory / "cache.bin")
+        key = cache.key(hashlib.sha256(b"payload").digest(), "sig", "SHA256:fp", "v1")
+        cache.add(key)
+        cache.save()
+        assert (directory.stat().st_mode & 0o777) == 0o700
+        assert (cache.path.stat().st_mode & 0o777) == 0o600
+        assert (cache.path.with_suffix(".key").stat().st_mode & 0o777) == 0o600
+
+        reloaded = VerificationCache(directory / "cache.bin")
+        assert key in reloaded
+        assert reloaded.key(hashlib.sha256(b"payload").digest(), "sig", "SHA256:fp", "v1") == key
+
+        cache.path.with_suffix(".key").chmod(0o644)  # a secret others can read is not trusted
+        assert VerificationCache(directory / "cache.bin").key(
+            hashlib.sha256(b"payload").digest(), "sig", "SHA256:fp", "v1") != key
+
+
+class TestCachedVerification:
+    def test_repeat_batch_skips_signature_math(self, signed_dir, monkeypatch):
+        from verify_message import verify_batch
+
+        first = verify_batch(str(signed_dir), workers=2, out=io.StringIO())
+        assert (first["valid"], first["cached"]) == (3, 0)
+
+        _no_signature_math(monkeypatch)
+        out = io.StringIO()
+        second = verify_batch(str(signed_dir), workers=1, out=out)
+        assert (second["valid"], second["cached"]) == (3, 3)
+        assert all("cache_key" not in json.loads(line) for line in out.getvalue().splitlines())
+
+    def test_tampered_payload_misses_the_cache(self, signed_dir, monkeypatch):
+        from verify_message import verify_batch
+
+        verify_batch(str(signed_dir), workers=1, out=io.StringIO())
+        tampered = signed_dir / "research-0.md"
+        tampered.write_text(tampered.read_text().replace("finding 0", "finding 9"))
+
+        summary = verify_batch(str(signed_dir), workers=1, out=io.StringIO())
+        assert (summary["valid"], summary["invalid"], summary["cached"]) == (2, 1, 2)
+
+    def test_key_rotation_in_registry_invalidates(self, signed_dir, temp_dir, monkeypatch):
+        from verify_message import verify_batch
+
+        verify_batch(str(signed_dir), workers=1, out=io.StringIO())
+
+        other = temp_dir / "other_key"
+        subprocess.run(["ssh-keygen", "-t", "ed25519", "-f", str(other), "-N", "", "-q"], check=True)
+        _write_registry(temp_dir / "agents" / "agents.yaml", Path(f"{other}.pub").read_text().strip())
+
+        summary = verify_batch(str(signed_dir), workers=1, out=io.StringIO())
+        assert (summary["valid"], summary["invalid"], summary["cached"]) == (0, 3, 0)
+
+    def test_no_cache_forces_full_check(self, signed_dir, monkeypatch):
+        from verify_message import verify_batch
+
+        verify_batch(str(signed_dir), workers=1, out=io.StringIO())
+        _no_signature_math(monkeypatch)
+        with pytest.raises(AssertionError):
+            verify_batch(str(signed_dir), workers=1, out=io.StringIO(), use_cache=False)
+
+    def test_single_file_verify_uses_cache(self, signed_dir, monkeypatch, capsys):
+        from verify_message import verify_message
+
+        message = str(signed_dir / "research-1.md")
+        assert verify_message(message, "test_agent")
+        _no_signature_math(monkeypatch)
+        assert verify_message(message, "test_agent")
+        assert "(cached)" in capsys.readouterr().out